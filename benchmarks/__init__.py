@@ -0,0 +1,7 @@
+"""Suite de benchmarks de servicios, repositorios y endpoints HTTP.
+
+Uso::
+
+    python -m benchmarks.run --sizes 10 1000 --output resultados.json
+    python -m benchmarks.compare base.json resultados.json
+"""
@@ -0,0 +1,72 @@
+"""Compara dos corridas de benchmarks y señala las regresiones.
+
+Uso::
+
+    python -m benchmarks.compare base.json actual.json --threshold 1.2
+"""
+from __future__ import annotations
+
+import argparse
+import json
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+_Key = Tuple[str, int]
+
+
+def load_medians(path: Path) -> Dict[_Key, float]:
+    """Lee la mediana de cada benchmark de un archivo de resultados.
+
+    Args:
+        path (Path): Archivo JSON generado por ``benchmarks.run``.
+
+    Returns:
+        Dict[Tuple[str, int], float]: Mediana en milisegundos por nombre y tamaño.
+    """
+    report = json.loads(path.read_text(encoding="utf-8"))
+    return {(result["name"], result["size"]): result["median_ms"] for result in report["results"]}
+
+
+def compare(baseline: Dict[_Key, float], current: Dict[_Key, float]) -> List[Tuple[_Key, float, float, float]]:
+    """Empareja los benchmarks presentes en ambas corridas.
+
+    Args:
+        baseline (Dict[Tuple[str, int], float]): Medianas de referencia.
+        current (Dict[Tuple[str, int], float]): Medianas a evaluar.
+
+    Returns:
+        List[Tuple[Tuple[str, int], float, float, float]]: Clave, mediana base,
+            mediana actual y razón actual/base, ordenados por nombre y tamaño.
+    """
+    rows = []
+    for key in sorted(baseline.keys() & current.keys()):
+        before, after = baseline[key], current[key]
+        rows.append((key, before, after, after / before if before else float("inf")))
+    return rows
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """Imprime la comparación y retorna 1 si alguna razón supera el umbral.
+
+    Args:
+        argv (Optional[List[str]]): Argumentos; por defecto los del proceso.
+
+    Returns:
+        int: Código de salida.
+    """
+    parser = argparse.ArgumentParser(description="Compara dos archivos de resultados de benchmarks.")
+    parser.add_argument("baseline", type=Path)
+    parser.add_argument("current", type=Path)
+    parser.add_argument("--threshold", type=float, default=1.2, help="Razón actual/base considerada regresión")
+    args = parser.parse_args(argv)
+
+    regressions = 0
+    for (name, size), before, after, ratio in compare(load_medians(args.baseline), load_medians(args.current)):
+        flag = "REGRESIÓN" if ratio > args.threshold else ""
+        regressions += bool(flag)
+        print(f"{size:>7} {name:<45} {before:>10.3f} -> {after:>10.3f} ms  x{ratio:5.2f} {flag}")
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
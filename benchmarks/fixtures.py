@@ -0,0 +1,157 @@
+"""Datos sintéticos reproducibles para los benchmarks."""
+from __future__ import annotations
+
+import random
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Dict, List, Sequence
+
+from sqlalchemy import create_engine
+from sqlalchemy.engine import Engine
+from sqlalchemy.ext.asyncio import AsyncEngine, async_sessionmaker, create_async_engine
+from sqlalchemy.orm import sessionmaker
+
+from src.domain.entities import ChatMessage, Product
+from src.infrastructure.db import models  # noqa: F401 - ensure models are registered
+from src.infrastructure.db.database import STORAGE_PROFILE, Base, to_async_url
+from src.infrastructure.db.storage import apply_storage_profile, engine_options
+from src.infrastructure.repositories.chat_repository import SQLChatRepository
+from src.infrastructure.repositories.product_repository import SQLProductRepository
+
+BRANDS = ("Nike", "Adidas", "Puma", "Asics", "Reebok", "New Balance", "Vans", "Converse", "Clarks", "Mizuno")
+CATEGORIES = ("Running", "Casual", "Formal", "Trail", "Basketball", "Skate")
+COLORS = ("Negro", "Blanco", "Azul", "Rojo", "Gris", "Verde", "Arena")
+SIZES = tuple(str(size) for size in range(36, 46))
+MODELS = ("Pegasus", "Ultraboost", "Suede", "Kayano", "Classic", "Fresh Foam", "Old Skool", "Chuck", "Desert", "Wave")
+ADJECTIVES = ("ligero", "cómodo", "resistente", "transpirable", "clásico", "acolchado", "versátil", "urbano")
+USER_MESSAGES = (
+    "Busco zapatillas para correr",
+    "¿Tienen algo en talla 42?",
+    "Prefiero colores oscuros",
+    "¿Cuál es la opción más barata?",
+    "Quiero algo de Nike o Adidas",
+    "¿Sirven para trail?",
+)
+
+
+def make_products(count: int, seed: int = 42) -> List[Product]:
+    """Genera un catálogo sintético determinista.
+
+    Args:
+        count (int): Cantidad de productos.
+        seed (int): Semilla del generador.
+
+    Returns:
+        List[Product]: Productos sin identificador, listos para insertarse.
+    """
+    rng = random.Random(seed)
+    products: List[Product] = []
+    for number in range(count):
+        brand = rng.choice(BRANDS)
+        model = rng.choice(MODELS)
+        category = rng.choice(CATEGORIES)
+        products.append(
+            Product(
+                id=None,
+                name=f"{brand} {model} {number}",
+                brand=brand,
+                category=category,
+                size=rng.choice(SIZES),
+                color=rng.choice(COLORS),
+                price=round(rng.uniform(30, 300), 2),
+                stock=rng.choice((0, 0, 1, 3, 5, 10, 25)),
+                description=f"Zapato {category.lower()} {rng.choice(ADJECTIVES)} y {rng.choice(ADJECTIVES)}.",
+            )
+        )
+    return products
+
+
+def make_chat_history(session_id: str, turns: int, seed: int = 42) -> List[ChatMessage]:
+    """Genera una sesión de chat larga alternando usuario y asistente.
+
+    Args:
+        session_id (str): Identificador de la sesión.
+        turns (int): Pares pregunta-respuesta a generar.
+        seed (int): Semilla del generador.
+
+    Returns:
+        List[ChatMessage]: Mensajes en orden cronológico.
+    """
+    rng = random.Random(seed)
+    start = datetime(2024, 1, 1)
+    messages: List[ChatMessage] = []
+    for turn in range(turns):
+        timestamp = start + timedelta(seconds=turn * 30)
+        question = rng.choice(USER_MESSAGES)
+        messages.append(ChatMessage(id=None, session_id=session_id, role="user", message=question, timestamp=timestamp))
+        answer = f"Te recomiendo revisar {rng.choice(BRANDS)} {rng.choice(MODELS)}, es {rng.choice(ADJECTIVES)}."
+        messages.append(
+            ChatMessage(id=None, session_id=session_id, role="assistant", message=answer, timestamp=timestamp + timedelta(seconds=5))
+        )
+    return messages
+
+
+@dataclass
+class BenchmarkDatabase:
+    """Base SQLite temporaria con sus motores síncrono y asíncrono.
+
+    Attributes:
+        url (str): URL síncrona de la base.
+        engine (Engine): Motor síncrono configurado con el perfil vigente.
+        session_factory (sessionmaker): Fábrica de sesiones síncronas.
+        async_engine (AsyncEngine): Motor asíncrono sobre el mismo archivo.
+        async_session_factory (async_sessionmaker): Fábrica de sesiones asíncronas.
+    """
+
+    url: str
+    engine: Engine
+    session_factory: sessionmaker
+    async_engine: AsyncEngine
+    async_session_factory: async_sessionmaker
+
+    async def aclose(self) -> None:
+        """Libera las conexiones de ambos motores."""
+        await self.async_engine.dispose()
+        self.engine.dispose()
+
+
+def create_database(directory: Path, products: Sequence[Product], histories: Dict[str, Sequence[ChatMessage]]) -> BenchmarkDatabase:
+    """Crea una base de datos en ``directory`` y la puebla con los datos indicados.
+
+    Los motores usan el perfil de almacenamiento configurado en
+    ``DB_STORAGE_PROFILE``, igual que la aplicación.
+
+    Args:
+        directory (Path): Carpeta donde crear el archivo.
+        products (Sequence[Product]): Catálogo a insertar.
+        histories (Dict[str, Sequence[ChatMessage]]): Mensajes por sesión.
+
+    Returns:
+        BenchmarkDatabase: Base poblada con sus motores.
+    """
+    url = f"sqlite:///{directory / 'benchmark.db'}"
+    engine = create_engine(url, **engine_options(url, STORAGE_PROFILE))
+    apply_storage_profile(engine, STORAGE_PROFILE)
+    Base.metadata.create_all(bind=engine)
+    session_factory = sessionmaker(bind=engine, autoflush=False)
+
+    session = session_factory()
+    try:
+        SQLProductRepository(session).upsert_many(products)
+        chat_repository = SQLChatRepository(session)
+        for messages in histories.values():
+            chat_repository.save_messages(messages)
+    finally:
+        session.close()
+
+    async_url = to_async_url(url)
+    async_engine = create_async_engine(async_url, **engine_options(async_url, STORAGE_PROFILE))
+    apply_storage_profile(async_engine.sync_engine, STORAGE_PROFILE)
+    return BenchmarkDatabase(
+        url=url,
+        engine=engine,
+        session_factory=session_factory,
+        async_engine=async_engine,
+        async_session_factory=async_sessionmaker(async_engine, expire_on_commit=False),
+    )
@@ -0,0 +1,139 @@
+"""Medición de tiempos y resumen estadístico de los benchmarks."""
+from __future__ import annotations
+
+import statistics
+import time
+from dataclasses import asdict, dataclass
+from typing import Any, Awaitable, Callable, Dict, List
+
+
+@dataclass
+class BenchmarkResult:
+    """Resumen de las ejecuciones de un benchmark para un tamaño de catálogo.
+
+    Attributes:
+        name (str): Operación medida.
+        size (int): Productos del catálogo usado.
+        iterations (int): Ejecuciones medidas, sin contar el calentamiento.
+        mean_ms (float): Promedio en milisegundos.
+        median_ms (float): Mediana en milisegundos.
+        p95_ms (float): Percentil 95 en milisegundos.
+        min_ms (float): Mínimo en milisegundos.
+        max_ms (float): Máximo en milisegundos.
+    """
+
+    name: str
+    size: int
+    iterations: int
+    mean_ms: float
+    median_ms: float
+    p95_ms: float
+    min_ms: float
+    max_ms: float
+
+    @classmethod
+    def from_samples(cls, name: str, size: int, samples: List[float]) -> "BenchmarkResult":
+        """Resume una lista de duraciones en milisegundos.
+
+        Args:
+            name (str): Operación medida.
+            size (int): Productos del catálogo usado.
+            samples (List[float]): Duraciones de cada ejecución.
+
+        Returns:
+            BenchmarkResult: Estadísticos redondeados a microsegundos.
+        """
+        ordered = sorted(samples)
+        p95 = ordered[min(len(ordered) - 1, round(0.95 * (len(ordered) - 1)))]
+        return cls(
+            name=name,
+            size=size,
+            iterations=len(ordered),
+            mean_ms=round(statistics.fmean(ordered), 3),
+            median_ms=round(statistics.median(ordered), 3),
+            p95_ms=round(p95, 3),
+            min_ms=round(ordered[0], 3),
+            max_ms=round(ordered[-1], 3),
+        )
+
+    def as_dict(self) -> Dict[str, Any]:
+        """Retorna el resultado como diccionario serializable a JSON."""
+        return asdict(self)
+
+
+def _should_continue(count: int, started: float, iterations: int, max_seconds: float, min_iterations: int) -> bool:
+    """Decide si corresponde otra ejecución según la cantidad y el presupuesto de tiempo."""
+    if count >= iterations:
+        return False
+    return count < min_iterations or time.perf_counter() - started < max_seconds
+
+
+def measure(
+    name: str,
+    size: int,
+    operation: Callable[[], Any],
+    iterations: int = 20,
+    max_seconds: float = 5.0,
+    warmup: int = 1,
+    min_iterations: int = 3,
+) -> BenchmarkResult:
+    """Mide una operación síncrona.
+
+    Se ejecuta hasta ``iterations`` veces o hasta agotar ``max_seconds``,
+    siempre al menos ``min_iterations`` veces.
+
+    Args:
+        name (str): Operación medida.
+        size (int): Productos del catálogo usado.
+        operation (Callable[[], Any]): Función a medir.
+        iterations (int): Ejecuciones máximas.
+        max_seconds (float): Presupuesto de tiempo por benchmark.
+        warmup (int): Ejecuciones previas descartadas.
+        min_iterations (int): Ejecuciones mínimas.
+
+    Returns:
+        BenchmarkResult: Estadísticos de las ejecuciones.
+    """
+    for _ in range(warmup):
+        operation()
+    samples: List[float] = []
+    started = time.perf_counter()
+    while _should_continue(len(samples), started, iterations, max_seconds, min_iterations):
+        begin = time.perf_counter_ns()
+        operation()
+        samples.append((time.perf_counter_ns() - begin) / 1_000_000)
+    return BenchmarkResult.from_samples(name, size, samples)
+
+
+async def measure_async(
+    name: str,
+    size: int,
+    operation: Callable[[], Awaitable[Any]],
+    iterations: int = 20,
+    max_seconds: float = 5.0,
+    warmup: int = 1,
+    min_iterations: int = 3,
+) -> BenchmarkResult:
+    """Mide una operación asíncrona con los mismos criterios que ``measure``.
+
+    Args:
+        name (str): Operación medida.
+        size (int): Productos del catálogo usado.
+        operation (Callable[[], Awaitable[Any]]): Corrutina a medir.
+        iterations (int): Ejecuciones máximas.
+        max_seconds (float): Presupuesto de tiempo por benchmark.
+        warmup (int): Ejecuciones previas descartadas.
+        min_iterations (int): Ejecuciones mínimas.
+
+    Returns:
+        BenchmarkResult: Estadísticos de las ejecuciones.
+    """
+    for _ in range(warmup):
+        await operation()
+    samples: List[float] = []
+    started = time.perf_counter()
+    while _should_continue(len(samples), started, iterations, max_seconds, min_iterations):
+        begin = time.perf_counter_ns()
+        await operation()
+        samples.append((time.perf_counter_ns() - begin) / 1_000_000)
+    return BenchmarkResult.from_samples(name, size, samples)
@@ -0,0 +1,239 @@
+"""Ejecuta la suite de benchmarks y escribe los resultados en JSON.
+
+Uso::
+
+    python -m benchmarks.run
+    python -m benchmarks.run --sizes 10 1000 --history-turns 500 --output resultados.json
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Sequence
+
+import httpx
+
+from src.application.product_service import ProductService
+from src.domain.entities import ChatContext
+from src.infrastructure.cache.catalog_cache import CatalogCache, catalog_cache
+from src.infrastructure.cache.prompt_fragments import CatalogPromptCache
+from src.infrastructure.db.database import STORAGE_PROFILE
+from src.infrastructure.llm_providers.fake_service import FakeAIService
+from src.infrastructure.repositories.cached_product_repository import CachedProductRepository
+from src.infrastructure.repositories.chat_repository import SQLChatRepository
+from src.infrastructure.repositories.product_repository import SQLProductRepository
+from src.infrastructure.search.columnar_catalog import ColumnarCatalog
+
+from .fixtures import BenchmarkDatabase, create_database, make_chat_history, make_products
+from .harness import BenchmarkResult, measure, measure_async
+
+DEFAULT_SIZES = (10, 1_000, 10_000, 100_000)
+LONG_SESSION_ID = "bench-long-session"
+DEFAULT_RESULTS_DIR = Path(__file__).resolve().parent / "results"
+
+
+def _git_revision() -> Optional[str]:
+    """Retorna el commit actual si el árbol es un repositorio git."""
+    try:
+        completed = subprocess.run(["git", "rev-parse", "HEAD"], capture_output=True, text=True, check=True, timeout=5)
+    except (OSError, subprocess.SubprocessError):
+        return None
+    return completed.stdout.strip() or None
+
+
+def _bench_repositories(db: BenchmarkDatabase, size: int, options: Dict[str, Any]) -> List[BenchmarkResult]:
+    """Mide las lecturas SQL con una sesión nueva por operación, como en cada petición."""
+
+    def get_all() -> None:
+        session = db.session_factory()
+        try:
+            SQLProductRepository(session).get_all()
+        finally:
+            session.close()
+
+    def get_recent_messages() -> None:
+        session = db.session_factory()
+        try:
+            SQLChatRepository(session).get_recent_messages(LONG_SESSION_ID, 10)
+        finally:
+            session.close()
+
+    return [
+        measure("SQLProductRepository.get_all", size, get_all, **options),
+        measure("SQLChatRepository.get_recent_messages", size, get_recent_messages, **options),
+    ]
+
+
+def _bench_services(db: BenchmarkDatabase, size: int, options: Dict[str, Any]) -> List[BenchmarkResult]:
+    """Mide la búsqueda de productos y la construcción del prompt sobre una caché propia."""
+    from src.infrastructure.llm_providers.gemini_service import GeminiService
+
+    cache = CatalogCache()
+    columnar = ColumnarCatalog()
+    prompt_cache = CatalogPromptCache()
+    cache.subscribe(columnar)
+    cache.subscribe(prompt_cache)
+    session = db.session_factory()
+    try:
+        repository = CachedProductRepository(SQLProductRepository(session), cache)
+        products = repository.get_all()
+        filters = {"brand": "Nike", "available": True}
+        scanning = ProductService(repository)
+        vectorized = ProductService(repository, columnar=columnar, columnar_min_products=0)
+
+        os.environ.setdefault("GEMINI_API_KEY", "benchmark")
+        gemini = GeminiService(prompt_cache=prompt_cache)
+        context = ChatContext(messages=make_chat_history(LONG_SESSION_ID, 3))
+        message = "Busco zapatillas Nike para correr en talla 42"
+
+        return [
+            measure("ProductService.search_products", size, lambda: scanning.search_products(filters), **options),
+            measure(
+                "ProductService.search_products[columnar]",
+                size,
+                lambda: vectorized.search_products(filters, sort="-price", limit=20),
+                **options,
+            ),
+            measure("GeminiService._build_prompt[top8]", size, lambda: gemini._build_prompt(message, products[:8], context), **options),
+            measure("GeminiService._build_prompt[catalog]", size, lambda: gemini._build_prompt(message, products, context), **options),
+        ]
+    finally:
+        session.close()
+
+
+async def _bench_http(db: BenchmarkDatabase, size: int, options: Dict[str, Any]) -> List[BenchmarkResult]:
+    """Mide ``GET /products`` y ``POST /chat`` de punta a punta con un cliente ASGI en proceso."""
+    from src.infrastructure.api.dependencies import get_async_chat_repository, get_async_product_repository, get_conversation_summaries
+    from src.infrastructure.api.main import app
+    from src.infrastructure.db.database import get_db, get_read_db
+    from src.infrastructure.llm_providers.registry import AIProviderRegistry
+    from src.infrastructure.repositories.async_chat_repository import AsyncSQLChatRepository
+    from src.infrastructure.repositories.async_product_repository import AsyncCachedProductRepository, AsyncSQLProductRepository
+
+    def override_get_db():
+        session = db.session_factory()
+        try:
+            yield session
+        finally:
+            session.close()
+
+    # Proveedor falso sin latencia: aísla el costo del servidor.
+    registry = AIProviderRegistry(default="fake")
+    registry.register("fake", FakeAIService)
+    product_repository = AsyncCachedProductRepository(AsyncSQLProductRepository(db.async_session_factory), catalog_cache)
+    chat_repository = AsyncSQLChatRepository(db.async_session_factory)
+    app.state.ai_providers = registry
+    app.dependency_overrides[get_db] = override_get_db
+    app.dependency_overrides[get_read_db] = override_get_db
+    app.dependency_overrides[get_async_product_repository] = lambda: product_repository
+    app.dependency_overrides[get_async_chat_repository] = lambda: chat_repository
+    app.dependency_overrides[get_conversation_summaries] = lambda: None
+    catalog_cache.invalidate()
+    try:
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://benchmark") as client:
+
+            async def list_products() -> None:
+                response = await client.get("/products", params={"limit": 100})
+                response.raise_for_status()
+
+            async def chat() -> None:
+                response = await client.post("/chat", json={"session_id": "bench-http", "message": "Busco zapatillas Nike para correr"})
+                response.raise_for_status()
+
+            return [
+                await measure_async("GET /products", size, list_products, **options),
+                await measure_async("POST /chat", size, chat, **options),
+            ]
+    finally:
+        app.dependency_overrides.clear()
+        catalog_cache.invalidate()
+
+
+async def run_suite(
+    sizes: Sequence[int] = DEFAULT_SIZES,
+    history_turns: int = 1000,
+    iterations: int = 20,
+    max_seconds: float = 5.0,
+    progress: bool = False,
+) -> Dict[str, Any]:
+    """Ejecuta todos los benchmarks para cada tamaño de catálogo.
+
+    Args:
+        sizes (Sequence[int]): Tamaños de catálogo a generar.
+        history_turns (int): Turnos de la sesión de chat larga.
+        iterations (int): Ejecuciones máximas por benchmark.
+        max_seconds (float): Presupuesto de tiempo por benchmark.
+        progress (bool): Imprime cada resultado en la salida de errores.
+
+    Returns:
+        Dict[str, Any]: Metadatos de la corrida y lista de resultados.
+    """
+    options = {"iterations": iterations, "max_seconds": max_seconds}
+    results: List[BenchmarkResult] = []
+    for size in sizes:
+        with tempfile.TemporaryDirectory(prefix="ecommerce-bench-") as directory:
+            db = create_database(
+                Path(directory),
+                make_products(size),
+                {LONG_SESSION_ID: make_chat_history(LONG_SESSION_ID, history_turns)},
+            )
+            try:
+                batch = _bench_repositories(db, size, options) + _bench_services(db, size, options) + await _bench_http(db, size, options)
+            finally:
+                await db.aclose()
+        results.extend(batch)
+        if progress:
+            for result in batch:
+                print(f"{result.size:>7} {result.name:<45} median {result.median_ms:>10.3f} ms  p95 {result.p95_ms:>10.3f} ms", file=sys.stderr)
+    return {
+        "metadata": {
+            "timestamp": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+            "git_revision": _git_revision(),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "storage_profile": STORAGE_PROFILE.name,
+            "sizes": list(sizes),
+            "history_turns": history_turns,
+            "iterations": iterations,
+            "max_seconds": max_seconds,
+        },
+        "results": [result.as_dict() for result in results],
+    }
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """Punto de entrada del comando.
+
+    Args:
+        argv (Optional[List[str]]): Argumentos; por defecto los del proceso.
+
+    Returns:
+        int: Código de salida.
+    """
+    parser = argparse.ArgumentParser(description="Mide servicios, repositorios y endpoints con datos sintéticos.")
+    parser.add_argument("--sizes", type=int, nargs="+", default=list(DEFAULT_SIZES), help="Tamaños de catálogo")
+    parser.add_argument("--history-turns", type=int, default=1000, help="Turnos de la sesión de chat larga")
+    parser.add_argument("--iterations", type=int, default=20, help="Ejecuciones máximas por benchmark")
+    parser.add_argument("--max-seconds", type=float, default=5.0, help="Presupuesto de tiempo por benchmark")
+    parser.add_argument("--output", type=Path, help="Archivo JSON de salida (por defecto benchmarks/results/<fecha>.json)")
+    args = parser.parse_args(argv)
+
+    report = asyncio.run(run_suite(args.sizes, args.history_turns, args.iterations, args.max_seconds, progress=True))
+    output = args.output or DEFAULT_RESULTS_DIR / f"{datetime.now(timezone.utc).strftime('%Y%m%dT%H%M%SZ')}.json"
+    output.parent.mkdir(parents=True, exist_ok=True)
+    output.write_text(json.dumps(report, indent=2, ensure_ascii=False) + "\n", encoding="utf-8")
+    print(output)
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
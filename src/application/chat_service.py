@@ -1,14 +1,61 @@
 """Servicio de aplicación responsable de orquestar las interacciones de chat."""
 from __future__ import annotations
 
+import asyncio
+import base64
+import binascii
+import time
+from contextlib import contextmanager, nullcontext
 from datetime import datetime
-from typing import List, Optional, Protocol
+from typing import TYPE_CHECKING, AsyncIterator, ContextManager, Iterator, List, Optional, Protocol, Sequence, Set, Tuple
 
-from src.domain.entities import ChatContext, ChatMessage, Product
-from src.domain.exceptions import ChatServiceError
-from src.domain.repositories import IChatRepository, IProductRepository
+from src.domain.entities import ChatContext, ChatMessage, ConversationSummary, HistoryCursor, Product
+from src.domain.exceptions import ChatServiceError, ProviderOverloadedError
+from src.domain.repositories import IAsyncChatRepository, IAsyncProductRepository
 
-from .dtos import ChatHistoryDTO, ChatMessageRequestDTO, ChatMessageResponseDTO
+from .dtos import ChatHistoryDTO, ChatHistoryPageDTO, ChatMessageRequestDTO, ChatMessageResponseDTO
+from .retrieval import ProductRetrieverProtocol
+
+if TYPE_CHECKING:
+    from .conversation_summary import ConversationSummaryService
+
+FALLBACK_RESPONSE = "Lo siento, no tengo información suficiente en este momento."
+CHAT_STAGES = ("catalog_fetch", "history_fetch", "prompt_build", "llm_call", "persist")
+
+_interrupted_persists: Set[asyncio.Task] = set()
+
+
+def encode_history_cursor(cursor: HistoryCursor) -> str:
+    """Serializa un cursor de historial como cadena opaca apta para URLs.
+
+    Args:
+        cursor (HistoryCursor): Cursor a serializar.
+
+    Returns:
+        str: Representación base64 del cursor.
+    """
+    raw = f"{cursor.timestamp.isoformat()}|{cursor.message_id}".encode("utf-8")
+    return base64.urlsafe_b64encode(raw).decode("ascii").rstrip("=")
+
+
+def decode_history_cursor(value: str) -> HistoryCursor:
+    """Reconstruye un cursor a partir de su representación opaca.
+
+    Args:
+        value (str): Cursor recibido del cliente.
+
+    Returns:
+        HistoryCursor: Cursor decodificado.
+
+    Raises:
+        ValueError: Si el cursor no tiene un formato válido.
+    """
+    try:
+        raw = base64.urlsafe_b64decode(value + "=" * (-len(value) % 4)).decode("utf-8")
+        timestamp, message_id = raw.rsplit("|", 1)
+        return HistoryCursor(timestamp=datetime.fromisoformat(timestamp), message_id=int(message_id))
+    except (binascii.Error, UnicodeDecodeError, ValueError) as exc:
+        raise ValueError("Cursor de historial inválido") from exc
 
 
 class AIServiceProtocol(Protocol):
@@ -26,36 +73,267 @@ class AIServiceProtocol(Protocol):
             str: Respuesta redactada por el proveedor de IA.
         """
 
+    def stream_response(self, user_message: str, products: List[Product], context: ChatContext) -> AsyncIterator[str]:
+        """Genera la respuesta del asistente como una secuencia de fragmentos.
+
+        Args:
+            user_message (str): Mensaje recibido por parte del usuario.
+            products (List[Product]): Catálogo actual para enriquecer la respuesta.
+            context (ChatContext): Historial reciente que aporta memoria conversacional.
+
+        Returns:
+            AsyncIterator[str]: Fragmentos de texto en el orden en que se generan.
+        """
+
+
+class LLMCallSpan:
+    """Tramo de una llamada al proveedor que descuenta el tiempo ajeno a ella.
+
+    En los turnos transmitidos, el tiempo que el cliente tarda en consumir
+    cada fragmento se marca con ``paused`` y no se atribuye al proveedor.
+    """
+
+    def __init__(self) -> None:
+        """Inicia el tramo sin tiempo descontado."""
+        self.paused_seconds = 0.0
+
+    @contextmanager
+    def paused(self) -> Iterator[None]:
+        """Descuenta la duración del bloque de la llamada."""
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.paused_seconds += time.perf_counter() - started
+
+
+class ChatTelemetryProtocol(Protocol):
+    """Contrato para observar las etapas del flujo conversacional."""
+
+    def stage(self, name: str) -> ContextManager[None]:
+        """Mide la duración de una etapa de ``CHAT_STAGES``.
+
+        Args:
+            name (str): Etapa en curso.
+
+        Returns:
+            ContextManager[None]: Bloque que delimita la etapa.
+        """
+
+    def llm_call(self) -> ContextManager[LLMCallSpan]:
+        """Mide una llamada al proveedor de IA y registra sus fallas.
+
+        Returns:
+            ContextManager[LLMCallSpan]: Bloque que delimita la llamada; el
+                tiempo marcado con ``LLMCallSpan.paused`` no se cuenta.
+        """
+
+    def observe_prompt(self, products: int, characters: int) -> None:
+        """Registra el tamaño del prompt enviado al proveedor.
+
+        Args:
+            products (int): Productos incluidos.
+            characters (int): Caracteres del mensaje y del contexto conversacional.
+        """
+
 
 class ChatService:
     """Orquesta los flujos conversacionales con el asistente de IA.
 
+    Todo el servicio trabaja sobre los contratos asíncronos de repositorio, de
+    modo que los endpoints no bloquean el event loop con E/S de base de datos.
+    Los repositorios síncronos se integran mediante los adaptadores de
+    ``src.infrastructure.repositories.sync_adapters``.
+
     Attributes:
-        _product_repo (IProductRepository): Repositorio para productos.
-        _chat_repo (IChatRepository): Repositorio para historial de chat.
-        _ai_service (AIServiceProtocol): Servicio de IA que genera respuestas.
+        _product_repo (IAsyncProductRepository): Repositorio para productos.
+        _chat_repo (IAsyncChatRepository): Repositorio para historial de chat.
+        _ai_service (Optional[AIServiceProtocol]): Servicio de IA que genera
+            respuestas; puede omitirse en flujos de solo lectura.
         _context_size (int): Cantidad máxima de mensajes a usar como contexto.
+        _retriever (Optional[ProductRetrieverProtocol]): Selector de productos
+            relevantes; sin él se envía el catálogo completo al proveedor.
+        _top_k (int): Cantidad de productos enviados al proveedor de IA.
+        _summaries (Optional[ConversationSummaryService]): Resumen incremental de
+            los mensajes que quedan fuera de la ventana de contexto.
+        _telemetry (Optional[ChatTelemetryProtocol]): Métricas por etapa del turno.
     """
 
     def __init__(
         self,
-        product_repo: IProductRepository,
-        chat_repo: IChatRepository,
-        ai_service: AIServiceProtocol,
+        product_repo: IAsyncProductRepository,
+        chat_repo: IAsyncChatRepository,
+        ai_service: Optional[AIServiceProtocol] = None,
         context_size: int = 6,
+        retriever: Optional[ProductRetrieverProtocol] = None,
+        top_k: int = 8,
+        summaries: Optional[ConversationSummaryService] = None,
+        telemetry: Optional[ChatTelemetryProtocol] = None,
     ) -> None:
         """Inicializa el servicio con los repositorios y proveedor de IA.
 
         Args:
-            product_repo (IProductRepository): Repositorio de productos.
-            chat_repo (IChatRepository): Repositorio de historial de chat.
-            ai_service (AIServiceProtocol): Servicio capaz de generar respuestas.
+            product_repo (IAsyncProductRepository): Repositorio de productos.
+            chat_repo (IAsyncChatRepository): Repositorio de historial de chat.
+            ai_service (Optional[AIServiceProtocol]): Servicio capaz de generar
+                respuestas; no es necesario para consultar o borrar historial.
             context_size (int): Cantidad máxima de mensajes a considerar.
+            retriever (Optional[ProductRetrieverProtocol]): Selector de productos
+                relevantes para acotar el prompt.
+            top_k (int): Cantidad máxima de productos a enviar al proveedor.
+            summaries (Optional[ConversationSummaryService]): Servicio compartido
+                que mantiene el resumen de cada sesión.
+            telemetry (Optional[ChatTelemetryProtocol]): Receptor de las
+                duraciones por etapa, fallas del proveedor y tamaño del prompt.
         """
         self._product_repo = product_repo
         self._chat_repo = chat_repo
         self._ai_service = ai_service
         self._context_size = context_size
+        self._retriever = retriever
+        self._top_k = top_k
+        self._summaries = summaries
+        self._telemetry = telemetry
+
+    def _stage(self, name: str) -> ContextManager[None]:
+        """Delimita una etapa del turno para la telemetría, si está configurada."""
+        if self._telemetry is None:
+            return nullcontext()
+        return self._telemetry.stage(name)
+
+    def _llm_call(self) -> ContextManager[LLMCallSpan]:
+        """Delimita la llamada al proveedor para la telemetría, si está configurada."""
+        if self._telemetry is None:
+            return nullcontext(LLMCallSpan())
+        return self._telemetry.llm_call()
+
+    def _select_products(self, user_message: str, products: Sequence[Product], context: ChatContext) -> List[Product]:
+        """Acota el catálogo a los productos relevantes para el turno actual.
+
+        Args:
+            user_message (str): Mensaje más reciente del usuario.
+            products (Sequence[Product]): Catálogo completo.
+            context (ChatContext): Historial reciente de la sesión.
+
+        Returns:
+            List[Product]: Productos a incluir en el prompt. Si nada coincide
+                con la consulta se envían los primeros productos con stock.
+        """
+        if self._retriever is None or len(products) <= self._top_k:
+            return list(products)
+        previous = [message.message for message in context.get_recent_messages() if message.is_from_user()]
+        query = " ".join([*previous, user_message])
+        selected = self._retriever.retrieve(query, products, self._top_k)
+        if not selected:
+            selected = [product for product in products if product.is_available()][: self._top_k]
+        return selected
+
+    def _require_ai_service(self) -> AIServiceProtocol:
+        """Retorna el proveedor de IA configurado.
+
+        Returns:
+            AIServiceProtocol: Proveedor usado para generar respuestas.
+
+        Raises:
+            ChatServiceError: Si el servicio se construyó sin proveedor de IA.
+        """
+        if self._ai_service is None:
+            raise ChatServiceError("No hay un proveedor de IA configurado")
+        return self._ai_service
+
+    async def _fetch_catalog(self) -> Tuple[Sequence[Product], Optional[int]]:
+        """Obtiene el catálogo y, si el repositorio la expone, su versión.
+
+        Si el repositorio ofrece instantáneas se usa la instantánea misma, sin
+        copiarla, y su versión; así las cachés de respuestas asocian cada
+        respuesta al catálogo realmente usado y los recuperadores pueden
+        rankear sus índices sin recorrer el catálogo.
+
+        Returns:
+            Tuple[Sequence[Product], Optional[int]]: Productos y versión del catálogo.
+        """
+        snapshot = getattr(self._product_repo, "snapshot", None)
+        if snapshot is None:
+            return await self._product_repo.get_all(), None
+        current = await snapshot()
+        return current, current.version
+
+    async def _prepare_turn(self, request: ChatMessageRequestDTO) -> Tuple[List[Product], ChatContext, Optional[ConversationSummary]]:
+        """Reúne los productos relevantes y el contexto de la sesión.
+
+        Con resúmenes habilitados se leen además los mensajes previos a la
+        ventana, necesarios para decidir si el resumen debe refrescarse.
+
+        Args:
+            request (ChatMessageRequestDTO): Mensaje enviado por el usuario.
+
+        Returns:
+            Tuple[List[Product], ChatContext, Optional[ConversationSummary]]:
+                Productos para el prompt, contexto reciente y resumen vigente.
+        """
+        with self._stage("catalog_fetch"):
+            products, catalog_version = await self._fetch_catalog()
+        with self._stage("history_fetch"):
+            summary = None
+            history_size = self._context_size
+            if self._summaries is not None:
+                summary = await self._summaries.load(request.session_id)
+                history_size += self._summaries.lookahead
+            history = await self._chat_repo.get_recent_messages(request.session_id, history_size)
+        with self._stage("prompt_build"):
+            context = ChatContext(
+                messages=history,
+                max_messages=self._context_size,
+                summary=summary.summary if summary is not None else "",
+                catalog_version=catalog_version,
+            )
+            selected = self._select_products(request.message, products, context)
+        if self._telemetry is not None:
+            self._telemetry.observe_prompt(len(selected), len(request.message) + len(context.format_for_prompt()))
+        return selected, context, summary
+
+    async def _persist_turn(
+        self,
+        request: ChatMessageRequestDTO,
+        ai_response: str,
+        context: ChatContext,
+        summary: Optional[ConversationSummary],
+    ) -> datetime:
+        """Guarda el mensaje del usuario y la respuesta del asistente en un solo lote.
+
+        Si corresponde, programa en segundo plano el refresco del resumen.
+
+        Args:
+            request (ChatMessageRequestDTO): Mensaje enviado por el usuario.
+            ai_response (str): Respuesta generada por el proveedor de IA.
+            context (ChatContext): Contexto leído al preparar el turno.
+            summary (Optional[ConversationSummary]): Resumen vigente de la sesión.
+
+        Returns:
+            datetime: Marca de tiempo del mensaje del asistente.
+        """
+        user_timestamp = datetime.utcnow()
+        user_message = ChatMessage(
+            id=None,
+            session_id=request.session_id,
+            role="user",
+            message=request.message,
+            timestamp=user_timestamp,
+        )
+
+        assistant_timestamp = datetime.utcnow()
+        assistant_message = ChatMessage(
+            id=None,
+            session_id=request.session_id,
+            role="assistant",
+            message=ai_response,
+            timestamp=assistant_timestamp,
+        )
+        with self._stage("persist"):
+            await self._chat_repo.save_messages([user_message, assistant_message])
+        if self._summaries is not None and self._summaries.needs_refresh(summary, context.messages):
+            self._summaries.schedule(request.session_id, self._ai_service)
+        return assistant_timestamp
 
     async def process_message(self, request: ChatMessageRequestDTO) -> ChatMessageResponseDTO:
         """Procesa un mensaje entrante, persiste el historial y retorna la respuesta.
@@ -67,39 +345,20 @@ class ChatService:
             ChatMessageResponseDTO: Respuesta del asistente al usuario.
 
         Raises:
+            ProviderOverloadedError: Si el proveedor de IA rechaza la llamada por saturación.
             ChatServiceError: Si ocurre algún problema en el flujo conversacional.
         """
 
         try:
-            products = self._product_repo.get_all()
-            history = self._chat_repo.get_recent_messages(request.session_id, self._context_size)
-            context = ChatContext(messages=history, max_messages=self._context_size)
-
-            ai_response = await self._ai_service.generate_response(
-                user_message=request.message,
-                products=products,
-                context=context,
-            )
-
-            user_timestamp = datetime.utcnow()
-            user_message = ChatMessage(
-                id=None,
-                session_id=request.session_id,
-                role="user",
-                message=request.message,
-                timestamp=user_timestamp,
-            )
-            self._chat_repo.save_message(user_message)
-
-            assistant_timestamp = datetime.utcnow()
-            assistant_message = ChatMessage(
-                id=None,
-                session_id=request.session_id,
-                role="assistant",
-                message=ai_response,
-                timestamp=assistant_timestamp,
-            )
-            self._chat_repo.save_message(assistant_message)
+            products, context, summary = await self._prepare_turn(request)
+            ai_service = self._require_ai_service()
+            with self._llm_call():
+                ai_response = await ai_service.generate_response(
+                    user_message=request.message,
+                    products=products,
+                    context=context,
+                )
+            assistant_timestamp = await self._persist_turn(request, ai_response, context, summary)
 
             return ChatMessageResponseDTO(
                 session_id=request.session_id,
@@ -107,10 +366,75 @@ class ChatService:
                 assistant_message=ai_response,
                 timestamp=assistant_timestamp,
             )
+        except ProviderOverloadedError:
+            raise
         except Exception as exc:  # pragma: no cover - defensive catch
             raise ChatServiceError(str(exc)) from exc
 
-    def get_session_history(self, session_id: str, limit: Optional[int] = None) -> List[ChatHistoryDTO]:
+    async def _persist_interrupted(
+        self,
+        request: ChatMessageRequestDTO,
+        partial_response: str,
+        context: ChatContext,
+        summary: Optional[ConversationSummary],
+    ) -> None:
+        """Persiste un turno cortado por el cliente sin que la cancelación lo aborte.
+
+        La escritura corre en su propia tarea: si la petición vuelve a
+        cancelarse mientras se espera, la tarea termina igualmente.
+        """
+        task = asyncio.ensure_future(self._persist_turn(request, partial_response, context, summary))
+        _interrupted_persists.add(task)
+        task.add_done_callback(_interrupted_persists.discard)
+        await asyncio.shield(task)
+
+    async def stream_message(self, request: ChatMessageRequestDTO) -> AsyncIterator[str]:
+        """Transmite la respuesta del asistente y persiste el turno al finalizar.
+
+        Si el cliente se desconecta a mitad del flujo, se persiste el turno con
+        la parte de la respuesta ya generada, para que el historial refleje lo
+        que el usuario llegó a recibir. La métrica ``llm_call`` solo cuenta la
+        espera de los fragmentos del proveedor.
+
+        Args:
+            request (ChatMessageRequestDTO): Mensaje enviado por el usuario.
+
+        Yields:
+            str: Fragmentos de la respuesta a medida que el proveedor los genera.
+
+        Raises:
+            ProviderOverloadedError: Si el proveedor de IA rechaza la llamada por saturación.
+            ChatServiceError: Si ocurre algún problema en el flujo conversacional.
+        """
+        try:
+            products, context, summary = await self._prepare_turn(request)
+            ai_service = self._require_ai_service()
+            chunks: List[str] = []
+            try:
+                with self._llm_call() as call:
+                    async for chunk in ai_service.stream_response(
+                        user_message=request.message,
+                        products=products,
+                        context=context,
+                    ):
+                        chunks.append(chunk)
+                        with call.paused():
+                            yield chunk
+            except (GeneratorExit, asyncio.CancelledError):
+                if chunks:
+                    await self._persist_interrupted(request, "".join(chunks), context, summary)
+                raise
+            ai_response = "".join(chunks)
+            if not ai_response.strip():
+                ai_response = FALLBACK_RESPONSE
+                yield ai_response
+            await self._persist_turn(request, ai_response, context, summary)
+        except ProviderOverloadedError:
+            raise
+        except Exception as exc:
+            raise ChatServiceError(str(exc)) from exc
+
+    async def get_session_history(self, session_id: str, limit: Optional[int] = None) -> List[ChatHistoryDTO]:
         """Recupera el historial de conversación de una sesión.
 
         Args:
@@ -120,10 +444,52 @@ class ChatService:
         Returns:
             List[ChatHistoryDTO]: Mensajes ordenados listos para exponer al cliente.
         """
-        messages = self._chat_repo.get_session_history(session_id, limit)
+        messages = await self._chat_repo.get_session_history(session_id, limit)
         return [ChatHistoryDTO.model_validate(message) for message in messages]
 
-    def clear_session_history(self, session_id: str) -> int:
+    async def get_history_page(
+        self,
+        session_id: str,
+        limit: int,
+        before: Optional[str] = None,
+        after: Optional[str] = None,
+        newest_first: bool = False,
+    ) -> ChatHistoryPageDTO:
+        """Recupera una página del historial usando cursores opacos.
+
+        Para avanzar, el ``next_cursor`` retornado se envía como ``before`` al
+        paginar del más reciente al más antiguo, o como ``after`` en el orden
+        cronológico.
+
+        Args:
+            session_id (str): Identificador de la sesión de chat.
+            limit (int): Cantidad máxima de mensajes de la página.
+            before (Optional[str]): Cursor exclusivo superior.
+            after (Optional[str]): Cursor exclusivo inferior.
+            newest_first (bool): Ordena del más reciente al más antiguo.
+
+        Returns:
+            ChatHistoryPageDTO: Mensajes de la página y cursor de la siguiente.
+
+        Raises:
+            ValueError: Si alguno de los cursores es inválido.
+        """
+        messages = await self._chat_repo.get_history_page(
+            session_id,
+            limit,
+            before=decode_history_cursor(before) if before else None,
+            after=decode_history_cursor(after) if after else None,
+            newest_first=newest_first,
+        )
+        next_cursor = None
+        if messages and len(messages) == limit:
+            next_cursor = encode_history_cursor(HistoryCursor.from_message(messages[-1]))
+        return ChatHistoryPageDTO(
+            items=[ChatHistoryDTO.model_validate(message) for message in messages],
+            next_cursor=next_cursor,
+        )
+
+    async def clear_session_history(self, session_id: str) -> int:
         """Elimina todos los mensajes guardados de una sesión.
 
         Args:
@@ -132,4 +498,4 @@ class ChatService:
         Returns:
             int: Cantidad de mensajes eliminados.
         """
-        return self._chat_repo.delete_session_history(session_id)
+        return await self._chat_repo.delete_session_history(session_id)
@@ -0,0 +1,181 @@
+"""Resumen incremental de conversaciones para acotar el tamaño del prompt."""
+from __future__ import annotations
+
+import asyncio
+import logging
+from datetime import datetime
+from typing import Dict, List, Optional, Protocol, Sequence, runtime_checkable
+
+from src.domain.entities import ChatMessage, ConversationSummary, HistoryCursor
+from src.domain.repositories import IAsyncChatRepository
+
+logger = logging.getLogger(__name__)
+
+
+@runtime_checkable
+class ConversationSummarizerProtocol(Protocol):
+    """Contrato para los proveedores capaces de condensar una conversación."""
+
+    async def summarize_conversation(self, previous_summary: str, messages: List[ChatMessage]) -> str:
+        """Integra mensajes nuevos en un resumen existente.
+
+        Args:
+            previous_summary (str): Resumen acumulado hasta ahora (puede ser vacío).
+            messages (List[ChatMessage]): Mensajes a incorporar en orden cronológico.
+
+        Returns:
+            str: Resumen actualizado.
+        """
+
+
+class ConversationSummaryService:
+    """Mantiene un resumen por sesión de los mensajes fuera de la ventana reciente.
+
+    El resumen se refresca en segundo plano cada ``every_turns`` turnos: los
+    mensajes que salieron de la ventana de contexto y aún no están cubiertos se
+    pliegan en el resumen almacenado. La instancia debe compartirse durante la
+    vida de la aplicación para evitar refrescos simultáneos de una misma sesión.
+
+    Attributes:
+        _chat_repo (IAsyncChatRepository): Repositorio del historial.
+        _every_turns (int): Turnos sin resumir que disparan un refresco.
+        _context_size (int): Mensajes recientes que se envían completos al modelo.
+        _max_batch (int): Mensajes máximos plegados en cada refresco.
+    """
+
+    def __init__(
+        self,
+        chat_repo: IAsyncChatRepository,
+        every_turns: int = 4,
+        context_size: int = 6,
+        max_batch: int = 200,
+    ) -> None:
+        """Inicializa el servicio.
+
+        Args:
+            chat_repo (IAsyncChatRepository): Repositorio del historial;
+                debe poder usarse fuera del ciclo de una petición.
+            every_turns (int): Turnos sin resumir que disparan un refresco.
+            context_size (int): Tamaño de la ventana de mensajes recientes.
+            max_batch (int): Mensajes máximos plegados en cada refresco.
+        """
+        self._chat_repo = chat_repo
+        self._every_turns = max(1, every_turns)
+        self._context_size = context_size
+        self._max_batch = max_batch
+        self._tasks: Dict[str, asyncio.Task[Optional[ConversationSummary]]] = {}
+
+    @property
+    def lookahead(self) -> int:
+        """Mensajes adicionales a la ventana que deben leerse para decidir un refresco."""
+        return 2 * self._every_turns
+
+    async def load(self, session_id: str) -> Optional[ConversationSummary]:
+        """Obtiene el resumen almacenado de una sesión.
+
+        Args:
+            session_id (str): Identificador de la conversación.
+
+        Returns:
+            Optional[ConversationSummary]: Resumen actual o ``None``.
+        """
+        return await self._chat_repo.get_summary(session_id)
+
+    def needs_refresh(self, summary: Optional[ConversationSummary], history: Sequence[ChatMessage]) -> bool:
+        """Indica si, tras guardar un turno nuevo, conviene refrescar el resumen.
+
+        Args:
+            summary (Optional[ConversationSummary]): Resumen vigente.
+            history (Sequence[ChatMessage]): Mensajes recientes leídos antes del turno,
+                al menos ``context_size + lookahead`` si existen.
+
+        Returns:
+            bool: ``True`` si hay ``every_turns`` turnos fuera de la ventana sin resumir.
+        """
+        # El turno nuevo suma dos mensajes y desplaza la ventana hacia adelante.
+        outside_window = history[: max(0, len(history) - max(0, self._context_size - 2))]
+        covered = summary.covered_until if summary is not None else None
+        pending = [
+            message
+            for message in outside_window
+            if message.id is not None and (covered is None or (message.timestamp, message.id) > covered.sort_key())
+        ]
+        return len(pending) >= self.lookahead
+
+    async def refresh(self, session_id: str, summarizer: ConversationSummarizerProtocol) -> Optional[ConversationSummary]:
+        """Pliega en el resumen los mensajes que quedaron fuera de la ventana.
+
+        Args:
+            session_id (str): Identificador de la conversación.
+            summarizer (ConversationSummarizerProtocol): Proveedor que redacta el resumen.
+
+        Returns:
+            Optional[ConversationSummary]: Resumen vigente tras el refresco.
+        """
+        summary = await self.load(session_id)
+        recent = await self._chat_repo.get_recent_messages(session_id, self._context_size)
+        window_start = next((message for message in recent if message.id is not None), None)
+        if window_start is None:
+            return summary
+        older = await self._chat_repo.get_history_page(
+            session_id,
+            self._max_batch,
+            before=HistoryCursor.from_message(window_start),
+            after=summary.covered_until if summary is not None else None,
+        )
+        if not older:
+            return summary
+        text = await summarizer.summarize_conversation(summary.summary if summary is not None else "", older)
+        updated = ConversationSummary(
+            session_id=session_id,
+            summary=text.strip(),
+            covered_until=HistoryCursor.from_message(older[-1]),
+            updated_at=datetime.utcnow(),
+        )
+        return await self._chat_repo.save_summary(updated)
+
+    def schedule(self, session_id: str, summarizer: object) -> bool:
+        """Programa un refresco en segundo plano si la sesión no tiene uno en curso.
+
+        Args:
+            session_id (str): Identificador de la conversación.
+            summarizer (object): Proveedor de IA; se ignora si no sabe resumir.
+
+        Returns:
+            bool: ``True`` si se programó una tarea nueva.
+        """
+        if not isinstance(summarizer, ConversationSummarizerProtocol):
+            return False
+        running = self._tasks.get(session_id)
+        if running is not None and not running.done():
+            return False
+        task = asyncio.get_running_loop().create_task(self._run(session_id, summarizer))
+        self._tasks[session_id] = task
+        task.add_done_callback(lambda finished: self._forget(session_id, finished))
+        return True
+
+    async def _run(self, session_id: str, summarizer: ConversationSummarizerProtocol) -> Optional[ConversationSummary]:
+        """Ejecuta un refresco registrando las fallas en lugar de propagarlas."""
+        try:
+            return await self.refresh(session_id, summarizer)
+        except Exception:  # noqa: BLE001 - el turno ya respondió; se reintenta más adelante
+            logger.exception("No se pudo actualizar el resumen de la sesión %s", session_id)
+            return None
+
+    def _forget(self, session_id: str, task: asyncio.Task[Optional[ConversationSummary]]) -> None:
+        """Retira la tarea terminada del registro de refrescos en curso."""
+        if self._tasks.get(session_id) is task:
+            del self._tasks[session_id]
+
+    async def wait_idle(self) -> None:
+        """Espera a que terminen los refrescos en curso."""
+        if self._tasks:
+            await asyncio.gather(*self._tasks.values(), return_exceptions=True)
+
+    async def aclose(self) -> None:
+        """Cancela los refrescos pendientes al apagar la aplicación."""
+        tasks = list(self._tasks.values())
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        self._tasks.clear()
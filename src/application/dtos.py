@@ -2,9 +2,9 @@
 from __future__ import annotations
 
 from datetime import datetime
-from typing import Optional
+from typing import Any, Dict, List, Optional
 
-from pydantic import BaseModel, field_validator
+from pydantic import BaseModel, Field, field_validator
 
 
 class ProductDTO(BaseModel):
@@ -134,3 +134,107 @@ class ChatHistoryDTO(BaseModel):
 
     class Config:
         from_attributes = True
+
+
+class ChatHistoryPageDTO(BaseModel):
+    """DTO que agrupa una página del historial y el cursor de la siguiente."""
+
+    items: List[ChatHistoryDTO]
+    next_cursor: Optional[str] = None
+
+
+class ProductPageDTO(BaseModel):
+    """DTO con una página del catálogo (posiblemente proyectada) y el cursor de la siguiente."""
+
+    items: List[Dict[str, Any]]
+    next_cursor: Optional[str] = None
+
+
+class ProductImportErrorDTO(BaseModel):
+    """DTO que describe por qué se rechazó una fila de una importación masiva."""
+
+    row: int
+    errors: List[str]
+
+
+class ProductImportReportDTO(BaseModel):
+    """DTO con el resultado de una importación masiva de productos.
+
+    Attributes:
+        processed (int): Filas leídas de la entrada.
+        imported (int): Filas insertadas o actualizadas.
+        failed (int): Filas rechazadas.
+        errors (List[ProductImportErrorDTO]): Detalle de las filas rechazadas.
+        errors_truncated (bool): Indica si se omitieron errores por exceder el máximo.
+    """
+
+    processed: int = 0
+    imported: int = 0
+    failed: int = 0
+    errors: List[ProductImportErrorDTO] = Field(default_factory=list)
+    errors_truncated: bool = False
+
+
+class StockAdjustmentDTO(BaseModel):
+    """DTO de un ajuste de stock: ``delta`` negativo descuenta y positivo repone."""
+
+    product_id: int
+    delta: int
+
+    @field_validator("delta")
+    @classmethod
+    def delta_must_not_be_zero(cls, value: int) -> int:
+        """Valida que el ajuste modifique el stock.
+
+        Args:
+            value (int): Variación solicitada.
+
+        Returns:
+            int: La misma variación si es válida.
+
+        Raises:
+            ValueError: Si la variación es cero.
+        """
+        if value == 0:
+            raise ValueError("La cantidad a ajustar debe ser distinta de cero")
+        return value
+
+
+class StockBatchRequestDTO(BaseModel):
+    """DTO con los ajustes de stock a aplicar en una sola transacción."""
+
+    items: List[StockAdjustmentDTO] = Field(min_length=1, max_length=1000)
+
+
+class StockAdjustmentResultDTO(BaseModel):
+    """DTO con el resultado de un ajuste de stock."""
+
+    product_id: int
+    delta: int
+    applied: bool
+    stock: Optional[int] = None
+    error: Optional[str] = None
+
+    class Config:
+        from_attributes = True
+
+
+class FacetedSearchResponseDTO(BaseModel):
+    """DTO con una página de búsqueda facetada y los conteos de cada faceta.
+
+    Attributes:
+        items (List[ProductDTO]): Productos que cumplen todos los filtros.
+        total (int): Total de productos que cumplen todos los filtros.
+        facets (Dict[str, Dict[str, int]]): Conteos por dimensión y valor.
+    """
+
+    items: List[ProductDTO]
+    total: int
+    facets: Dict[str, Dict[str, int]] = Field(default_factory=dict)
+
+
+class ProductMatchDTO(BaseModel):
+    """DTO con un producto encontrado por búsqueda aproximada y su similitud (0 a 1)."""
+
+    product: ProductDTO
+    score: float
@@ -0,0 +1,273 @@
+"""Importación masiva de productos desde flujos NDJSON o CSV."""
+from __future__ import annotations
+
+import csv
+import json
+from dataclasses import dataclass
+from typing import Any, Dict, Iterable, List, Optional, Protocol
+
+from pydantic import ValidationError
+
+from src.domain.entities import Product
+from src.domain.repositories import IProductRepository
+
+from .dtos import ProductDTO, ProductImportErrorDTO, ProductImportReportDTO
+
+IMPORT_FORMATS = ("ndjson", "csv")
+
+
+@dataclass
+class ImportRow:
+    """Fila leída de la entrada antes de validarla.
+
+    Attributes:
+        number (int): Número de fila de datos (1 es la primera tras el encabezado).
+        data (Optional[Dict[str, Any]]): Campos leídos; ``None`` si no se pudo interpretar.
+        error (Optional[str]): Motivo por el que la fila no pudo interpretarse.
+    """
+
+    number: int
+    data: Optional[Dict[str, Any]]
+    error: Optional[str] = None
+
+
+class RowParser(Protocol):
+    """Contrato de los lectores incrementales de filas."""
+
+    def feed(self, line: str) -> Optional[ImportRow]:
+        """Consume una línea y retorna una fila cuando se completa."""
+
+    def close(self) -> Optional[ImportRow]:
+        """Retorna la fila pendiente al terminar la entrada, si la hay."""
+
+
+class NDJSONRowParser:
+    """Interpreta un objeto JSON por línea, ignorando líneas vacías."""
+
+    def __init__(self) -> None:
+        """Inicializa el contador de filas."""
+        self._count = 0
+
+    def feed(self, line: str) -> Optional[ImportRow]:
+        """Interpreta una línea como un objeto JSON.
+
+        Args:
+            line (str): Línea de la entrada.
+
+        Returns:
+            Optional[ImportRow]: Fila leída o ``None`` si la línea está vacía.
+        """
+        if not line.strip():
+            return None
+        self._count += 1
+        try:
+            data = json.loads(line)
+        except json.JSONDecodeError as exc:
+            return ImportRow(self._count, None, f"JSON inválido: {exc.msg}")
+        if not isinstance(data, dict):
+            return ImportRow(self._count, None, "Cada línea debe ser un objeto JSON")
+        return ImportRow(self._count, data)
+
+    def close(self) -> Optional[ImportRow]:
+        """No hay estado pendiente en NDJSON."""
+        return None
+
+
+class CSVRowParser:
+    """Interpreta CSV con encabezado, admitiendo campos entre comillas con saltos de línea.
+
+    Los registros se acumulan hasta que las comillas quedan balanceadas, de
+    modo que el lector puede alimentarse línea a línea desde un flujo.
+    """
+
+    def __init__(self) -> None:
+        """Inicializa el lector a la espera del encabezado."""
+        self._header: Optional[List[str]] = None
+        self._pending = ""
+        self._count = 0
+
+    def feed(self, line: str) -> Optional[ImportRow]:
+        """Acumula una línea y retorna la fila cuando el registro está completo.
+
+        Args:
+            line (str): Línea de la entrada.
+
+        Returns:
+            Optional[ImportRow]: Fila leída, o ``None`` si aún falta contenido.
+        """
+        self._pending += line if line.endswith("\n") else line + "\n"
+        if self._pending.count('"') % 2:
+            return None
+        record, self._pending = self._pending, ""
+        return self._parse(record)
+
+    def close(self) -> Optional[ImportRow]:
+        """Interpreta el registro pendiente, incluso con comillas sin cerrar."""
+        if not self._pending:
+            return None
+        record, self._pending = self._pending, ""
+        return self._parse(record)
+
+    def _parse(self, record: str) -> Optional[ImportRow]:
+        """Convierte un registro completo en fila usando el encabezado."""
+        if not record.strip():
+            return None
+        try:
+            values = next(csv.reader([record.rstrip("\r\n")]))
+        except csv.Error as exc:
+            self._count += 1
+            return ImportRow(self._count, None, f"CSV inválido: {exc}")
+        if self._header is None:
+            self._header = [name.strip() for name in values]
+            return None
+        self._count += 1
+        if len(values) != len(self._header):
+            return ImportRow(self._count, None, f"Se esperaban {len(self._header)} columnas y llegaron {len(values)}")
+        data: Dict[str, Any] = dict(zip(self._header, values))
+        if not str(data.get("id", "")).strip():
+            data["id"] = None
+        return ImportRow(self._count, data)
+
+
+def make_row_parser(import_format: str) -> RowParser:
+    """Crea el lector de filas para un formato de importación.
+
+    Args:
+        import_format (str): ``ndjson`` o ``csv``.
+
+    Returns:
+        RowParser: Lector incremental.
+
+    Raises:
+        ValueError: Si el formato no es soportado.
+    """
+    if import_format == "ndjson":
+        return NDJSONRowParser()
+    if import_format == "csv":
+        return CSVRowParser()
+    raise ValueError(f"Formato de importación no soportado: {import_format}")
+
+
+def parse_rows(lines: Iterable[str], import_format: str) -> Iterable[ImportRow]:
+    """Lee filas de una secuencia de líneas en el formato indicado.
+
+    Args:
+        lines (Iterable[str]): Líneas de la entrada (por ejemplo, un archivo abierto).
+        import_format (str): ``ndjson`` o ``csv``.
+
+    Yields:
+        ImportRow: Filas en el orden de la entrada.
+    """
+    parser = make_row_parser(import_format)
+    for line in lines:
+        row = parser.feed(line)
+        if row is not None:
+            yield row
+    row = parser.close()
+    if row is not None:
+        yield row
+
+
+class ProductImportService:
+    """Valida y escribe productos en lotes, acumulando un reporte por fila.
+
+    Las filas se agregan con ``add``; cuando el lote alcanza ``batch_size``
+    se valida contra ``ProductDTO`` y las reglas de ``Product`` y las filas
+    válidas se escriben con ``upsert_many`` en una transacción. Si el lote
+    falla al escribirse, todas sus filas se reportan como rechazadas.
+
+    Attributes:
+        _product_repository (IProductRepository): Repositorio de destino.
+        _batch_size (int): Filas por lote y transacción.
+        _max_errors (int): Errores detallados máximos en el reporte.
+    """
+
+    def __init__(self, product_repository: IProductRepository, batch_size: int = 1000, max_errors: int = 1000) -> None:
+        """Inicializa el servicio.
+
+        Args:
+            product_repository (IProductRepository): Repositorio de destino.
+            batch_size (int): Filas por lote y transacción.
+            max_errors (int): Errores detallados máximos en el reporte.
+        """
+        self._product_repository = product_repository
+        self._batch_size = max(1, batch_size)
+        self._max_errors = max_errors
+        self._pending: List[ImportRow] = []
+        self._report = ProductImportReportDTO()
+
+    def add(self, row: ImportRow) -> bool:
+        """Agrega una fila al lote en curso.
+
+        Args:
+            row (ImportRow): Fila leída de la entrada.
+
+        Returns:
+            bool: ``True`` cuando el lote está lleno y debe llamarse ``flush``.
+        """
+        self._report.processed += 1
+        if row.data is None:
+            self._reject(row.number, [row.error or "Fila inválida"])
+        else:
+            self._pending.append(row)
+        return len(self._pending) >= self._batch_size
+
+    def flush(self) -> int:
+        """Valida y escribe el lote en curso.
+
+        Returns:
+            int: Filas escritas del lote.
+        """
+        rows, self._pending = self._pending, []
+        products: List[Product] = []
+        numbers: List[int] = []
+        for row in rows:
+            try:
+                products.append(Product(**ProductDTO.model_validate(row.data).model_dump()))
+                numbers.append(row.number)
+            except ValidationError as exc:
+                self._reject(row.number, [f"{'.'.join(str(part) for part in error['loc'])}: {error['msg']}" for error in exc.errors()])
+            except (TypeError, ValueError) as exc:
+                self._reject(row.number, [str(exc)])
+        if not products:
+            return 0
+        try:
+            written = self._product_repository.upsert_many(products)
+        except Exception as exc:  # noqa: BLE001 - se reporta el lote completo como rechazado
+            for number in numbers:
+                self._reject(number, [f"No se pudo guardar el lote: {exc}"])
+            return 0
+        self._report.imported += written
+        return written
+
+    def report(self) -> ProductImportReportDTO:
+        """Escribe el lote pendiente y retorna el reporte acumulado.
+
+        Returns:
+            ProductImportReportDTO: Totales y errores por fila.
+        """
+        if self._pending:
+            self.flush()
+        return self._report
+
+    def import_rows(self, rows: Iterable[ImportRow]) -> ProductImportReportDTO:
+        """Importa todas las filas de una secuencia síncrona.
+
+        Args:
+            rows (Iterable[ImportRow]): Filas leídas de la entrada.
+
+        Returns:
+            ProductImportReportDTO: Totales y errores por fila.
+        """
+        for row in rows:
+            if self.add(row):
+                self.flush()
+        return self.report()
+
+    def _reject(self, row_number: int, errors: List[str]) -> None:
+        """Registra una fila rechazada respetando el máximo de errores detallados."""
+        self._report.failed += 1
+        if len(self._report.errors) < self._max_errors:
+            self._report.errors.append(ProductImportErrorDTO(row=row_number, errors=errors))
+        else:
+            self._report.errors_truncated = True
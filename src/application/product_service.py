@@ -1,14 +1,81 @@
 """Servicio de aplicación que orquesta los casos de uso de productos."""
 from __future__ import annotations
 
+import base64
+import binascii
+import difflib
+import json
 from dataclasses import asdict
-from typing import Dict, Iterable, List, Optional
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
 
-from src.domain.entities import Product
+from src.domain.entities import PRODUCT_FIELDS, PRODUCT_SORT_FIELDS, Product, ProductCursor, StockAdjustment
 from src.domain.exceptions import ProductNotFoundError
 from src.domain.repositories import IProductRepository
 
-from .dtos import ProductDTO
+from .dtos import FacetedSearchResponseDTO, ProductDTO, ProductMatchDTO, ProductPageDTO, StockAdjustmentDTO, StockAdjustmentResultDTO
+from .retrieval import (
+    FACET_DIMENSIONS,
+    ColumnarCatalogProtocol,
+    FacetIndexProtocol,
+    FacetQuery,
+    FuzzyIndexProtocol,
+    ProductRetrieverProtocol,
+)
+
+
+def encode_product_cursor(cursor: ProductCursor) -> str:
+    """Serializa un cursor de catálogo como cadena opaca apta para URLs.
+
+    Args:
+        cursor (ProductCursor): Cursor a serializar.
+
+    Returns:
+        str: Representación base64 del cursor.
+    """
+    raw = json.dumps([cursor.sort_by, cursor.value, cursor.product_id], separators=(",", ":")).encode("utf-8")
+    return base64.urlsafe_b64encode(raw).decode("ascii").rstrip("=")
+
+
+def decode_product_cursor(value: str, sort_by: str) -> ProductCursor:
+    """Reconstruye un cursor de catálogo y verifica que corresponda al orden pedido.
+
+    Args:
+        value (str): Cursor recibido del cliente.
+        sort_by (str): Campo de orden del listado solicitado.
+
+    Returns:
+        ProductCursor: Cursor decodificado.
+
+    Raises:
+        ValueError: Si el cursor es inválido o fue emitido para otro orden.
+    """
+    try:
+        raw = base64.urlsafe_b64decode(value + "=" * (-len(value) % 4)).decode("utf-8")
+        cursor_sort, sort_value, product_id = json.loads(raw)
+    except (binascii.Error, UnicodeDecodeError, ValueError, TypeError) as exc:
+        raise ValueError("Cursor de productos inválido") from exc
+    if cursor_sort != sort_by or not isinstance(product_id, int) or not isinstance(sort_value, (int, float, str)):
+        raise ValueError("Cursor de productos inválido")
+    return ProductCursor(sort_by=cursor_sort, value=sort_value, product_id=product_id)
+
+
+def parse_product_sort(sort: str) -> Tuple[str, bool]:
+    """Interpreta un parámetro de orden como ``price`` o ``-price``.
+
+    Args:
+        sort (str): Campo de orden, con prefijo ``-`` para orden descendente.
+
+    Returns:
+        Tuple[str, bool]: Campo de orden y si es descendente.
+
+    Raises:
+        ValueError: Si el campo no admite ordenamiento.
+    """
+    descending = sort.startswith("-")
+    sort_by = sort[1:] if descending else sort
+    if sort_by not in PRODUCT_SORT_FIELDS:
+        raise ValueError(f"Orden no soportado: {sort}. Use uno de {', '.join(PRODUCT_SORT_FIELDS)}")
+    return sort_by, descending
 
 
 class ProductService:
@@ -17,16 +84,50 @@ class ProductService:
     Attributes:
         _product_repository (IProductRepository): Repositorio utilizado para
             acceder y persistir entidades ``Product``.
+        _retriever (Optional[ProductRetrieverProtocol]): Índice usado para las
+            búsquedas en texto libre.
+        _facets (Optional[FacetIndexProtocol]): Índice usado para las
+            búsquedas facetadas.
+        _columnar (Optional[ColumnarCatalogProtocol]): Vista columnar opcional
+            usada para filtrar y ordenar catálogos grandes; la API no la entrega.
+        _columnar_min_products (int): Tamaño de catálogo desde el que se usa la
+            vista columnar en lugar de recorrer las entidades.
+        _fuzzy (Optional[FuzzyIndexProtocol]): Índice usado para las búsquedas
+            tolerantes a errores de tipeo.
     """
 
-    def __init__(self, product_repository: IProductRepository) -> None:
+    def __init__(
+        self,
+        product_repository: IProductRepository,
+        retriever: Optional[ProductRetrieverProtocol] = None,
+        facets: Optional[FacetIndexProtocol] = None,
+        columnar: Optional[ColumnarCatalogProtocol] = None,
+        columnar_min_products: int = 2000,
+        fuzzy: Optional[FuzzyIndexProtocol] = None,
+    ) -> None:
         """Inicializa el servicio con su dependencia de repositorio.
 
         Args:
             product_repository (IProductRepository): Implementación concreta
                 para interactuar con la persistencia.
+            retriever (Optional[ProductRetrieverProtocol]): Índice de búsqueda
+                semántica del catálogo.
+            facets (Optional[FacetIndexProtocol]): Índice de facetas del catálogo.
+            columnar (Optional[ColumnarCatalogProtocol]): Vista columnar del catálogo.
+            columnar_min_products (int): Productos a partir de los cuales se
+                filtra sobre la vista columnar.
+            fuzzy (Optional[FuzzyIndexProtocol]): Índice de trigramas del catálogo.
         """
         self._product_repository = product_repository
+        self._retriever = retriever
+        self._facets = facets
+        self._columnar = columnar
+        self._columnar_min_products = columnar_min_products
+        self._fuzzy = fuzzy
+
+    def _use_columnar(self) -> bool:
+        """Indica si el catálogo es lo bastante grande para filtrar en la vista columnar."""
+        return self._columnar is not None and len(self._columnar) >= self._columnar_min_products
 
     def _dto_to_entity(self, dto: ProductDTO, product_id: Optional[int] = None) -> Product:
         """Convierte un DTO en una entidad ``Product``.
@@ -68,20 +169,47 @@ class ProductService:
             raise ProductNotFoundError(product_id)
         return product
 
-    def search_products(self, filters: Optional[Dict[str, object]] = None) -> List[Product]:
+    def search_products(
+        self,
+        filters: Optional[Dict[str, object]] = None,
+        sort: Optional[str] = None,
+        limit: Optional[int] = None,
+    ) -> List[Product]:
         """Busca productos aplicando filtros por marca, categoría o stock.
 
+        En catálogos grandes con vista columnar los filtros, el orden y el
+        recorte se resuelven con máscaras vectorizadas; en otro caso se
+        recorren las entidades.
+
         Args:
             filters (Optional[Dict[str, object]]): Diccionario con filtros
                 opcionales (``brand``, ``category``, ``available``).
+            sort (Optional[str]): Campo de orden (``id``, ``name``, ``price``,
+                ``stock``), con prefijo ``-`` para orden descendente; ``None``
+                conserva el orden del catálogo.
+            limit (Optional[int]): Cantidad máxima de productos a retornar.
 
         Returns:
             List[Product]: Productos que cumplen con los filtros aplicados.
+
+        Raises:
+            ValueError: Si el campo de orden no es soportado.
         """
         filters = filters or {}
         brand = filters.get("brand")
         category = filters.get("category")
         require_available = bool(filters.get("available"))
+        sort_by, descending = parse_product_sort(sort) if sort else (None, False)
+
+        if self._use_columnar():
+            return self._columnar.select(
+                brand=str(brand) if brand else None,
+                category=str(category) if category else None,
+                available=True if require_available else None,
+                sort_by=sort_by,
+                descending=descending,
+                limit=limit,
+            )
 
         candidates: Iterable[Product]
         if brand and not category:
@@ -99,7 +227,151 @@ class ProductService:
         if require_available:
             results = [product for product in results if product.is_available()]
 
-        return results
+        if sort_by is not None:
+            results.sort(key=lambda product: (getattr(product, sort_by), product.id), reverse=descending)
+
+        return results[:limit] if limit is not None else results
+
+    def list_products_page(
+        self,
+        limit: int,
+        sort: str = "id",
+        cursor: Optional[str] = None,
+        fields: Optional[Sequence[str]] = None,
+    ) -> ProductPageDTO:
+        """Recupera una página del catálogo ordenada, proyectada y con cursor.
+
+        Args:
+            limit (int): Cantidad máxima de productos de la página.
+            sort (str): Campo de orden (``id``, ``name``, ``price``, ``stock``),
+                con prefijo ``-`` para orden descendente.
+            cursor (Optional[str]): Cursor opaco retornado por la página anterior.
+            fields (Optional[Sequence[str]]): Campos a incluir; ``None`` incluye todos.
+
+        Returns:
+            ProductPageDTO: Productos de la página y cursor de la siguiente.
+
+        Raises:
+            ValueError: Si el orden, los campos o el cursor son inválidos.
+        """
+        sort_by, descending = parse_product_sort(sort)
+        if fields is not None:
+            unknown = [name for name in fields if name not in PRODUCT_FIELDS]
+            if unknown:
+                raise ValueError(f"Campos desconocidos: {', '.join(unknown)}")
+        rows = self._product_repository.get_page(
+            limit,
+            sort_by=sort_by,
+            descending=descending,
+            after=decode_product_cursor(cursor, sort_by) if cursor else None,
+            fields=fields,
+        )
+        next_cursor = None
+        if rows and len(rows) == limit:
+            last = rows[-1]
+            next_cursor = encode_product_cursor(ProductCursor(sort_by=sort_by, value=last[sort_by], product_id=last["id"]))
+        selected = [name for name in PRODUCT_FIELDS if fields is None or name in fields]
+        return ProductPageDTO(items=[{name: row[name] for name in selected} for row in rows], next_cursor=next_cursor)
+
+    def semantic_search(self, query: str, limit: int = 10) -> List[Product]:
+        """Busca productos por similitud con una consulta en texto libre.
+
+        Args:
+            query (str): Texto ingresado por el usuario.
+            limit (int): Cantidad máxima de resultados.
+
+        Returns:
+            List[Product]: Productos ordenados por relevancia.
+        """
+        if not query.strip():
+            return []
+        products = self._product_repository.get_all()
+        if self._retriever is None:
+            terms = query.lower().split()
+            return [product for product in products if any(term in product.name.lower() for term in terms)][:limit]
+        return self._retriever.retrieve(query, products, limit)
+
+    def fuzzy_search(self, query: str, limit: int = 10) -> List[ProductMatchDTO]:
+        """Busca productos tolerando errores de tipeo (``addidas``, ``runing``).
+
+        Con índice de trigramas se comparan los términos de la consulta con el
+        vocabulario de nombre, marca, categoría y descripción; sin él se compara
+        la consulta con el nombre de cada producto.
+
+        Args:
+            query (str): Texto ingresado por el usuario.
+            limit (int): Cantidad máxima de resultados.
+
+        Returns:
+            List[ProductMatchDTO]: Productos con su similitud, de mayor a menor.
+        """
+        if not query.strip():
+            return []
+        if self._fuzzy is not None:
+            matches = self._fuzzy.search(query, limit)
+        else:
+            needle = query.lower()
+            scored = [
+                (product, difflib.SequenceMatcher(None, needle, product.name.lower()).ratio())
+                for product in self._product_repository.get_all()
+            ]
+            matches = sorted((match for match in scored if match[1] >= 0.5), key=lambda match: -match[1])[:limit]
+        return [ProductMatchDTO(product=ProductDTO.model_validate(product), score=round(score, 4)) for product, score in matches]
+
+    def faceted_search(self, query: FacetQuery, limit: int = 20, offset: int = 0) -> FacetedSearchResponseDTO:
+        """Filtra el catálogo por facetas y retorna los conteos de cada una.
+
+        Con índice de facetas los filtros y conteos se resuelven sobre mapas de
+        bits; sin él se recorre el catálogo completo y no se cuentan rangos de
+        precio.
+
+        Args:
+            query (FacetQuery): Filtros por marca, categoría, talla, color,
+                precio y disponibilidad.
+            limit (int): Cantidad máxima de productos a retornar.
+            offset (int): Productos a omitir antes de la página.
+
+        Returns:
+            FacetedSearchResponseDTO: Página de productos, total y conteos.
+        """
+        if self._facets is not None:
+            result = self._facets.search(query, limit, offset)
+            products, total, facets = result.products, result.total, result.facets
+        else:
+            products, total, facets = self._scan_facets(query, limit, offset)
+        return FacetedSearchResponseDTO(
+            items=[ProductDTO.model_validate(product) for product in products],
+            total=total,
+            facets=facets,
+        )
+
+    def _scan_facets(self, query: FacetQuery, limit: int, offset: int) -> Tuple[List[Product], int, Dict[str, Dict[str, int]]]:
+        """Resuelve una búsqueda facetada recorriendo el catálogo completo."""
+
+        def matches(product: Product, excluding: Optional[str] = None) -> bool:
+            for dimension in FACET_DIMENSIONS:
+                values = {value.strip().lower() for value in query.values(dimension)}
+                if dimension != excluding and values and str(getattr(product, dimension)).strip().lower() not in values:
+                    return False
+            if excluding != "price" and query.min_price is not None and product.price < query.min_price:
+                return False
+            if excluding != "price" and query.max_price is not None and product.price > query.max_price:
+                return False
+            return excluding == "available" or query.available is None or product.is_available() == query.available
+
+        products = self._product_repository.get_all()
+        facets: Dict[str, Dict[str, int]] = {}
+        for dimension in FACET_DIMENSIONS:
+            counts: Dict[str, int] = {}
+            for product in products:
+                if matches(product, excluding=dimension):
+                    label = str(getattr(product, dimension))
+                    counts[label] = counts.get(label, 0) + 1
+            facets[dimension] = dict(sorted(counts.items()))
+        available = [product.is_available() for product in products if matches(product, excluding="available")]
+        facets["available"] = {"true": available.count(True), "false": available.count(False)}
+        results = [product for product in products if matches(product)]
+        return results[offset : offset + limit], len(results), facets
 
     def create_product(self, product_dto: ProductDTO) -> Product:
         """Crea un producto nuevo aplicando las reglas del dominio.
@@ -151,10 +423,28 @@ class ProductService:
             raise ProductNotFoundError(product_id)
         return self._product_repository.delete(product_id)
 
+    def adjust_stock(self, items: Sequence[StockAdjustmentDTO]) -> List[StockAdjustmentResultDTO]:
+        """Aplica varios ajustes de stock de forma atómica por ítem.
+
+        Cada descuento se acepta solo si hay stock suficiente en el momento de
+        aplicarse; los rechazos no impiden aplicar el resto del lote.
+
+        Args:
+            items (Sequence[StockAdjustmentDTO]): Ajustes en el orden a aplicar.
+
+        Returns:
+            List[StockAdjustmentResultDTO]: Un resultado por ajuste, en el mismo orden.
+        """
+        adjustments = [StockAdjustment(product_id=item.product_id, delta=item.delta) for item in items]
+        results = self._product_repository.adjust_stock_many(adjustments)
+        return [StockAdjustmentResultDTO.model_validate(result) for result in results]
+
     def get_available_products(self) -> List[Product]:
         """Obtiene los productos que tienen stock disponible.
 
         Returns:
             List[Product]: Productos cuya cantidad en inventario es positiva.
         """
+        if self._use_columnar():
+            return self._columnar.select(available=True)
         return [product for product in self._product_repository.get_all() if product.is_available()]
@@ -0,0 +1,145 @@
+"""Contratos de recuperación de productos relevantes usados por los servicios."""
+from __future__ import annotations
+
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Protocol, Sequence, Tuple
+
+from src.domain.entities import Product
+
+
+class ProductRetrieverProtocol(Protocol):
+    """Contrato para seleccionar los productos relevantes de una consulta."""
+
+    def retrieve(self, query: str, products: Sequence[Product], limit: int) -> List[Product]:
+        """Retorna los productos más relevantes para la consulta.
+
+        Args:
+            query (str): Texto de búsqueda construido a partir de la conversación.
+            products (Sequence[Product]): Catálogo candidato; puede ser la
+                instantánea completa del catálogo, que los recuperadores con
+                índice propio rankean sin recorrerla.
+            limit (int): Cantidad máxima de productos a retornar.
+
+        Returns:
+            List[Product]: Productos ordenados por relevancia.
+        """
+
+
+FACET_DIMENSIONS = ("brand", "category", "size", "color")
+
+
+@dataclass(frozen=True)
+class FacetQuery:
+    """Filtros de una búsqueda facetada; las listas vacías no restringen.
+
+    Los valores de una misma dimensión se combinan con OR y las dimensiones
+    entre sí con AND. Los textos se comparan sin distinguir mayúsculas.
+
+    Attributes:
+        brand (Tuple[str, ...]): Marcas aceptadas.
+        category (Tuple[str, ...]): Categorías aceptadas.
+        size (Tuple[str, ...]): Tallas aceptadas.
+        color (Tuple[str, ...]): Colores aceptados.
+        min_price (Optional[float]): Precio mínimo inclusivo.
+        max_price (Optional[float]): Precio máximo inclusivo.
+        available (Optional[bool]): Filtra por disponibilidad si se indica.
+    """
+
+    brand: Tuple[str, ...] = ()
+    category: Tuple[str, ...] = ()
+    size: Tuple[str, ...] = ()
+    color: Tuple[str, ...] = ()
+    min_price: Optional[float] = None
+    max_price: Optional[float] = None
+    available: Optional[bool] = None
+
+    def values(self, dimension: str) -> Tuple[str, ...]:
+        """Retorna los valores filtrados de una dimensión textual."""
+        return getattr(self, dimension)
+
+    def has_price_range(self) -> bool:
+        """Indica si la consulta restringe el precio."""
+        return self.min_price is not None or self.max_price is not None
+
+
+@dataclass
+class FacetResult:
+    """Resultado de una búsqueda facetada.
+
+    Attributes:
+        products (List[Product]): Página de productos que cumplen todos los filtros.
+        total (int): Total de productos que cumplen todos los filtros.
+        facets (Dict[str, Dict[str, int]]): Conteos por dimensión y valor. Cada
+            dimensión se cuenta aplicando los filtros de las demás, de modo que
+            muestra cuántos resultados habría al elegir otro valor.
+    """
+
+    products: List[Product]
+    total: int
+    facets: Dict[str, Dict[str, int]] = field(default_factory=dict)
+
+
+class FacetIndexProtocol(Protocol):
+    """Contrato de los índices capaces de resolver búsquedas facetadas."""
+
+    def search(self, query: FacetQuery, limit: int, offset: int = 0) -> FacetResult:
+        """Filtra el catálogo y calcula los conteos de cada faceta.
+
+        Args:
+            query (FacetQuery): Filtros a aplicar.
+            limit (int): Cantidad máxima de productos a retornar.
+            offset (int): Productos a omitir antes de la página.
+
+        Returns:
+            FacetResult: Página de productos, total y conteos por faceta.
+        """
+
+
+class ColumnarCatalogProtocol(Protocol):
+    """Contrato de las vistas columnares del catálogo que filtran y ordenan en bloque."""
+
+    def __len__(self) -> int:
+        """Cantidad de productos vigentes en la vista."""
+
+    def select(
+        self,
+        brand: Optional[str] = None,
+        category: Optional[str] = None,
+        available: Optional[bool] = None,
+        min_price: Optional[float] = None,
+        max_price: Optional[float] = None,
+        sort_by: Optional[str] = None,
+        descending: bool = False,
+        limit: Optional[int] = None,
+    ) -> List[Product]:
+        """Filtra, ordena y recorta el catálogo.
+
+        Args:
+            brand (Optional[str]): Marca exacta, sin distinguir mayúsculas.
+            category (Optional[str]): Categoría exacta, sin distinguir mayúsculas.
+            available (Optional[bool]): Filtra por disponibilidad si se indica.
+            min_price (Optional[float]): Precio mínimo inclusivo.
+            max_price (Optional[float]): Precio máximo inclusivo.
+            sort_by (Optional[str]): Campo de orden; ``None`` conserva el orden del catálogo.
+            descending (bool): Ordena de mayor a menor.
+            limit (Optional[int]): Cantidad máxima de productos a retornar.
+
+        Returns:
+            List[Product]: Productos seleccionados; el identificador desempata el orden.
+        """
+
+
+class FuzzyIndexProtocol(Protocol):
+    """Contrato de los índices de búsqueda aproximada tolerantes a errores de tipeo."""
+
+    def search(self, query: str, limit: int) -> List[Tuple[Product, float]]:
+        """Busca los productos cuyos términos se parecen a los de la consulta.
+
+        Args:
+            query (str): Consulta en texto libre, posiblemente con errores.
+            limit (int): Cantidad máxima de resultados.
+
+        Returns:
+            List[Tuple[Product, float]]: Pares ``(producto, score)`` ordenados de
+                mayor a menor similitud.
+        """
@@ -3,7 +3,11 @@ from __future__ import annotations
 
 from dataclasses import dataclass, field
 from datetime import datetime
-from typing import List, Optional
+from typing import List, Optional, Tuple, Union
+
+PRODUCT_FIELDS: Tuple[str, ...] = ("id", "name", "brand", "category", "size", "color", "price", "stock", "description")
+PRODUCT_SORT_FIELDS: Tuple[str, ...] = ("id", "name", "price", "stock")
+INSUFFICIENT_STOCK_MESSAGE = "Stock insuficiente para completar la operación"
 
 
 @dataclass
@@ -72,7 +76,7 @@ class Product:
         if quantity <= 0:
             raise ValueError("La cantidad a reducir debe ser positiva")
         if quantity > self.stock:
-            raise ValueError("Stock insuficiente para completar la operación")
+            raise ValueError(INSUFFICIENT_STOCK_MESSAGE)
         self.stock -= quantity
 
     def increase_stock(self, quantity: int) -> None:
@@ -89,6 +93,75 @@ class Product:
         self.stock += quantity
 
 
+@dataclass(frozen=True)
+class StockAdjustment:
+    """Variación de stock solicitada para un producto.
+
+    Un ``delta`` negativo descuenta unidades con la misma regla que
+    ``Product.reduce_stock`` (no puede superar el stock disponible) y uno
+    positivo las repone como ``Product.increase_stock``.
+
+    Attributes:
+        product_id (int): Producto a ajustar.
+        delta (int): Unidades a sumar (positivo) o descontar (negativo).
+    """
+
+    product_id: int
+    delta: int
+
+    def __post_init__(self) -> None:
+        """Valida que el ajuste modifique el stock.
+
+        Raises:
+            ValueError: Si ``delta`` es cero.
+        """
+        if self.delta == 0:
+            raise ValueError("La cantidad a ajustar debe ser distinta de cero")
+
+    @property
+    def is_reduction(self) -> bool:
+        """bool: ``True`` si el ajuste descuenta unidades."""
+        return self.delta < 0
+
+    @property
+    def quantity(self) -> int:
+        """int: Unidades involucradas, siempre positivas."""
+        return abs(self.delta)
+
+    def apply_to(self, product: Product) -> None:
+        """Aplica el ajuste sobre una entidad en memoria usando sus reglas.
+
+        Args:
+            product (Product): Producto a modificar.
+
+        Raises:
+            ValueError: Si el stock es insuficiente para descontar.
+        """
+        if self.is_reduction:
+            product.reduce_stock(self.quantity)
+        else:
+            product.increase_stock(self.quantity)
+
+
+@dataclass(frozen=True)
+class StockAdjustmentResult:
+    """Resultado de aplicar un ``StockAdjustment``.
+
+    Attributes:
+        product_id (int): Producto ajustado.
+        delta (int): Variación solicitada.
+        applied (bool): Indica si el ajuste se aplicó.
+        stock (Optional[int]): Stock resultante, o el vigente si no se aplicó.
+        error (Optional[str]): Motivo del rechazo.
+    """
+
+    product_id: int
+    delta: int
+    applied: bool
+    stock: Optional[int] = None
+    error: Optional[str] = None
+
+
 @dataclass
 class ChatMessage:
     """Entidad que modela un mensaje dentro de una sesión de chat.
@@ -138,6 +211,79 @@ class ChatMessage:
         return self.role == "assistant"
 
 
+@dataclass(frozen=True)
+class HistoryCursor:
+    """Posición estable dentro del historial de una sesión.
+
+    El par ``(timestamp, message_id)`` ordena los mensajes de forma total aun
+    cuando varios comparten la misma marca de tiempo.
+
+    Attributes:
+        timestamp (datetime): Marca de tiempo del mensaje de referencia.
+        message_id (int): Identificador del mensaje de referencia.
+    """
+
+    timestamp: datetime
+    message_id: int
+
+    @classmethod
+    def from_message(cls, message: ChatMessage) -> "HistoryCursor":
+        """Construye el cursor que apunta a un mensaje persistido.
+
+        Args:
+            message (ChatMessage): Mensaje con identificador asignado.
+
+        Returns:
+            HistoryCursor: Cursor posicionado en el mensaje.
+
+        Raises:
+            ValueError: Si el mensaje aún no tiene identificador.
+        """
+        if message.id is None:
+            raise ValueError("El mensaje debe estar persistido para construir un cursor")
+        return cls(timestamp=message.timestamp, message_id=message.id)
+
+    def sort_key(self) -> tuple:
+        """Retorna la clave de orden equivalente a la usada en la persistencia."""
+        return (self.timestamp, self.message_id)
+
+
+@dataclass(frozen=True)
+class ProductCursor:
+    """Posición de un producto dentro de un listado ordenado por un campo.
+
+    Attributes:
+        sort_by (str): Campo de orden con el que se obtuvo el cursor.
+        value (Union[int, float, str]): Valor del campo en el producto de referencia.
+        product_id (int): Identificador que desempata valores iguales.
+    """
+
+    sort_by: str
+    value: Union[int, float, str]
+    product_id: int
+
+    def sort_key(self) -> tuple:
+        """Retorna la clave de orden equivalente a la usada en la persistencia."""
+        return (self.value, self.product_id)
+
+
+@dataclass
+class ConversationSummary:
+    """Resumen incremental de los mensajes antiguos de una sesión.
+
+    Attributes:
+        session_id (str): Conversación a la que pertenece el resumen.
+        summary (str): Texto que condensa los mensajes ya plegados.
+        covered_until (Optional[HistoryCursor]): Último mensaje incluido en el resumen.
+        updated_at (datetime): Momento de la última actualización.
+    """
+
+    session_id: str
+    summary: str
+    covered_until: Optional[HistoryCursor]
+    updated_at: datetime
+
+
 @dataclass
 class ChatContext:
     """Objeto de valor que conserva el historial relevante de una sesión.
@@ -145,10 +291,15 @@ class ChatContext:
     Attributes:
         messages (List[ChatMessage]): Colección de mensajes registrados.
         max_messages (int): Número máximo de mensajes a considerar en contexto.
+        summary (str): Resumen de los mensajes anteriores a la ventana reciente.
+        catalog_version (Optional[int]): Versión del catálogo del que salieron
+            los productos del turno, si el repositorio la conoce.
     """
 
     messages: List[ChatMessage] = field(default_factory=list)
     max_messages: int = 6
+    summary: str = ""
+    catalog_version: Optional[int] = None
 
     def get_recent_messages(self) -> List[ChatMessage]:
         """Obtiene los mensajes más recientes respetando el límite definido.
@@ -161,10 +312,14 @@ class ChatContext:
     def format_for_prompt(self) -> str:
         """Genera una transcripción legible para enviar al modelo de IA.
 
+        Cuando existe un resumen, se antepone a los mensajes recientes.
+
         Returns:
             str: Texto con la conversación formateada para el prompt.
         """
         formatted_lines: List[str] = []
+        if self.summary:
+            formatted_lines.append(f"Resumen de la conversación previa: {self.summary}")
         for message in self.get_recent_messages():
             prefix = "Usuario" if message.is_from_user() else "Asistente"
             formatted_lines.append(f"{prefix}: {message.message}")
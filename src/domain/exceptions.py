@@ -41,3 +41,21 @@ class ChatServiceError(Exception):
         """
 
         super().__init__(message)
+
+
+class ProviderOverloadedError(Exception):
+    """Error lanzado cuando el proveedor de IA no admite más trabajo por ahora."""
+
+    def __init__(self, retry_after: float, queue_full: bool = True) -> None:
+        """Inicializa la excepción con el tiempo sugerido de reintento.
+
+        Args:
+            retry_after (float): Segundos que conviene esperar antes de reintentar.
+            queue_full (bool): ``True`` si se rechazó por cola llena; ``False``
+                si venció el plazo de espera en la cola.
+        """
+
+        reason = "la cola de espera está llena" if queue_full else "venció el plazo de espera en la cola"
+        super().__init__(f"El proveedor de IA está saturado: {reason}")
+        self.retry_after = retry_after
+        self.queue_full = queue_full
@@ -2,9 +2,9 @@
 from __future__ import annotations
 
 from abc import ABC, abstractmethod
-from typing import List, Optional
+from typing import Any, Dict, List, Optional, Sequence
 
-from .entities import ChatMessage, Product
+from .entities import ChatMessage, ConversationSummary, HistoryCursor, Product, ProductCursor, StockAdjustment, StockAdjustmentResult
 
 
 class IProductRepository(ABC):
@@ -73,6 +73,89 @@ class IProductRepository(ABC):
             bool: ``True`` si el registro existía y fue eliminado.
         """
 
+    def upsert_many(self, products: Sequence[Product]) -> int:
+        """Inserta o actualiza (por identificador) un lote de productos en una transacción.
+
+        La implementación por omisión guarda producto por producto; los
+        repositorios concretos deberían usar sentencias de varias filas.
+
+        Args:
+            products (Sequence[Product]): Productos validados; los que traen
+                ``id`` reemplazan al existente y los demás se insertan.
+
+        Returns:
+            int: Cantidad de productos escritos.
+        """
+        for product in products:
+            self.save(product)
+        return len(products)
+
+    def adjust_stock_many(self, adjustments: Sequence[StockAdjustment]) -> List[StockAdjustmentResult]:
+        """Aplica varios ajustes de stock y reporta el resultado de cada uno.
+
+        La implementación por omisión lee, modifica y guarda cada producto; los
+        repositorios concretos deberían usar actualizaciones condicionales en
+        una sola transacción para no perder ajustes concurrentes.
+
+        Args:
+            adjustments (Sequence[StockAdjustment]): Ajustes en el orden a aplicar.
+
+        Returns:
+            List[StockAdjustmentResult]: Un resultado por ajuste, en el mismo orden.
+        """
+        results: List[StockAdjustmentResult] = []
+        for adjustment in adjustments:
+            product = self.get_by_id(adjustment.product_id)
+            if product is None:
+                results.append(StockAdjustmentResult(adjustment.product_id, adjustment.delta, False, error="Producto no encontrado"))
+                continue
+            try:
+                adjustment.apply_to(product)
+            except ValueError as exc:
+                results.append(StockAdjustmentResult(adjustment.product_id, adjustment.delta, False, product.stock, str(exc)))
+                continue
+            saved = self.save(product)
+            results.append(StockAdjustmentResult(adjustment.product_id, adjustment.delta, True, saved.stock))
+        return results
+
+    def get_page(
+        self,
+        limit: int,
+        sort_by: str = "id",
+        descending: bool = False,
+        after: Optional[ProductCursor] = None,
+        fields: Optional[Sequence[str]] = None,
+    ) -> List[Dict[str, Any]]:
+        """Obtiene una página del catálogo ordenada y paginada por rango (keyset).
+
+        La implementación por omisión ordena el catálogo completo en memoria;
+        los repositorios concretos deberían resolverla con una consulta.
+
+        Args:
+            limit (int): Cantidad máxima de productos de la página.
+            sort_by (str): Campo de orden; el identificador desempata.
+            descending (bool): Ordena de mayor a menor.
+            after (Optional[ProductCursor]): Solo productos posteriores al cursor.
+            fields (Optional[Sequence[str]]): Columnas a leer; siempre se incluyen
+                ``id`` y el campo de orden. ``None`` lee todas.
+
+        Returns:
+            List[Dict[str, Any]]: Filas con las columnas solicitadas.
+        """
+        products = sorted(self.get_all(), key=lambda product: (getattr(product, sort_by), product.id), reverse=descending)
+        if after is not None:
+            key = after.sort_key()
+            products = [
+                product
+                for product in products
+                if ((getattr(product, sort_by), product.id) < key if descending else (getattr(product, sort_by), product.id) > key)
+            ]
+        columns = set(fields) | {"id", sort_by} if fields is not None else None
+        return [
+            {name: value for name, value in vars(product).items() if columns is None or name in columns}
+            for product in products[:limit]
+        ]
+
 
 class IChatRepository(ABC):
     """Interfaz para manejar la persistencia del historial conversacional."""
@@ -88,6 +171,20 @@ class IChatRepository(ABC):
             ChatMessage: Entidad almacenada con sus metadatos actualizados.
         """
 
+    def save_messages(self, messages: Sequence[ChatMessage]) -> List[ChatMessage]:
+        """Guarda varios mensajes como una sola operación.
+
+        La implementación por omisión delega en ``save_message``; los
+        repositorios concretos deberían escribirlos en una única transacción.
+
+        Args:
+            messages (Sequence[ChatMessage]): Mensajes a persistir en orden.
+
+        Returns:
+            List[ChatMessage]: Entidades almacenadas.
+        """
+        return [self.save_message(message) for message in messages]
+
     @abstractmethod
     def get_session_history(self, session_id: str, limit: Optional[int] = None) -> List[ChatMessage]:
         """Obtiene el historial ordenado de una sesión.
@@ -111,6 +208,59 @@ class IChatRepository(ABC):
             int: Número de registros eliminados.
         """
 
+    def get_history_page(
+        self,
+        session_id: str,
+        limit: int,
+        before: Optional[HistoryCursor] = None,
+        after: Optional[HistoryCursor] = None,
+        newest_first: bool = False,
+    ) -> List[ChatMessage]:
+        """Obtiene una página del historial delimitada por cursores.
+
+        La implementación por omisión filtra el historial completo; los
+        repositorios concretos deberían resolverla con una consulta por rango.
+
+        Args:
+            session_id (str): Identificador de la conversación.
+            limit (int): Cantidad máxima de mensajes de la página.
+            before (Optional[HistoryCursor]): Solo mensajes anteriores al cursor.
+            after (Optional[HistoryCursor]): Solo mensajes posteriores al cursor.
+            newest_first (bool): Ordena del más reciente al más antiguo.
+
+        Returns:
+            List[ChatMessage]: Mensajes de la página en el orden solicitado.
+        """
+        messages = [message for message in self.get_session_history(session_id) if message.id is not None]
+        messages.sort(key=lambda message: (message.timestamp, message.id), reverse=newest_first)
+        if before is not None:
+            messages = [message for message in messages if (message.timestamp, message.id) < before.sort_key()]
+        if after is not None:
+            messages = [message for message in messages if (message.timestamp, message.id) > after.sort_key()]
+        return messages[:limit]
+
+    @abstractmethod
+    def get_summary(self, session_id: str) -> Optional[ConversationSummary]:
+        """Obtiene el resumen acumulado de una sesión.
+
+        Args:
+            session_id (str): Identificador de la conversación.
+
+        Returns:
+            Optional[ConversationSummary]: Resumen almacenado o ``None``.
+        """
+
+    @abstractmethod
+    def save_summary(self, summary: ConversationSummary) -> ConversationSummary:
+        """Crea o reemplaza el resumen de una sesión.
+
+        Args:
+            summary (ConversationSummary): Resumen a persistir.
+
+        Returns:
+            ConversationSummary: Resumen almacenado.
+        """
+
     @abstractmethod
     def get_recent_messages(self, session_id: str, count: int) -> List[ChatMessage]:
         """Obtiene los mensajes más recientes de una sesión.
@@ -122,3 +272,187 @@ class IChatRepository(ABC):
         Returns:
             List[ChatMessage]: Mensajes ordenados del más antiguo al más nuevo.
         """
+
+
+class IAsyncProductRepository(ABC):
+    """Variante asíncrona de ``IProductRepository`` para rutas no bloqueantes."""
+
+    @abstractmethod
+    async def get_all(self) -> List[Product]:
+        """Obtiene todos los productos disponibles en el catálogo.
+
+        Returns:
+            List[Product]: Colección completa de entidades ``Product``.
+        """
+
+    @abstractmethod
+    async def get_by_id(self, product_id: int) -> Optional[Product]:
+        """Busca un producto por su identificador.
+
+        Args:
+            product_id (int): Identificador único del producto.
+
+        Returns:
+            Optional[Product]: Entidad encontrada o ``None`` si no existe.
+        """
+
+    @abstractmethod
+    async def get_by_brand(self, brand: str) -> List[Product]:
+        """Recupera productos filtrados por marca.
+
+        Args:
+            brand (str): Nombre de la marca a consultar.
+
+        Returns:
+            List[Product]: Lista de productos pertenecientes a la marca.
+        """
+
+    @abstractmethod
+    async def get_by_category(self, category: str) -> List[Product]:
+        """Recupera productos filtrados por categoría.
+
+        Args:
+            category (str): Categoría de producto a buscar.
+
+        Returns:
+            List[Product]: Productos que coinciden con la categoría solicitada.
+        """
+
+    @abstractmethod
+    async def save(self, product: Product) -> Product:
+        """Persiste un producto insertándolo o actualizándolo según corresponda.
+
+        Args:
+            product (Product): Entidad a guardar.
+
+        Returns:
+            Product: Entidad almacenada con los datos persistidos.
+        """
+
+    @abstractmethod
+    async def delete(self, product_id: int) -> bool:
+        """Elimina un producto por su identificador.
+
+        Args:
+            product_id (int): Identificador del producto a eliminar.
+
+        Returns:
+            bool: ``True`` si el registro existía y fue eliminado.
+        """
+
+
+class IAsyncChatRepository(ABC):
+    """Variante asíncrona de ``IChatRepository`` para rutas no bloqueantes."""
+
+    @abstractmethod
+    async def save_message(self, message: ChatMessage) -> ChatMessage:
+        """Guarda un mensaje y lo retorna tras su almacenamiento.
+
+        Args:
+            message (ChatMessage): Mensaje que se desea persistir.
+
+        Returns:
+            ChatMessage: Entidad almacenada con sus metadatos actualizados.
+        """
+
+    async def save_messages(self, messages: Sequence[ChatMessage]) -> List[ChatMessage]:
+        """Guarda varios mensajes como una sola operación.
+
+        La implementación por omisión delega en ``save_message``; los
+        repositorios concretos deberían escribirlos en una única transacción.
+
+        Args:
+            messages (Sequence[ChatMessage]): Mensajes a persistir en orden.
+
+        Returns:
+            List[ChatMessage]: Entidades almacenadas.
+        """
+        return [await self.save_message(message) for message in messages]
+
+    @abstractmethod
+    async def get_session_history(self, session_id: str, limit: Optional[int] = None) -> List[ChatMessage]:
+        """Obtiene el historial ordenado de una sesión.
+
+        Args:
+            session_id (str): Identificador de la conversación.
+            limit (Optional[int]): Cantidad máxima de registros a retornar.
+
+        Returns:
+            List[ChatMessage]: Mensajes ordenados cronológicamente.
+        """
+
+    @abstractmethod
+    async def delete_session_history(self, session_id: str) -> int:
+        """Elimina todos los mensajes asociados a una sesión.
+
+        Args:
+            session_id (str): Identificador de la conversación.
+
+        Returns:
+            int: Número de registros eliminados.
+        """
+
+    async def get_history_page(
+        self,
+        session_id: str,
+        limit: int,
+        before: Optional[HistoryCursor] = None,
+        after: Optional[HistoryCursor] = None,
+        newest_first: bool = False,
+    ) -> List[ChatMessage]:
+        """Obtiene una página del historial delimitada por cursores.
+
+        La implementación por omisión filtra el historial completo; los
+        repositorios concretos deberían resolverla con una consulta por rango.
+
+        Args:
+            session_id (str): Identificador de la conversación.
+            limit (int): Cantidad máxima de mensajes de la página.
+            before (Optional[HistoryCursor]): Solo mensajes anteriores al cursor.
+            after (Optional[HistoryCursor]): Solo mensajes posteriores al cursor.
+            newest_first (bool): Ordena del más reciente al más antiguo.
+
+        Returns:
+            List[ChatMessage]: Mensajes de la página en el orden solicitado.
+        """
+        messages = [message for message in await self.get_session_history(session_id) if message.id is not None]
+        messages.sort(key=lambda message: (message.timestamp, message.id), reverse=newest_first)
+        if before is not None:
+            messages = [message for message in messages if (message.timestamp, message.id) < before.sort_key()]
+        if after is not None:
+            messages = [message for message in messages if (message.timestamp, message.id) > after.sort_key()]
+        return messages[:limit]
+
+    @abstractmethod
+    async def get_summary(self, session_id: str) -> Optional[ConversationSummary]:
+        """Obtiene el resumen acumulado de una sesión.
+
+        Args:
+            session_id (str): Identificador de la conversación.
+
+        Returns:
+            Optional[ConversationSummary]: Resumen almacenado o ``None``.
+        """
+
+    @abstractmethod
+    async def save_summary(self, summary: ConversationSummary) -> ConversationSummary:
+        """Crea o reemplaza el resumen de una sesión.
+
+        Args:
+            summary (ConversationSummary): Resumen a persistir.
+
+        Returns:
+            ConversationSummary: Resumen almacenado.
+        """
+
+    @abstractmethod
+    async def get_recent_messages(self, session_id: str, count: int) -> List[ChatMessage]:
+        """Obtiene los mensajes más recientes de una sesión.
+
+        Args:
+            session_id (str): Conversación objetivo.
+            count (int): Cantidad de mensajes a recuperar.
+
+        Returns:
+            List[ChatMessage]: Mensajes ordenados del más antiguo al más nuevo.
+        """
@@ -0,0 +1,164 @@
+"""Validadores de caché HTTP (ETag y Last-Modified) para peticiones GET condicionales."""
+from __future__ import annotations
+
+import hashlib
+import uuid
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from email.utils import format_datetime, parsedate_to_datetime
+from typing import Dict, Optional
+
+from fastapi import Depends, HTTPException, Request
+from starlette.datastructures import QueryParams
+
+from src.domain.repositories import IChatRepository
+
+from ..cache.catalog_cache import catalog_cache
+from .dependencies import get_read_chat_repository
+
+# Distingue las versiones de este proceso de las de ejecuciones anteriores,
+# cuyos contadores en memoria empezaban también en cero.
+_INSTANCE_TAG = uuid.uuid4().hex[:8]
+
+
+@dataclass(frozen=True)
+class CacheValidators:
+    """Validadores de una representación: ETag fuerte y fecha de modificación.
+
+    Attributes:
+        etag (str): Etiqueta entre comillas que identifica la representación.
+        last_modified (Optional[datetime]): Último cambio (UTC, sin zona horaria).
+    """
+
+    etag: str
+    last_modified: Optional[datetime] = None
+
+    def headers(self) -> Dict[str, str]:
+        """Retorna los encabezados a incluir en respuestas 200 y 304.
+
+        Returns:
+            Dict[str, str]: ``ETag``, ``Last-Modified`` y ``Cache-Control``.
+        """
+        headers = {"ETag": self.etag, "Cache-Control": "no-cache"}
+        if self.last_modified is not None:
+            headers["Last-Modified"] = format_datetime(self.last_modified.replace(tzinfo=timezone.utc), usegmt=True)
+        return headers
+
+    def is_fresh(self, request: Request) -> bool:
+        """Indica si la copia del cliente sigue vigente según sus precondiciones.
+
+        ``If-None-Match`` tiene precedencia; ``If-Modified-Since`` solo se evalúa
+        cuando aquel no viene en la petición.
+
+        Args:
+            request (Request): Petición entrante.
+
+        Returns:
+            bool: ``True`` si corresponde responder ``304 Not Modified``.
+        """
+        if_none_match = request.headers.get("if-none-match")
+        if if_none_match is not None:
+            candidates = {tag.strip().removeprefix("W/") for tag in if_none_match.split(",")}
+            return "*" in candidates or self.etag in candidates
+        if_modified_since = request.headers.get("if-modified-since")
+        if if_modified_since is None or self.last_modified is None:
+            return False
+        try:
+            since = parsedate_to_datetime(if_modified_since)
+        except (TypeError, ValueError):
+            return False
+        if since.tzinfo is None:
+            since = since.replace(tzinfo=timezone.utc)
+        return self.last_modified.replace(tzinfo=timezone.utc, microsecond=0) <= since
+
+
+def make_etag(*parts: object) -> str:
+    """Construye un ETag fuerte a partir de las partes que determinan el contenido.
+
+    Args:
+        *parts (object): Versiones, identificadores o huellas de la representación.
+
+    Returns:
+        str: ETag entre comillas.
+    """
+    return '"' + "-".join([_INSTANCE_TAG, *(str(part) for part in parts)]) + '"'
+
+
+def _query_fingerprint(query: QueryParams) -> str:
+    """Resume los parámetros de consulta que cambian la representación."""
+    canonical = "&".join(f"{key}={value}" for key, value in sorted(query.multi_items()))
+    return hashlib.sha1(canonical.encode("utf-8")).hexdigest()[:12]
+
+
+def _not_modified(request: Request, validators: CacheValidators) -> CacheValidators:
+    """Interrumpe la petición con ``304`` si el cliente ya tiene la representación.
+
+    Raises:
+        HTTPException: Con código 304 y los validadores como encabezados.
+    """
+    if validators.is_fresh(request):
+        raise HTTPException(status_code=304, headers=validators.headers())
+    return validators
+
+
+def catalog_validators(request: Request) -> CacheValidators:
+    """Validadores de ``GET /products`` a partir de la versión del catálogo.
+
+    Se resuelven sin consultar la base de datos, por lo que un ``304`` no
+    ejecuta consultas ni serializa productos.
+
+    Args:
+        request (Request): Petición entrante.
+
+    Returns:
+        CacheValidators: Validadores de la página solicitada.
+    """
+    validators = CacheValidators(
+        etag=make_etag("c", catalog_cache.version, _query_fingerprint(request.query_params)),
+        last_modified=catalog_cache.last_modified,
+    )
+    return _not_modified(request, validators)
+
+
+def product_validators(product_id: int, request: Request) -> CacheValidators:
+    """Validadores de ``GET /products/{product_id}`` a partir de la versión del producto.
+
+    Args:
+        product_id (int): Identificador del producto solicitado.
+        request (Request): Petición entrante.
+
+    Returns:
+        CacheValidators: Validadores del producto.
+    """
+    version, changed_at = catalog_cache.product_version(product_id)
+    return _not_modified(request, CacheValidators(etag=make_etag("p", product_id, version), last_modified=changed_at))
+
+
+def history_validators(
+    session_id: str,
+    request: Request,
+    chat_repo: IChatRepository = Depends(get_read_chat_repository),
+) -> CacheValidators:
+    """Validadores del historial a partir del último mensaje de la sesión.
+
+    Solo se lee el mensaje más reciente (consulta indexada con ``LIMIT 1``);
+    la página completa no se consulta cuando la respuesta es ``304``.
+
+    Args:
+        session_id (str): Identificador de la sesión de chat.
+        request (Request): Petición entrante.
+        chat_repo (IChatRepository): Repositorio de historial de la petición.
+
+    Returns:
+        CacheValidators: Validadores de la página de historial solicitada.
+    """
+    last = next(iter(chat_repo.get_recent_messages(session_id, 1)), None)
+    if last is None:
+        validators = CacheValidators(etag=make_etag("h", 0, _query_fingerprint(request.query_params)))
+    else:
+        marker = f"{last.id}.{int(last.timestamp.timestamp() * 1_000_000)}"
+        validators = CacheValidators(
+            etag=make_etag("h", marker, _query_fingerprint(request.query_params)),
+            last_modified=last.timestamp,
+        )
+    return _not_modified(request, validators)
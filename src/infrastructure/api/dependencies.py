@@ -0,0 +1,305 @@
+"""Proveedores de dependencias de FastAPI compartidos por los endpoints."""
+from __future__ import annotations
+
+import os
+from typing import Optional
+
+from fastapi import Depends, Header, HTTPException, Request
+from sqlalchemy.orm import Session
+
+from src.application.chat_service import AIServiceProtocol, ChatTelemetryProtocol
+from src.application.conversation_summary import ConversationSummaryService
+from src.domain.repositories import IAsyncChatRepository, IAsyncProductRepository, IChatRepository, IProductRepository
+
+from ..cache.catalog_cache import catalog_cache
+from ..cache.prompt_fragments import CatalogPromptCache
+from ..cache.response_cache import LLMResponseCache
+from ..db.database import AsyncSessionLocal, SessionLocal, get_db, get_read_db
+from ..llm_providers.admission import AdmissionSettings
+from ..llm_providers.registry import AIProviderRegistry
+from ..observability.chat_metrics import ChatPipelineMetrics
+from ..observability.metrics import MetricsRegistry
+from ..observability.profiler import ProfileStore, RequestProfiler
+from ..repositories.async_chat_repository import AsyncSQLChatRepository
+from ..repositories.async_product_repository import AsyncCachedProductRepository, AsyncSQLProductRepository
+from ..repositories.cached_product_repository import CachedProductRepository
+from ..repositories.chat_repository import SQLChatRepository
+from ..repositories.product_repository import SQLProductRepository
+from ..repositories.write_behind_chat_repository import WriteBehindChatRepository
+from ..search.bm25_index import BM25ProductRetriever
+from ..search.facet_index import FacetIndex
+from ..search.hybrid_retriever import HybridProductRetriever
+from ..search.trigram_index import TrigramIndex
+from ..search.vector_index import HashedNgramVectorizer, ProductVectorIndex
+
+CHAT_RETRIEVAL_TOP_K = int(os.getenv("CHAT_RETRIEVAL_TOP_K", "8"))
+VECTOR_INDEX_DIMENSIONS = int(os.getenv("VECTOR_INDEX_DIMENSIONS", "1024"))
+LLM_CACHE_ENABLED = os.getenv("LLM_CACHE_ENABLED", "true").lower() in {"1", "true", "yes"}
+LLM_CACHE_MAX_ENTRIES = int(os.getenv("LLM_CACHE_MAX_ENTRIES", "1024"))
+LLM_CACHE_TTL_SECONDS = float(os.getenv("LLM_CACHE_TTL_SECONDS", "600"))
+LLM_COALESCING_ENABLED = os.getenv("LLM_COALESCING_ENABLED", "true").lower() in {"1", "true", "yes"}
+CHAT_WRITE_BEHIND = os.getenv("CHAT_WRITE_BEHIND", "false").lower() in {"1", "true", "yes"}
+CHAT_SUMMARY_EVERY_TURNS = int(os.getenv("CHAT_SUMMARY_EVERY_TURNS", "4"))
+FACET_PRICE_BUCKET_WIDTH = float(os.getenv("FACET_PRICE_BUCKET_WIDTH", "50"))
+LLM_CONCURRENCY_ENABLED = os.getenv("LLM_CONCURRENCY_ENABLED", "true").lower() in {"1", "true", "yes"}
+PROFILING_HEADER_ENABLED = os.getenv("PROFILING_HEADER_ENABLED", "false").lower() in {"1", "true", "yes"}
+PROFILING_SAMPLE_RATE = float(os.getenv("PROFILING_SAMPLE_RATE", "0"))
+PROFILING_INTERVAL_MS = float(os.getenv("PROFILING_INTERVAL_MS", "5"))
+PROFILING_MAX_PROFILES = int(os.getenv("PROFILING_MAX_PROFILES", "20"))
+PROFILING_TOKEN = os.getenv("PROFILING_TOKEN")
+
+product_vector_index = ProductVectorIndex(HashedNgramVectorizer(dimensions=VECTOR_INDEX_DIMENSIONS))
+catalog_cache.subscribe(product_vector_index)
+catalog_prompt_cache = CatalogPromptCache()
+catalog_cache.subscribe(catalog_prompt_cache)
+product_facet_index = FacetIndex(price_bucket_width=FACET_PRICE_BUCKET_WIDTH)
+catalog_cache.subscribe(product_facet_index)
+product_trigram_index = TrigramIndex()
+catalog_cache.subscribe(product_trigram_index)
+product_bm25_retriever = BM25ProductRetriever()
+catalog_cache.subscribe(product_bm25_retriever)
+product_retriever = HybridProductRetriever([product_bm25_retriever, product_vector_index])
+
+llm_admission = (
+    AdmissionSettings(
+        initial_limit=int(os.getenv("LLM_CONCURRENCY_INITIAL", "8")),
+        min_limit=int(os.getenv("LLM_CONCURRENCY_MIN", "1")),
+        max_limit=int(os.getenv("LLM_CONCURRENCY_MAX", "64")),
+        queue_size=int(os.getenv("LLM_QUEUE_SIZE", "32")),
+        queue_timeout=float(os.getenv("LLM_QUEUE_TIMEOUT_SECONDS", "5")),
+        latency_target=float(os.getenv("LLM_LATENCY_TARGET_SECONDS", "5")),
+    )
+    if LLM_CONCURRENCY_ENABLED
+    else None
+)
+
+metrics_registry = MetricsRegistry()
+chat_metrics = ChatPipelineMetrics(metrics_registry)
+request_profiler = RequestProfiler(
+    ProfileStore(max_profiles=PROFILING_MAX_PROFILES),
+    header_enabled=PROFILING_HEADER_ENABLED,
+    sample_rate=PROFILING_SAMPLE_RATE,
+    interval=PROFILING_INTERVAL_MS / 1000,
+    access_token=PROFILING_TOKEN,
+)
+
+response_cache = (
+    LLMResponseCache(max_entries=LLM_CACHE_MAX_ENTRIES, ttl_seconds=LLM_CACHE_TTL_SECONDS, registry=metrics_registry)
+    if LLM_CACHE_ENABLED
+    else None
+)
+
+async_product_repository = AsyncCachedProductRepository(AsyncSQLProductRepository(AsyncSessionLocal), catalog_cache)
+async_chat_repository: IAsyncChatRepository = AsyncSQLChatRepository(AsyncSessionLocal)
+if CHAT_WRITE_BEHIND:
+    async_chat_repository = WriteBehindChatRepository(async_chat_repository)
+
+conversation_summaries = (
+    ConversationSummaryService(async_chat_repository, every_turns=CHAT_SUMMARY_EVERY_TURNS) if CHAT_SUMMARY_EVERY_TURNS > 0 else None
+)
+
+
+def get_product_repository(db: Session = Depends(get_db)) -> IProductRepository:
+    """Entrega el repositorio de productos respaldado por la caché de catálogo.
+
+    Args:
+        db (Session): Sesión de base de datos de la petición.
+
+    Returns:
+        IProductRepository: Repositorio que lee desde la instantánea compartida.
+    """
+    return CachedProductRepository(SQLProductRepository(db), catalog_cache)
+
+
+def get_chat_repository(db: Session = Depends(get_db)) -> IChatRepository:
+    """Entrega el repositorio de historial de chat de la petición.
+
+    Args:
+        db (Session): Sesión de base de datos de la petición.
+
+    Returns:
+        IChatRepository: Repositorio SQL del historial conversacional.
+    """
+    return SQLChatRepository(db)
+
+
+def get_read_product_repository(db: Session = Depends(get_read_db)) -> IProductRepository:
+    """Entrega el repositorio de productos para peticiones de solo lectura.
+
+    Comparte la caché de catálogo con el de escritura; las consultas que no
+    resuelve la instantánea usan el motor de solo lectura.
+
+    Args:
+        db (Session): Sesión de solo lectura de la petición.
+
+    Returns:
+        IProductRepository: Repositorio que lee desde la instantánea compartida.
+    """
+    return CachedProductRepository(SQLProductRepository(db), catalog_cache)
+
+
+def get_read_chat_repository(db: Session = Depends(get_read_db)) -> IChatRepository:
+    """Entrega el repositorio de historial para peticiones de solo lectura.
+
+    Args:
+        db (Session): Sesión de solo lectura de la petición.
+
+    Returns:
+        IChatRepository: Repositorio SQL del historial sobre el motor de lectura.
+    """
+    return SQLChatRepository(db)
+
+
+def get_async_product_repository() -> IAsyncProductRepository:
+    """Entrega el repositorio asíncrono de productos compartido por el proceso.
+
+    Returns:
+        IAsyncProductRepository: Repositorio no bloqueante respaldado por la caché.
+    """
+    return async_product_repository
+
+
+def get_async_chat_repository() -> IAsyncChatRepository:
+    """Entrega el repositorio asíncrono de historial compartido por el proceso.
+
+    Returns:
+        IAsyncChatRepository: Repositorio no bloqueante del historial.
+    """
+    return async_chat_repository
+
+
+def get_conversation_summaries() -> Optional[ConversationSummaryService]:
+    """Entrega el servicio de resúmenes de conversación compartido por el proceso.
+
+    Returns:
+        Optional[ConversationSummaryService]: Servicio de resúmenes o ``None`` si
+            ``CHAT_SUMMARY_EVERY_TURNS`` es 0.
+    """
+    return conversation_summaries
+
+
+def get_chat_telemetry() -> ChatTelemetryProtocol:
+    """Entrega las métricas del flujo conversacional expuestas en ``/metrics``.
+
+    Returns:
+        ChatTelemetryProtocol: Receptor compartido por todos los turnos.
+    """
+    return chat_metrics
+
+
+def get_profile_store(request: Request, x_profile_token: Optional[str] = Header(None)) -> ProfileStore:
+    """Entrega el almacén de perfiles capturados por el middleware.
+
+    Args:
+        request (Request): Petición en curso.
+        x_profile_token (Optional[str]): Token de acceso a los perfiles.
+
+    Returns:
+        ProfileStore: Perfiles recientes listos para descargar.
+
+    Raises:
+        HTTPException: Con código 404 si el perfilado está deshabilitado o
+            403 si el cliente no presenta el token ni es local.
+    """
+    if not request_profiler.enabled:
+        raise HTTPException(status_code=404, detail="Not Found")
+    client_host = request.client.host if request.client is not None else None
+    if not request_profiler.allows_download(client_host, x_profile_token):
+        raise HTTPException(status_code=403, detail="Acceso a perfiles no autorizado")
+    return request_profiler.store
+
+
+async def close_async_repositories() -> None:
+    """Detiene los resúmenes en curso y persiste las escrituras diferidas pendientes."""
+    if conversation_summaries is not None:
+        await conversation_summaries.aclose()
+    if isinstance(async_chat_repository, WriteBehindChatRepository):
+        await async_chat_repository.aclose()
+
+
+def get_provider_registry(request: Request) -> AIProviderRegistry:
+    """Entrega el registro de proveedores creado al iniciar la aplicación.
+
+    Args:
+        request (Request): Petición en curso.
+
+    Returns:
+        AIProviderRegistry: Registro compartido por la aplicación.
+    """
+    return request.app.state.ai_providers
+
+
+def get_ai_service(registry: AIProviderRegistry = Depends(get_provider_registry)) -> AIServiceProtocol:
+    """Entrega el proveedor de IA predeterminado, construyéndolo si es necesario.
+
+    Args:
+        registry (AIProviderRegistry): Registro de proveedores de la aplicación.
+
+    Returns:
+        AIServiceProtocol: Proveedor compartido entre peticiones.
+
+    Raises:
+        HTTPException: Con código 503 si el proveedor no puede configurarse.
+    """
+    try:
+        return registry.get()
+    except ValueError as exc:
+        raise HTTPException(status_code=503, detail=str(exc)) from exc
+
+
+def get_product_retriever() -> HybridProductRetriever:
+    """Entrega el recuperador de productos usado por el chat.
+
+    Returns:
+        HybridProductRetriever: Fusión de los índices BM25 y vectorial.
+    """
+    return product_retriever
+
+
+def get_vector_index() -> ProductVectorIndex:
+    """Entrega el índice vectorial del catálogo compartido por el proceso.
+
+    Returns:
+        ProductVectorIndex: Índice de búsqueda semántica.
+    """
+    return product_vector_index
+
+
+def get_facet_index(product_repo: IProductRepository = Depends(get_read_product_repository)) -> FacetIndex:
+    """Entrega el índice de facetas asegurando que refleje el catálogo vigente.
+
+    Tras una invalidación (por ejemplo, una importación masiva) la instantánea
+    se recarga aquí, lo que reconstruye el índice antes de consultarlo.
+
+    Args:
+        product_repo (IProductRepository): Repositorio de catálogo de la petición.
+
+    Returns:
+        FacetIndex: Índice de mapas de bits del catálogo.
+    """
+    if isinstance(product_repo, CachedProductRepository):
+        product_repo.snapshot()
+    return product_facet_index
+
+
+def get_trigram_index(product_repo: IProductRepository = Depends(get_read_product_repository)) -> TrigramIndex:
+    """Entrega el índice de trigramas asegurando que refleje el catálogo vigente.
+
+    Args:
+        product_repo (IProductRepository): Repositorio de catálogo de la petición.
+
+    Returns:
+        TrigramIndex: Índice de búsqueda tolerante a errores de tipeo.
+    """
+    if isinstance(product_repo, CachedProductRepository):
+        product_repo.snapshot()
+    return product_trigram_index
+
+
+def warm_catalog_cache() -> None:
+    """Carga la instantánea del catálogo para poblar los índices derivados."""
+    session = SessionLocal()
+    try:
+        CachedProductRepository(SQLProductRepository(session), catalog_cache).snapshot()
+    finally:
+        session.close()
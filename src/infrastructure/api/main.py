@@ -1,41 +1,105 @@
 """Aplicación FastAPI que expone los endpoints de e-commerce y chat."""
 from __future__ import annotations
 
+import codecs
+import json
+import math
 from datetime import datetime
-from typing import List
+from typing import Any, AsyncIterator, Dict, List, Literal, Optional
 
-from fastapi import Depends, FastAPI, HTTPException
+from fastapi import Depends, FastAPI, HTTPException, Query, Request, Response
 from fastapi.middleware.cors import CORSMiddleware
-from sqlalchemy.orm import Session
-
-from src.application.chat_service import ChatService
-from src.application.dtos import ChatHistoryDTO, ChatMessageRequestDTO, ChatMessageResponseDTO, ProductDTO
+from fastapi.responses import JSONResponse, PlainTextResponse, StreamingResponse
+from starlette.concurrency import run_in_threadpool
+
+from src.application.chat_service import AIServiceProtocol, ChatService, ChatTelemetryProtocol
+from src.application.conversation_summary import ConversationSummaryService
+from src.application.dtos import (
+    ChatHistoryDTO,
+    ChatMessageRequestDTO,
+    ChatMessageResponseDTO,
+    FacetedSearchResponseDTO,
+    ProductDTO,
+    ProductImportReportDTO,
+    ProductMatchDTO,
+    StockAdjustmentResultDTO,
+    StockBatchRequestDTO,
+)
+from src.application.product_import import IMPORT_FORMATS, ProductImportService, make_row_parser
 from src.application.product_service import ProductService
-from src.domain.exceptions import ChatServiceError, ProductNotFoundError
-from src.infrastructure.db.database import get_db, init_db
-from src.infrastructure.llm_providers.gemini_service import GeminiService
-from src.infrastructure.repositories.chat_repository import SQLChatRepository
-from src.infrastructure.repositories.product_repository import SQLProductRepository
+from src.application.retrieval import FacetIndexProtocol, FacetQuery, FuzzyIndexProtocol, ProductRetrieverProtocol
+from src.domain.exceptions import ChatServiceError, ProductNotFoundError, ProviderOverloadedError
+from src.domain.repositories import IAsyncChatRepository, IAsyncProductRepository, IProductRepository
+from src.infrastructure.api.conditional import CacheValidators, catalog_validators, history_validators, product_validators
+from src.infrastructure.api.dependencies import (
+    CHAT_RETRIEVAL_TOP_K,
+    LLM_COALESCING_ENABLED,
+    catalog_prompt_cache,
+    close_async_repositories,
+    get_ai_service,
+    get_async_chat_repository,
+    get_async_product_repository,
+    get_chat_telemetry,
+    get_conversation_summaries,
+    get_facet_index,
+    get_profile_store,
+    get_product_repository,
+    get_product_retriever,
+    get_read_product_repository,
+    get_trigram_index,
+    get_vector_index,
+    llm_admission,
+    metrics_registry,
+    request_profiler,
+    response_cache,
+    warm_catalog_cache,
+)
+from src.infrastructure.db.database import async_engine, init_db
+from src.infrastructure.llm_providers.registry import build_provider_registry
+from src.infrastructure.observability.http import HTTPMetricsMiddleware
+from src.infrastructure.observability.profiler import ProfileStore
+from src.infrastructure.observability.server_timing import ServerTimingMiddleware, ServerTimingRoute, install_db_timing
 
 app = FastAPI(
     title="E-commerce Chat IA",
     description="API para gestionar productos y chat conversacional con IA.",
     version="1.0.0",
 )
+app.router.route_class = ServerTimingRoute
+install_db_timing()
 
+app.add_middleware(HTTPMetricsMiddleware, registry=metrics_registry)
+app.add_middleware(ServerTimingMiddleware, profiler=request_profiler)
 app.add_middleware(
     CORSMiddleware,
     allow_origins=["*"],
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["X-Next-Cursor", "ETag", "Last-Modified", "Server-Timing", "X-Profile-Id"],
 )
 
 
 @app.on_event("startup")
 def on_startup() -> None:
-    """Inicializa la base de datos y carga datos semilla al arrancar el servicio."""
+    """Inicializa la base de datos, carga datos semilla y precarga el catálogo."""
     init_db()
+    warm_catalog_cache()
+    app.state.ai_providers = build_provider_registry(
+        response_cache,
+        coalesce=LLM_COALESCING_ENABLED,
+        prompt_cache=catalog_prompt_cache,
+        admission=llm_admission,
+        metrics=metrics_registry,
+    )
+
+
+@app.on_event("shutdown")
+async def on_shutdown() -> None:
+    """Libera los proveedores de IA, las escrituras diferidas y el pool asíncrono."""
+    await app.state.ai_providers.aclose()
+    await close_async_repositories()
+    await async_engine.dispose()
 
 
 @app.get("/")
@@ -50,10 +114,18 @@ def root() -> dict:
         "version": "1.0.0",
         "endpoints": [
             "/products",
+            "/products/search",
+            "/products/facets",
+            "/products/lookup",
+            "/products/import",
+            "/products/stock:batch",
             "/products/{product_id}",
             "/chat",
+            "/chat/stream",
             "/chat/history/{session_id}",
             "/health",
+            "/metrics",
+            "/debug/profiles",
         ],
     }
 
@@ -68,28 +140,299 @@ def health_check() -> dict:
     return {"status": "ok", "timestamp": datetime.utcnow()}
 
 
-@app.get("/products", response_model=List[ProductDTO])
-def list_products(db: Session = Depends(get_db)) -> List[ProductDTO]:
-    """Retorna el catálogo completo de productos.
+@app.get("/metrics", response_class=PlainTextResponse)
+def metrics() -> PlainTextResponse:
+    """Expone las métricas del proceso en el formato de texto de Prometheus.
+
+    Returns:
+        PlainTextResponse: Contadores, indicadores e histogramas por etapa.
+    """
+    return PlainTextResponse(metrics_registry.render(), media_type=metrics_registry.content_type)
+
+
+@app.get("/debug/profiles")
+def list_profiles(store: ProfileStore = Depends(get_profile_store)) -> List[Dict[str, Any]]:
+    """Lista los perfiles capturados por muestreo, del más reciente al más antiguo.
+
+    Args:
+        store (ProfileStore): Almacén de perfiles del proceso.
+
+    Returns:
+        List[Dict[str, Any]]: Metadatos de cada perfil retenido.
+    """
+    return [profile.summary() for profile in store.list()]
+
+
+@app.get("/debug/profiles/{profile_id}", response_class=PlainTextResponse)
+def download_profile(profile_id: str, store: ProfileStore = Depends(get_profile_store)) -> PlainTextResponse:
+    """Descarga un perfil en formato *folded*, apto para generar un flamegraph.
+
+    Args:
+        profile_id (str): Identificador recibido en la cabecera ``X-Profile-Id``.
+        store (ProfileStore): Almacén de perfiles del proceso.
+
+    Returns:
+        PlainTextResponse: Una línea ``pila cantidad`` por pila muestreada.
+
+    Raises:
+        HTTPException: Con código 404 si el perfil no existe o ya fue descartado.
+    """
+    profile = store.get(profile_id)
+    if profile is None:
+        raise HTTPException(status_code=404, detail="Perfil no encontrado")
+    return PlainTextResponse(
+        profile.folded(),
+        headers={"Content-Disposition": f'attachment; filename="{profile_id}.folded"'},
+    )
+
+
+@app.get("/products", response_model=List[Dict[str, Any]])
+def list_products(
+    validators: CacheValidators = Depends(catalog_validators),
+    limit: int = Query(100, ge=1, le=1000),
+    cursor: Optional[str] = Query(None),
+    sort: str = Query("id", description="Campo de orden: id, name, price o stock; prefijo '-' para descendente."),
+    fields: Optional[str] = Query(None, description="Campos separados por comas a incluir en cada producto."),
+    product_repo: IProductRepository = Depends(get_read_product_repository),
+) -> JSONResponse:
+    """Retorna una página del catálogo ordenada y, opcionalmente, proyectada.
+
+    La página y la proyección se resuelven en la consulta SQL. Si hay más
+    resultados, el cursor de la siguiente página se envía en ``X-Next-Cursor``
+    y debe repetirse con el mismo ``sort``. Con ``If-None-Match`` vigente se
+    responde ``304`` sin consultar la base de datos.
+
+    Args:
+        validators (CacheValidators): ETag y fecha derivados de la versión del catálogo.
+        limit (int): Cantidad máxima de productos (1 a 1000).
+        cursor (Optional[str]): Cursor opaco de la página anterior.
+        sort (str): Campo de orden, con ``-`` para orden descendente.
+        fields (Optional[str]): Campos a incluir separados por comas.
+        product_repo (IProductRepository): Repositorio de catálogo inyectado por FastAPI.
+
+    Returns:
+        JSONResponse: Listado de productos de la página.
+
+    Raises:
+        HTTPException: Con código 400 si el orden, los campos o el cursor son inválidos.
+    """
+    product_service = ProductService(product_repo)
+    selected = [name.strip() for name in fields.split(",") if name.strip()] if fields else None
+    try:
+        page = product_service.list_products_page(limit, sort=sort, cursor=cursor, fields=selected)
+    except ValueError as exc:
+        raise HTTPException(status_code=400, detail=str(exc)) from exc
+    headers = validators.headers()
+    if page.next_cursor:
+        headers["X-Next-Cursor"] = page.next_cursor
+    return JSONResponse(content=page.items, headers=headers)
+
+
+@app.get("/products/search", response_model=List[ProductDTO])
+def search_products(
+    q: str = Query(..., min_length=1),
+    limit: int = Query(10, ge=1, le=100),
+    product_repo: IProductRepository = Depends(get_read_product_repository),
+    retriever: ProductRetrieverProtocol = Depends(get_vector_index),
+) -> List[ProductDTO]:
+    """Busca productos por similitud semántica con una consulta libre.
+
+    Args:
+        q (str): Texto de búsqueda.
+        limit (int): Cantidad máxima de resultados.
+        product_repo (IProductRepository): Repositorio de catálogo inyectado.
+        retriever (ProductRetrieverProtocol): Índice vectorial del catálogo.
+
+    Returns:
+        List[ProductDTO]: Productos ordenados por relevancia.
+    """
+    product_service = ProductService(product_repo, retriever)
+    return [ProductDTO.model_validate(product) for product in product_service.semantic_search(q, limit)]
+
+
+@app.get("/products/lookup", response_model=List[ProductMatchDTO])
+def lookup_products(
+    q: str = Query(..., min_length=1),
+    limit: int = Query(10, ge=1, le=100),
+    product_repo: IProductRepository = Depends(get_read_product_repository),
+    fuzzy: FuzzyIndexProtocol = Depends(get_trigram_index),
+) -> List[ProductMatchDTO]:
+    """Busca productos tolerando errores de tipeo mediante un índice de trigramas.
+
+    Args:
+        q (str): Texto de búsqueda (por ejemplo, ``addidas runing``).
+        limit (int): Cantidad máxima de resultados.
+        product_repo (IProductRepository): Repositorio de catálogo inyectado.
+        fuzzy (FuzzyIndexProtocol): Índice de trigramas del catálogo.
+
+    Returns:
+        List[ProductMatchDTO]: Productos con su similitud, de mayor a menor.
+    """
+    return ProductService(product_repo, fuzzy=fuzzy).fuzzy_search(q, limit)
+
+
+@app.get("/products/facets", response_model=FacetedSearchResponseDTO)
+def faceted_search(
+    response: Response,
+    validators: CacheValidators = Depends(catalog_validators),
+    brand: List[str] = Query([]),
+    category: List[str] = Query([]),
+    size: List[str] = Query([]),
+    color: List[str] = Query([]),
+    min_price: Optional[float] = Query(None, ge=0),
+    max_price: Optional[float] = Query(None, ge=0),
+    available: Optional[bool] = Query(None),
+    limit: int = Query(20, ge=1, le=100),
+    offset: int = Query(0, ge=0),
+    product_repo: IProductRepository = Depends(get_read_product_repository),
+    facets: FacetIndexProtocol = Depends(get_facet_index),
+) -> FacetedSearchResponseDTO:
+    """Filtra el catálogo por facetas y retorna los conteos de cada dimensión.
+
+    Los parámetros textuales pueden repetirse (``brand=Nike&brand=Adidas``);
+    los valores de una dimensión se combinan con OR y las dimensiones con
+    AND. Cada faceta cuenta los productos aplicando los filtros de las demás.
+
+    Args:
+        response (Response): Respuesta saliente para agregar encabezados.
+        validators (CacheValidators): ETag y fecha derivados de la versión del catálogo.
+        brand (List[str]): Marcas aceptadas.
+        category (List[str]): Categorías aceptadas.
+        size (List[str]): Tallas aceptadas.
+        color (List[str]): Colores aceptados.
+        min_price (Optional[float]): Precio mínimo inclusivo.
+        max_price (Optional[float]): Precio máximo inclusivo.
+        available (Optional[bool]): Filtra por disponibilidad si se indica.
+        limit (int): Cantidad máxima de productos.
+        offset (int): Productos a omitir.
+        product_repo (IProductRepository): Repositorio de catálogo inyectado.
+        facets (FacetIndexProtocol): Índice de facetas del catálogo.
+
+    Returns:
+        FacetedSearchResponseDTO: Productos, total y conteos por faceta.
+
+    Raises:
+        HTTPException: Con código 400 si el rango de precios está invertido.
+    """
+    if min_price is not None and max_price is not None and min_price > max_price:
+        raise HTTPException(status_code=400, detail="min_price no puede ser mayor que max_price")
+    query = FacetQuery(
+        brand=tuple(brand),
+        category=tuple(category),
+        size=tuple(size),
+        color=tuple(color),
+        min_price=min_price,
+        max_price=max_price,
+        available=available,
+    )
+    result = ProductService(product_repo, facets=facets).faceted_search(query, limit, offset)
+    response.headers.update(validators.headers())
+    return result
+
+
+async def _iter_request_lines(request: Request) -> AsyncIterator[str]:
+    """Divide el cuerpo de la petición en líneas a medida que llega.
+
+    Args:
+        request (Request): Petición cuyo cuerpo se lee como flujo UTF-8.
+
+    Yields:
+        str: Líneas del cuerpo, incluyendo su salto de línea.
+    """
+    decoder = codecs.getincrementaldecoder("utf-8-sig")(errors="replace")
+    buffer = ""
+    async for chunk in request.stream():
+        buffer += decoder.decode(chunk)
+        *lines, buffer = buffer.split("\n")
+        for line in lines:
+            yield line + "\n"
+    buffer += decoder.decode(b"", final=True)
+    if buffer:
+        yield buffer
+
+
+@app.post("/products/import", response_model=ProductImportReportDTO)
+async def import_products(
+    request: Request,
+    input_format: Optional[Literal["ndjson", "csv"]] = Query(
+        None, alias="format", description="Formato del cuerpo; por defecto se deduce del Content-Type."
+    ),
+    batch_size: int = Query(1000, ge=1, le=10000),
+    product_repo: IProductRepository = Depends(get_product_repository),
+) -> ProductImportReportDTO:
+    """Importa o actualiza productos en bloque desde un cuerpo NDJSON o CSV.
+
+    El cuerpo se lee como flujo: cada lote de ``batch_size`` filas se valida y
+    se escribe en su propia transacción con sentencias de varias filas. Las
+    filas con ``id`` actualizan el producto existente (o lo crean con ese
+    identificador) y las demás se insertan.
+
+    Args:
+        request (Request): Petición con el contenido a importar.
+        input_format (Optional[str]): ``ndjson`` o ``csv`` (parámetro ``format``).
+        batch_size (int): Filas por lote y transacción.
+        product_repo (IProductRepository): Repositorio de catálogo inyectado.
+
+    Returns:
+        ProductImportReportDTO: Totales y errores por fila.
+
+    Raises:
+        HTTPException: Con código 415 si el formato no puede determinarse.
+    """
+    content_type = request.headers.get("content-type", "")
+    import_format = input_format or ("csv" if "csv" in content_type else "ndjson" if "json" in content_type else None)
+    if import_format not in IMPORT_FORMATS:
+        raise HTTPException(status_code=415, detail="Use Content-Type application/x-ndjson o text/csv, o el parámetro format")
+
+    importer = ProductImportService(product_repo, batch_size=batch_size)
+    parser = make_row_parser(import_format)
+    async for line in _iter_request_lines(request):
+        row = parser.feed(line)
+        if row is not None and importer.add(row):
+            await run_in_threadpool(importer.flush)
+    row = parser.close()
+    if row is not None:
+        importer.add(row)
+    return await run_in_threadpool(importer.report)
+
+
+@app.post("/products/stock:batch", response_model=List[StockAdjustmentResultDTO])
+def adjust_stock_batch(
+    request: StockBatchRequestDTO,
+    product_repo: IProductRepository = Depends(get_product_repository),
+) -> List[StockAdjustmentResultDTO]:
+    """Aplica ajustes de stock en lote con actualizaciones condicionales.
+
+    Un ``delta`` negativo descuenta unidades solo si hay stock suficiente
+    (``UPDATE ... WHERE stock >= n``) y uno positivo las repone. Todo el lote
+    se aplica en una transacción y cada ítem informa si se aplicó.
 
     Args:
-        db (Session): Sesión de base de datos inyectada por FastAPI.
+        request (StockBatchRequestDTO): Ajustes a aplicar, en orden.
+        product_repo (IProductRepository): Repositorio de catálogo inyectado.
 
     Returns:
-        List[ProductDTO]: Listado de productos disponibles.
+        List[StockAdjustmentResultDTO]: Un resultado por ajuste.
     """
-    product_service = ProductService(SQLProductRepository(db))
-    products = product_service.get_all_products()
-    return [ProductDTO.model_validate(product) for product in products]
+    return ProductService(product_repo).adjust_stock(request.items)
 
 
 @app.get("/products/{product_id}", response_model=ProductDTO)
-def get_product(product_id: int, db: Session = Depends(get_db)) -> ProductDTO:
+def get_product(
+    product_id: int,
+    response: Response,
+    validators: CacheValidators = Depends(product_validators),
+    product_repo: IProductRepository = Depends(get_read_product_repository),
+) -> ProductDTO:
     """Obtiene un producto específico por identificador.
 
+    Responde ``304`` sin leer el producto si el ETag enviado sigue vigente.
+
     Args:
         product_id (int): Identificador numérico del producto.
-        db (Session): Sesión de base de datos inyectada.
+        response (Response): Respuesta saliente para agregar encabezados.
+        validators (CacheValidators): ETag y fecha derivados de la versión del producto.
+        product_repo (IProductRepository): Repositorio de catálogo inyectado.
 
     Returns:
         ProductDTO: Producto encontrado en el catálogo.
@@ -97,68 +440,233 @@ def get_product(product_id: int, db: Session = Depends(get_db)) -> ProductDTO:
     Raises:
         HTTPException: Con código 404 si el producto no existe.
     """
-    product_service = ProductService(SQLProductRepository(db))
+    product_service = ProductService(product_repo)
     try:
         product = product_service.get_product_by_id(product_id)
     except ProductNotFoundError as exc:
         raise HTTPException(status_code=404, detail=str(exc)) from exc
+    response.headers.update(validators.headers())
     return ProductDTO.model_validate(product)
 
 
 @app.post("/chat", response_model=ChatMessageResponseDTO)
-async def chat_endpoint(request: ChatMessageRequestDTO, db: Session = Depends(get_db)) -> ChatMessageResponseDTO:
+async def chat_endpoint(
+    request: ChatMessageRequestDTO,
+    product_repo: IAsyncProductRepository = Depends(get_async_product_repository),
+    chat_repo: IAsyncChatRepository = Depends(get_async_chat_repository),
+    retriever: ProductRetrieverProtocol = Depends(get_product_retriever),
+    ai_service: AIServiceProtocol = Depends(get_ai_service),
+    summaries: Optional[ConversationSummaryService] = Depends(get_conversation_summaries),
+    telemetry: ChatTelemetryProtocol = Depends(get_chat_telemetry),
+) -> ChatMessageResponseDTO:
     """Procesa un mensaje de chat y retorna la respuesta del asistente.
 
     Args:
         request (ChatMessageRequestDTO): Mensaje ingresado por el cliente.
-        db (Session): Sesión de base de datos inyectada.
+        product_repo (IAsyncProductRepository): Repositorio asíncrono de catálogo.
+        chat_repo (IAsyncChatRepository): Repositorio asíncrono de historial.
+        retriever (ProductRetrieverProtocol): Selector de productos relevantes.
+        ai_service (AIServiceProtocol): Proveedor de IA compartido por la aplicación.
+        summaries (Optional[ConversationSummaryService]): Resúmenes de sesión compartidos.
+        telemetry (ChatTelemetryProtocol): Métricas por etapa del turno.
 
     Returns:
         ChatMessageResponseDTO: Respuesta generada por la IA.
 
     Raises:
-        HTTPException: Con código 500 si ocurre un error en el servicio de chat.
+        HTTPException: Con código 500 si ocurre un error en el servicio de chat,
+            503 si el proveedor de IA no está configurado y 429/503 con
+            ``Retry-After`` si el proveedor está saturado.
     """
-    product_repo = SQLProductRepository(db)
-    chat_repo = SQLChatRepository(db)
-    ai_service = GeminiService()
-    chat_service = ChatService(product_repo, chat_repo, ai_service)
+    chat_service = ChatService(
+        product_repo,
+        chat_repo,
+        ai_service,
+        retriever=retriever,
+        top_k=CHAT_RETRIEVAL_TOP_K,
+        summaries=summaries,
+        telemetry=telemetry,
+    )
 
     try:
         return await chat_service.process_message(request)
+    except ProviderOverloadedError as exc:
+        raise _overloaded(exc) from exc
     except ChatServiceError as exc:
         raise HTTPException(status_code=500, detail=str(exc)) from exc
 
 
+def _overloaded(exc: ProviderOverloadedError) -> HTTPException:
+    """Traduce la saturación del proveedor en un rechazo inmediato con ``Retry-After``.
+
+    Args:
+        exc (ProviderOverloadedError): Rechazo del control de admisión.
+
+    Returns:
+        HTTPException: ``429`` si la cola estaba llena o ``503`` si venció la espera.
+    """
+    return HTTPException(
+        status_code=429 if exc.queue_full else 503,
+        detail=str(exc),
+        headers={"Retry-After": str(math.ceil(exc.retry_after))},
+    )
+
+
+def _sse_event(payload: dict, event: str | None = None) -> str:
+    """Serializa un evento con el formato de *server-sent events*.
+
+    Args:
+        payload (dict): Datos a enviar como JSON.
+        event (Optional[str]): Nombre del evento; ``None`` para mensajes simples.
+
+    Returns:
+        str: Bloque de texto listo para escribirse en el flujo.
+    """
+    prefix = f"event: {event}\n" if event else ""
+    return f"{prefix}data: {json.dumps(payload, ensure_ascii=False)}\n\n"
+
+
+@app.post("/chat/stream")
+async def chat_stream_endpoint(
+    request: ChatMessageRequestDTO,
+    product_repo: IAsyncProductRepository = Depends(get_async_product_repository),
+    chat_repo: IAsyncChatRepository = Depends(get_async_chat_repository),
+    retriever: ProductRetrieverProtocol = Depends(get_product_retriever),
+    ai_service: AIServiceProtocol = Depends(get_ai_service),
+    summaries: Optional[ConversationSummaryService] = Depends(get_conversation_summaries),
+    telemetry: ChatTelemetryProtocol = Depends(get_chat_telemetry),
+) -> StreamingResponse:
+    """Transmite la respuesta del asistente como *server-sent events*.
+
+    Cada fragmento se envía como ``data: {"token": ...}``; al terminar se emite
+    el evento ``done`` y, ante fallas, el evento ``error``.
+
+    Args:
+        request (ChatMessageRequestDTO): Mensaje ingresado por el cliente.
+        product_repo (IAsyncProductRepository): Repositorio asíncrono de catálogo.
+        chat_repo (IAsyncChatRepository): Repositorio asíncrono de historial.
+        retriever (ProductRetrieverProtocol): Selector de productos relevantes.
+        ai_service (AIServiceProtocol): Proveedor de IA compartido por la aplicación.
+        summaries (Optional[ConversationSummaryService]): Resúmenes de sesión compartidos.
+        telemetry (ChatTelemetryProtocol): Métricas por etapa del turno.
+
+    Returns:
+        StreamingResponse: Flujo ``text/event-stream`` con la respuesta.
+
+    Raises:
+        HTTPException: Con código 429/503 y ``Retry-After`` si el proveedor está saturado.
+    """
+    chat_service = ChatService(
+        product_repo,
+        chat_repo,
+        ai_service,
+        retriever=retriever,
+        top_k=CHAT_RETRIEVAL_TOP_K,
+        summaries=summaries,
+        telemetry=telemetry,
+    )
+
+    # El primer fragmento se obtiene antes de responder: así la admisión del
+    # proveedor se resuelve mientras aún es posible contestar 429/503.
+    tokens = chat_service.stream_message(request).__aiter__()
+    first: List[str] = []
+    failure: Optional[ChatServiceError] = None
+    try:
+        first.append(await tokens.__anext__())
+    except ProviderOverloadedError as exc:
+        raise _overloaded(exc) from exc
+    except ChatServiceError as exc:
+        failure = exc
+    except StopAsyncIteration:
+        pass
+
+    async def event_stream() -> AsyncIterator[str]:
+        if failure is not None:
+            yield _sse_event({"detail": str(failure)}, event="error")
+            return
+        try:
+            for token in first:
+                yield _sse_event({"token": token})
+            async for token in tokens:
+                yield _sse_event({"token": token})
+        except ChatServiceError as exc:
+            yield _sse_event({"detail": str(exc)}, event="error")
+            return
+        yield _sse_event({"session_id": request.session_id, "timestamp": datetime.utcnow().isoformat()}, event="done")
+
+    return StreamingResponse(
+        event_stream(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
 @app.get("/chat/history/{session_id}", response_model=List[ChatHistoryDTO])
-def get_chat_history(session_id: str, limit: int = 10, db: Session = Depends(get_db)) -> List[ChatHistoryDTO]:
-    """Recupera el historial de chat para una sesión determinada.
+async def get_chat_history(
+    session_id: str,
+    response: Response,
+    validators: CacheValidators = Depends(history_validators),
+    limit: int = Query(10, ge=1, le=500),
+    before: Optional[str] = None,
+    after: Optional[str] = None,
+    order: Literal["asc", "desc"] = "asc",
+    product_repo: IAsyncProductRepository = Depends(get_async_product_repository),
+    chat_repo: IAsyncChatRepository = Depends(get_async_chat_repository),
+) -> List[ChatHistoryDTO]:
+    """Recupera una página del historial de chat de una sesión.
+
+    Sin cursores retorna los primeros ``limit`` mensajes en el orden pedido.
+    Cuando la página está completa, el encabezado ``X-Next-Cursor`` contiene
+    el cursor a enviar como ``after`` (orden ``asc``) o ``before`` (orden
+    ``desc``) para obtener la siguiente. El ETag se deriva del último mensaje
+    de la sesión y un ``If-None-Match`` vigente se responde con ``304``.
 
     Args:
         session_id (str): Identificador de la sesión de chat.
+        response (Response): Respuesta saliente para agregar encabezados.
+        validators (CacheValidators): ETag y fecha derivados del último mensaje.
         limit (int): Máximo de mensajes a retornar.
-        db (Session): Sesión de base de datos inyectada.
+        before (Optional[str]): Cursor; solo mensajes anteriores a él.
+        after (Optional[str]): Cursor; solo mensajes posteriores a él.
+        order (str): ``asc`` (cronológico) o ``desc`` (más recientes primero).
+        product_repo (IAsyncProductRepository): Repositorio asíncrono de catálogo.
+        chat_repo (IAsyncChatRepository): Repositorio asíncrono de historial.
 
     Returns:
-        List[ChatHistoryDTO]: Mensajes ordenados cronológicamente.
+        List[ChatHistoryDTO]: Mensajes de la página en el orden solicitado.
+
+    Raises:
+        HTTPException: Con código 400 si algún cursor es inválido.
     """
-    chat_repo = SQLChatRepository(db)
-    product_repo = SQLProductRepository(db)
-    chat_service = ChatService(product_repo, chat_repo, GeminiService())
-    return chat_service.get_session_history(session_id, limit)
+    chat_service = ChatService(product_repo, chat_repo)
+    try:
+        page = await chat_service.get_history_page(session_id, limit, before=before, after=after, newest_first=order == "desc")
+    except ValueError as exc:
+        raise HTTPException(status_code=400, detail=str(exc)) from exc
+    response.headers.update(validators.headers())
+    if page.next_cursor:
+        response.headers["X-Next-Cursor"] = page.next_cursor
+    return page.items
 
 
 @app.delete("/chat/history/{session_id}")
-def delete_chat_history(session_id: str, db: Session = Depends(get_db)) -> dict:
+async def delete_chat_history(
+    session_id: str,
+    product_repo: IAsyncProductRepository = Depends(get_async_product_repository),
+    chat_repo: IAsyncChatRepository = Depends(get_async_chat_repository),
+) -> dict:
     """Elimina el historial completo de una sesión.
 
+    Pasa por el repositorio asíncrono para que, con escritura diferida, los
+    lotes aún pendientes de la sesión se descarten junto con lo persistido.
+
     Args:
         session_id (str): Identificador de la sesión objetivo.
-        db (Session): Sesión de base de datos inyectada.
+        product_repo (IAsyncProductRepository): Repositorio asíncrono de catálogo.
+        chat_repo (IAsyncChatRepository): Repositorio asíncrono de historial.
 
     Returns:
         dict: Resultado con la cantidad de mensajes eliminados.
     """
-    chat_repo = SQLChatRepository(db)
-    deleted = chat_repo.delete_session_history(session_id)
+    deleted = await ChatService(product_repo, chat_repo).clear_session_history(session_id)
     return {"session_id": session_id, "deleted_messages": deleted}
@@ -0,0 +1,334 @@
+"""Caché de catálogo en memoria compartida por todo el proceso."""
+from __future__ import annotations
+
+import threading
+from datetime import datetime
+from typing import Any, Callable, Dict, Iterator, List, Optional, Protocol, Sequence, Tuple
+
+from src.domain.entities import Product
+
+
+class CatalogSnapshot:
+    """Instantánea inmutable del catálogo etiquetada con un número de versión.
+
+    Los productos se guardan en un diccionario ordenado por identificador;
+    derivar una instantánea tras un cambio copia solo ese diccionario, y la
+    tupla ``products`` se materializa la primera vez que se consulta. Se
+    comporta como una secuencia de productos, de modo que puede entregarse
+    directamente a quien espera el catálogo. Las entidades ``Product``
+    contenidas se comparten entre peticiones, por lo que deben tratarse como
+    de solo lectura.
+
+    Attributes:
+        version (int): Versión del catálogo con la que se construyó.
+    """
+
+    __slots__ = ("version", "_items", "_products")
+
+    def __init__(self, version: int, items: Dict[Any, Product]) -> None:
+        """Inicializa la instantánea; usar ``build`` o las derivaciones.
+
+        Args:
+            version (int): Versión del catálogo.
+            items (Dict[Any, Product]): Productos por identificador, en orden;
+                no debe modificarse después.
+        """
+        self.version = version
+        self._items = items
+        self._products: Optional[Tuple[Product, ...]] = None
+
+    @classmethod
+    def build(cls, version: int, products: Sequence[Product]) -> "CatalogSnapshot":
+        """Construye una instantánea e indexa sus productos por identificador.
+
+        Args:
+            version (int): Versión del catálogo.
+            products (Sequence[Product]): Productos a incluir.
+
+        Returns:
+            CatalogSnapshot: Instantánea lista para consultas.
+        """
+        items: Dict[Any, Product] = {}
+        for position, product in enumerate(products):
+            items[product.id if product.id is not None else ("sin-id", position)] = product
+        return cls(version, items)
+
+    @property
+    def products(self) -> Tuple[Product, ...]:
+        """Tuple[Product, ...]: Productos en el orden del repositorio."""
+        products = self._products
+        if products is None:
+            products = self._products = tuple(self._items.values())
+        return products
+
+    def get(self, product_id: int) -> Optional[Product]:
+        """Obtiene un producto de la instantánea por su identificador.
+
+        Args:
+            product_id (int): Identificador del producto.
+
+        Returns:
+            Optional[Product]: Producto encontrado o ``None``.
+        """
+        return self._items.get(product_id)
+
+    def __len__(self) -> int:
+        return len(self._items)
+
+    def __iter__(self) -> Iterator[Product]:
+        return iter(self._items.values())
+
+    def __getitem__(self, position: int) -> Product:
+        return self.products[position]
+
+    def with_changes(self, saved: Sequence[Product], deleted: Sequence[int], version: int) -> "CatalogSnapshot":
+        """Deriva una instantánea aplicando un lote de cambios con una sola copia.
+
+        Los productos actualizados conservan su posición y los nuevos se agregan
+        al final.
+
+        Args:
+            saved (Sequence[Product]): Productos creados o actualizados.
+            deleted (Sequence[int]): Identificadores de productos eliminados.
+            version (int): Versión de la nueva instantánea.
+
+        Returns:
+            CatalogSnapshot: Instantánea con los cambios aplicados.
+        """
+        items = dict(self._items)
+        for product in saved:
+            items[product.id] = product
+        for product_id in deleted:
+            items.pop(product_id, None)
+        return CatalogSnapshot(version, items)
+
+    def with_saved(self, product: Product, version: int) -> "CatalogSnapshot":
+        """Deriva una instantánea que incluye el producto creado o actualizado.
+
+        Args:
+            product (Product): Producto persistido.
+            version (int): Versión de la nueva instantánea.
+
+        Returns:
+            CatalogSnapshot: Instantánea con el producto reemplazado o agregado.
+        """
+        return self.with_changes((product,), (), version)
+
+    def without(self, product_id: int, version: int) -> "CatalogSnapshot":
+        """Deriva una instantánea sin el producto indicado.
+
+        Args:
+            product_id (int): Identificador del producto eliminado.
+            version (int): Versión de la nueva instantánea.
+
+        Returns:
+            CatalogSnapshot: Instantánea sin el producto.
+        """
+        return self.with_changes((), (product_id,), version)
+
+
+class CatalogListener(Protocol):
+    """Contrato de los componentes que mantienen vistas derivadas del catálogo."""
+
+    def on_catalog_loaded(self, snapshot: CatalogSnapshot) -> None:
+        """Reconstruye la vista a partir de una instantánea completa."""
+
+    def on_product_saved(self, product: Product, version: int) -> None:
+        """Aplica la creación o actualización de un producto."""
+
+    def on_products_saved(self, products: Sequence[Product], version: int) -> None:
+        """Aplica en un solo paso la creación o actualización de varios productos."""
+
+    def on_product_deleted(self, product_id: int, version: int) -> None:
+        """Aplica la eliminación de un producto."""
+
+
+class CatalogCache:
+    """Mantiene la instantánea vigente del catálogo y su contador de versión.
+
+    El contador se incrementa con cada cambio; una carga iniciada antes de un
+    cambio no se publica para evitar almacenar datos obsoletos. Los cambios
+    puntuales se aplican sobre la instantánea y se notifican a los
+    ``CatalogListener`` suscritos para que actualicen sus índices de forma
+    incremental. Además se registra la versión y el instante del último cambio
+    de cada producto, usados como validadores de caché HTTP.
+
+    Las notificaciones se entregan mientras se retiene el lock, de modo que
+    los listeners reciben los cambios exactamente en el orden de sus
+    versiones y una carga completa nunca llega después de un cambio posterior.
+    El lock es reentrante para que un listener pueda consultar la caché.
+    """
+
+    def __init__(self) -> None:
+        """Inicializa la caché vacía en la versión cero."""
+        self._lock = threading.RLock()
+        self._version = 0
+        self._snapshot: Optional[CatalogSnapshot] = None
+        self._listeners: List[CatalogListener] = []
+        self._changed_at = datetime.utcnow()
+        self._baseline: Tuple[int, datetime] = (0, self._changed_at)
+        self._product_versions: Dict[int, Tuple[int, datetime]] = {}
+
+    def subscribe(self, listener: CatalogListener) -> None:
+        """Registra un listener y le entrega la instantánea vigente si existe.
+
+        Args:
+            listener (CatalogListener): Componente a notificar.
+        """
+        with self._lock:
+            self._listeners.append(listener)
+            if self._snapshot is not None:
+                listener.on_catalog_loaded(self._snapshot)
+
+    @property
+    def version(self) -> int:
+        """int: Versión actual del catálogo."""
+        return self._version
+
+    @property
+    def last_modified(self) -> datetime:
+        """datetime: Instante (UTC) del último cambio del catálogo."""
+        return self._changed_at
+
+    def product_version(self, product_id: int) -> Tuple[int, datetime]:
+        """Retorna la versión y el instante del último cambio de un producto.
+
+        Los productos no modificados desde la última invalidación comparten la
+        versión de esa invalidación.
+
+        Args:
+            product_id (int): Identificador del producto.
+
+        Returns:
+            Tuple[int, datetime]: Versión del catálogo en que cambió y su instante.
+        """
+        return self._product_versions.get(product_id, self._baseline)
+
+    def _bump(self) -> int:
+        """Incrementa la versión registrando el instante; requiere tener el lock."""
+        self._version += 1
+        self._changed_at = datetime.utcnow()
+        return self._version
+
+    def current(self) -> Optional[CatalogSnapshot]:
+        """Retorna la instantánea vigente sin consultar la persistencia.
+
+        Returns:
+            Optional[CatalogSnapshot]: Instantánea cargada o ``None``.
+        """
+        return self._snapshot
+
+    def publish(self, products: Sequence[Product], version: int) -> CatalogSnapshot:
+        """Publica productos leídos de la persistencia como nueva instantánea.
+
+        Args:
+            products (Sequence[Product]): Productos leídos.
+            version (int): Versión observada antes de iniciar la lectura.
+
+        Returns:
+            CatalogSnapshot: Instantánea construida con los productos recibidos.
+        """
+        snapshot = CatalogSnapshot.build(version, products)
+        with self._lock:
+            if self._snapshot is not None and self._snapshot.version == version:
+                return self._snapshot
+            if self._version == version and self._snapshot is None:
+                self._snapshot = snapshot
+                for listener in self._listeners:
+                    listener.on_catalog_loaded(snapshot)
+        return snapshot
+
+    def load(self, loader: Callable[[], Sequence[Product]]) -> CatalogSnapshot:
+        """Retorna la instantánea vigente o la construye con ``loader``.
+
+        Args:
+            loader (Callable[[], Sequence[Product]]): Función que lee el catálogo
+                completo desde la persistencia.
+
+        Returns:
+            CatalogSnapshot: Instantánea del catálogo.
+        """
+        snapshot = self._snapshot
+        if snapshot is not None:
+            return snapshot
+        version = self._version
+        return self.publish(loader(), version)
+
+    def apply_saved(self, product: Product) -> int:
+        """Registra la creación o actualización de un producto persistido.
+
+        Args:
+            product (Product): Producto tal como quedó en la persistencia.
+
+        Returns:
+            int: Nueva versión del catálogo.
+        """
+        with self._lock:
+            version = self._bump()
+            if product.id is not None:
+                self._product_versions[product.id] = (version, self._changed_at)
+            if self._snapshot is not None:
+                self._snapshot = self._snapshot.with_saved(product, version)
+            for listener in self._listeners:
+                listener.on_product_saved(product, version)
+        return version
+
+    def apply_saved_many(self, products: Sequence[Product]) -> int:
+        """Registra un lote de productos persistidos como un único cambio.
+
+        El lote produce una sola versión, una sola instantánea derivada y una
+        sola notificación por listener, en lugar de una por producto.
+
+        Args:
+            products (Sequence[Product]): Productos tal como quedaron en la persistencia.
+
+        Returns:
+            int: Nueva versión del catálogo.
+        """
+        with self._lock:
+            version = self._bump()
+            for product in products:
+                if product.id is not None:
+                    self._product_versions[product.id] = (version, self._changed_at)
+            if self._snapshot is not None:
+                self._snapshot = self._snapshot.with_changes(products, (), version)
+            for listener in self._listeners:
+                listener.on_products_saved(products, version)
+        return version
+
+    def apply_deleted(self, product_id: int) -> int:
+        """Registra la eliminación de un producto.
+
+        Args:
+            product_id (int): Identificador del producto eliminado.
+
+        Returns:
+            int: Nueva versión del catálogo.
+        """
+        with self._lock:
+            version = self._bump()
+            self._product_versions[product_id] = (version, self._changed_at)
+            if self._snapshot is not None:
+                self._snapshot = self._snapshot.without(product_id, version)
+            for listener in self._listeners:
+                listener.on_product_deleted(product_id, version)
+        return version
+
+    def invalidate(self) -> int:
+        """Descarta la instantánea vigente e incrementa la versión.
+
+        Se usa ante cambios masivos; los listeners se reconstruyen con la
+        siguiente carga completa del catálogo.
+
+        Returns:
+            int: Nueva versión del catálogo.
+        """
+        with self._lock:
+            version = self._bump()
+            self._snapshot = None
+            self._baseline = (version, self._changed_at)
+            self._product_versions.clear()
+            return version
+
+
+catalog_cache = CatalogCache()
@@ -0,0 +1,146 @@
+"""Fragmentos de prompt del catálogo precompilados y mantenidos de forma incremental."""
+from __future__ import annotations
+
+import threading
+from dataclasses import dataclass, field
+from typing import Callable, Dict, Optional, Sequence
+
+from src.domain.entities import Product
+
+from .catalog_cache import CatalogSnapshot
+
+
+def format_product_line(product: Product) -> str:
+    """Describe un producto en una línea del bloque de catálogo del prompt.
+
+    Args:
+        product (Product): Producto a describir.
+
+    Returns:
+        str: Línea con nombre, marca, categoría, talla, color, precio y stock.
+    """
+    availability = "Disponible" if product.is_available() else "Agotado"
+    return (
+        f"- {product.name} | Marca: {product.brand} | Categoría: {product.category} | "
+        f"Talla: {product.size} | Color: {product.color} | Precio: ${product.price:.2f} | "
+        f"Stock: {product.stock} ({availability})"
+    )
+
+
+@dataclass(frozen=True)
+class _Fragment:
+    """Línea renderizada de un producto junto con la versión que la produjo."""
+
+    version: int
+    product: Product
+    line: str
+
+
+@dataclass
+class _PromptState:
+    """Fragmentos vigentes en el orden del catálogo y su bloque unido."""
+
+    fragments: Dict[int, _Fragment] = field(default_factory=dict)
+    block: Optional[str] = None
+
+
+class CatalogPromptCache:
+    """Caché de las líneas del catálogo que se insertan en el prompt.
+
+    Cada producto se renderiza una sola vez por versión y el bloque completo
+    se une de forma perezosa, solo después de que un guardado o borrado lo
+    invalida. Se suscribe a ``CatalogCache`` como ``CatalogListener``; el
+    estado se reemplaza completo en cada cambio para que los lectores nunca
+    observen una actualización a medias.
+    """
+
+    def __init__(self, render: Callable[[Product], str] = format_product_line) -> None:
+        """Inicializa la caché vacía.
+
+        Args:
+            render (Callable[[Product], str]): Función que produce la línea de un producto.
+        """
+        self._render = render
+        self._lock = threading.Lock()
+        self._state = _PromptState()
+
+    def __len__(self) -> int:
+        return len(self._state.fragments)
+
+    def line(self, product: Product) -> str:
+        """Retorna la línea de un producto, reutilizando la precompilada si sigue vigente.
+
+        Args:
+            product (Product): Producto a describir.
+
+        Returns:
+            str: Línea del producto.
+        """
+        fragment = self._state.fragments.get(product.id)
+        if fragment is not None and fragment.product is product:
+            return fragment.line
+        return self._render(product)
+
+    def block(self) -> str:
+        """Retorna el bloque del catálogo completo, uniéndolo solo si cambió.
+
+        Returns:
+            str: Líneas de todos los productos separadas por saltos de línea.
+        """
+        state = self._state
+        if state.block is None:
+            state.block = "\n".join(fragment.line for fragment in state.fragments.values())
+        return state.block
+
+    def render(self, products: Sequence[Product]) -> str:
+        """Describe los productos recibidos usando los fragmentos precompilados.
+
+        Si la secuencia es exactamente el catálogo vigente se retorna el bloque
+        ya unido; en otro caso se unen las líneas de cada producto.
+
+        Args:
+            products (Sequence[Product]): Productos a incluir en el prompt.
+
+        Returns:
+            str: Texto con un producto por línea.
+        """
+        state = self._state
+        fragments = state.fragments
+        if len(products) == len(fragments) and all(
+            fragment.product is product for product, fragment in zip(products, fragments.values())
+        ):
+            return self.block()
+        return "\n".join(self.line(product) for product in products)
+
+    def on_catalog_loaded(self, snapshot: CatalogSnapshot) -> None:
+        """Renderiza todas las líneas a partir de una instantánea completa."""
+        fragments = {
+            product.id: _Fragment(snapshot.version, product, self._render(product))
+            for product in snapshot.products
+            if product.id is not None
+        }
+        with self._lock:
+            self._state = _PromptState(fragments)
+
+    def on_product_saved(self, product: Product, version: int) -> None:
+        """Renderiza de nuevo solo la línea del producto guardado."""
+        self.on_products_saved((product,), version)
+
+    def on_products_saved(self, products: Sequence[Product], version: int) -> None:
+        """Renderiza de nuevo las líneas del lote con una sola copia del estado."""
+        rendered = {
+            product.id: _Fragment(version, product, self._render(product)) for product in products if product.id is not None
+        }
+        if not rendered:
+            return
+        with self._lock:
+            self._state = _PromptState({**self._state.fragments, **rendered})
+
+    def on_product_deleted(self, product_id: int, version: int) -> None:
+        """Retira la línea del producto eliminado."""
+        with self._lock:
+            if product_id not in self._state.fragments:
+                return
+            fragments = dict(self._state.fragments)
+            del fragments[product_id]
+            self._state = _PromptState(fragments)
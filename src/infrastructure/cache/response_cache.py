@@ -0,0 +1,272 @@
+"""Caché de respuestas del proveedor de IA con expulsión LRU y TTL."""
+from __future__ import annotations
+
+import hashlib
+import re
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, AsyncIterator, Callable, List, Optional, Sequence, Tuple
+
+from src.application.chat_service import AIServiceProtocol
+from src.domain.entities import ChatContext, Product
+
+from ..observability.metrics import MetricsRegistry
+from ..search.text import normalize
+from .catalog_cache import CatalogCache
+
+_WORD_PATTERN = re.compile(r"[a-z0-9]+")
+
+
+def normalize_prompt(user_message: str) -> str:
+    """Normaliza un mensaje para que variaciones triviales compartan clave.
+
+    Args:
+        user_message (str): Mensaje original del usuario.
+
+    Returns:
+        str: Palabras en minúsculas, sin tildes ni signos de puntuación.
+    """
+    return " ".join(_WORD_PATTERN.findall(normalize(user_message)))
+
+
+def context_fingerprint(context: ChatContext) -> str:
+    """Calcula la huella de la ventana de contexto enviada al proveedor.
+
+    Args:
+        context (ChatContext): Contexto conversacional del turno.
+
+    Returns:
+        str: Hash hexadecimal del contexto formateado.
+    """
+    return hashlib.sha1(context.format_for_prompt().encode("utf-8")).hexdigest()
+
+
+def turn_catalog_version(context: ChatContext, catalog: CatalogCache) -> int:
+    """Retorna la versión del catálogo con la que se armó el turno.
+
+    Args:
+        context (ChatContext): Contexto del turno, con la versión de su instantánea.
+        catalog (CatalogCache): Caché consultada si el contexto no trae versión.
+
+    Returns:
+        int: Versión a incluir en la clave de generación.
+    """
+    return context.catalog_version if context.catalog_version is not None else catalog.version
+
+
+def generation_key(user_message: str, context: ChatContext, catalog_version: int) -> str:
+    """Construye la clave que identifica una generación equivalente.
+
+    Args:
+        user_message (str): Mensaje del usuario.
+        context (ChatContext): Contexto conversacional del turno.
+        catalog_version (int): Versión del catálogo usada en el prompt.
+
+    Returns:
+        str: Clave estable para caché y coalescencia de peticiones.
+    """
+    raw = f"{catalog_version}\x00{normalize_prompt(user_message)}\x00{context_fingerprint(context)}"
+    return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+
+@dataclass(frozen=True)
+class CacheStats:
+    """Contadores de uso de la caché.
+
+    Attributes:
+        hits (int): Consultas resueltas desde la caché.
+        misses (int): Consultas que requirieron al proveedor.
+        evictions (int): Entradas expulsadas por capacidad o expiración.
+        size (int): Entradas vigentes.
+    """
+
+    hits: int
+    misses: int
+    evictions: int
+    size: int
+
+
+class LLMResponseCache:
+    """Caché LRU con expiración por tiempo para respuestas generadas.
+
+    La versión de la instantánea de la que salieron los productos del turno
+    forma parte de la clave, por lo que nunca se sirve una respuesta
+    construida sobre un catálogo anterior; las entradas de versiones previas
+    dejan de consultarse y salen por LRU o por TTL.
+    """
+
+    def __init__(
+        self,
+        max_entries: int = 1024,
+        ttl_seconds: float = 600.0,
+        clock: Callable[[], float] = time.monotonic,
+        registry: Optional[MetricsRegistry] = None,
+    ) -> None:
+        """Inicializa la caché vacía.
+
+        Args:
+            max_entries (int): Capacidad máxima antes de expulsar la entrada menos usada.
+            ttl_seconds (float): Vigencia de cada entrada en segundos.
+            clock (Callable[[], float]): Reloj monotónico usado para la expiración.
+            registry (Optional[MetricsRegistry]): Registro donde se exponen
+                aciertos, fallos, expulsiones y tamaño.
+        """
+        self._max_entries = max_entries
+        self._ttl = ttl_seconds
+        self._clock = clock
+        self._entries: "OrderedDict[str, Tuple[float, str]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+        self._metrics = None
+        if registry is not None:
+            self._metrics = (
+                registry.counter("llm_response_cache_hits_total", "Respuestas del proveedor de IA servidas desde la caché."),
+                registry.counter("llm_response_cache_misses_total", "Consultas a la caché de respuestas que requirieron al proveedor."),
+                registry.counter("llm_response_cache_evictions_total", "Entradas expulsadas por capacidad o expiración."),
+                registry.gauge("llm_response_cache_entries", "Entradas vigentes en la caché de respuestas."),
+            )
+
+    def _observe(self, hits: int = 0, misses: int = 0, evictions: int = 0) -> None:
+        """Acumula los contadores y actualiza las métricas; requiere tener el lock."""
+        self._hits += hits
+        self._misses += misses
+        self._evictions += evictions
+        if self._metrics is not None:
+            hit_counter, miss_counter, eviction_counter, entries = self._metrics
+            if hits:
+                hit_counter.inc(hits)
+            if misses:
+                miss_counter.inc(misses)
+            if evictions:
+                eviction_counter.inc(evictions)
+            entries.set(len(self._entries))
+
+    def get(self, key: str) -> Optional[str]:
+        """Obtiene una respuesta vigente y la marca como usada recientemente.
+
+        Args:
+            key (str): Clave de generación.
+
+        Returns:
+            Optional[str]: Respuesta almacenada o ``None``.
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            expired = entry is not None and entry[0] < self._clock()
+            if expired:
+                del self._entries[key]
+                entry = None
+            if entry is None:
+                self._observe(misses=1, evictions=int(expired))
+                return None
+            self._entries.move_to_end(key)
+            self._observe(hits=1)
+            return entry[1]
+
+    def put(self, key: str, response: str) -> None:
+        """Almacena una respuesta expulsando la menos usada si no hay espacio.
+
+        Args:
+            key (str): Clave de generación.
+            response (str): Texto generado por el proveedor.
+        """
+        with self._lock:
+            self._entries[key] = (self._clock() + self._ttl, response)
+            self._entries.move_to_end(key)
+            evicted = 0
+            while len(self._entries) > self._max_entries:
+                self._entries.popitem(last=False)
+                evicted += 1
+            self._observe(evictions=evicted)
+
+    def clear(self) -> None:
+        """Descarta todas las entradas conservando los contadores."""
+        with self._lock:
+            evicted = len(self._entries)
+            self._entries.clear()
+            self._observe(evictions=evicted)
+
+    def stats(self) -> CacheStats:
+        """Retorna una copia de los contadores actuales.
+
+        Returns:
+            CacheStats: Aciertos, fallos, expulsiones y tamaño.
+        """
+        with self._lock:
+            return CacheStats(self._hits, self._misses, self._evictions, len(self._entries))
+
+
+class CachingAIService:
+    """Decorador de ``AIServiceProtocol`` que reutiliza respuestas repetidas."""
+
+    def __init__(self, provider: AIServiceProtocol, cache: LLMResponseCache, catalog: CatalogCache) -> None:
+        """Inicializa el decorador.
+
+        Args:
+            provider (AIServiceProtocol): Proveedor real de IA.
+            cache (LLMResponseCache): Caché compartida de respuestas.
+            catalog (CatalogCache): Versión del catálogo si el turno no trae la suya.
+        """
+        self._provider = provider
+        self._cache = cache
+        self._catalog = catalog
+
+    async def generate_response(self, user_message: str, products: List[Product], context: ChatContext) -> str:
+        """Retorna la respuesta en caché o la solicita al proveedor.
+
+        Args:
+            user_message (str): Mensaje del usuario.
+            products (List[Product]): Productos relevantes del turno.
+            context (ChatContext): Historial reciente.
+
+        Returns:
+            str: Respuesta del asistente.
+        """
+        key = generation_key(user_message, context, turn_catalog_version(context, self._catalog))
+        cached = self._cache.get(key)
+        if cached is not None:
+            return cached
+        response = await self._provider.generate_response(user_message, products, context)
+        if response:
+            self._cache.put(key, response)
+        return response
+
+    async def stream_response(self, user_message: str, products: List[Product], context: ChatContext) -> AsyncIterator[str]:
+        """Transmite la respuesta en caché o la del proveedor, guardándola al completar.
+
+        Args:
+            user_message (str): Mensaje del usuario.
+            products (List[Product]): Productos relevantes del turno.
+            context (ChatContext): Historial reciente.
+
+        Yields:
+            str: Fragmentos de la respuesta.
+        """
+        key = generation_key(user_message, context, turn_catalog_version(context, self._catalog))
+        cached = self._cache.get(key)
+        if cached is not None:
+            yield cached
+            return
+        chunks: List[str] = []
+        async for chunk in self._provider.stream_response(user_message, products, context):
+            chunks.append(chunk)
+            yield chunk
+        response = "".join(chunks)
+        if response:
+            self._cache.put(key, response)
+
+    def __getattr__(self, name: str) -> Any:
+        """Expone las capacidades opcionales del proveedor envuelto, como los resúmenes."""
+        if name.startswith("_"):
+            raise AttributeError(name)
+        return getattr(self._provider, name)
+
+    async def aclose(self) -> None:
+        """Libera los recursos del proveedor envuelto."""
+        close = getattr(self._provider, "aclose", None)
+        if close is not None:
+            await close()
@@ -0,0 +1,145 @@
+"""Comando para importar productos en bloque desde archivos NDJSON o CSV.
+
+Uso::
+
+    python -m src.infrastructure.cli.import_products catalogo.csv --api-url http://localhost:8000
+    python -m src.infrastructure.cli.import_products - --format ndjson < feed.ndjson
+
+Con ``--api-url`` el archivo se envía a ``POST /products/import`` del servidor
+en ejecución, que actualiza su catálogo en memoria, sus índices y sus ETag.
+Sin él se escribe directamente en la base de datos: un servidor en ejecución
+no se entera del cambio y sigue sirviendo su catálogo hasta reiniciarse.
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import sys
+import urllib.error
+import urllib.parse
+import urllib.request
+from pathlib import Path
+from typing import Iterator, List, Optional, TextIO
+
+from src.application.product_import import IMPORT_FORMATS, ProductImportService, parse_rows
+
+from ..db.database import SessionLocal, init_db
+from ..repositories.product_repository import SQLProductRepository
+
+_CONTENT_TYPES = {"ndjson": "application/x-ndjson", "csv": "text/csv"}
+_CHUNK_SIZE = 64 * 1024
+
+
+def _detect_format(path: str, explicit: Optional[str]) -> str:
+    """Determina el formato a partir del argumento o de la extensión del archivo."""
+    if explicit:
+        return explicit
+    suffix = Path(path).suffix.lower()
+    if suffix == ".csv":
+        return "csv"
+    if suffix in {".ndjson", ".jsonl"}:
+        return "ndjson"
+    raise SystemExit("No se pudo deducir el formato; use --format ndjson|csv")
+
+
+def _encoded_chunks(source: TextIO) -> Iterator[bytes]:
+    """Lee ``source`` en bloques UTF-8 para enviarlo con codificación *chunked*."""
+    while True:
+        block = source.read(_CHUNK_SIZE)
+        if not block:
+            return
+        yield block.encode("utf-8")
+
+
+def upload(source: TextIO, import_format: str, batch_size: int, api_url: str) -> int:
+    """Envía el contenido de ``source`` al servidor e imprime el reporte.
+
+    Args:
+        source (TextIO): Archivo de texto abierto.
+        import_format (str): ``ndjson`` o ``csv``.
+        batch_size (int): Filas por lote y transacción.
+        api_url (str): URL base del servidor, por ejemplo ``http://localhost:8000``.
+
+    Returns:
+        int: Código de salida; 1 si alguna fila fue rechazada o el servidor falló.
+    """
+    query = urllib.parse.urlencode({"format": import_format, "batch_size": batch_size})
+    request = urllib.request.Request(
+        f"{api_url.rstrip('/')}/products/import?{query}",
+        data=_encoded_chunks(source),
+        headers={"Content-Type": _CONTENT_TYPES[import_format]},
+        method="POST",
+    )
+    try:
+        with urllib.request.urlopen(request) as response:
+            report = json.load(response)
+    except urllib.error.HTTPError as exc:
+        print(f"El servidor rechazó la importación ({exc.code}): {exc.read().decode('utf-8', 'replace')}", file=sys.stderr)
+        return 1
+    except urllib.error.URLError as exc:
+        print(f"No se pudo contactar al servidor {api_url}: {exc.reason}", file=sys.stderr)
+        return 1
+    print(json.dumps(report, indent=2, ensure_ascii=False))
+    return 1 if report.get("failed") else 0
+
+
+def run(source: TextIO, import_format: str, batch_size: int) -> int:
+    """Importa el contenido de ``source`` directamente en la base de datos.
+
+    Un servidor en ejecución no ve el cambio hasta reiniciarse; para
+    actualizarlo en caliente use ``upload``.
+
+    Args:
+        source (TextIO): Archivo de texto abierto.
+        import_format (str): ``ndjson`` o ``csv``.
+        batch_size (int): Filas por lote y transacción.
+
+    Returns:
+        int: Código de salida; 1 si alguna fila fue rechazada.
+    """
+    init_db()
+    session = SessionLocal()
+    try:
+        report = ProductImportService(SQLProductRepository(session), batch_size=batch_size).import_rows(parse_rows(source, import_format))
+    finally:
+        session.close()
+    print(report.model_dump_json(indent=2))
+    print("Importación escrita en la base de datos: reinicie el servidor en ejecución o use --api-url.", file=sys.stderr)
+    return 1 if report.failed else 0
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """Punto de entrada del comando.
+
+    Args:
+        argv (Optional[List[str]]): Argumentos; por defecto los del proceso.
+
+    Returns:
+        int: Código de salida.
+    """
+    parser = argparse.ArgumentParser(description="Importa o actualiza productos en bloque.")
+    parser.add_argument("path", help="Archivo a importar, o '-' para leer de la entrada estándar")
+    parser.add_argument("--format", choices=IMPORT_FORMATS, help="Formato del archivo (por defecto según la extensión)")
+    parser.add_argument("--batch-size", type=int, default=1000, help="Filas por lote y transacción")
+    parser.add_argument(
+        "--api-url",
+        help="Servidor al que enviar el archivo (POST /products/import); sin él se escribe directo en la base de datos",
+    )
+    args = parser.parse_args(argv)
+
+    def dispatch(source: TextIO, import_format: str) -> int:
+        if args.api_url:
+            return upload(source, import_format, args.batch_size, args.api_url)
+        return run(source, import_format, args.batch_size)
+
+    if args.path == "-":
+        if not args.format:
+            parser.error("--format es obligatorio al leer de la entrada estándar")
+        return dispatch(sys.stdin, args.format)
+    import_format = _detect_format(args.path, args.format)
+    with open(args.path, encoding="utf-8-sig", newline="") as source:
+        return dispatch(source, import_format)
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
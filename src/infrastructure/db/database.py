@@ -5,15 +5,47 @@ import os
 from typing import Generator
 
 from sqlalchemy import create_engine
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
 from sqlalchemy.orm import declarative_base, sessionmaker
 
+from .storage import apply_storage_profile, engine_options, get_storage_profile, is_memory_sqlite
+
 DATABASE_URL = os.getenv("DATABASE_URL", "sqlite:///./data/ecommerce_chat.db")
 
-engine = create_engine(
-    DATABASE_URL,
-    connect_args={"check_same_thread": False} if DATABASE_URL.startswith("sqlite") else {},
-)
+
+def to_async_url(url: str) -> str:
+    """Traduce una URL síncrona de SQLAlchemy a su driver asíncrono.
+
+    Args:
+        url (str): URL de conexión configurada.
+
+    Returns:
+        str: URL equivalente para ``create_async_engine``.
+    """
+    if url.startswith("sqlite://"):
+        return "sqlite+aiosqlite://" + url[len("sqlite://") :]
+    return url
+
+
+ASYNC_DATABASE_URL = os.getenv("ASYNC_DATABASE_URL", to_async_url(DATABASE_URL))
+READ_DATABASE_URL = os.getenv("READ_DATABASE_URL", DATABASE_URL)
+STORAGE_PROFILE = get_storage_profile(os.getenv("DB_STORAGE_PROFILE", "balanced"))
+
+engine = create_engine(DATABASE_URL, **engine_options(DATABASE_URL, STORAGE_PROFILE))
+apply_storage_profile(engine, STORAGE_PROFILE)
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+
+# Una base en memoria no puede abrirse desde otro motor: las lecturas comparten el principal.
+if is_memory_sqlite(READ_DATABASE_URL):
+    read_engine = engine
+else:
+    read_engine = create_engine(READ_DATABASE_URL, **engine_options(READ_DATABASE_URL, STORAGE_PROFILE, read_only=True))
+    apply_storage_profile(read_engine, STORAGE_PROFILE, read_only=True)
+ReadSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=read_engine)
+
+async_engine = create_async_engine(ASYNC_DATABASE_URL, **engine_options(ASYNC_DATABASE_URL, STORAGE_PROFILE))
+apply_storage_profile(async_engine.sync_engine, STORAGE_PROFILE)
+AsyncSessionLocal = async_sessionmaker(async_engine, autoflush=False, expire_on_commit=False)
 Base = declarative_base()
 
 
@@ -30,10 +62,34 @@ def get_db() -> Generator:
         db.close()
 
 
+def get_read_db() -> Generator:
+    """Proporciona una sesión del motor de solo lectura para peticiones GET.
+
+    En SQLite las conexiones de este motor usan ``query_only``, por lo que
+    cualquier escritura accidental falla en lugar de competir con los
+    escritores por el bloqueo de la base.
+
+    Yields:
+        Session: Sesión de solo lectura.
+    """
+    db = ReadSessionLocal()
+    try:
+        yield db
+    finally:
+        db.close()
+
+
 def init_db() -> None:
-    """Inicializa el esquema y carga los datos iniciales."""
+    """Inicializa el esquema y carga los datos iniciales.
+
+    Los índices se crean también sobre tablas existentes, ya que
+    ``create_all`` solo los genera al crear la tabla.
+    """
     from . import models  # noqa: F401 - ensure models are registered
     from .init_data import load_initial_data
 
     Base.metadata.create_all(bind=engine)
+    for table in Base.metadata.sorted_tables:
+        for index in table.indexes:
+            index.create(bind=engine, checkfirst=True)
     load_initial_data()
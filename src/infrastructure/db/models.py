@@ -3,15 +3,24 @@ from __future__ import annotations
 
 from datetime import datetime
 
-from sqlalchemy import Column, DateTime, Float, Integer, String, Text
+from sqlalchemy import Column, DateTime, Float, Index, Integer, String, Text
 
 from .database import Base
 
 
 class ProductModel(Base):
-    """Modelo ORM que refleja la tabla ``products`` en la base de datos."""
+    """Modelo ORM que refleja la tabla ``products`` en la base de datos.
+
+    Los índices ``(campo, id)`` sostienen la paginación por cursor de los
+    listados ordenados por nombre, precio o stock.
+    """
 
     __tablename__ = "products"
+    __table_args__ = (
+        Index("ix_products_name_id", "name", "id"),
+        Index("ix_products_price_id", "price", "id"),
+        Index("ix_products_stock_id", "stock", "id"),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     name = Column(String(200), nullable=False)
@@ -25,12 +34,30 @@ class ProductModel(Base):
 
 
 class ChatMemoryModel(Base):
-    """Modelo ORM que almacena los registros del historial conversacional."""
+    """Modelo ORM que almacena los registros del historial conversacional.
+
+    El índice compuesto ``(session_id, timestamp, id)`` resuelve las lecturas
+    por sesión en orden cronológico y la paginación por cursor sin ordenar
+    en memoria.
+    """
 
     __tablename__ = "chat_memory"
+    __table_args__ = (Index("ix_chat_memory_session_timestamp_id", "session_id", "timestamp", "id"),)
 
     id = Column(Integer, primary_key=True, index=True)
     session_id = Column(String(100), index=True, nullable=False)
     role = Column(String(20), nullable=False)
     message = Column(Text, nullable=False)
     timestamp = Column(DateTime, default=datetime.utcnow, nullable=False)
+
+
+class ChatSummaryModel(Base):
+    """Modelo ORM que guarda el resumen incremental de cada sesión de chat."""
+
+    __tablename__ = "chat_summaries"
+
+    session_id = Column(String(100), primary_key=True)
+    summary = Column(Text, nullable=False)
+    covered_message_id = Column(Integer, nullable=True)
+    covered_timestamp = Column(DateTime, nullable=True)
+    updated_at = Column(DateTime, default=datetime.utcnow, nullable=False)
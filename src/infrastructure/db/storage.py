@@ -0,0 +1,170 @@
+"""Perfiles de almacenamiento: pragmas de SQLite y tamaño de los pools de conexión."""
+from __future__ import annotations
+
+from dataclasses import dataclass, field
+from typing import Any, Dict, Tuple
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from sqlalchemy.engine.url import make_url
+from sqlalchemy.pool import AsyncAdaptedQueuePool
+
+
+@dataclass(frozen=True)
+class StorageProfile:
+    """Configuración de conexión aplicada a los motores de base de datos.
+
+    Attributes:
+        name (str): Nombre con el que se selecciona el perfil.
+        pragmas (Tuple[Tuple[str, str], ...]): Pragmas de SQLite a ejecutar en
+            cada conexión nueva, en orden.
+        pool_size (int): Conexiones persistentes del motor de escritura.
+        max_overflow (int): Conexiones adicionales temporales del motor de escritura.
+        read_pool_size (int): Conexiones persistentes del motor de solo lectura.
+        pool_timeout (float): Segundos de espera por una conexión libre.
+    """
+
+    name: str
+    pragmas: Tuple[Tuple[str, str], ...] = field(default_factory=tuple)
+    pool_size: int = 5
+    max_overflow: int = 10
+    read_pool_size: int = 5
+    pool_timeout: float = 30.0
+
+
+STORAGE_PROFILES: Dict[str, StorageProfile] = {
+    profile.name: profile
+    for profile in (
+        # Comportamiento de SQLite sin ajustes: diario de reversión y pool por defecto.
+        StorageProfile(name="default"),
+        # WAL permite lecturas concurrentes con un escritor; NORMAL solo arriesga
+        # la última transacción ante un corte de energía.
+        StorageProfile(
+            name="balanced",
+            pragmas=(
+                ("journal_mode", "WAL"),
+                ("synchronous", "NORMAL"),
+                ("busy_timeout", "5000"),
+                ("cache_size", "-16000"),
+                ("mmap_size", str(64 * 1024 * 1024)),
+                ("temp_store", "MEMORY"),
+            ),
+            pool_size=5,
+            max_overflow=10,
+            read_pool_size=10,
+        ),
+        StorageProfile(
+            name="throughput",
+            pragmas=(
+                ("journal_mode", "WAL"),
+                ("synchronous", "NORMAL"),
+                ("busy_timeout", "10000"),
+                ("cache_size", "-65536"),
+                ("mmap_size", str(256 * 1024 * 1024)),
+                ("temp_store", "MEMORY"),
+                ("wal_autocheckpoint", "4000"),
+            ),
+            pool_size=10,
+            max_overflow=20,
+            read_pool_size=20,
+        ),
+        StorageProfile(
+            name="durable",
+            pragmas=(
+                ("journal_mode", "WAL"),
+                ("synchronous", "FULL"),
+                ("busy_timeout", "10000"),
+                ("cache_size", "-8000"),
+            ),
+            pool_size=5,
+            max_overflow=5,
+            read_pool_size=5,
+        ),
+    )
+}
+
+
+def get_storage_profile(name: str) -> StorageProfile:
+    """Obtiene un perfil de almacenamiento por nombre.
+
+    Args:
+        name (str): Nombre del perfil (``default``, ``balanced``, ``throughput`` o ``durable``).
+
+    Returns:
+        StorageProfile: Perfil solicitado.
+
+    Raises:
+        ValueError: Si el perfil no existe.
+    """
+    try:
+        return STORAGE_PROFILES[name.strip().lower()]
+    except KeyError:
+        raise ValueError(f"Perfil de almacenamiento desconocido: {name}. Use uno de {', '.join(STORAGE_PROFILES)}") from None
+
+
+def is_sqlite(url: str) -> bool:
+    """Indica si la URL apunta a SQLite."""
+    return make_url(url).get_backend_name() == "sqlite"
+
+
+def is_memory_sqlite(url: str) -> bool:
+    """Indica si la URL apunta a una base SQLite en memoria, no compartible entre motores."""
+    parsed = make_url(url)
+    return parsed.get_backend_name() == "sqlite" and parsed.database in (None, "", ":memory:")
+
+
+def engine_options(url: str, profile: StorageProfile, read_only: bool = False) -> Dict[str, Any]:
+    """Construye los argumentos de ``create_engine`` para una URL y un perfil.
+
+    Las bases SQLite en memoria conservan el pool de un solo hilo de SQLAlchemy,
+    que no admite dimensionamiento. ``aiosqlite`` usa ``NullPool`` por defecto
+    (un hilo y una conexión nuevos por sesión), por lo que se le asigna un pool
+    con cola para reutilizar conexiones ya configuradas.
+
+    Args:
+        url (str): URL de conexión.
+        profile (StorageProfile): Perfil de almacenamiento.
+        read_only (bool): Si el motor atiende solo lecturas.
+
+    Returns:
+        Dict[str, Any]: Argumentos con nombre para ``create_engine``.
+    """
+    options: Dict[str, Any] = {}
+    if is_sqlite(url) and not url.startswith("sqlite+aiosqlite"):
+        options["connect_args"] = {"check_same_thread": False}
+    if not is_memory_sqlite(url):
+        if url.startswith("sqlite+aiosqlite"):
+            options["poolclass"] = AsyncAdaptedQueuePool
+        options["pool_size"] = profile.read_pool_size if read_only else profile.pool_size
+        options["max_overflow"] = 0 if read_only else profile.max_overflow
+        options["pool_timeout"] = profile.pool_timeout
+    return options
+
+
+def apply_storage_profile(engine: Engine, profile: StorageProfile, read_only: bool = False) -> None:
+    """Registra la ejecución de los pragmas del perfil en cada conexión nueva.
+
+    En motores de solo lectura se agrega ``query_only`` para que SQLite rechace
+    cualquier escritura. No tiene efecto sobre motores que no son SQLite.
+
+    Args:
+        engine (Engine): Motor síncrono (o ``AsyncEngine.sync_engine``).
+        profile (StorageProfile): Perfil de almacenamiento.
+        read_only (bool): Si el motor atiende solo lecturas.
+    """
+    if engine.dialect.name != "sqlite":
+        return
+    pragmas = list(profile.pragmas)
+    if read_only:
+        pragmas.append(("query_only", "ON"))
+    if not pragmas:
+        return
+
+    @event.listens_for(engine, "connect")
+    def _set_pragmas(dbapi_connection: Any, connection_record: Any) -> None:
+        cursor = dbapi_connection.cursor()
+        try:
+            for name, value in pragmas:
+                cursor.execute(f"PRAGMA {name}={value}")
+        finally:
+            cursor.close()
@@ -0,0 +1,363 @@
+"""Control de admisión de llamadas al proveedor de IA con límite adaptativo (AIMD)."""
+from __future__ import annotations
+
+import asyncio
+import math
+import time
+from collections import deque
+from contextlib import asynccontextmanager, contextmanager
+from dataclasses import dataclass
+from typing import Any, AsyncIterator, Callable, Deque, Iterator, List, Optional
+
+from src.application.chat_service import AIServiceProtocol
+from src.domain.entities import ChatContext, ChatMessage, Product
+from src.domain.exceptions import ProviderOverloadedError
+
+from ..observability.metrics import MetricsRegistry
+
+
+@dataclass(frozen=True)
+class AdmissionSettings:
+    """Parámetros del limitador de concurrencia.
+
+    Attributes:
+        initial_limit (int): Llamadas simultáneas admitidas al iniciar.
+        min_limit (int): Piso del límite adaptativo.
+        max_limit (int): Techo del límite adaptativo.
+        queue_size (int): Llamadas que pueden esperar un turno; el resto se rechaza.
+        queue_timeout (float): Segundos máximos de espera en la cola.
+        latency_target (float): Latencia por encima de la cual se reduce el límite.
+        backoff (float): Factor multiplicativo aplicado al reducir el límite.
+    """
+
+    initial_limit: int = 8
+    min_limit: int = 1
+    max_limit: int = 64
+    queue_size: int = 32
+    queue_timeout: float = 5.0
+    latency_target: float = 5.0
+    backoff: float = 0.7
+
+    def __post_init__(self) -> None:
+        """Valida la coherencia de los parámetros.
+
+        Raises:
+            ValueError: Si algún parámetro está fuera de rango.
+        """
+        if not 1 <= self.min_limit <= self.initial_limit <= self.max_limit:
+            raise ValueError("Se requiere 1 <= min_limit <= initial_limit <= max_limit")
+        if self.queue_size < 0 or self.queue_timeout < 0 or self.latency_target <= 0:
+            raise ValueError("La cola, su plazo y la latencia objetivo no pueden ser negativos")
+        if not 0 < self.backoff < 1:
+            raise ValueError("El factor de reducción debe estar entre 0 y 1")
+
+
+@dataclass(frozen=True)
+class AdmissionStats:
+    """Estado instantáneo del limitador.
+
+    Attributes:
+        limit (float): Límite de concurrencia vigente.
+        in_flight (int): Llamadas en curso.
+        queued (int): Llamadas esperando turno.
+        rejected (int): Llamadas rechazadas desde el inicio.
+    """
+
+    limit: float
+    in_flight: int
+    queued: int
+    rejected: int
+
+
+class AdmissionMetrics:
+    """Publica el estado de los limitadores en el registro de métricas, por proveedor."""
+
+    def __init__(self, registry: MetricsRegistry) -> None:
+        """Registra las series del control de admisión.
+
+        Args:
+            registry (MetricsRegistry): Registro expuesto en ``/metrics``.
+        """
+        self.limit = registry.gauge("llm_admission_limit", "Límite de concurrencia vigente del proveedor de IA.", ("provider",))
+        self.in_flight = registry.gauge("llm_admission_in_flight", "Llamadas en curso admitidas por el limitador.", ("provider",))
+        self.queued = registry.gauge("llm_admission_queued", "Llamadas esperando turno en el limitador.", ("provider",))
+        self.rejected = registry.counter("llm_admission_rejected_total", "Llamadas rechazadas por saturación.", ("provider",))
+
+    def publish(self, provider: str, stats: AdmissionStats) -> None:
+        """Actualiza los indicadores con el estado instantáneo del limitador.
+
+        Args:
+            provider (str): Proveedor al que pertenece el limitador.
+            stats (AdmissionStats): Estado a publicar.
+        """
+        self.limit.set(stats.limit, provider=provider)
+        self.in_flight.set(stats.in_flight, provider=provider)
+        self.queued.set(stats.queued, provider=provider)
+
+
+class AdmissionSlot:
+    """Turno ocupado cuya latencia descuenta el tiempo ajeno al proveedor.
+
+    En los flujos, el tiempo que el cliente tarda en pedir cada fragmento se
+    marca con ``paused`` y no cuenta como latencia del proveedor.
+    """
+
+    def __init__(self, clock: Callable[[], float]) -> None:
+        """Inicia el turno sin tiempo descontado.
+
+        Args:
+            clock (Callable[[], float]): Reloj del limitador.
+        """
+        self._clock = clock
+        self.paused_seconds = 0.0
+
+    @contextmanager
+    def paused(self) -> Iterator[None]:
+        """Descuenta la duración del bloque de la latencia del turno."""
+        started = self._clock()
+        try:
+            yield
+        finally:
+            self.paused_seconds += self._clock() - started
+
+
+class AdaptiveConcurrencyLimiter:
+    """Limita las llamadas simultáneas y ajusta el límite según la latencia observada.
+
+    Sigue el esquema AIMD de TCP:
+    - Cada llamada exitosa y rápida mientras el límite está saturado lo eleva en ``1 / límite``.
+    - Una llamada lenta o fallida lo reduce por ``backoff``.
+    - Se reduce a lo sumo una vez por ventana: solo cuentan las llamadas iniciadas tras la última reducción.
+
+    Las llamadas sin turno esperan en una cola acotada con plazo. Si la cola
+    está llena o vence el plazo, se rechazan de inmediato con
+    ``ProviderOverloadedError`` en lugar de acumular latencia.
+    """
+
+    def __init__(
+        self,
+        settings: AdmissionSettings,
+        clock: Callable[[], float] = time.monotonic,
+        metrics: Optional[AdmissionMetrics] = None,
+        provider: str = "default",
+    ) -> None:
+        """Inicializa el limitador.
+
+        Args:
+            settings (AdmissionSettings): Parámetros de concurrencia y cola.
+            clock (Callable[[], float]): Reloj monótono en segundos.
+            metrics (Optional[AdmissionMetrics]): Series donde publicar el estado.
+            provider (str): Proveedor con el que se etiquetan las series.
+        """
+        self._settings = settings
+        self._clock = clock
+        self._metrics = metrics
+        self._provider = provider
+        self._limit = float(settings.initial_limit)
+        self._in_flight = 0
+        self._waiters: Deque[asyncio.Future] = deque()
+        self._last_decrease = float("-inf")
+        self._latency = settings.latency_target / 2
+        self._rejected = 0
+        self._publish()
+
+    def stats(self) -> AdmissionStats:
+        """AdmissionStats: Límite, llamadas en curso, en cola y rechazadas."""
+        return AdmissionStats(
+            limit=round(self._limit, 3),
+            in_flight=self._in_flight,
+            queued=len(self._waiters),
+            rejected=self._rejected,
+        )
+
+    def retry_after(self) -> float:
+        """Estima cuándo habrá turno libre según la latencia reciente y la cola.
+
+        Returns:
+            float: Segundos sugeridos para reintentar, al menos uno.
+        """
+        rounds = (len(self._waiters) + 1) / max(1, int(self._limit))
+        return float(max(1, math.ceil(self._latency * rounds)))
+
+    def _publish(self) -> None:
+        """Refleja el estado actual en las métricas, si las hay."""
+        if self._metrics is not None:
+            self._metrics.publish(self._provider, self.stats())
+
+    def _reject(self, queue_full: bool) -> ProviderOverloadedError:
+        """Construye el rechazo con el tiempo de reintento vigente."""
+        self._rejected += 1
+        if self._metrics is not None:
+            self._metrics.rejected.inc(provider=self._provider)
+        return ProviderOverloadedError(retry_after=self.retry_after(), queue_full=queue_full)
+
+    async def _acquire(self) -> None:
+        """Obtiene un turno o lo espera en la cola.
+
+        Raises:
+            ProviderOverloadedError: Si la cola está llena o vence el plazo de espera.
+        """
+        if self._in_flight < int(self._limit) and not self._waiters:
+            self._in_flight += 1
+            self._publish()
+            return
+        if len(self._waiters) >= self._settings.queue_size:
+            raise self._reject(queue_full=True)
+
+        waiter = asyncio.get_running_loop().create_future()
+        self._waiters.append(waiter)
+        self._publish()
+        granted = False
+        try:
+            await asyncio.wait_for(waiter, self._settings.queue_timeout)
+            granted = True
+        except asyncio.TimeoutError:
+            raise self._reject(queue_full=False) from None
+        finally:
+            if not granted and waiter in self._waiters:
+                self._waiters.remove(waiter)
+            elif not granted and waiter.done() and not waiter.cancelled():
+                # Turno concedido a una llamada cancelada mientras despertaba.
+                self._in_flight -= 1
+                self._wake()
+            self._publish()
+
+    def _release(self, started: float, succeeded: bool, paused: float = 0.0) -> None:
+        """Libera el turno y ajusta el límite con la latencia de la llamada.
+
+        Args:
+            started (float): Instante en que se concedió el turno.
+            succeeded (bool): Indica si la llamada terminó sin errores.
+            paused (float): Segundos del turno ajenos al proveedor.
+        """
+        now = self._clock()
+        latency = now - started - paused
+        saturated = bool(self._waiters) or self._in_flight >= int(self._limit)
+        self._in_flight -= 1
+        self._latency = 0.8 * self._latency + 0.2 * latency
+        settings = self._settings
+        if not succeeded or latency > settings.latency_target:
+            if started >= self._last_decrease:
+                self._limit = max(float(settings.min_limit), self._limit * settings.backoff)
+                self._last_decrease = now
+        elif saturated:
+            self._limit = min(float(settings.max_limit), self._limit + 1 / self._limit)
+        self._wake()
+
+    def _wake(self) -> None:
+        """Entrega los turnos libres a las llamadas en cola, en orden de llegada."""
+        while self._waiters and self._in_flight < int(self._limit):
+            waiter = self._waiters.popleft()
+            if waiter.done():
+                continue
+            self._in_flight += 1
+            waiter.set_result(None)
+        self._publish()
+
+    @asynccontextmanager
+    async def slot(self) -> AsyncIterator[AdmissionSlot]:
+        """Ocupa un turno durante el bloque.
+
+        Las excepciones del bloque reducen el límite; las cancelaciones no lo
+        afectan. El tiempo marcado con ``AdmissionSlot.paused`` no cuenta como
+        latencia.
+
+        Yields:
+            AdmissionSlot: Turno concedido.
+
+        Raises:
+            ProviderOverloadedError: Si no se obtiene turno.
+        """
+        await self._acquire()
+        started = self._clock()
+        slot = AdmissionSlot(self._clock)
+        succeeded = None
+        try:
+            yield slot
+            succeeded = True
+        except Exception:
+            succeeded = False
+            raise
+        finally:
+            if succeeded is None:
+                self._in_flight -= 1
+                self._wake()
+            else:
+                self._release(started, succeeded, slot.paused_seconds)
+
+
+class LimitedAIService:
+    """Decorador de ``AIServiceProtocol`` que admite llamadas según el limitador.
+
+    Los flujos conservan su turno mientras el flujo del proveedor sigue
+    abierto, pero su latencia solo cuenta la espera de cada fragmento: el
+    tiempo que el cliente tarda en consumirlos no reduce el límite. Los
+    resúmenes de conversación, si el proveedor los ofrece, compiten por los
+    mismos turnos.
+    """
+
+    def __init__(self, provider: AIServiceProtocol, limiter: AdaptiveConcurrencyLimiter) -> None:
+        """Inicializa el decorador.
+
+        Args:
+            provider (AIServiceProtocol): Proveedor a proteger.
+            limiter (AdaptiveConcurrencyLimiter): Limitador propio del proveedor.
+        """
+        self._provider = provider
+        self.limiter = limiter
+
+    async def generate_response(self, user_message: str, products: List[Product], context: ChatContext) -> str:
+        """Genera la respuesta dentro de un turno del limitador.
+
+        Args:
+            user_message (str): Mensaje ingresado por el usuario.
+            products (List[Product]): Catálogo disponible durante la conversación.
+            context (ChatContext): Historial de mensajes recientes.
+
+        Returns:
+            str: Respuesta del proveedor envuelto.
+
+        Raises:
+            ProviderOverloadedError: Si el proveedor está saturado.
+        """
+        async with self.limiter.slot():
+            return await self._provider.generate_response(user_message, products, context)
+
+    async def stream_response(self, user_message: str, products: List[Product], context: ChatContext) -> AsyncIterator[str]:
+        """Transmite la respuesta ocupando un turno mientras el proveedor genera.
+
+        Args:
+            user_message (str): Mensaje ingresado por el usuario.
+            products (List[Product]): Catálogo disponible durante la conversación.
+            context (ChatContext): Historial de mensajes recientes.
+
+        Yields:
+            str: Fragmentos del proveedor envuelto.
+
+        Raises:
+            ProviderOverloadedError: Si el proveedor está saturado.
+        """
+        async with self.limiter.slot() as slot:
+            async for chunk in self._provider.stream_response(user_message, products, context):
+                with slot.paused():
+                    yield chunk
+
+    async def _summarize_conversation(self, previous_summary: str, messages: List[ChatMessage]) -> str:
+        """Resume la conversación dentro de un turno del limitador."""
+        async with self.limiter.slot():
+            return await self._provider.summarize_conversation(previous_summary, messages)
+
+    def __getattr__(self, name: str) -> Any:
+        """Expone las capacidades opcionales del proveedor envuelto, como los resúmenes."""
+        if name.startswith("_"):
+            raise AttributeError(name)
+        attribute = getattr(self._provider, name)
+        if name == "summarize_conversation":
+            return self._summarize_conversation
+        return attribute
+
+    async def aclose(self) -> None:
+        """Libera los recursos del proveedor envuelto."""
+        close = getattr(self._provider, "aclose", None)
+        if close is not None:
+            await close()
@@ -0,0 +1,241 @@
+"""Proveedor de IA local y determinista para pruebas de carga y desarrollo sin red."""
+from __future__ import annotations
+
+import asyncio
+import hashlib
+import math
+import os
+import random
+from dataclasses import dataclass
+from typing import AsyncIterator, Awaitable, Callable, List, Optional
+
+from src.domain.entities import ChatContext, ChatMessage, Product
+
+from ..observability.server_timing import timed
+
+LATENCY_DISTRIBUTIONS = ("fixed", "normal", "long_tail")
+
+_OPENINGS = (
+    "Con gusto te ayudo.",
+    "Buena elección para empezar.",
+    "Revisé el catálogo por ti.",
+    "Tengo algunas opciones interesantes.",
+)
+_FILLER = (
+    "Todas", "las", "opciones", "tienen", "envío", "rápido", "y", "cambio", "de", "talla",
+    "sin", "costo", "dentro", "de", "los", "primeros", "treinta", "días", "según", "disponibilidad",
+)
+
+
+class FakeProviderError(RuntimeError):
+    """Falla simulada por el proveedor falso según su tasa de errores."""
+
+
+@dataclass(frozen=True)
+class LatencyProfile:
+    """Distribución del tiempo hasta el primer token del proveedor falso.
+
+    Attributes:
+        distribution (str): ``fixed``, ``normal`` o ``long_tail``.
+        mean_ms (float): Latencia fija, media de la normal o mediana de la cola larga.
+        stddev_ms (float): Desviación estándar de la distribución normal.
+        tail_sigma (float): Dispersión de la log-normal usada para la cola larga.
+    """
+
+    distribution: str = "fixed"
+    mean_ms: float = 0.0
+    stddev_ms: float = 0.0
+    tail_sigma: float = 1.0
+
+    def __post_init__(self) -> None:
+        """Valida los parámetros de la distribución.
+
+        Raises:
+            ValueError: Si la distribución no existe o algún parámetro es negativo.
+        """
+        if self.distribution not in LATENCY_DISTRIBUTIONS:
+            raise ValueError(
+                f"Distribución de latencia desconocida: {self.distribution!r}; opciones: {', '.join(LATENCY_DISTRIBUTIONS)}"
+            )
+        if min(self.mean_ms, self.stddev_ms, self.tail_sigma) < 0:
+            raise ValueError("Los parámetros de latencia no pueden ser negativos")
+
+    def sample(self, rng: random.Random) -> float:
+        """Obtiene una latencia en segundos.
+
+        Args:
+            rng (random.Random): Generador del que se extrae la muestra.
+
+        Returns:
+            float: Latencia no negativa en segundos.
+        """
+        if self.distribution == "normal":
+            millis = rng.gauss(self.mean_ms, self.stddev_ms)
+        elif self.distribution == "long_tail":
+            millis = self.mean_ms * math.exp(rng.gauss(0.0, self.tail_sigma))
+        else:
+            millis = self.mean_ms
+        return max(0.0, millis) / 1000
+
+
+class FakeAIService:
+    """Proveedor que imita a un modelo remoto sin salir del proceso.
+
+    El texto de cada respuesta se deriva de un hash del mensaje, los productos
+    y el contexto, de modo que el mismo prompt produce siempre la misma
+    respuesta. La latencia hasta el primer token, la velocidad de generación
+    y las fallas se extraen de un generador con semilla fija, por lo que una
+    misma secuencia de llamadas se comporta igual en cada corrida.
+    """
+
+    def __init__(
+        self,
+        latency: Optional[LatencyProfile] = None,
+        tokens_per_second: float = 0.0,
+        failure_rate: float = 0.0,
+        response_tokens: int = 40,
+        seed: int = 0,
+        sleep: Callable[[float], Awaitable[None]] = asyncio.sleep,
+    ) -> None:
+        """Configura el comportamiento simulado.
+
+        Args:
+            latency (Optional[LatencyProfile]): Latencia hasta el primer token;
+                por omisión ninguna.
+            tokens_per_second (float): Velocidad de generación; ``0`` entrega
+                todo el texto de inmediato.
+            failure_rate (float): Probabilidad entre 0 y 1 de que una llamada falle.
+            response_tokens (int): Palabras aproximadas de cada respuesta.
+            seed (int): Semilla del generador de latencias y fallas.
+            sleep (Callable[[float], Awaitable[None]]): Espera asíncrona; se
+                reemplaza en las pruebas para no dormir de verdad.
+
+        Raises:
+            ValueError: Si algún parámetro está fuera de rango.
+        """
+        if not 0.0 <= failure_rate <= 1.0:
+            raise ValueError("FAKE_LLM_FAILURE_RATE debe estar entre 0 y 1")
+        if tokens_per_second < 0 or response_tokens < 1:
+            raise ValueError("La velocidad y el largo de las respuestas deben ser positivos")
+        self._latency = latency or LatencyProfile()
+        self._tokens_per_second = tokens_per_second
+        self._failure_rate = failure_rate
+        self._response_tokens = response_tokens
+        self._rng = random.Random(seed)
+        self._sleep = sleep
+
+    @classmethod
+    def from_env(cls) -> "FakeAIService":
+        """Construye el proveedor a partir de las variables ``FAKE_LLM_*``.
+
+        Returns:
+            FakeAIService: Proveedor configurado según el entorno.
+
+        Raises:
+            ValueError: Si alguna variable tiene un valor inválido.
+        """
+        latency = LatencyProfile(
+            distribution=os.getenv("FAKE_LLM_LATENCY", "fixed").lower(),
+            mean_ms=float(os.getenv("FAKE_LLM_LATENCY_MS", "0")),
+            stddev_ms=float(os.getenv("FAKE_LLM_LATENCY_STDDEV_MS", "0")),
+            tail_sigma=float(os.getenv("FAKE_LLM_TAIL_SIGMA", "1.0")),
+        )
+        return cls(
+            latency=latency,
+            tokens_per_second=float(os.getenv("FAKE_LLM_TOKENS_PER_SECOND", "0")),
+            failure_rate=float(os.getenv("FAKE_LLM_FAILURE_RATE", "0")),
+            response_tokens=int(os.getenv("FAKE_LLM_RESPONSE_TOKENS", "40")),
+            seed=int(os.getenv("FAKE_LLM_SEED", "0")),
+        )
+
+    async def generate_response(self, user_message: str, products: List[Product], context: ChatContext) -> str:
+        """Simula una generación completa.
+
+        Args:
+            user_message (str): Mensaje ingresado por el usuario.
+            products (List[Product]): Catálogo disponible durante la conversación.
+            context (ChatContext): Historial de mensajes recientes.
+
+        Returns:
+            str: Respuesta determinista para el prompt recibido.
+
+        Raises:
+            FakeProviderError: Si la llamada cae dentro de la tasa de fallas.
+        """
+        with timed("prompt"):
+            tokens = self._compose(user_message, products, context)
+        await self._wait_first_token()
+        await self._sleep_tokens(len(tokens))
+        return " ".join(tokens)
+
+    async def stream_response(self, user_message: str, products: List[Product], context: ChatContext) -> AsyncIterator[str]:
+        """Simula una generación transmitida palabra por palabra.
+
+        Args:
+            user_message (str): Mensaje ingresado por el usuario.
+            products (List[Product]): Catálogo disponible durante la conversación.
+            context (ChatContext): Historial de mensajes recientes.
+
+        Yields:
+            str: Fragmentos cuya concatenación coincide con ``generate_response``.
+
+        Raises:
+            FakeProviderError: Si la llamada cae dentro de la tasa de fallas.
+        """
+        with timed("prompt"):
+            tokens = self._compose(user_message, products, context)
+        await self._wait_first_token()
+        for index, token in enumerate(tokens):
+            await self._sleep_tokens(1)
+            yield token if index == 0 else f" {token}"
+
+    async def summarize_conversation(self, previous_summary: str, messages: List[ChatMessage]) -> str:
+        """Simula el resumen incremental de una conversación.
+
+        Args:
+            previous_summary (str): Resumen acumulado hasta ahora.
+            messages (List[ChatMessage]): Mensajes a incorporar en orden cronológico.
+
+        Returns:
+            str: Resumen que conserva el anterior y agrega los mensajes del usuario.
+        """
+        await self._wait_first_token()
+        requests = "; ".join(message.message for message in messages if message.is_from_user())
+        summary = f"{previous_summary} El cliente pidió: {requests}." if previous_summary else f"El cliente pidió: {requests}."
+        words = summary.split()[-120:]
+        await self._sleep_tokens(len(words))
+        return " ".join(words)
+
+    def _compose(self, user_message: str, products: List[Product], context: ChatContext) -> List[str]:
+        """Construye las palabras de la respuesta a partir de un hash del prompt."""
+        material = "\x1f".join(
+            [user_message, context.summary]
+            + [f"{product.id}:{product.name}" for product in products]
+            + [f"{message.role}:{message.message}" for message in context.get_recent_messages()]
+        )
+        digest = hashlib.sha256(material.encode("utf-8")).digest()
+        rng = random.Random(int.from_bytes(digest[:8], "big"))
+        words = rng.choice(_OPENINGS).split()
+        if products:
+            picks = rng.sample(products, min(3, len(products)))
+            words += ["Te", "recomiendo"] + ", ".join(f"{product.name} (${product.price:.2f})" for product in picks).split()
+            words[-1] += "."
+        else:
+            words += ["Por", "ahora", "no", "encontré", "productos", "para", "tu", "búsqueda."]
+        while len(words) < self._response_tokens:
+            words.append(rng.choice(_FILLER))
+        return words
+
+    async def _wait_first_token(self) -> None:
+        """Espera la latencia inicial y aplica la tasa de fallas."""
+        delay = self._latency.sample(self._rng)
+        failed = self._rng.random() < self._failure_rate
+        if delay:
+            await self._sleep(delay)
+        if failed:
+            raise FakeProviderError("Falla simulada del proveedor de IA")
+
+    async def _sleep_tokens(self, count: int) -> None:
+        """Espera el tiempo de generación de ``count`` palabras."""
+        if self._tokens_per_second and count:
+            await self._sleep(count / self._tokens_per_second)
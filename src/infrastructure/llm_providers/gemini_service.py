@@ -2,21 +2,26 @@
 from __future__ import annotations
 
 import os
-from typing import Iterable, List
+from typing import AsyncIterator, Iterable, List, Optional
 
 import google.generativeai as genai
 
-from src.domain.entities import ChatContext, Product
+from src.domain.entities import ChatContext, ChatMessage, Product
+
+from ..cache.prompt_fragments import CatalogPromptCache, format_product_line
+from ..observability.server_timing import timed
 
 
 class GeminiService:
     """Fachada sobre Google Gemini para generar respuestas contextuales."""
 
-    def __init__(self, model_name: str = "gemini-2.0-flash") -> None:
+    def __init__(self, model_name: str = "gemini-2.0-flash", prompt_cache: Optional[CatalogPromptCache] = None) -> None:
         """Configura el modelo de Gemini a utilizar.
 
         Args:
             model_name (str): Nombre del modelo generativo a invocar.
+            prompt_cache (Optional[CatalogPromptCache]): Líneas del catálogo
+                precompiladas; sin ella cada producto se formatea en cada turno.
 
         Raises:
             ValueError: Si la variable de entorno ``GEMINI_API_KEY`` no está definida.
@@ -27,6 +32,7 @@ class GeminiService:
 
         genai.configure(api_key=api_key)
         self._model = genai.GenerativeModel(model_name)
+        self._prompt_cache = prompt_cache
 
     async def generate_response(self, user_message: str, products: List[Product], context: ChatContext) -> str:
         """Genera una respuesta contextual usando Gemini.
@@ -39,12 +45,63 @@ class GeminiService:
         Returns:
             str: Respuesta generada por el modelo de IA.
         """
-        prompt = self._build_prompt(user_message, products, context)
+        with timed("prompt"):
+            prompt = self._build_prompt(user_message, products, context)
         response = await self._model.generate_content_async(prompt)
         if not response.candidates:
             return "Lo siento, no tengo información suficiente en este momento."
         return response.text
 
+    async def stream_response(self, user_message: str, products: List[Product], context: ChatContext) -> AsyncIterator[str]:
+        """Genera la respuesta de Gemini en fragmentos a medida que llegan.
+
+        Args:
+            user_message (str): Mensaje ingresado por el usuario.
+            products (List[Product]): Catálogo disponible durante la conversación.
+            context (ChatContext): Historial de mensajes recientes.
+
+        Yields:
+            str: Fragmentos de texto generados por el modelo.
+        """
+        with timed("prompt"):
+            prompt = self._build_prompt(user_message, products, context)
+        response = await self._model.generate_content_async(prompt, stream=True)
+        async for chunk in response:
+            if chunk.candidates and chunk.candidates[0].content.parts:
+                yield chunk.text
+
+    async def summarize_conversation(self, previous_summary: str, messages: List[ChatMessage]) -> str:
+        """Integra mensajes antiguos de la conversación en un resumen breve.
+
+        Args:
+            previous_summary (str): Resumen acumulado hasta ahora.
+            messages (List[ChatMessage]): Mensajes a incorporar en orden cronológico.
+
+        Returns:
+            str: Resumen actualizado; se conserva el anterior si no hay respuesta.
+        """
+        transcript = "\n".join(
+            f"{'Usuario' if message.is_from_user() else 'Asistente'}: {message.message}" for message in messages
+        )
+        prompt = (
+            "Resume la conversación entre un cliente y el asistente de una tienda de zapatos.\n"
+            "Conserva preferencias del cliente (marca, talla, color, presupuesto), productos "
+            "mencionados y decisiones tomadas. Responde con un párrafo de máximo 120 palabras.\n\n"
+            f"Resumen previo:\n{previous_summary or '(sin resumen)'}\n\n"
+            f"Mensajes nuevos:\n{transcript}\n\n"
+            "Resumen actualizado:"
+        )
+        response = await self._model.generate_content_async(prompt)
+        if not response.candidates:
+            return previous_summary
+        return response.text
+
+    async def aclose(self) -> None:
+        """Cierra el canal del cliente asíncrono de Gemini si fue abierto."""
+        client = getattr(self._model, "_async_client", None)
+        if client is not None:
+            await client.transport.close()
+
     def _build_prompt(self, user_message: str, products: Iterable[Product], context: ChatContext) -> str:
         """Construye el prompt completo que se enviará al modelo de IA.
 
@@ -84,12 +141,9 @@ class GeminiService:
         Returns:
             str: Texto con cada producto en una línea.
         """
-        lines = []
-        for product in products:
-            availability = "Disponible" if product.is_available() else "Agotado"
-            lines.append(
-                f"- {product.name} | Marca: {product.brand} | Categoría: {product.category} | "
-                f"Talla: {product.size} | Color: {product.color} | Precio: ${product.price:.2f} | "
-                f"Stock: {product.stock} ({availability})"
-            )
-        return "\n".join(lines) if lines else "No hay productos disponibles actualmente."
+        items = list(products)
+        if not items:
+            return "No hay productos disponibles actualmente."
+        if self._prompt_cache is not None:
+            return self._prompt_cache.render(items)
+        return "\n".join(format_product_line(product) for product in items)
@@ -0,0 +1,179 @@
+"""Registro de proveedores de IA con ciclo de vida ligado a la aplicación."""
+from __future__ import annotations
+
+import inspect
+import os
+import threading
+from typing import Callable, Dict, List, Optional
+
+from src.application.chat_service import AIServiceProtocol
+
+from ..cache.catalog_cache import catalog_cache
+from ..cache.prompt_fragments import CatalogPromptCache
+from ..cache.response_cache import CachingAIService, LLMResponseCache
+from ..observability.metrics import MetricsRegistry
+from ..observability.server_timing import ServerTimingAIService
+from .admission import AdaptiveConcurrencyLimiter, AdmissionMetrics, AdmissionSettings, LimitedAIService
+from .single_flight import CoalescingAIService
+
+ProviderFactory = Callable[[], AIServiceProtocol]
+ProviderDecorator = Callable[[AIServiceProtocol], AIServiceProtocol]
+
+
+class AIProviderRegistry:
+    """Crea perezosamente y reutiliza las instancias de proveedores de IA.
+
+    Cada proveedor se construye la primera vez que se solicita y se comparte
+    entre peticiones, de modo que la configuración del cliente y sus
+    conexiones se reutilizan durante toda la vida del proceso. Los decoradores
+    registrados (caché, límites, métricas) envuelven cada instancia en el
+    orden en que se agregaron.
+    """
+
+    def __init__(self, default: str) -> None:
+        """Inicializa el registro vacío.
+
+        Args:
+            default (str): Nombre del proveedor entregado por omisión.
+        """
+        self._default = default
+        self._factories: Dict[str, ProviderFactory] = {}
+        self._instances: Dict[str, AIServiceProtocol] = {}
+        self._decorators: List[ProviderDecorator] = []
+        self._lock = threading.Lock()
+
+    @property
+    def default(self) -> str:
+        """str: Nombre del proveedor por omisión."""
+        return self._default
+
+    @property
+    def names(self) -> List[str]:
+        """List[str]: Nombres de los proveedores registrados."""
+        return list(self._factories)
+
+    def register(self, name: str, factory: ProviderFactory) -> None:
+        """Registra la fábrica de un proveedor.
+
+        Args:
+            name (str): Nombre con el que se solicitará el proveedor.
+            factory (ProviderFactory): Función que construye la instancia.
+        """
+        self._factories[name] = factory
+
+    def add_decorator(self, decorator: ProviderDecorator) -> None:
+        """Agrega un envoltorio que se aplicará a los proveedores construidos.
+
+        Args:
+            decorator (ProviderDecorator): Función que recibe y retorna un proveedor.
+        """
+        self._decorators.append(decorator)
+
+    def is_initialized(self, name: Optional[str] = None) -> bool:
+        """Indica si el proveedor ya fue construido.
+
+        Args:
+            name (Optional[str]): Proveedor a consultar; por omisión el predeterminado.
+
+        Returns:
+            bool: ``True`` si existe una instancia activa.
+        """
+        return (name or self._default) in self._instances
+
+    def get(self, name: Optional[str] = None) -> AIServiceProtocol:
+        """Obtiene el proveedor solicitado construyéndolo si es necesario.
+
+        Args:
+            name (Optional[str]): Proveedor a obtener; por omisión el predeterminado.
+
+        Returns:
+            AIServiceProtocol: Instancia compartida del proveedor.
+
+        Raises:
+            KeyError: Si el proveedor no está registrado.
+            ValueError: Si el proveedor no puede configurarse (por ejemplo, sin API key).
+        """
+        key = name or self._default
+        instance = self._instances.get(key)
+        if instance is not None:
+            return instance
+        with self._lock:
+            instance = self._instances.get(key)
+            if instance is None:
+                instance = self._factories[key]()
+                for decorator in self._decorators:
+                    instance = decorator(instance)
+                self._instances[key] = instance
+        return instance
+
+    async def aclose(self) -> None:
+        """Libera los recursos de todos los proveedores construidos."""
+        instances, self._instances = self._instances, {}
+        for instance in instances.values():
+            close = getattr(instance, "aclose", None)
+            if close is None:
+                continue
+            result = close()
+            if inspect.isawaitable(result):
+                await result
+
+
+def build_provider_registry(
+    response_cache: Optional[LLMResponseCache] = None,
+    coalesce: bool = True,
+    prompt_cache: Optional[CatalogPromptCache] = None,
+    default: Optional[str] = None,
+    admission: Optional[AdmissionSettings] = None,
+    metrics: Optional[MetricsRegistry] = None,
+) -> AIProviderRegistry:
+    """Construye el registro con los proveedores disponibles en la aplicación.
+
+    Los proveedores quedan envueltos, de afuera hacia adentro, por la medición
+    de ``Server-Timing``, la caché de respuestas, la coalescencia de
+    generaciones concurrentes y el control de admisión, de modo que solo las
+    llamadas que llegan al modelo ocupan turnos del limitador. El control de
+    admisión se aplica en la fábrica de cada proveedor para etiquetar sus
+    métricas con el nombre del proveedor.
+
+    Args:
+        response_cache (Optional[LLMResponseCache]): Caché de respuestas a
+            anteponer a los proveedores; ``None`` la deshabilita.
+        coalesce (bool): Agrupa generaciones idénticas concurrentes.
+        prompt_cache (Optional[CatalogPromptCache]): Fragmentos precompilados del
+            catálogo que reutilizan los proveedores al construir el prompt.
+        default (Optional[str]): Proveedor predeterminado; por omisión el de la
+            variable ``AI_PROVIDER`` o ``gemini``.
+        admission (Optional[AdmissionSettings]): Límite de concurrencia y cola de
+            cada proveedor; ``None`` lo deshabilita.
+        metrics (Optional[MetricsRegistry]): Registro donde se publica el estado
+            de los limitadores.
+
+    Returns:
+        AIProviderRegistry: Registro con ``gemini`` y ``fake`` disponibles.
+
+    Raises:
+        ValueError: Si el proveedor predeterminado no está registrado.
+    """
+    from .fake_service import FakeAIService
+    from .gemini_service import GeminiService
+
+    admission_metrics = AdmissionMetrics(metrics) if metrics is not None and admission is not None else None
+
+    def admitted(name: str, factory: ProviderFactory) -> ProviderFactory:
+        if admission is None:
+            return factory
+        return lambda: LimitedAIService(
+            factory(), AdaptiveConcurrencyLimiter(admission, metrics=admission_metrics, provider=name)
+        )
+
+    registry = AIProviderRegistry(default=(default or os.getenv("AI_PROVIDER", "gemini")).lower())
+    registry.register("gemini", admitted("gemini", lambda: GeminiService(prompt_cache=prompt_cache)))
+    registry.register("fake", admitted("fake", FakeAIService.from_env))
+    if registry.default not in registry.names:
+        raise ValueError(f"Proveedor de IA desconocido: {registry.default!r}")
+    if coalesce:
+        registry.add_decorator(lambda provider: CoalescingAIService(provider, catalog_cache))
+    if response_cache is not None:
+        registry.add_decorator(lambda provider: CachingAIService(provider, response_cache, catalog_cache))
+    registry.add_decorator(ServerTimingAIService)
+    return registry
@@ -0,0 +1,156 @@
+"""Coalescencia de generaciones idénticas concurrentes (*single-flight*)."""
+from __future__ import annotations
+
+import asyncio
+from typing import Any, AsyncIterator, Awaitable, Callable, Dict, List, Optional, TypeVar
+
+from src.application.chat_service import AIServiceProtocol
+from src.domain.entities import ChatContext, Product
+
+from ..cache.catalog_cache import CatalogCache
+from ..cache.response_cache import generation_key, turn_catalog_version
+
+T = TypeVar("T")
+
+
+class SingleFlight:
+    """Comparte una única ejecución en curso entre llamadas con la misma clave.
+
+    La ejecución corre en su propia tarea, de modo que la cancelación de la
+    petición que la inició no afecta a las demás que esperan su resultado.
+    """
+
+    def __init__(self) -> None:
+        """Inicializa el registro de ejecuciones en curso."""
+        self._inflight: Dict[str, asyncio.Task] = {}
+
+    @property
+    def inflight(self) -> int:
+        """int: Cantidad de claves con una ejecución en curso."""
+        return len(self._inflight)
+
+    async def do(self, key: str, func: Callable[[], Awaitable[T]]) -> T:
+        """Ejecuta ``func`` o se une a la ejecución en curso de la misma clave.
+
+        Args:
+            key (str): Clave que identifica ejecuciones equivalentes.
+            func (Callable[[], Awaitable[T]]): Operación a ejecutar.
+
+        Returns:
+            T: Resultado compartido por todas las llamadas coalescidas.
+        """
+        task = self._inflight.get(key)
+        if task is None:
+            task = asyncio.ensure_future(func())
+            self._inflight[key] = task
+            task.add_done_callback(lambda _: self._inflight.pop(key, None))
+        return await asyncio.shield(task)
+
+
+class _SharedStream:
+    """Difunde los fragmentos de un flujo a varios consumidores."""
+
+    def __init__(self) -> None:
+        self.chunks: List[str] = []
+        self.done = False
+        self.error: Optional[BaseException] = None
+        self._changed = asyncio.Condition()
+
+    async def pump(self, source: AsyncIterator[str]) -> None:
+        """Consume el flujo original publicando cada fragmento."""
+        try:
+            async for chunk in source:
+                async with self._changed:
+                    self.chunks.append(chunk)
+                    self._changed.notify_all()
+        except BaseException as exc:  # noqa: BLE001 - se propaga a los consumidores
+            self.error = exc
+        finally:
+            async with self._changed:
+                self.done = True
+                self._changed.notify_all()
+
+    async def subscribe(self) -> AsyncIterator[str]:
+        """Entrega todos los fragmentos, incluidos los ya publicados."""
+        position = 0
+        while True:
+            async with self._changed:
+                await self._changed.wait_for(lambda: position < len(self.chunks) or self.done)
+                pending = self.chunks[position:]
+                finished = self.done
+            for chunk in pending:
+                yield chunk
+            position += len(pending)
+            if finished and position >= len(self.chunks):
+                if self.error is not None:
+                    raise self.error
+                return
+
+
+class CoalescingAIService:
+    """Decorador de ``AIServiceProtocol`` que agrupa generaciones idénticas.
+
+    Las peticiones concurrentes con la misma clave de generación (mensaje
+    normalizado, huella del contexto y versión del catálogo) comparten una
+    sola llamada al proveedor. Cada petición sigue persistiendo su propio
+    historial, ya que la agrupación ocurre por debajo de ``ChatService``.
+    """
+
+    def __init__(self, provider: AIServiceProtocol, catalog: CatalogCache) -> None:
+        """Inicializa el decorador.
+
+        Args:
+            provider (AIServiceProtocol): Proveedor real de IA.
+            catalog (CatalogCache): Versión del catálogo si el turno no trae la suya.
+        """
+        self._provider = provider
+        self._catalog = catalog
+        self._responses = SingleFlight()
+        self._streams: Dict[str, _SharedStream] = {}
+
+    async def generate_response(self, user_message: str, products: List[Product], context: ChatContext) -> str:
+        """Genera la respuesta compartiendo la llamada con peticiones idénticas.
+
+        Args:
+            user_message (str): Mensaje del usuario.
+            products (List[Product]): Productos relevantes del turno.
+            context (ChatContext): Historial reciente.
+
+        Returns:
+            str: Respuesta del asistente.
+        """
+        key = generation_key(user_message, context, turn_catalog_version(context, self._catalog))
+        return await self._responses.do(key, lambda: self._provider.generate_response(user_message, products, context))
+
+    async def stream_response(self, user_message: str, products: List[Product], context: ChatContext) -> AsyncIterator[str]:
+        """Transmite la respuesta uniéndose a un flujo idéntico en curso si existe.
+
+        Args:
+            user_message (str): Mensaje del usuario.
+            products (List[Product]): Productos relevantes del turno.
+            context (ChatContext): Historial reciente.
+
+        Yields:
+            str: Fragmentos de la respuesta.
+        """
+        key = generation_key(user_message, context, turn_catalog_version(context, self._catalog))
+        shared = self._streams.get(key)
+        if shared is None:
+            shared = _SharedStream()
+            self._streams[key] = shared
+            task = asyncio.ensure_future(shared.pump(self._provider.stream_response(user_message, products, context)))
+            task.add_done_callback(lambda _: self._streams.pop(key, None))
+        async for chunk in shared.subscribe():
+            yield chunk
+
+    def __getattr__(self, name: str) -> Any:
+        """Expone las capacidades opcionales del proveedor envuelto, como los resúmenes."""
+        if name.startswith("_"):
+            raise AttributeError(name)
+        return getattr(self._provider, name)
+
+    async def aclose(self) -> None:
+        """Libera los recursos del proveedor envuelto."""
+        close = getattr(self._provider, "aclose", None)
+        if close is not None:
+            await close()
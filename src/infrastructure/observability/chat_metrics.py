@@ -0,0 +1,91 @@
+"""Métricas del flujo conversacional: etapas, llamadas al proveedor y tamaño del prompt."""
+from __future__ import annotations
+
+import time
+from contextlib import contextmanager
+from typing import ContextManager, Iterator
+
+from src.application.chat_service import CHAT_STAGES, LLMCallSpan
+
+from .metrics import MetricsRegistry
+
+PROMPT_PRODUCT_BUCKETS = (0, 1, 2, 4, 8, 16, 32, 64, 128, 256, 512, 1024)
+PROMPT_CHARACTER_BUCKETS = (128, 256, 512, 1024, 2048, 4096, 8192, 16384, 32768, 65536)
+
+
+class ChatPipelineMetrics:
+    """Implementa ``ChatTelemetryProtocol`` sobre un registro de métricas.
+
+    En los turnos transmitidos, la etapa ``llm_call`` abarca desde la
+    petición al proveedor hasta su último fragmento, sin el tiempo que el
+    cliente tarda en consumirlos.
+    """
+
+    def __init__(self, registry: MetricsRegistry) -> None:
+        """Registra las métricas del flujo conversacional.
+
+        Args:
+            registry (MetricsRegistry): Registro donde se exponen.
+        """
+        self._stages = registry.histogram(
+            "chat_stage_duration_seconds",
+            "Duración de cada etapa de un turno de chat.",
+            ["stage"],
+        )
+        self._llm_in_flight = registry.gauge("chat_llm_calls_in_flight", "Llamadas al proveedor de IA en curso.")
+        self._llm_errors = registry.counter(
+            "chat_llm_errors_total",
+            "Llamadas al proveedor de IA que terminaron con error, por tipo de excepción.",
+            ["error"],
+        )
+        self._prompt_products = registry.histogram(
+            "chat_prompt_products",
+            "Productos incluidos en cada prompt.",
+            buckets=PROMPT_PRODUCT_BUCKETS,
+        )
+        self._prompt_characters = registry.histogram(
+            "chat_prompt_context_characters",
+            "Caracteres del mensaje y del contexto conversacional de cada prompt.",
+            buckets=PROMPT_CHARACTER_BUCKETS,
+        )
+
+    def stage(self, name: str) -> ContextManager[None]:
+        """Mide la duración de una etapa del turno.
+
+        Args:
+            name (str): Etapa de ``CHAT_STAGES``.
+
+        Returns:
+            ContextManager[None]: Bloque que observa su duración al cerrarse.
+
+        Raises:
+            ValueError: Si la etapa no es conocida.
+        """
+        if name not in CHAT_STAGES:
+            raise ValueError(f"Etapa de chat desconocida: {name}")
+        return self._stages.time(stage=name)
+
+    @contextmanager
+    def llm_call(self) -> Iterator[LLMCallSpan]:
+        """Mide una llamada al proveedor, la cuenta como en curso y registra sus fallas."""
+        span = LLMCallSpan()
+        started = time.perf_counter()
+        with self._llm_in_flight.track_inprogress():
+            try:
+                yield span
+            except Exception as exc:
+                self._llm_errors.inc(error=type(exc).__name__)
+                raise
+            finally:
+                elapsed = time.perf_counter() - started - span.paused_seconds
+                self._stages.observe(max(0.0, elapsed), stage="llm_call")
+
+    def observe_prompt(self, products: int, characters: int) -> None:
+        """Registra el tamaño del prompt enviado al proveedor.
+
+        Args:
+            products (int): Productos incluidos.
+            characters (int): Caracteres del mensaje y del contexto conversacional.
+        """
+        self._prompt_products.observe(products)
+        self._prompt_characters.observe(characters)
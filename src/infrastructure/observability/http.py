@@ -0,0 +1,80 @@
+"""Middleware ASGI que mide las peticiones HTTP por ruta."""
+from __future__ import annotations
+
+import time
+from typing import Any, Dict
+
+from starlette.routing import Match
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from .metrics import MetricsRegistry
+
+UNMATCHED_ROUTE = "unmatched"
+
+
+def route_template(scope: Scope) -> str:
+    """Obtiene la plantilla de la ruta que atenderá la petición.
+
+    Se usa la plantilla (``/products/{product_id}``) y no la URL para que la
+    cantidad de series no crezca con cada identificador.
+
+    Args:
+        scope (Scope): Scope ASGI de la petición.
+
+    Returns:
+        str: Plantilla de la ruta o ``unmatched`` si ninguna coincide.
+    """
+    app = scope.get("app")
+    for route in getattr(app, "routes", ()):
+        match, _ = route.matches(scope)
+        if match != Match.NONE:
+            return getattr(route, "path", UNMATCHED_ROUTE)
+    return UNMATCHED_ROUTE
+
+
+class HTTPMetricsMiddleware:
+    """Cuenta peticiones, mide su duración y lleva las que están en curso.
+
+    La duración abarca hasta el envío del último fragmento del cuerpo, por lo
+    que incluye las respuestas transmitidas completas.
+    """
+
+    def __init__(self, app: ASGIApp, registry: MetricsRegistry) -> None:
+        """Registra las métricas HTTP.
+
+        Args:
+            app (ASGIApp): Aplicación envuelta.
+            registry (MetricsRegistry): Registro donde se exponen.
+        """
+        self.app = app
+        self._requests = registry.counter(
+            "http_requests_total", "Peticiones HTTP atendidas.", ["method", "route", "status"]
+        )
+        self._duration = registry.histogram(
+            "http_request_duration_seconds", "Duración de las peticiones HTTP.", ["method", "route"]
+        )
+        self._in_flight = registry.gauge("http_requests_in_flight", "Peticiones HTTP en curso.", ["route"])
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        """Atiende la petición registrando sus métricas."""
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        route = route_template(scope)
+        method = scope["method"]
+        response: Dict[str, Any] = {"status": 500}
+
+        async def send_wrapper(message: Message) -> None:
+            if message["type"] == "http.response.start":
+                response["status"] = message["status"]
+            await send(message)
+
+        started = time.perf_counter()
+        self._in_flight.inc(route=route)
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            self._in_flight.dec(route=route)
+            self._duration.observe(time.perf_counter() - started, method=method, route=route)
+            self._requests.inc(method=method, route=route, status=str(response["status"]))
@@ -0,0 +1,306 @@
+"""Perfilador estadístico por petición con salida en formato *folded*.
+
+Un hilo muestrea periódicamente las pilas de todos los hilos del proceso
+mientras dura la petición perfilada. Las pilas se acumulan en el formato
+``marco;marco;marco cantidad`` que consumen ``flamegraph.pl``, speedscope e
+Inferno. Como Python no separa las pilas por petición, el perfil refleja
+todo lo que el proceso ejecutó en esa ventana; por eso se admite un único
+perfil a la vez.
+"""
+from __future__ import annotations
+
+import ipaddress
+import os
+import random
+import secrets
+import sys
+import threading
+import time
+import uuid
+from collections import Counter, OrderedDict
+from dataclasses import dataclass, field
+from datetime import datetime
+from types import FrameType
+from typing import Dict, List, Optional
+
+from starlette.types import Scope
+
+PROFILE_HEADER = "x-profile"
+PROFILES_PATH = "/debug/profiles"
+_IDLE_FRAMES = {("threading.py", "wait"), ("queue.py", "get"), ("selectors.py", "select")}
+
+
+def _frame_label(frame: FrameType) -> str:
+    """Describe un marco como ``función (archivo:línea)``."""
+    code = frame.f_code
+    return f"{code.co_name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})"
+
+
+def _is_idle(frame: FrameType) -> bool:
+    """Indica si el hilo está bloqueado esperando trabajo o E/S."""
+    return (os.path.basename(frame.f_code.co_filename), frame.f_code.co_name) in _IDLE_FRAMES
+
+
+class SamplingProfiler:
+    """Muestrea las pilas de los hilos del proceso a intervalos fijos."""
+
+    def __init__(self, interval: float = 0.005, max_depth: int = 128) -> None:
+        """Configura el muestreo.
+
+        Args:
+            interval (float): Segundos entre muestras.
+            max_depth (int): Marcos máximos por pila, desde el más interno.
+        """
+        self._interval = interval
+        self._max_depth = max_depth
+        self._stacks: Counter = Counter()
+        self._samples = 0
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self) -> None:
+        """Inicia el hilo de muestreo."""
+        self._thread = threading.Thread(target=self._run, name="request-profiler", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> Dict[str, int]:
+        """Detiene el muestreo y espera a que el hilo termine su última muestra.
+
+        Bloquea hasta un intervalo de muestreo; desde el bucle de eventos debe
+        llamarse en un hilo aparte.
+
+        Returns:
+            Dict[str, int]: Cantidad de muestras por pila plegada.
+        """
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+        return dict(self._stacks)
+
+    @property
+    def samples(self) -> int:
+        """int: Instantes muestreados."""
+        return self._samples
+
+    def _run(self) -> None:
+        own = threading.get_ident()
+        names = {}
+        while not self._stop.wait(self._interval):
+            self._samples += 1
+            for ident, frame in sys._current_frames().items():
+                if ident == own or _is_idle(frame):
+                    continue
+                if ident not in names:
+                    names = {thread.ident: thread.name for thread in threading.enumerate()}
+                labels: List[str] = []
+                while frame is not None and len(labels) < self._max_depth:
+                    labels.append(_frame_label(frame))
+                    frame = frame.f_back
+                labels.append(names.get(ident, f"thread-{ident}"))
+                self._stacks[";".join(reversed(labels))] += 1
+
+
+@dataclass
+class Profile:
+    """Perfil capturado durante una petición.
+
+    Attributes:
+        profile_id (str): Identificador enviado en ``X-Profile-Id``.
+        method (str): Método HTTP de la petición.
+        path (str): Ruta solicitada.
+        started_at (datetime): Inicio de la captura (UTC).
+        duration_ms (float): Duración de la captura.
+        samples (int): Instantes muestreados.
+        stacks (Dict[str, int]): Muestras por pila plegada.
+    """
+
+    profile_id: str
+    method: str
+    path: str
+    started_at: datetime
+    duration_ms: float = 0.0
+    samples: int = 0
+    stacks: Dict[str, int] = field(default_factory=dict)
+
+    def folded(self) -> str:
+        """Serializa el perfil en el formato *folded* de los flamegraphs.
+
+        Returns:
+            str: Una línea ``pila cantidad`` por pila, de la más frecuente a la menos.
+        """
+        ordered = sorted(self.stacks.items(), key=lambda item: (-item[1], item[0]))
+        return "".join(f"{stack} {count}\n" for stack, count in ordered)
+
+    def summary(self) -> Dict[str, object]:
+        """Retorna los metadatos del perfil sin las pilas."""
+        return {
+            "profile_id": self.profile_id,
+            "method": self.method,
+            "path": self.path,
+            "started_at": self.started_at.isoformat(),
+            "duration_ms": round(self.duration_ms, 3),
+            "samples": self.samples,
+        }
+
+
+class ProfileStore:
+    """Conserva los perfiles más recientes para su descarga."""
+
+    def __init__(self, max_profiles: int = 20) -> None:
+        """Inicializa el almacén.
+
+        Args:
+            max_profiles (int): Perfiles retenidos; se descartan los más antiguos.
+        """
+        self._max_profiles = max_profiles
+        self._profiles: "OrderedDict[str, Profile]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def add(self, profile: Profile) -> None:
+        """Guarda un perfil descartando el más antiguo si se excede la capacidad."""
+        with self._lock:
+            self._profiles[profile.profile_id] = profile
+            while len(self._profiles) > self._max_profiles:
+                self._profiles.popitem(last=False)
+
+    def get(self, profile_id: str) -> Optional[Profile]:
+        """Optional[Profile]: Perfil con el identificador indicado, si sigue retenido."""
+        with self._lock:
+            return self._profiles.get(profile_id)
+
+    def list(self) -> List[Profile]:
+        """List[Profile]: Perfiles retenidos, del más reciente al más antiguo."""
+        with self._lock:
+            return list(reversed(self._profiles.values()))
+
+
+@dataclass
+class ProfilingSession:
+    """Captura en curso asociada a una petición."""
+
+    profile: Profile
+    sampler: SamplingProfiler
+    started: float
+
+    @property
+    def profile_id(self) -> str:
+        """str: Identificador del perfil."""
+        return self.profile.profile_id
+
+
+class RequestProfiler:
+    """Decide qué peticiones perfilar y guarda sus perfiles.
+
+    Una petición se perfila si trae la cabecera ``X-Profile: 1`` (cuando está
+    habilitada) o si resulta elegida según ``sample_rate``. Las descargas de
+    perfiles nunca se perfilan y, como exponen el código que ejecuta el
+    proceso, solo se permiten con el token de acceso o, si no hay token,
+    desde la máquina local.
+    """
+
+    def __init__(
+        self,
+        store: ProfileStore,
+        header_enabled: bool = False,
+        sample_rate: float = 0.0,
+        interval: float = 0.005,
+        access_token: Optional[str] = None,
+    ) -> None:
+        """Configura la política de muestreo.
+
+        Args:
+            store (ProfileStore): Almacén de perfiles descargables.
+            header_enabled (bool): Acepta la cabecera ``X-Profile`` para activar la captura.
+            sample_rate (float): Fracción de peticiones perfiladas al azar (0 a 1).
+            interval (float): Segundos entre muestras.
+            access_token (Optional[str]): Token exigido para descargar perfiles;
+                sin token solo se atienden clientes locales.
+
+        Raises:
+            ValueError: Si ``sample_rate`` está fuera de rango.
+        """
+        if not 0.0 <= sample_rate <= 1.0:
+            raise ValueError("PROFILING_SAMPLE_RATE debe estar entre 0 y 1")
+        self.store = store
+        self._header_enabled = header_enabled
+        self._sample_rate = sample_rate
+        self._interval = interval
+        self._access_token = access_token or None
+        self._busy = threading.Lock()
+
+    @property
+    def enabled(self) -> bool:
+        """bool: Indica si alguna petición puede llegar a perfilarse."""
+        return self._header_enabled or self._sample_rate > 0
+
+    def allows_download(self, client_host: Optional[str], token: Optional[str]) -> bool:
+        """Indica si un cliente puede consultar los perfiles capturados.
+
+        Args:
+            client_host (Optional[str]): Dirección del cliente, si se conoce.
+            token (Optional[str]): Valor recibido en ``X-Profile-Token``.
+
+        Returns:
+            bool: ``True`` si el token coincide o, sin token configurado, si el
+            cliente es local.
+        """
+        if self._access_token is not None:
+            return token is not None and secrets.compare_digest(token.encode(), self._access_token.encode())
+        if client_host == "localhost":
+            return True
+        try:
+            return client_host is not None and ipaddress.ip_address(client_host).is_loopback
+        except ValueError:
+            return False
+
+    def _requested(self, scope: Scope) -> bool:
+        """Evalúa la cabecera y la tasa de muestreo de la petición."""
+        if not self.enabled or scope["path"].startswith(PROFILES_PATH):
+            return False
+        if self._header_enabled:
+            for name, value in scope.get("headers", ()):
+                if name.decode("latin-1").lower() == PROFILE_HEADER:
+                    return value.strip() in {b"1", b"true", b"yes"}
+        return self._sample_rate > 0 and random.random() < self._sample_rate
+
+    def start(self, scope: Scope) -> Optional[ProfilingSession]:
+        """Inicia la captura si la petición fue elegida y no hay otra en curso.
+
+        Args:
+            scope (Scope): Scope ASGI de la petición.
+
+        Returns:
+            Optional[ProfilingSession]: Captura iniciada o ``None``.
+        """
+        if not self._requested(scope) or not self._busy.acquire(blocking=False):
+            return None
+        sampler = SamplingProfiler(self._interval)
+        profile = Profile(
+            profile_id=uuid.uuid4().hex,
+            method=scope["method"],
+            path=scope["path"],
+            started_at=datetime.utcnow(),
+        )
+        sampler.start()
+        return ProfilingSession(profile=profile, sampler=sampler, started=time.perf_counter())
+
+    def finish(self, session: ProfilingSession) -> Profile:
+        """Detiene la captura y guarda el perfil.
+
+        Espera al hilo de muestreo, por lo que desde código asíncrono debe
+        ejecutarse fuera del bucle de eventos.
+
+        Args:
+            session (ProfilingSession): Captura iniciada con ``start``.
+
+        Returns:
+            Profile: Perfil almacenado.
+        """
+        try:
+            session.profile.duration_ms = (time.perf_counter() - session.started) * 1000
+            session.profile.stacks = session.sampler.stop()
+            session.profile.samples = session.sampler.samples
+            self.store.add(session.profile)
+        finally:
+            self._busy.release()
+        return session.profile
@@ -0,0 +1,308 @@
+"""Desglose del tiempo de cada petición en la cabecera ``Server-Timing``.
+
+Cada petición HTTP abre un acumulador en una ``ContextVar``. Las capas
+que realizan trabajo costoso le suman su duración:
+
+- ``db``: eventos de cursor de SQLAlchemy, síncronos y asíncronos.
+- ``prompt`` y ``llm``: los proveedores de IA.
+- ``serialize``: lo mide la ruta entre el fin del endpoint y el envío de cabeceras.
+
+Como las variables de contexto se propagan al *threadpool* y a los greenlets
+de SQLAlchemy, el tiempo se atribuye a la petición correcta aun con muchas
+peticiones concurrentes.
+"""
+from __future__ import annotations
+
+import asyncio
+import functools
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, AsyncIterator, Callable, Dict, Iterator, List, Optional, Sequence
+
+from fastapi.routing import APIRoute
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from starlette.concurrency import run_in_threadpool
+from starlette.datastructures import MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from src.application.chat_service import AIServiceProtocol
+from src.domain.entities import ChatContext, Product
+
+from .profiler import RequestProfiler
+
+SERVER_TIMING_STAGES = ("db", "serialize", "prompt", "llm")
+_DB_STARTS_KEY = "server_timing_starts"
+
+
+class RequestTimings:
+    """Acumulador de duraciones por etapa de una petición."""
+
+    def __init__(self) -> None:
+        """Inicia el cronómetro de la petición."""
+        self.started = time.perf_counter()
+        self.handler_finished: Optional[float] = None
+        self.closed = False
+        self._totals: Dict[str, float] = {}
+        self._lock = threading.Lock()
+
+    def add(self, stage: str, seconds: float) -> None:
+        """Suma ``seconds`` a la etapa indicada.
+
+        Args:
+            stage (str): Etapa de ``SERVER_TIMING_STAGES``.
+            seconds (float): Duración a acumular.
+        """
+        with self._lock:
+            self._totals[stage] = self._totals.get(stage, 0.0) + seconds
+
+    def get(self, stage: str) -> float:
+        """float: Segundos acumulados en la etapa indicada."""
+        return self._totals.get(stage, 0.0)
+
+    def header(self, now: Optional[float] = None) -> str:
+        """Construye el valor de la cabecera ``Server-Timing``.
+
+        Args:
+            now (Optional[float]): Instante del envío de cabeceras según ``perf_counter``.
+
+        Returns:
+            str: Entradas ``etapa;dur=<ms>`` más el total de la petición.
+        """
+        now = time.perf_counter() if now is None else now
+        if self.handler_finished is not None:
+            self.add("serialize", max(0.0, now - self.handler_finished))
+        entries = [f"{stage};dur={self.get(stage) * 1000:.3f}" for stage in SERVER_TIMING_STAGES if stage in self._totals]
+        entries.append(f"total;dur={(now - self.started) * 1000:.3f}")
+        return ", ".join(entries)
+
+
+_current_timings: ContextVar[Optional[RequestTimings]] = ContextVar("server_timing", default=None)
+
+
+def current_timings() -> Optional[RequestTimings]:
+    """Optional[RequestTimings]: Acumulador de la petición en curso, si existe."""
+    timings = _current_timings.get()
+    if timings is None or timings.closed:
+        return None
+    return timings
+
+
+def record(stage: str, seconds: float) -> None:
+    """Suma una duración a la petición en curso; fuera de una petición no hace nada.
+
+    Args:
+        stage (str): Etapa de ``SERVER_TIMING_STAGES``.
+        seconds (float): Duración a acumular.
+    """
+    timings = current_timings()
+    if timings is not None:
+        timings.add(stage, seconds)
+
+
+@contextmanager
+def timed(stage: str, exclude: Sequence[str] = ()) -> Iterator[None]:
+    """Atribuye la duración del bloque a una etapa.
+
+    Args:
+        stage (str): Etapa de ``SERVER_TIMING_STAGES``.
+        exclude (Sequence[str]): Etapas anidadas cuyo tiempo no se cuenta dos veces.
+    """
+    timings = current_timings()
+    if timings is None:
+        yield
+        return
+    nested = sum(timings.get(name) for name in exclude)
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        elapsed = time.perf_counter() - started - (sum(timings.get(name) for name in exclude) - nested)
+        timings.add(stage, max(0.0, elapsed))
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany) -> None:
+    conn.info.setdefault(_DB_STARTS_KEY, []).append(time.perf_counter())
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany) -> None:
+    starts = conn.info.get(_DB_STARTS_KEY)
+    if starts:
+        record("db", time.perf_counter() - starts.pop())
+
+
+def _handle_error(exception_context) -> None:
+    connection = exception_context.connection
+    starts = connection.info.get(_DB_STARTS_KEY) if connection is not None else None
+    if starts:
+        record("db", time.perf_counter() - starts.pop())
+
+
+def install_db_timing(target: Any = Engine) -> None:
+    """Mide cada sentencia SQL ejecutada por los motores de ``target``.
+
+    Por omisión se escuchan todos los motores, incluidos los síncronos
+    subyacentes de los motores asíncronos. La instalación es idempotente.
+
+    Args:
+        target (Any): Clase ``Engine`` o un motor concreto.
+    """
+    for name, listener in (
+        ("before_cursor_execute", _before_cursor_execute),
+        ("after_cursor_execute", _after_cursor_execute),
+        ("handle_error", _handle_error),
+    ):
+        if not event.contains(target, name, listener):
+            event.listen(target, name, listener)
+
+
+def _mark_handler_finished(endpoint: Callable[..., Any]) -> Callable[..., Any]:
+    """Envuelve un endpoint para registrar cuándo termina y empieza la serialización."""
+
+    def finish() -> None:
+        timings = current_timings()
+        if timings is not None:
+            timings.handler_finished = time.perf_counter()
+
+    if asyncio.iscoroutinefunction(endpoint):
+
+        @functools.wraps(endpoint)
+        async def async_wrapper(*args: Any, **kwargs: Any) -> Any:
+            try:
+                return await endpoint(*args, **kwargs)
+            finally:
+                finish()
+
+        return async_wrapper
+
+    @functools.wraps(endpoint)
+    def wrapper(*args: Any, **kwargs: Any) -> Any:
+        try:
+            return endpoint(*args, **kwargs)
+        finally:
+            finish()
+
+    return wrapper
+
+
+class ServerTimingRoute(APIRoute):
+    """Ruta de FastAPI que separa el tiempo del endpoint del de serialización.
+
+    El envoltorio se aplica después de analizar la firma del endpoint, por lo
+    que las dependencias y la documentación OpenAPI no cambian.
+    """
+
+    def get_route_handler(self) -> Callable:
+        """Construye el manejador marcando el fin de la ejecución del endpoint."""
+        self.dependant.call = _mark_handler_finished(self.endpoint)
+        return super().get_route_handler()
+
+
+class ServerTimingAIService:
+    """Decorador de ``AIServiceProtocol`` que atribuye su duración a la etapa ``llm``.
+
+    El tiempo que el proveedor dedica a construir el prompt se informa aparte
+    en ``prompt``. En los flujos solo se cuenta la espera de cada fragmento,
+    no el tiempo que tarda el cliente en consumirlo.
+    """
+
+    def __init__(self, provider: AIServiceProtocol) -> None:
+        """Inicializa el decorador.
+
+        Args:
+            provider (AIServiceProtocol): Proveedor a medir.
+        """
+        self._provider = provider
+
+    async def generate_response(self, user_message: str, products: List[Product], context: ChatContext) -> str:
+        """Genera la respuesta midiendo la llamada al proveedor.
+
+        Args:
+            user_message (str): Mensaje ingresado por el usuario.
+            products (List[Product]): Catálogo disponible durante la conversación.
+            context (ChatContext): Historial de mensajes recientes.
+
+        Returns:
+            str: Respuesta del proveedor envuelto.
+        """
+        with timed("llm", exclude=("prompt",)):
+            return await self._provider.generate_response(user_message, products, context)
+
+    async def stream_response(self, user_message: str, products: List[Product], context: ChatContext) -> AsyncIterator[str]:
+        """Transmite la respuesta midiendo la espera de cada fragmento.
+
+        Args:
+            user_message (str): Mensaje ingresado por el usuario.
+            products (List[Product]): Catálogo disponible durante la conversación.
+            context (ChatContext): Historial de mensajes recientes.
+
+        Yields:
+            str: Fragmentos del proveedor envuelto.
+        """
+        stream = self._provider.stream_response(user_message, products, context).__aiter__()
+        while True:
+            with timed("llm", exclude=("prompt",)):
+                try:
+                    chunk = await stream.__anext__()
+                except StopAsyncIteration:
+                    return
+            yield chunk
+
+    def __getattr__(self, name: str) -> Any:
+        """Expone las capacidades opcionales del proveedor envuelto, como los resúmenes."""
+        if name.startswith("_"):
+            raise AttributeError(name)
+        return getattr(self._provider, name)
+
+    async def aclose(self) -> None:
+        """Libera los recursos del proveedor envuelto."""
+        close = getattr(self._provider, "aclose", None)
+        if close is not None:
+            await close()
+
+
+class ServerTimingMiddleware:
+    """Agrega ``Server-Timing`` a cada respuesta y perfila las peticiones elegidas.
+
+    La cabecera se escribe al enviar las cabeceras de la respuesta, de modo que
+    en las respuestas transmitidas solo refleja el trabajo previo al primer byte.
+    """
+
+    def __init__(self, app: ASGIApp, profiler: Optional[RequestProfiler] = None) -> None:
+        """Inicializa el middleware.
+
+        Args:
+            app (ASGIApp): Aplicación envuelta.
+            profiler (Optional[RequestProfiler]): Perfilador opcional por muestreo.
+        """
+        self.app = app
+        self._profiler = profiler
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        """Atiende la petición acumulando sus tiempos por etapa."""
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        timings = RequestTimings()
+        token = _current_timings.set(timings)
+        session = self._profiler.start(scope) if self._profiler is not None else None
+
+        async def send_wrapper(message: Message) -> None:
+            if message["type"] == "http.response.start":
+                headers = MutableHeaders(scope=message)
+                headers.append("Server-Timing", timings.header())
+                if session is not None:
+                    headers.append("X-Profile-Id", session.profile_id)
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            timings.closed = True
+            _current_timings.reset(token)
+            if session is not None:
+                # Esperar al hilo de muestreo bloquearía el bucle de eventos.
+                await run_in_threadpool(self._profiler.finish, session)
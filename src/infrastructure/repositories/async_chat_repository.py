@@ -0,0 +1,157 @@
+"""Repositorio asíncrono del historial de chat basado en ``AsyncSession``."""
+from __future__ import annotations
+
+from typing import List, Optional, Sequence
+
+from sqlalchemy import delete, select
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from src.domain.entities import ChatMessage, ConversationSummary, HistoryCursor
+from src.domain.repositories import IAsyncChatRepository
+
+from ..db.models import ChatMemoryModel, ChatSummaryModel
+from .chat_mapping import history_ordering, history_page_conditions, message_to_entity, summary_to_entity, summary_to_model
+
+
+class AsyncSQLChatRepository(IAsyncChatRepository):
+    """Repositorio de historial que no bloquea el event loop.
+
+    Cada operación abre una sesión corta desde la fábrica recibida, por lo que
+    una misma instancia puede compartirse entre peticiones concurrentes.
+    """
+
+    def __init__(self, session_factory: async_sessionmaker[AsyncSession]) -> None:
+        """Inicializa el repositorio con una fábrica de sesiones asíncronas.
+
+        Args:
+            session_factory (async_sessionmaker[AsyncSession]): Fábrica de sesiones.
+        """
+        self._session_factory = session_factory
+
+    async def save_message(self, message: ChatMessage) -> ChatMessage:
+        """Guarda un mensaje de chat y retorna la entidad persistida."""
+        async with self._session_factory() as session:
+            model = ChatMemoryModel(
+                id=message.id,
+                session_id=message.session_id,
+                role=message.role,
+                message=message.message,
+                timestamp=message.timestamp,
+            )
+            if message.id is not None:
+                model = await session.merge(model)
+            else:
+                session.add(model)
+            await session.commit()
+            return message_to_entity(model)
+
+    async def save_messages(self, messages: Sequence[ChatMessage]) -> List[ChatMessage]:
+        """Inserta varios mensajes en una sola transacción sin releerlos.
+
+        Args:
+            messages (Sequence[ChatMessage]): Mensajes nuevos a persistir en orden.
+
+        Returns:
+            List[ChatMessage]: Entidades con los identificadores asignados.
+        """
+        models = [
+            ChatMemoryModel(session_id=message.session_id, role=message.role, message=message.message, timestamp=message.timestamp)
+            for message in messages
+        ]
+        async with self._session_factory() as session:
+            session.add_all(models)
+            await session.flush()
+            saved = [message_to_entity(model) for model in models]
+            await session.commit()
+        return saved
+
+    async def get_session_history(self, session_id: str, limit: int | None = None) -> List[ChatMessage]:
+        """Recupera el historial completo de una sesión.
+
+        Args:
+            session_id (str): Identificador de la conversación.
+            limit (Optional[int]): Máximo de registros a retornar.
+
+        Returns:
+            List[ChatMessage]: Mensajes ordenados ascendentemente por fecha.
+        """
+        statement = select(ChatMemoryModel).where(ChatMemoryModel.session_id == session_id).order_by(*history_ordering())
+        if limit is not None:
+            statement = statement.limit(limit)
+        async with self._session_factory() as session:
+            return [message_to_entity(model) for model in await session.scalars(statement)]
+
+    async def delete_session_history(self, session_id: str) -> int:
+        """Elimina todos los mensajes de una sesión específica.
+
+        Args:
+            session_id (str): Identificador de la conversación.
+
+        Returns:
+            int: Cantidad de registros eliminados.
+        """
+        async with self._session_factory() as session:
+            result = await session.execute(delete(ChatMemoryModel).where(ChatMemoryModel.session_id == session_id))
+            await session.execute(delete(ChatSummaryModel).where(ChatSummaryModel.session_id == session_id))
+            await session.commit()
+            return int(result.rowcount)
+
+    async def get_summary(self, session_id: str) -> Optional[ConversationSummary]:
+        """Obtiene el resumen acumulado de una sesión, si existe."""
+        async with self._session_factory() as session:
+            model = await session.get(ChatSummaryModel, session_id)
+            return summary_to_entity(model) if model is not None else None
+
+    async def save_summary(self, summary: ConversationSummary) -> ConversationSummary:
+        """Crea o reemplaza el resumen de una sesión."""
+        async with self._session_factory() as session:
+            model = await session.merge(summary_to_model(summary))
+            await session.commit()
+            return summary_to_entity(model)
+
+    async def get_history_page(
+        self,
+        session_id: str,
+        limit: int,
+        before: Optional[HistoryCursor] = None,
+        after: Optional[HistoryCursor] = None,
+        newest_first: bool = False,
+    ) -> List[ChatMessage]:
+        """Obtiene una página del historial mediante paginación por rango (keyset).
+
+        Args:
+            session_id (str): Identificador de la conversación.
+            limit (int): Cantidad máxima de mensajes de la página.
+            before (Optional[HistoryCursor]): Solo mensajes anteriores al cursor.
+            after (Optional[HistoryCursor]): Solo mensajes posteriores al cursor.
+            newest_first (bool): Ordena del más reciente al más antiguo.
+
+        Returns:
+            List[ChatMessage]: Mensajes de la página en el orden solicitado.
+        """
+        conditions = history_page_conditions(session_id, before, after)
+        ordering = history_ordering(newest_first)
+        statement = select(ChatMemoryModel).where(*conditions).order_by(*ordering).limit(limit)
+        async with self._session_factory() as session:
+            return [message_to_entity(model) for model in await session.scalars(statement)]
+
+    async def get_recent_messages(self, session_id: str, count: int) -> List[ChatMessage]:
+        """Obtiene los mensajes más recientes de una sesión en orden cronológico.
+
+        Args:
+            session_id (str): Identificador de la conversación.
+            count (int): Cantidad de mensajes recientes a recuperar.
+
+        Returns:
+            List[ChatMessage]: Mensajes ordenados del más antiguo al más reciente.
+        """
+        statement = (
+            select(ChatMemoryModel)
+            .where(ChatMemoryModel.session_id == session_id)
+            .order_by(*history_ordering(newest_first=True))
+            .limit(count)
+        )
+        async with self._session_factory() as session:
+            models = list(await session.scalars(statement))
+        models.reverse()
+        return [message_to_entity(model) for model in models]
@@ -0,0 +1,230 @@
+"""Repositorios asíncronos de productos basados en ``AsyncSession``."""
+from __future__ import annotations
+
+from typing import List, Optional
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+from src.domain.entities import Product
+from src.domain.repositories import IAsyncProductRepository
+
+from ..cache.catalog_cache import CatalogCache, CatalogSnapshot
+from ..db.models import ProductModel
+
+
+class AsyncSQLProductRepository(IAsyncProductRepository):
+    """Repositorio de productos que no bloquea el event loop.
+
+    Cada operación abre una sesión corta desde la fábrica recibida, por lo que
+    una misma instancia puede compartirse entre peticiones concurrentes.
+    """
+
+    def __init__(self, session_factory: async_sessionmaker[AsyncSession]) -> None:
+        """Inicializa el repositorio con una fábrica de sesiones asíncronas.
+
+        Args:
+            session_factory (async_sessionmaker[AsyncSession]): Fábrica de sesiones.
+        """
+        self._session_factory = session_factory
+
+    def _model_to_entity(self, model: ProductModel) -> Product:
+        """Convierte un modelo ORM en entidad de dominio."""
+        return Product(
+            id=model.id,
+            name=model.name,
+            brand=model.brand,
+            category=model.category,
+            size=model.size,
+            color=model.color,
+            price=model.price,
+            stock=model.stock,
+            description=model.description,
+        )
+
+    async def _fetch(self, statement) -> List[Product]:  # noqa: ANN001 - sentencia SQLAlchemy
+        """Ejecuta una consulta de productos y mapea el resultado a entidades."""
+        async with self._session_factory() as session:
+            result = await session.scalars(statement)
+            return [self._model_to_entity(model) for model in result]
+
+    async def get_all(self) -> List[Product]:
+        """Obtiene todos los productos almacenados.
+
+        Returns:
+            List[Product]: Entidades convertidas desde la base de datos.
+        """
+        return await self._fetch(select(ProductModel))
+
+    async def get_by_id(self, product_id: int) -> Optional[Product]:
+        """Busca un producto por su identificador.
+
+        Args:
+            product_id (int): Identificador único del producto.
+
+        Returns:
+            Optional[Product]: Producto encontrado o ``None``.
+        """
+        async with self._session_factory() as session:
+            model = await session.get(ProductModel, product_id)
+            return self._model_to_entity(model) if model else None
+
+    async def get_by_brand(self, brand: str) -> List[Product]:
+        """Obtiene productos filtrados por marca (insensible a mayúsculas).
+
+        Args:
+            brand (str): Nombre de la marca a buscar.
+
+        Returns:
+            List[Product]: Productos que pertenecen a la marca indicada.
+        """
+        return await self._fetch(select(ProductModel).where(ProductModel.brand.ilike(brand)))
+
+    async def get_by_category(self, category: str) -> List[Product]:
+        """Obtiene productos filtrados por categoría.
+
+        Args:
+            category (str): Categoría objetivo.
+
+        Returns:
+            List[Product]: Productos que coinciden con la categoría.
+        """
+        return await self._fetch(select(ProductModel).where(ProductModel.category.ilike(category)))
+
+    async def save(self, product: Product) -> Product:
+        """Guarda (crea o actualiza) un producto.
+
+        Args:
+            product (Product): Entidad a persistir.
+
+        Returns:
+            Product: Entidad resultante después del commit.
+        """
+        async with self._session_factory() as session:
+            model = await session.get(ProductModel, product.id) if product.id is not None else None
+            if model is None:
+                model = ProductModel(id=product.id)
+                session.add(model)
+            model.name = product.name
+            model.brand = product.brand
+            model.category = product.category
+            model.size = product.size
+            model.color = product.color
+            model.price = product.price
+            model.stock = product.stock
+            model.description = product.description
+            await session.commit()
+            return self._model_to_entity(model)
+
+    async def delete(self, product_id: int) -> bool:
+        """Elimina un producto por su identificador.
+
+        Args:
+            product_id (int): Identificador del producto a eliminar.
+
+        Returns:
+            bool: ``True`` si la operación fue exitosa.
+        """
+        async with self._session_factory() as session:
+            model = await session.get(ProductModel, product_id)
+            if model is None:
+                return False
+            await session.delete(model)
+            await session.commit()
+            return True
+
+
+class AsyncCachedProductRepository(IAsyncProductRepository):
+    """Variante asíncrona de ``CachedProductRepository`` sobre la misma caché."""
+
+    def __init__(self, repository: IAsyncProductRepository, cache: CatalogCache) -> None:
+        """Inicializa el decorador.
+
+        Args:
+            repository (IAsyncProductRepository): Repositorio con acceso a la persistencia.
+            cache (CatalogCache): Caché de catálogo compartida por el proceso.
+        """
+        self._repository = repository
+        self._cache = cache
+
+    async def snapshot(self) -> CatalogSnapshot:
+        """Obtiene la instantánea vigente, cargándola si es necesario.
+
+        Returns:
+            CatalogSnapshot: Catálogo completo con su versión.
+        """
+        snapshot = self._cache.current()
+        if snapshot is not None:
+            return snapshot
+        version = self._cache.version
+        return self._cache.publish(await self._repository.get_all(), version)
+
+    async def get_all(self) -> List[Product]:
+        """Obtiene todos los productos desde la instantánea en memoria.
+
+        Returns:
+            List[Product]: Productos del catálogo.
+        """
+        return list((await self.snapshot()).products)
+
+    async def get_by_id(self, product_id: int) -> Optional[Product]:
+        """Busca un producto en la instantánea por su identificador.
+
+        Args:
+            product_id (int): Identificador único del producto.
+
+        Returns:
+            Optional[Product]: Producto encontrado o ``None``.
+        """
+        return (await self.snapshot()).get(product_id)
+
+    async def get_by_brand(self, brand: str) -> List[Product]:
+        """Filtra la instantánea por marca sin distinguir mayúsculas.
+
+        Args:
+            brand (str): Marca a buscar.
+
+        Returns:
+            List[Product]: Productos de la marca indicada.
+        """
+        needle = brand.lower()
+        return [product for product in (await self.snapshot()).products if product.brand.lower() == needle]
+
+    async def get_by_category(self, category: str) -> List[Product]:
+        """Filtra la instantánea por categoría sin distinguir mayúsculas.
+
+        Args:
+            category (str): Categoría objetivo.
+
+        Returns:
+            List[Product]: Productos de la categoría indicada.
+        """
+        needle = category.lower()
+        return [product for product in (await self.snapshot()).products if product.category.lower() == needle]
+
+    async def save(self, product: Product) -> Product:
+        """Persiste el producto y lo aplica sobre la caché de catálogo.
+
+        Args:
+            product (Product): Entidad a persistir.
+
+        Returns:
+            Product: Entidad resultante de la persistencia.
+        """
+        saved = await self._repository.save(product)
+        self._cache.apply_saved(saved)
+        return saved
+
+    async def delete(self, product_id: int) -> bool:
+        """Elimina el producto y lo retira de la caché si existía.
+
+        Args:
+            product_id (int): Identificador del producto a eliminar.
+
+        Returns:
+            bool: ``True`` si el producto existía y fue eliminado.
+        """
+        deleted = await self._repository.delete(product_id)
+        if deleted:
+            self._cache.apply_deleted(product_id)
+        return deleted
@@ -0,0 +1,171 @@
+"""Decorador de ``IProductRepository`` que sirve lecturas desde la caché de catálogo."""
+from __future__ import annotations
+
+from dataclasses import replace
+from typing import Any, Dict, List, Optional, Sequence
+
+from src.domain.entities import Product, ProductCursor, StockAdjustment, StockAdjustmentResult
+from src.domain.repositories import IProductRepository
+
+from ..cache.catalog_cache import CatalogCache, CatalogSnapshot
+
+
+class CachedProductRepository(IProductRepository):
+    """Repositorio que responde lecturas desde una instantánea compartida.
+
+    Las escrituras se delegan al repositorio envuelto y se aplican sobre la
+    instantánea, publicando una nueva versión del catálogo sin releer la tabla.
+    """
+
+    def __init__(self, repository: IProductRepository, cache: CatalogCache) -> None:
+        """Inicializa el decorador.
+
+        Args:
+            repository (IProductRepository): Repositorio con acceso a la persistencia.
+            cache (CatalogCache): Caché de catálogo compartida por el proceso.
+        """
+        self._repository = repository
+        self._cache = cache
+
+    def snapshot(self) -> CatalogSnapshot:
+        """Obtiene la instantánea vigente, cargándola si es necesario.
+
+        Returns:
+            CatalogSnapshot: Catálogo completo con su versión.
+        """
+        return self._cache.load(self._repository.get_all)
+
+    def get_all(self) -> List[Product]:
+        """Obtiene todos los productos desde la instantánea en memoria.
+
+        Returns:
+            List[Product]: Productos del catálogo.
+        """
+        return list(self.snapshot().products)
+
+    def upsert_many(self, products: Sequence[Product]) -> int:
+        """Escribe el lote en el repositorio envuelto e invalida la instantánea.
+
+        Un lote masivo no se aplica producto por producto: la siguiente lectura
+        recarga el catálogo y reconstruye los índices derivados.
+
+        Args:
+            products (Sequence[Product]): Productos validados.
+
+        Returns:
+            int: Cantidad de productos escritos.
+        """
+        written = self._repository.upsert_many(products)
+        self._cache.invalidate()
+        return written
+
+    def adjust_stock_many(self, adjustments: Sequence[StockAdjustment]) -> List[StockAdjustmentResult]:
+        """Aplica los ajustes en la persistencia y publica el stock final como un solo cambio.
+
+        Args:
+            adjustments (Sequence[StockAdjustment]): Ajustes en el orden a aplicar.
+
+        Returns:
+            List[StockAdjustmentResult]: Un resultado por ajuste, en el mismo orden.
+        """
+        results = self._repository.adjust_stock_many(adjustments)
+        final_stock = {result.product_id: result.stock for result in results if result.applied}
+        if not final_stock:
+            return results
+        snapshot = self._cache.current()
+        if snapshot is None:
+            self._cache.invalidate()
+            return results
+        updated = []
+        for product_id, stock in final_stock.items():
+            product = snapshot.get(product_id)
+            if product is None:
+                self._cache.invalidate()
+                return results
+            updated.append(replace(product, stock=stock))
+        self._cache.apply_saved_many(updated)
+        return results
+
+    def get_page(
+        self,
+        limit: int,
+        sort_by: str = "id",
+        descending: bool = False,
+        after: Optional[ProductCursor] = None,
+        fields: Optional[Sequence[str]] = None,
+    ) -> List[Dict[str, Any]]:
+        """Delega la paginación al repositorio envuelto para resolverla en la consulta.
+
+        Args:
+            limit (int): Cantidad máxima de productos de la página.
+            sort_by (str): Campo de orden; el identificador desempata.
+            descending (bool): Ordena de mayor a menor.
+            after (Optional[ProductCursor]): Solo productos posteriores al cursor.
+            fields (Optional[Sequence[str]]): Columnas a leer.
+
+        Returns:
+            List[Dict[str, Any]]: Filas con las columnas solicitadas.
+        """
+        return self._repository.get_page(limit, sort_by=sort_by, descending=descending, after=after, fields=fields)
+
+    def get_by_id(self, product_id: int) -> Optional[Product]:
+        """Busca un producto en la instantánea por su identificador.
+
+        Args:
+            product_id (int): Identificador único del producto.
+
+        Returns:
+            Optional[Product]: Producto encontrado o ``None``.
+        """
+        return self.snapshot().get(product_id)
+
+    def get_by_brand(self, brand: str) -> List[Product]:
+        """Filtra la instantánea por marca sin distinguir mayúsculas.
+
+        Args:
+            brand (str): Marca a buscar.
+
+        Returns:
+            List[Product]: Productos de la marca indicada.
+        """
+        needle = brand.lower()
+        return [product for product in self.snapshot().products if product.brand.lower() == needle]
+
+    def get_by_category(self, category: str) -> List[Product]:
+        """Filtra la instantánea por categoría sin distinguir mayúsculas.
+
+        Args:
+            category (str): Categoría objetivo.
+
+        Returns:
+            List[Product]: Productos de la categoría indicada.
+        """
+        needle = category.lower()
+        return [product for product in self.snapshot().products if product.category.lower() == needle]
+
+    def save(self, product: Product) -> Product:
+        """Persiste el producto y lo aplica sobre la caché de catálogo.
+
+        Args:
+            product (Product): Entidad a persistir.
+
+        Returns:
+            Product: Entidad resultante de la persistencia.
+        """
+        saved = self._repository.save(product)
+        self._cache.apply_saved(saved)
+        return saved
+
+    def delete(self, product_id: int) -> bool:
+        """Elimina el producto y lo retira de la caché si existía.
+
+        Args:
+            product_id (int): Identificador del producto a eliminar.
+
+        Returns:
+            bool: ``True`` si el producto existía y fue eliminado.
+        """
+        deleted = self._repository.delete(product_id)
+        if deleted:
+            self._cache.apply_deleted(product_id)
+        return deleted
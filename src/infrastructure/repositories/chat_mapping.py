@@ -0,0 +1,86 @@
+"""Mapeos y condiciones de consulta compartidos por los repositorios SQL de chat."""
+from __future__ import annotations
+
+from typing import List, Optional, Tuple
+
+from sqlalchemy import and_, asc, desc, or_
+from sqlalchemy.sql.elements import ColumnElement, UnaryExpression
+
+from src.domain.entities import ChatMessage, ConversationSummary, HistoryCursor
+
+from ..db.models import ChatMemoryModel, ChatSummaryModel
+
+
+def message_to_entity(model: ChatMemoryModel) -> ChatMessage:
+    """Mapea un mensaje persistido a entidad de dominio."""
+    return ChatMessage(
+        id=model.id,
+        session_id=model.session_id,
+        role=model.role,
+        message=model.message,
+        timestamp=model.timestamp,
+    )
+
+
+def summary_to_entity(model: ChatSummaryModel) -> ConversationSummary:
+    """Mapea el resumen persistido a entidad de dominio."""
+    covered_until = None
+    if model.covered_message_id is not None and model.covered_timestamp is not None:
+        covered_until = HistoryCursor(timestamp=model.covered_timestamp, message_id=model.covered_message_id)
+    return ConversationSummary(
+        session_id=model.session_id,
+        summary=model.summary,
+        covered_until=covered_until,
+        updated_at=model.updated_at,
+    )
+
+
+def summary_to_model(summary: ConversationSummary) -> ChatSummaryModel:
+    """Transforma un resumen de dominio en modelo ORM."""
+    covered = summary.covered_until
+    return ChatSummaryModel(
+        session_id=summary.session_id,
+        summary=summary.summary,
+        covered_message_id=covered.message_id if covered is not None else None,
+        covered_timestamp=covered.timestamp if covered is not None else None,
+        updated_at=summary.updated_at,
+    )
+
+
+def history_page_conditions(
+    session_id: str,
+    before: Optional[HistoryCursor] = None,
+    after: Optional[HistoryCursor] = None,
+) -> List[ColumnElement[bool]]:
+    """Construye los filtros de una página de historial por rango (keyset).
+
+    Args:
+        session_id (str): Identificador de la conversación.
+        before (Optional[HistoryCursor]): Solo mensajes anteriores al cursor.
+        after (Optional[HistoryCursor]): Solo mensajes posteriores al cursor.
+
+    Returns:
+        List[ColumnElement[bool]]: Condiciones a combinar con ``AND``.
+    """
+    conditions: List[ColumnElement[bool]] = [ChatMemoryModel.session_id == session_id]
+    if before is not None:
+        conditions.append(
+            or_(
+                ChatMemoryModel.timestamp < before.timestamp,
+                and_(ChatMemoryModel.timestamp == before.timestamp, ChatMemoryModel.id < before.message_id),
+            )
+        )
+    if after is not None:
+        conditions.append(
+            or_(
+                ChatMemoryModel.timestamp > after.timestamp,
+                and_(ChatMemoryModel.timestamp == after.timestamp, ChatMemoryModel.id > after.message_id),
+            )
+        )
+    return conditions
+
+
+def history_ordering(newest_first: bool = False) -> Tuple[UnaryExpression, UnaryExpression]:
+    """Orden ``(timestamp, id)`` del historial, coherente con los cursores."""
+    direction = desc if newest_first else asc
+    return direction(ChatMemoryModel.timestamp), direction(ChatMemoryModel.id)
@@ -1,15 +1,15 @@
 """Repositorio de chat respaldado por SQLAlchemy que gestiona el historial."""
 from __future__ import annotations
 
-from typing import List
+from typing import List, Optional, Sequence
 
-from sqlalchemy import asc, desc
 from sqlalchemy.orm import Session
 
-from src.domain.entities import ChatMessage
+from src.domain.entities import ChatMessage, ConversationSummary, HistoryCursor
 from src.domain.repositories import IChatRepository
 
-from ..db.models import ChatMemoryModel
+from ..db.models import ChatMemoryModel, ChatSummaryModel
+from .chat_mapping import history_ordering, history_page_conditions, message_to_entity, summary_to_entity, summary_to_model
 
 
 class SQLChatRepository(IChatRepository):
@@ -23,16 +23,6 @@ class SQLChatRepository(IChatRepository):
         """
         self._db = db_session
 
-    def _model_to_entity(self, model: ChatMemoryModel) -> ChatMessage:
-        """Mapea un modelo ORM a entidad de dominio."""
-        return ChatMessage(
-            id=model.id,
-            session_id=model.session_id,
-            role=model.role,
-            message=model.message,
-            timestamp=model.timestamp,
-        )
-
     def _entity_to_model(self, entity: ChatMessage) -> ChatMemoryModel:
         """Transforma una entidad de dominio en modelo ORM."""
         if entity.id is not None:
@@ -54,7 +44,23 @@ class SQLChatRepository(IChatRepository):
         self._db.add(model)
         self._db.commit()
         self._db.refresh(model)
-        return self._model_to_entity(model)
+        return message_to_entity(model)
+
+    def save_messages(self, messages: Sequence[ChatMessage]) -> List[ChatMessage]:
+        """Inserta varios mensajes en una sola transacción sin releerlos.
+
+        Args:
+            messages (Sequence[ChatMessage]): Mensajes a persistir en orden.
+
+        Returns:
+            List[ChatMessage]: Entidades con los identificadores asignados.
+        """
+        models = [self._entity_to_model(message) for message in messages]
+        self._db.add_all(models)
+        self._db.flush()
+        saved = [message_to_entity(model) for model in models]
+        self._db.commit()
+        return saved
 
     def get_session_history(self, session_id: str, limit: int | None = None) -> List[ChatMessage]:
         """Recupera el historial completo de una sesión.
@@ -66,10 +72,10 @@ class SQLChatRepository(IChatRepository):
         Returns:
             List[ChatMessage]: Mensajes ordenados ascendentemente por fecha.
         """
-        query = self._db.query(ChatMemoryModel).filter(ChatMemoryModel.session_id == session_id).order_by(asc(ChatMemoryModel.timestamp))
+        query = self._db.query(ChatMemoryModel).filter(ChatMemoryModel.session_id == session_id).order_by(*history_ordering())
         if limit is not None:
             query = query.limit(limit)
-        return [self._model_to_entity(model) for model in query.all()]
+        return [message_to_entity(model) for model in query.all()]
 
     def delete_session_history(self, session_id: str) -> int:
         """Elimina todos los mensajes de una sesión específica.
@@ -85,9 +91,46 @@ class SQLChatRepository(IChatRepository):
             .filter(ChatMemoryModel.session_id == session_id)
             .delete(synchronize_session=False)
         )
+        self._db.query(ChatSummaryModel).filter(ChatSummaryModel.session_id == session_id).delete(synchronize_session=False)
         self._db.commit()
         return int(deleted)
 
+    def get_summary(self, session_id: str) -> Optional[ConversationSummary]:
+        """Obtiene el resumen acumulado de una sesión, si existe."""
+        model = self._db.get(ChatSummaryModel, session_id)
+        return summary_to_entity(model) if model is not None else None
+
+    def save_summary(self, summary: ConversationSummary) -> ConversationSummary:
+        """Crea o reemplaza el resumen de una sesión."""
+        model = self._db.merge(summary_to_model(summary))
+        self._db.commit()
+        return summary_to_entity(model)
+
+    def get_history_page(
+        self,
+        session_id: str,
+        limit: int,
+        before: Optional[HistoryCursor] = None,
+        after: Optional[HistoryCursor] = None,
+        newest_first: bool = False,
+    ) -> List[ChatMessage]:
+        """Obtiene una página del historial mediante paginación por rango (keyset).
+
+        Args:
+            session_id (str): Identificador de la conversación.
+            limit (int): Cantidad máxima de mensajes de la página.
+            before (Optional[HistoryCursor]): Solo mensajes anteriores al cursor.
+            after (Optional[HistoryCursor]): Solo mensajes posteriores al cursor.
+            newest_first (bool): Ordena del más reciente al más antiguo.
+
+        Returns:
+            List[ChatMessage]: Mensajes de la página en el orden solicitado.
+        """
+        conditions = history_page_conditions(session_id, before, after)
+        ordering = history_ordering(newest_first)
+        query = self._db.query(ChatMemoryModel).filter(*conditions).order_by(*ordering).limit(limit)
+        return [message_to_entity(model) for model in query.all()]
+
     def get_recent_messages(self, session_id: str, count: int) -> List[ChatMessage]:
         """Obtiene los mensajes más recientes de una sesión en orden cronológico.
 
@@ -101,9 +144,9 @@ class SQLChatRepository(IChatRepository):
         query = (
             self._db.query(ChatMemoryModel)
             .filter(ChatMemoryModel.session_id == session_id)
-            .order_by(desc(ChatMemoryModel.timestamp))
+            .order_by(*history_ordering(newest_first=True))
             .limit(count)
         )
         models = list(query.all())
         models.reverse()
-        return [self._model_to_entity(model) for model in models]
+        return [message_to_entity(model) for model in models]
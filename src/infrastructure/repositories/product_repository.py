@@ -1,19 +1,35 @@
 """Implementación de repositorio de productos respaldada por SQLAlchemy."""
 from __future__ import annotations
 
-from typing import List, Optional
+from typing import Any, Dict, List, Optional, Sequence
 
+from sqlalchemy import and_, asc, desc, insert, or_, select, update
+from sqlalchemy.dialects import postgresql, sqlite
 from sqlalchemy.orm import Session
 
-from src.domain.entities import Product
+from src.domain.entities import (
+    INSUFFICIENT_STOCK_MESSAGE,
+    PRODUCT_FIELDS,
+    Product,
+    ProductCursor,
+    StockAdjustment,
+    StockAdjustmentResult,
+)
 from src.domain.repositories import IProductRepository
 
 from ..db.models import ProductModel
 
 
+_UPSERT_INSERTS = {"sqlite": sqlite.insert, "postgresql": postgresql.insert}
+
+
 class SQLProductRepository(IProductRepository):
     """Repositorio concreto que persiste productos usando sesiones de SQLAlchemy."""
 
+    # Filas por sentencia: mantiene 9 columnas x filas bajo el límite de
+    # parámetros de SQLite antiguos (999).
+    upsert_rows_per_statement = 100
+
     def __init__(self, db_session: Session) -> None:
         """Inicializa el repositorio con una sesión activa.
 
@@ -63,6 +79,47 @@ class SQLProductRepository(IProductRepository):
         """
         return [self._model_to_entity(model) for model in self._db.query(ProductModel).all()]
 
+    def get_page(
+        self,
+        limit: int,
+        sort_by: str = "id",
+        descending: bool = False,
+        after: Optional[ProductCursor] = None,
+        fields: Optional[Sequence[str]] = None,
+    ) -> List[Dict[str, Any]]:
+        """Obtiene una página del catálogo leyendo solo las columnas pedidas.
+
+        Args:
+            limit (int): Cantidad máxima de productos de la página.
+            sort_by (str): Campo de orden; el identificador desempata.
+            descending (bool): Ordena de mayor a menor.
+            after (Optional[ProductCursor]): Solo productos posteriores al cursor.
+            fields (Optional[Sequence[str]]): Columnas a leer; siempre se incluyen
+                ``id`` y el campo de orden. ``None`` lee todas.
+
+        Returns:
+            List[Dict[str, Any]]: Filas con las columnas solicitadas.
+        """
+        requested = set(fields) | {"id", sort_by} if fields is not None else set(PRODUCT_FIELDS)
+        columns = [getattr(ProductModel, name) for name in PRODUCT_FIELDS if name in requested]
+        sort_column = getattr(ProductModel, sort_by)
+        statement = select(*columns)
+        if after is not None:
+            if descending:
+                statement = statement.where(
+                    or_(sort_column < after.value, and_(sort_column == after.value, ProductModel.id < after.product_id))
+                )
+            else:
+                statement = statement.where(
+                    or_(sort_column > after.value, and_(sort_column == after.value, ProductModel.id > after.product_id))
+                )
+        direction = desc if descending else asc
+        if sort_by == "id":
+            statement = statement.order_by(direction(ProductModel.id))
+        else:
+            statement = statement.order_by(direction(sort_column), direction(ProductModel.id))
+        return [dict(row) for row in self._db.execute(statement.limit(limit)).mappings()]
+
     def get_by_id(self, product_id: int) -> Optional[Product]:
         """Busca un producto por su identificador.
 
@@ -114,6 +171,85 @@ class SQLProductRepository(IProductRepository):
         self._db.refresh(model)
         return self._model_to_entity(model)
 
+    def upsert_many(self, products: Sequence[Product]) -> int:
+        """Inserta o actualiza un lote con sentencias de varias filas en una transacción.
+
+        Los productos con ``id`` usan ``INSERT ... ON CONFLICT (id) DO UPDATE``
+        en SQLite y PostgreSQL; en otros motores se recurre a ``merge``. Ante
+        cualquier error se revierte el lote completo.
+
+        Args:
+            products (Sequence[Product]): Productos validados.
+
+        Returns:
+            int: Cantidad de productos escritos.
+        """
+        rows = [{name: getattr(product, name) for name in PRODUCT_FIELDS} for product in products]
+        new_rows = [{key: value for key, value in row.items() if key != "id"} for row in rows if row["id"] is None]
+        keyed_rows = [row for row in rows if row["id"] is not None]
+        dialect_insert = _UPSERT_INSERTS.get(self._db.get_bind().dialect.name)
+        step = self.upsert_rows_per_statement
+        try:
+            for start in range(0, len(new_rows), step):
+                self._db.execute(insert(ProductModel), new_rows[start : start + step])
+            for start in range(0, len(keyed_rows), step):
+                chunk = keyed_rows[start : start + step]
+                if dialect_insert is None:
+                    for row in chunk:
+                        self._db.merge(ProductModel(**row))
+                    continue
+                statement = dialect_insert(ProductModel).values(chunk)
+                updates = {name: statement.excluded[name] for name in PRODUCT_FIELDS if name != "id"}
+                self._db.execute(statement.on_conflict_do_update(index_elements=[ProductModel.id], set_=updates))
+            self._db.commit()
+        except Exception:
+            self._db.rollback()
+            raise
+        return len(rows)
+
+    def adjust_stock_many(self, adjustments: Sequence[StockAdjustment]) -> List[StockAdjustmentResult]:
+        """Aplica los ajustes con ``UPDATE`` condicionales en una sola transacción.
+
+        Los descuentos se ejecutan como ``SET stock = stock - :n WHERE stock >= :n``,
+        por lo que la base de datos garantiza la regla de ``reduce_stock`` aun
+        con compras concurrentes sobre el mismo producto, sin leer antes la fila.
+        Solo los ajustes rechazados consultan el stock para informar el motivo.
+
+        Args:
+            adjustments (Sequence[StockAdjustment]): Ajustes en el orden a aplicar.
+
+        Returns:
+            List[StockAdjustmentResult]: Un resultado por ajuste, en el mismo orden.
+        """
+        returning = self._db.get_bind().dialect.update_returning
+        results: List[StockAdjustmentResult] = []
+        try:
+            for adjustment in adjustments:
+                conditions = [ProductModel.id == adjustment.product_id]
+                if adjustment.is_reduction:
+                    conditions.append(ProductModel.stock >= adjustment.quantity)
+                statement = update(ProductModel).where(*conditions).values(stock=ProductModel.stock + adjustment.delta)
+                if returning:
+                    stock = self._db.execute(statement.returning(ProductModel.stock)).scalar_one_or_none()
+                else:
+                    updated = self._db.execute(statement).rowcount
+                    stock = self._current_stock(adjustment.product_id) if updated else None
+                if stock is not None:
+                    results.append(StockAdjustmentResult(adjustment.product_id, adjustment.delta, True, stock))
+                    continue
+                current = self._current_stock(adjustment.product_id)
+                error = "Producto no encontrado" if current is None else INSUFFICIENT_STOCK_MESSAGE
+                results.append(StockAdjustmentResult(adjustment.product_id, adjustment.delta, False, current, error))
+            self._db.commit()
+        except Exception:
+            self._db.rollback()
+            raise
+        return results
+
+    def _current_stock(self, product_id: int) -> Optional[int]:
+        """Lee solo la columna de stock de un producto."""
+        return self._db.execute(select(ProductModel.stock).where(ProductModel.id == product_id)).scalar_one_or_none()
+
     def delete(self, product_id: int) -> bool:
         """Elimina un producto por su identificador.
 
@@ -0,0 +1,103 @@
+"""Adaptadores que exponen repositorios síncronos con el contrato asíncrono."""
+from __future__ import annotations
+
+from typing import List, Optional, Sequence
+
+from src.domain.entities import ChatMessage, ConversationSummary, HistoryCursor, Product
+from src.domain.repositories import IAsyncChatRepository, IAsyncProductRepository, IChatRepository, IProductRepository
+
+
+class AsyncProductRepositoryAdapter(IAsyncProductRepository):
+    """Presenta un ``IProductRepository`` como ``IAsyncProductRepository``.
+
+    Las llamadas se ejecutan en línea, por lo que solo conviene envolver
+    repositorios que no bloquean (en memoria o servidos desde la caché de
+    catálogo); los respaldados por SQL tienen su propia versión asíncrona.
+    """
+
+    def __init__(self, repository: IProductRepository) -> None:
+        """Inicializa el adaptador.
+
+        Args:
+            repository (IProductRepository): Repositorio síncrono a envolver.
+        """
+        self._repository = repository
+
+    async def get_all(self) -> List[Product]:
+        """Delega en ``IProductRepository.get_all``."""
+        return self._repository.get_all()
+
+    async def get_by_id(self, product_id: int) -> Optional[Product]:
+        """Delega en ``IProductRepository.get_by_id``."""
+        return self._repository.get_by_id(product_id)
+
+    async def get_by_brand(self, brand: str) -> List[Product]:
+        """Delega en ``IProductRepository.get_by_brand``."""
+        return self._repository.get_by_brand(brand)
+
+    async def get_by_category(self, category: str) -> List[Product]:
+        """Delega en ``IProductRepository.get_by_category``."""
+        return self._repository.get_by_category(category)
+
+    async def save(self, product: Product) -> Product:
+        """Delega en ``IProductRepository.save``."""
+        return self._repository.save(product)
+
+    async def delete(self, product_id: int) -> bool:
+        """Delega en ``IProductRepository.delete``."""
+        return self._repository.delete(product_id)
+
+
+class AsyncChatRepositoryAdapter(IAsyncChatRepository):
+    """Presenta un ``IChatRepository`` como ``IAsyncChatRepository``.
+
+    Las llamadas se ejecutan en línea, con la misma salvedad que
+    ``AsyncProductRepositoryAdapter``.
+    """
+
+    def __init__(self, repository: IChatRepository) -> None:
+        """Inicializa el adaptador.
+
+        Args:
+            repository (IChatRepository): Repositorio síncrono a envolver.
+        """
+        self._repository = repository
+
+    async def save_message(self, message: ChatMessage) -> ChatMessage:
+        """Delega en ``IChatRepository.save_message``."""
+        return self._repository.save_message(message)
+
+    async def save_messages(self, messages: Sequence[ChatMessage]) -> List[ChatMessage]:
+        """Delega en ``IChatRepository.save_messages``."""
+        return self._repository.save_messages(messages)
+
+    async def get_session_history(self, session_id: str, limit: Optional[int] = None) -> List[ChatMessage]:
+        """Delega en ``IChatRepository.get_session_history``."""
+        return self._repository.get_session_history(session_id, limit)
+
+    async def delete_session_history(self, session_id: str) -> int:
+        """Delega en ``IChatRepository.delete_session_history``."""
+        return self._repository.delete_session_history(session_id)
+
+    async def get_history_page(
+        self,
+        session_id: str,
+        limit: int,
+        before: Optional[HistoryCursor] = None,
+        after: Optional[HistoryCursor] = None,
+        newest_first: bool = False,
+    ) -> List[ChatMessage]:
+        """Delega en ``IChatRepository.get_history_page``."""
+        return self._repository.get_history_page(session_id, limit, before=before, after=after, newest_first=newest_first)
+
+    async def get_summary(self, session_id: str) -> Optional[ConversationSummary]:
+        """Delega en ``IChatRepository.get_summary``."""
+        return self._repository.get_summary(session_id)
+
+    async def save_summary(self, summary: ConversationSummary) -> ConversationSummary:
+        """Delega en ``IChatRepository.save_summary``."""
+        return self._repository.save_summary(summary)
+
+    async def get_recent_messages(self, session_id: str, count: int) -> List[ChatMessage]:
+        """Delega en ``IChatRepository.get_recent_messages``."""
+        return self._repository.get_recent_messages(session_id, count)
@@ -0,0 +1,219 @@
+"""Decorador de historial de chat que persiste los mensajes en segundo plano."""
+from __future__ import annotations
+
+import asyncio
+import logging
+import weakref
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Sequence
+
+from src.domain.entities import ChatMessage, ConversationSummary, HistoryCursor
+from src.domain.repositories import IAsyncChatRepository
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(eq=False)
+class _PendingBatch:
+    """Lote de mensajes encolado; ``settled`` indica que ya no debe escribirse."""
+
+    session_id: str
+    messages: List[ChatMessage]
+    settled: bool = False
+
+
+class WriteBehindChatRepository(IAsyncChatRepository):
+    """Repositorio que encola las escrituras y las persiste con reintentos.
+
+    ``save_messages`` retorna inmediatamente y una tarea en segundo plano
+    escribe cada lote en el repositorio envuelto. Las lecturas combinan los
+    mensajes aún pendientes para conservar la lectura de lo propio escrito;
+    la paginación, que necesita identificadores para sus cursores, persiste
+    antes los lotes pendientes de la sesión. Cuando la cola está llena el lote
+    se persiste en línea como contrapresión.
+
+    Cada escritura y cada borrado toman el candado de su sesión, de modo que
+    un borrado espera al lote en vuelo y los lotes posteriores lo encuentran
+    ya descartado.
+    """
+
+    def __init__(
+        self,
+        repository: IAsyncChatRepository,
+        max_queue_size: int = 1000,
+        max_attempts: int = 3,
+        retry_delay: float = 0.1,
+    ) -> None:
+        """Inicializa el decorador.
+
+        Args:
+            repository (IAsyncChatRepository): Repositorio que persiste realmente.
+            max_queue_size (int): Lotes máximos en espera antes de escribir en línea.
+            max_attempts (int): Intentos por lote antes de descartarlo.
+            retry_delay (float): Espera base en segundos entre reintentos (exponencial).
+        """
+        self._repository = repository
+        self._max_queue_size = max_queue_size
+        self._max_attempts = max_attempts
+        self._retry_delay = retry_delay
+        self._queue: Optional[asyncio.Queue[_PendingBatch]] = None
+        self._worker: Optional[asyncio.Task[None]] = None
+        self._pending: Dict[str, List[_PendingBatch]] = {}
+        self._locks: "weakref.WeakValueDictionary[str, asyncio.Lock]" = weakref.WeakValueDictionary()
+
+    def _lock(self, session_id: str) -> asyncio.Lock:
+        """Retorna el candado de la sesión; se libera cuando nadie lo usa."""
+        lock = self._locks.get(session_id)
+        if lock is None:
+            lock = self._locks[session_id] = asyncio.Lock()
+        return lock
+
+    def _ensure_worker(self) -> asyncio.Queue[_PendingBatch]:
+        """Crea la cola y la tarea consumidora en el event loop actual."""
+        if self._queue is None or self._worker is None or self._worker.done():
+            self._queue = asyncio.Queue(self._max_queue_size)
+            self._worker = asyncio.get_running_loop().create_task(self._drain(self._queue))
+        return self._queue
+
+    async def _drain(self, queue: asyncio.Queue[_PendingBatch]) -> None:
+        """Consume lotes de la cola hasta que la tarea se cancele."""
+        while True:
+            batch = await queue.get()
+            try:
+                await self._write(batch)
+            finally:
+                self._forget(batch)
+                queue.task_done()
+
+    async def _write(self, batch: _PendingBatch) -> None:
+        """Persiste un lote aplicando reintentos con espera exponencial.
+
+        Cada intento verifica bajo el candado de la sesión que el lote siga
+        vigente, por lo que un borrado ocurrido durante la espera lo descarta.
+        """
+        for attempt in range(1, self._max_attempts + 1):
+            async with self._lock(batch.session_id):
+                if batch.settled:
+                    return
+                try:
+                    await self._repository.save_messages(batch.messages)
+                    batch.settled = True
+                    return
+                except Exception:  # noqa: BLE001 - se reintenta cualquier falla de E/S
+                    if attempt == self._max_attempts:
+                        batch.settled = True
+                        logger.exception("Se descartó un lote de %d mensajes de la sesión %s", len(batch.messages), batch.session_id)
+                        return
+            await asyncio.sleep(self._retry_delay * 2 ** (attempt - 1))
+
+    def _forget(self, batch: _PendingBatch) -> None:
+        """Retira el lote del registro de pendientes de su sesión."""
+        pending = self._pending.get(batch.session_id)
+        if pending is None or batch not in pending:
+            return
+        pending.remove(batch)
+        if not pending:
+            del self._pending[batch.session_id]
+
+    def _merge(self, session_id: str, persisted: List[ChatMessage]) -> List[ChatMessage]:
+        """Combina los mensajes persistidos con los pendientes de la sesión."""
+        pending = [message for batch in self._pending.get(session_id, ()) for message in batch.messages]
+        if not pending:
+            return persisted
+        return sorted([*persisted, *pending], key=lambda message: message.timestamp)
+
+    async def _settle(self, session_id: str) -> None:
+        """Persiste en línea los lotes pendientes de la sesión, en orden de llegada."""
+        if session_id not in self._pending:
+            return
+        async with self._lock(session_id):
+            for batch in list(self._pending.get(session_id, ())):
+                if not batch.settled:
+                    await self._repository.save_messages(batch.messages)
+                    batch.settled = True
+                self._forget(batch)
+
+    async def save_message(self, message: ChatMessage) -> ChatMessage:
+        """Encola un único mensaje para persistirlo en segundo plano."""
+        return (await self.save_messages([message]))[0]
+
+    async def save_messages(self, messages: Sequence[ChatMessage]) -> List[ChatMessage]:
+        """Encola un lote de mensajes y retorna sin esperar la escritura.
+
+        Args:
+            messages (Sequence[ChatMessage]): Mensajes de una misma sesión.
+
+        Returns:
+            List[ChatMessage]: Los mismos mensajes, aún sin identificador.
+        """
+        items = list(messages)
+        if not items:
+            return items
+        batch = _PendingBatch(items[0].session_id, items)
+        queue = self._ensure_worker()
+        if queue.full():
+            await self._write(batch)
+            return items
+        self._pending.setdefault(batch.session_id, []).append(batch)
+        queue.put_nowait(batch)
+        return items
+
+    async def get_session_history(self, session_id: str, limit: int | None = None) -> List[ChatMessage]:
+        """Recupera el historial incluyendo los mensajes pendientes de escritura."""
+        history = self._merge(session_id, await self._repository.get_session_history(session_id))
+        return history[:limit] if limit is not None else history
+
+    async def get_recent_messages(self, session_id: str, count: int) -> List[ChatMessage]:
+        """Obtiene los mensajes recientes incluyendo los pendientes de escritura."""
+        recent = self._merge(session_id, await self._repository.get_recent_messages(session_id, count))
+        return recent[-count:]
+
+    async def get_history_page(
+        self,
+        session_id: str,
+        limit: int,
+        before: Optional[HistoryCursor] = None,
+        after: Optional[HistoryCursor] = None,
+        newest_first: bool = False,
+    ) -> List[ChatMessage]:
+        """Persiste los lotes pendientes de la sesión y delega la paginación."""
+        await self._settle(session_id)
+        return await self._repository.get_history_page(session_id, limit, before=before, after=after, newest_first=newest_first)
+
+    async def get_summary(self, session_id: str) -> Optional[ConversationSummary]:
+        """Delega la lectura del resumen al repositorio envuelto."""
+        return await self._repository.get_summary(session_id)
+
+    async def save_summary(self, summary: ConversationSummary) -> ConversationSummary:
+        """Persiste el resumen directamente; no pasa por la cola de mensajes."""
+        return await self._repository.save_summary(summary)
+
+    async def delete_session_history(self, session_id: str) -> int:
+        """Elimina el historial y descarta los lotes pendientes de la sesión.
+
+        Espera al lote de la sesión que esté escribiéndose, de modo que ninguna
+        escritura previa aparezca después del borrado.
+        """
+        async with self._lock(session_id):
+            discarded = 0
+            for batch in self._pending.pop(session_id, []):
+                batch.settled = True
+                discarded += len(batch.messages)
+            return discarded + await self._repository.delete_session_history(session_id)
+
+    async def flush(self) -> None:
+        """Espera a que todos los lotes encolados se hayan procesado."""
+        if self._queue is not None and self._worker is not None and not self._worker.done():
+            await self._queue.join()
+
+    async def aclose(self) -> None:
+        """Vacía la cola pendiente y detiene la tarea consumidora."""
+        await self.flush()
+        if self._worker is not None:
+            self._worker.cancel()
+            try:
+                await self._worker
+            except asyncio.CancelledError:
+                pass
+        self._worker = None
+        self._queue = None
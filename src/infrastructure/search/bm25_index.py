@@ -0,0 +1,207 @@
+"""Índice invertido con puntuación BM25 para recuperar productos relevantes."""
+from __future__ import annotations
+
+import heapq
+import math
+import threading
+from collections import Counter
+from typing import Container, Dict, List, Optional, Sequence, Tuple
+
+from src.domain.entities import Product
+
+from ..cache.catalog_cache import CatalogSnapshot
+from .text import product_text, tokenize
+
+
+class BM25Index:
+    """Índice invertido incremental que puntúa documentos con BM25.
+
+    Attributes:
+        k1 (float): Saturación de la frecuencia de términos.
+        b (float): Peso de la normalización por longitud de documento.
+    """
+
+    def __init__(self, k1: float = 1.2, b: float = 0.75) -> None:
+        """Inicializa un índice vacío.
+
+        Args:
+            k1 (float): Parámetro de saturación de BM25.
+            b (float): Parámetro de normalización por longitud.
+        """
+        self.k1 = k1
+        self.b = b
+        self._postings: Dict[str, Dict[int, int]] = {}
+        self._doc_terms: Dict[int, Counter] = {}
+        self._doc_lengths: Dict[int, int] = {}
+        self._total_length = 0
+
+    def __len__(self) -> int:
+        return len(self._doc_lengths)
+
+    def add(self, doc_id: int, tokens: Sequence[str]) -> None:
+        """Indexa (o reindexa) un documento.
+
+        Args:
+            doc_id (int): Identificador del documento.
+            tokens (Sequence[str]): Términos del documento.
+        """
+        if doc_id in self._doc_lengths:
+            self.remove(doc_id)
+        frequencies = Counter(tokens)
+        for term, frequency in frequencies.items():
+            self._postings.setdefault(term, {})[doc_id] = frequency
+        self._doc_terms[doc_id] = frequencies
+        self._doc_lengths[doc_id] = len(tokens)
+        self._total_length += len(tokens)
+
+    def remove(self, doc_id: int) -> None:
+        """Elimina un documento del índice si existe.
+
+        Args:
+            doc_id (int): Identificador del documento.
+        """
+        frequencies = self._doc_terms.pop(doc_id, None)
+        if frequencies is None:
+            return
+        for term in frequencies:
+            postings = self._postings[term]
+            postings.pop(doc_id, None)
+            if not postings:
+                del self._postings[term]
+        self._total_length -= self._doc_lengths.pop(doc_id)
+
+    def search(
+        self,
+        query_tokens: Sequence[str],
+        limit: int,
+        allowed: Optional[Container[int]] = None,
+    ) -> List[Tuple[int, float]]:
+        """Puntúa los documentos que contienen algún término de la consulta.
+
+        Args:
+            query_tokens (Sequence[str]): Términos de la consulta.
+            limit (int): Cantidad máxima de resultados.
+            allowed (Optional[Container[int]]): Documentos elegibles; ``None`` admite todos.
+
+        Returns:
+            List[Tuple[int, float]]: Pares ``(doc_id, score)`` de mayor a menor.
+        """
+        total_docs = len(self._doc_lengths)
+        if total_docs == 0 or limit <= 0:
+            return []
+        average_length = self._total_length / total_docs or 1.0
+        scores: Dict[int, float] = {}
+        for term, query_frequency in Counter(query_tokens).items():
+            postings = self._postings.get(term)
+            if not postings:
+                continue
+            idf = math.log(1 + (total_docs - len(postings) + 0.5) / (len(postings) + 0.5))
+            for doc_id, frequency in postings.items():
+                if allowed is not None and doc_id not in allowed:
+                    continue
+                length_norm = 1 - self.b + self.b * self._doc_lengths[doc_id] / average_length
+                weight = idf * frequency * (self.k1 + 1) / (frequency + self.k1 * length_norm)
+                scores[doc_id] = scores.get(doc_id, 0.0) + weight * query_frequency
+        return heapq.nlargest(limit, scores.items(), key=lambda item: (item[1], -item[0]))
+
+
+class BM25ProductRetriever:
+    """Recuperador de productos que mantiene un índice BM25 del catálogo.
+
+    Implementa ``CatalogListener``: el índice se reconstruye con cada carga
+    completa del catálogo y se actualiza producto a producto ante altas,
+    cambios y bajas. Las consultas sobre la instantánea completa solo
+    recorren las listas de los términos consultados; las restringidas a otra
+    secuencia de candidatos además la recorren una vez.
+    """
+
+    def __init__(self, k1: float = 1.2, b: float = 0.75) -> None:
+        """Inicializa el recuperador con un índice vacío.
+
+        Args:
+            k1 (float): Parámetro de saturación de BM25.
+            b (float): Parámetro de normalización por longitud.
+        """
+        self.k1 = k1
+        self.b = b
+        self._index = BM25Index(k1=k1, b=b)
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._index)
+
+    def rebuild(self, products: Sequence[Product]) -> None:
+        """Reconstruye el índice a partir del catálogo completo.
+
+        Args:
+            products (Sequence[Product]): Productos del catálogo.
+        """
+        index = BM25Index(k1=self.k1, b=self.b)
+        for product in products:
+            if product.id is not None:
+                index.add(product.id, tokenize(product_text(product)))
+        with self._lock:
+            self._index = index
+
+    def upsert_many(self, products: Sequence[Product]) -> None:
+        """Indexa o reindexa un lote de productos.
+
+        Args:
+            products (Sequence[Product]): Productos a indexar.
+        """
+        documents = [(product.id, tokenize(product_text(product))) for product in products if product.id is not None]
+        with self._lock:
+            for product_id, tokens in documents:
+                self._index.add(product_id, tokens)
+
+    def remove(self, product_id: int) -> None:
+        """Retira un producto del índice.
+
+        Args:
+            product_id (int): Identificador del producto.
+        """
+        with self._lock:
+            self._index.remove(product_id)
+
+    def retrieve(self, query: str, products: Sequence[Product], limit: int) -> List[Product]:
+        """Selecciona los ``limit`` candidatos más relevantes para la consulta.
+
+        Con una ``CatalogSnapshot`` se rankea el índice completo y solo los
+        ``limit`` mejores se resuelven contra la instantánea; con otra
+        secuencia el ranking se restringe a sus productos.
+
+        Args:
+            query (str): Texto de la consulta (mensaje y contexto reciente).
+            products (Sequence[Product]): Catálogo candidato.
+            limit (int): Cantidad máxima de productos a retornar.
+
+        Returns:
+            List[Product]: Candidatos ordenados por relevancia; vacía si ningún
+                término coincide.
+        """
+        tokens = tokenize(query)
+        if isinstance(products, CatalogSnapshot):
+            with self._lock:
+                ranked = self._index.search(tokens, limit)
+            resolved = (products.get(product_id) for product_id, _ in ranked)
+            return [product for product in resolved if product is not None]
+        candidates = {product.id: product for product in products if product.id is not None}
+        with self._lock:
+            ranked = self._index.search(tokens, limit, allowed=candidates)
+        return [candidates[product_id] for product_id, _ in ranked]
+
+    def on_catalog_loaded(self, snapshot: CatalogSnapshot) -> None:
+        """Reconstruye el índice a partir de una instantánea completa."""
+        self.rebuild(snapshot.products)
+
+    def on_product_saved(self, product: Product, version: int) -> None:
+        """Reindexa el producto guardado."""
+        self.upsert_many((product,))
+
+    def on_products_saved(self, products: Sequence[Product], version: int) -> None:
+        """Reindexa los productos del lote."""
+        self.upsert_many(products)
+
+    def on_product_deleted(self, product_id: int, version: int) -> None:
+        """Retira el producto eliminado."""
+        self.remove(product_id)
@@ -0,0 +1,284 @@
+"""Vista columnar del catálogo sobre arreglos NumPy para filtrar y ordenar en bloque."""
+from __future__ import annotations
+
+import threading
+from dataclasses import dataclass, field, replace
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from src.domain.entities import Product
+
+from ..cache.catalog_cache import CatalogSnapshot
+
+COLUMNAR_DIMENSIONS = ("brand", "category", "size", "color")
+_NUMERIC_SORT_FIELDS = ("id", "price", "stock")
+
+
+@dataclass(frozen=True)
+class _Columns:
+    """Columnas del catálogo; una fila por producto, las bajas quedan inactivas.
+
+    Attributes:
+        products (Tuple[Product, ...]): Entidad de cada fila.
+        ids (np.ndarray): Identificadores (``int64``).
+        price (np.ndarray): Precios (``float64``).
+        stock (np.ndarray): Stock (``int64``).
+        live (np.ndarray): Filas vigentes (``bool``).
+        codes (Dict[str, np.ndarray]): Código entero (``int32``) de cada dimensión textual.
+        vocab (Dict[str, Dict[str, int]]): Código de cada valor normalizado por dimensión.
+        rows (Dict[int, int]): Fila de cada identificador vigente.
+    """
+
+    products: Tuple[Product, ...] = ()
+    ids: np.ndarray = field(default_factory=lambda: np.empty(0, dtype=np.int64))
+    price: np.ndarray = field(default_factory=lambda: np.empty(0, dtype=np.float64))
+    stock: np.ndarray = field(default_factory=lambda: np.empty(0, dtype=np.int64))
+    live: np.ndarray = field(default_factory=lambda: np.empty(0, dtype=bool))
+    codes: Dict[str, np.ndarray] = field(default_factory=lambda: {d: np.empty(0, dtype=np.int32) for d in COLUMNAR_DIMENSIONS})
+    vocab: Dict[str, Dict[str, int]] = field(default_factory=lambda: {d: {} for d in COLUMNAR_DIMENSIONS})
+    rows: Dict[int, int] = field(default_factory=dict)
+
+
+def _normalize(value: object) -> str:
+    """Normaliza un valor textual para compararlo sin distinguir mayúsculas."""
+    return str(value).strip().lower()
+
+
+class ColumnarCatalog:
+    """Modelo de lectura columnar del catálogo mantenido como ``CatalogListener``.
+
+    Precio y stock se guardan en arreglos NumPy y marca, categoría, talla y
+    color se codifican con diccionario como enteros, de modo que filtrar es
+    combinar máscaras booleanas y ordenar o elegir los N primeros se resuelve
+    con ``lexsort`` y ``partition`` en lugar de recorrer entidades en Python.
+    Cada cambio publica columnas nuevas (copia en escritura) para que las
+    lecturas concurrentes nunca vean un estado a medias; las filas de
+    productos eliminados se compactan en la siguiente carga completa.
+    """
+
+    def __init__(self) -> None:
+        """Inicializa una vista vacía."""
+        self._lock = threading.Lock()
+        self._columns = _Columns()
+
+    def __len__(self) -> int:
+        return len(self._columns.rows)
+
+    @staticmethod
+    def _build(products: Sequence[Product]) -> _Columns:
+        """Construye las columnas de un catálogo completo."""
+        items = tuple(product for product in products if product.id is not None)
+        count = len(items)
+        codes: Dict[str, np.ndarray] = {}
+        vocab: Dict[str, Dict[str, int]] = {}
+        for dimension in COLUMNAR_DIMENSIONS:
+            mapping: Dict[str, int] = {}
+            codes[dimension] = np.fromiter(
+                (mapping.setdefault(_normalize(getattr(product, dimension)), len(mapping)) for product in items),
+                dtype=np.int32,
+                count=count,
+            )
+            vocab[dimension] = mapping
+        return _Columns(
+            products=items,
+            ids=np.fromiter((product.id for product in items), dtype=np.int64, count=count),
+            price=np.fromiter((product.price for product in items), dtype=np.float64, count=count),
+            stock=np.fromiter((product.stock for product in items), dtype=np.int64, count=count),
+            live=np.ones(count, dtype=bool),
+            codes=codes,
+            vocab=vocab,
+            rows={product.id: row for row, product in enumerate(items)},
+        )
+
+    @staticmethod
+    def _with_saved(columns: _Columns, saved: Sequence[Product]) -> _Columns:
+        """Deriva columnas con los productos reemplazados en su fila o agregados al final.
+
+        Cada columna se copia una sola vez por lote.
+        """
+        vocab = dict(columns.vocab)
+        product_codes: Dict[str, List[int]] = {dimension: [] for dimension in COLUMNAR_DIMENSIONS}
+        for product in saved:
+            for dimension in COLUMNAR_DIMENSIONS:
+                key = _normalize(getattr(product, dimension))
+                if key not in vocab[dimension]:
+                    vocab[dimension] = {**vocab[dimension], key: len(vocab[dimension])}
+                product_codes[dimension].append(vocab[dimension][key])
+
+        rows = dict(columns.rows)
+        products = list(columns.products)
+        target: List[int] = []
+        for product in saved:
+            row = rows.get(product.id)
+            if row is None:
+                row = rows[product.id] = len(products)
+                products.append(product)
+            else:
+                products[row] = product
+            target.append(row)
+
+        grown = len(products) - len(columns.products)
+        index = np.asarray(target, dtype=np.int64)
+
+        def extend(column: np.ndarray, values: Sequence, fill: object = 0) -> np.ndarray:
+            updated = np.append(column, np.full(grown, fill, dtype=column.dtype)) if grown else column.copy()
+            updated[index] = values
+            return updated
+
+        return replace(
+            columns,
+            products=tuple(products),
+            ids=extend(columns.ids, [product.id for product in saved]),
+            price=extend(columns.price, [product.price for product in saved]),
+            stock=extend(columns.stock, [product.stock for product in saved]),
+            live=extend(columns.live, [True] * len(saved), False),
+            codes={dimension: extend(columns.codes[dimension], product_codes[dimension]) for dimension in COLUMNAR_DIMENSIONS},
+            vocab=vocab,
+            rows=rows,
+        )
+
+    @staticmethod
+    def _without(columns: _Columns, product_id: int) -> _Columns:
+        """Deriva columnas con la fila del producto marcada como inactiva."""
+        row = columns.rows.get(product_id)
+        if row is None:
+            return columns
+        live = columns.live.copy()
+        live[row] = False
+        rows = dict(columns.rows)
+        del rows[product_id]
+        return replace(columns, live=live, rows=rows)
+
+    def rebuild(self, products: Sequence[Product]) -> None:
+        """Reconstruye las columnas a partir del catálogo completo.
+
+        Args:
+            products (Sequence[Product]): Productos del catálogo.
+        """
+        columns = self._build(products)
+        with self._lock:
+            self._columns = columns
+
+    def upsert(self, product: Product) -> None:
+        """Aplica la creación o actualización de un producto.
+
+        Args:
+            product (Product): Producto persistido.
+        """
+        self.upsert_many((product,))
+
+    def upsert_many(self, products: Sequence[Product]) -> None:
+        """Aplica un lote de productos creados o actualizados con una sola copia de columnas.
+
+        Args:
+            products (Sequence[Product]): Productos persistidos.
+        """
+        items = [product for product in products if product.id is not None]
+        if not items:
+            return
+        with self._lock:
+            self._columns = self._with_saved(self._columns, items)
+
+    def remove(self, product_id: int) -> None:
+        """Retira un producto de la vista.
+
+        Args:
+            product_id (int): Identificador del producto eliminado.
+        """
+        with self._lock:
+            self._columns = self._without(self._columns, product_id)
+
+    def _mask(
+        self,
+        brand: Optional[str] = None,
+        category: Optional[str] = None,
+        available: Optional[bool] = None,
+        min_price: Optional[float] = None,
+        max_price: Optional[float] = None,
+    ) -> Tuple[_Columns, np.ndarray]:
+        """Retorna las columnas vigentes y la máscara de las filas que cumplen los filtros."""
+        columns = self._columns
+        selected = columns.live.copy()
+        for dimension, value in (("brand", brand), ("category", category)):
+            if value is None:
+                continue
+            code = columns.vocab[dimension].get(_normalize(value))
+            if code is None:
+                selected[:] = False
+                return columns, selected
+            selected &= columns.codes[dimension] == code
+        if available is not None:
+            selected &= (columns.stock > 0) == available
+        if min_price is not None:
+            selected &= columns.price >= min_price
+        if max_price is not None:
+            selected &= columns.price <= max_price
+        return columns, selected
+
+    def select(
+        self,
+        brand: Optional[str] = None,
+        category: Optional[str] = None,
+        available: Optional[bool] = None,
+        min_price: Optional[float] = None,
+        max_price: Optional[float] = None,
+        sort_by: Optional[str] = None,
+        descending: bool = False,
+        limit: Optional[int] = None,
+    ) -> List[Product]:
+        """Filtra, ordena y recorta el catálogo con operaciones vectorizadas.
+
+        Los campos numéricos se ordenan con ``lexsort`` (el identificador
+        desempata) y, si hay ``limit``, solo las filas que superan el umbral de
+        ``partition`` participan del orden final. ``name`` se ordena en Python
+        sobre las filas ya filtradas.
+
+        Args:
+            brand (Optional[str]): Marca exacta, sin distinguir mayúsculas.
+            category (Optional[str]): Categoría exacta, sin distinguir mayúsculas.
+            available (Optional[bool]): Filtra por disponibilidad si se indica.
+            min_price (Optional[float]): Precio mínimo inclusivo.
+            max_price (Optional[float]): Precio máximo inclusivo.
+            sort_by (Optional[str]): ``id``, ``name``, ``price`` o ``stock``; ``None``
+                conserva el orden del catálogo.
+            descending (bool): Ordena de mayor a menor.
+            limit (Optional[int]): Cantidad máxima de productos a retornar.
+
+        Returns:
+            List[Product]: Productos seleccionados.
+        """
+        columns, selected = self._mask(brand, category, available, min_price, max_price)
+        rows = np.flatnonzero(selected)
+        if sort_by in _NUMERIC_SORT_FIELDS:
+            keys = {"id": columns.ids, "price": columns.price, "stock": columns.stock}[sort_by][rows]
+            ids = columns.ids[rows]
+            if descending:
+                keys, ids = -keys, -ids
+            if limit is not None and limit < len(rows):
+                threshold = np.partition(keys, limit - 1)[limit - 1]
+                candidates = np.flatnonzero(keys <= threshold)
+                rows, keys, ids = rows[candidates], keys[candidates], ids[candidates]
+            rows = rows[np.lexsort((ids, keys))]
+        elif sort_by == "name":
+            products = sorted((columns.products[row] for row in rows), key=lambda product: (product.name, product.id), reverse=descending)
+            return products[:limit] if limit is not None else products
+        if limit is not None:
+            rows = rows[:limit]
+        return [columns.products[row] for row in rows.tolist()]
+
+    def on_catalog_loaded(self, snapshot: CatalogSnapshot) -> None:
+        """Reconstruye las columnas a partir de una instantánea completa."""
+        self.rebuild(snapshot.products)
+
+    def on_product_saved(self, product: Product, version: int) -> None:
+        """Actualiza o agrega la fila del producto guardado."""
+        self.upsert(product)
+
+    def on_products_saved(self, products: Sequence[Product], version: int) -> None:
+        """Actualiza o agrega las filas de los productos del lote."""
+        self.upsert_many(products)
+
+    def on_product_deleted(self, product_id: int, version: int) -> None:
+        """Marca como inactiva la fila del producto eliminado."""
+        self.remove(product_id)
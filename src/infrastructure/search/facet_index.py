@@ -0,0 +1,164 @@
+"""Índice de mapas de bits para búsquedas facetadas sobre el catálogo."""
+from __future__ import annotations
+
+from itertools import islice
+from typing import Dict, Iterator, Optional
+
+from src.application.retrieval import FACET_DIMENSIONS, FacetQuery, FacetResult
+from src.domain.entities import Product
+
+from .slotted_index import SlottedProductIndex
+
+
+def _iter_bits(mask: int) -> Iterator[int]:
+    """Recorre las posiciones de los bits encendidos de menor a mayor."""
+    while mask:
+        lowest = mask & -mask
+        yield lowest.bit_length() - 1
+        mask ^= lowest
+
+
+class FacetIndex(SlottedProductIndex):
+    """Índice de facetas basado en mapas de bits (enteros de Python).
+
+    Cada producto ocupa una posición fija y cada valor de marca, categoría,
+    talla, color, rango de precio y disponibilidad mantiene el mapa de bits de
+    los productos que lo tienen. Filtrar es una intersección de mapas y cada
+    conteo de faceta un ``bit_count``, sin recorrer el catálogo. Las
+    posiciones y los eventos del catálogo los gestiona ``SlottedProductIndex``.
+
+    Attributes:
+        price_bucket_width (float): Ancho de los rangos de precio de la faceta.
+    """
+
+    def __init__(self, price_bucket_width: float = 50.0) -> None:
+        """Inicializa un índice vacío.
+
+        Args:
+            price_bucket_width (float): Ancho de los rangos de precio.
+        """
+        self.price_bucket_width = price_bucket_width
+        super().__init__()
+
+    def _clear(self) -> None:
+        """Descarta todos los mapas de bits."""
+        self._all = 0
+        self._available = 0
+        self._values: Dict[str, Dict[str, int]] = {dimension: {} for dimension in FACET_DIMENSIONS}
+        self._labels: Dict[str, Dict[str, str]] = {dimension: {} for dimension in FACET_DIMENSIONS}
+        self._price_buckets: Dict[int, int] = {}
+
+    def _bucket(self, price: float) -> int:
+        """Rango de precio al que pertenece un valor."""
+        return int(price // self.price_bucket_width)
+
+    def _bucket_label(self, bucket: int) -> str:
+        """Etiqueta legible de un rango de precio."""
+        low = bucket * self.price_bucket_width
+        return f"{low:g}-{low + self.price_bucket_width:g}"
+
+    def _index(self, product: Product, slot: int) -> None:
+        """Enciende los bits del producto ubicado en ``slot``."""
+        bit = 1 << slot
+        self._all |= bit
+        if product.is_available():
+            self._available |= bit
+        for dimension in FACET_DIMENSIONS:
+            label = str(getattr(product, dimension))
+            key = label.strip().lower()
+            self._values[dimension][key] = self._values[dimension].get(key, 0) | bit
+            self._labels[dimension].setdefault(key, label)
+        bucket = self._bucket(product.price)
+        self._price_buckets[bucket] = self._price_buckets.get(bucket, 0) | bit
+
+    def _unindex(self, product: Product, slot: int) -> None:
+        """Apaga los bits del producto que ocupaba ``slot``."""
+        bit = 1 << slot
+        self._all &= ~bit
+        self._available &= ~bit
+        for dimension in FACET_DIMENSIONS:
+            key = str(getattr(product, dimension)).strip().lower()
+            remaining = self._values[dimension][key] & ~bit
+            if remaining:
+                self._values[dimension][key] = remaining
+            else:
+                del self._values[dimension][key]
+                del self._labels[dimension][key]
+        bucket = self._bucket(product.price)
+        remaining = self._price_buckets[bucket] & ~bit
+        if remaining:
+            self._price_buckets[bucket] = remaining
+        else:
+            del self._price_buckets[bucket]
+
+    def _price_mask(self, min_price: Optional[float], max_price: Optional[float]) -> int:
+        """Mapa de los productos dentro del rango; solo los rangos de borde se revisan uno a uno."""
+        width = self.price_bucket_width
+        mask = 0
+        for bucket, bitmap in self._price_buckets.items():
+            low, high = bucket * width, (bucket + 1) * width
+            if (min_price is not None and high <= min_price) or (max_price is not None and low > max_price):
+                continue
+            if (min_price is None or low >= min_price) and (max_price is None or high <= max_price):
+                mask |= bitmap
+                continue
+            for slot in _iter_bits(bitmap):
+                price = self._products[slot].price
+                if (min_price is None or price >= min_price) and (max_price is None or price <= max_price):
+                    mask |= 1 << slot
+        return mask
+
+    def _filter_masks(self, query: FacetQuery) -> Dict[str, int]:
+        """Calcula el mapa de cada dimensión filtrada."""
+        masks: Dict[str, int] = {}
+        for dimension in FACET_DIMENSIONS:
+            values = query.values(dimension)
+            if values:
+                bitmaps = self._values[dimension]
+                mask = 0
+                for value in values:
+                    mask |= bitmaps.get(value.strip().lower(), 0)
+                masks[dimension] = mask
+        if query.has_price_range():
+            masks["price"] = self._price_mask(query.min_price, query.max_price)
+        if query.available is not None:
+            masks["available"] = self._available if query.available else self._all & ~self._available
+        return masks
+
+    def _combine(self, masks: Dict[str, int], excluding: Optional[str] = None) -> int:
+        """Intersecta los filtros, omitiendo opcionalmente una dimensión."""
+        combined = self._all
+        for dimension, mask in masks.items():
+            if dimension != excluding:
+                combined &= mask
+        return combined
+
+    def search(self, query: FacetQuery, limit: int, offset: int = 0) -> FacetResult:
+        """Filtra el catálogo y calcula los conteos de cada faceta.
+
+        Args:
+            query (FacetQuery): Filtros a aplicar.
+            limit (int): Cantidad máxima de productos a retornar.
+            offset (int): Productos a omitir antes de la página.
+
+        Returns:
+            FacetResult: Página de productos en orden de catálogo, total y conteos.
+        """
+        with self._lock:
+            masks = self._filter_masks(query)
+            matches = self._combine(masks)
+            facets: Dict[str, Dict[str, int]] = {}
+            for dimension in FACET_DIMENSIONS:
+                base = self._combine(masks, excluding=dimension)
+                labels = self._labels[dimension]
+                counts = {labels[key]: (base & bitmap).bit_count() for key, bitmap in self._values[dimension].items()}
+                facets[dimension] = {label: count for label, count in sorted(counts.items()) if count}
+            base = self._combine(masks, excluding="price")
+            price_counts = {
+                self._bucket_label(bucket): (base & self._price_buckets[bucket]).bit_count() for bucket in sorted(self._price_buckets)
+            }
+            facets["price"] = {label: count for label, count in price_counts.items() if count}
+            base = self._combine(masks, excluding="available")
+            facets["available"] = {"true": (base & self._available).bit_count(), "false": (base & ~self._available).bit_count()}
+            products = [self._products[slot] for slot in islice(_iter_bits(matches), offset, offset + limit)]
+            return FacetResult(products=products, total=matches.bit_count(), facets=facets)
@@ -0,0 +1,48 @@
+"""Recuperador que fusiona rankings léxicos y vectoriales del catálogo."""
+from __future__ import annotations
+
+from typing import Dict, List, Sequence
+
+from src.application.retrieval import ProductRetrieverProtocol
+from src.domain.entities import Product
+
+
+class HybridProductRetriever:
+    """Combina varios recuperadores mediante *reciprocal rank fusion*.
+
+    Attributes:
+        rank_constant (int): Constante ``k`` de la fusión; valores altos
+            suavizan la ventaja de las primeras posiciones.
+    """
+
+    def __init__(self, retrievers: Sequence[ProductRetrieverProtocol], rank_constant: int = 60, depth: int = 3) -> None:
+        """Inicializa el recuperador híbrido.
+
+        Args:
+            retrievers (Sequence[ProductRetrieverProtocol]): Recuperadores a fusionar.
+            rank_constant (int): Constante de la fusión por rango recíproco.
+            depth (int): Multiplicador de candidatos pedidos a cada recuperador.
+        """
+        self._retrievers = list(retrievers)
+        self.rank_constant = rank_constant
+        self._depth = depth
+
+    def retrieve(self, query: str, products: Sequence[Product], limit: int) -> List[Product]:
+        """Fusiona los rankings de los recuperadores configurados.
+
+        Args:
+            query (str): Texto de la consulta.
+            products (Sequence[Product]): Catálogo candidato.
+            limit (int): Cantidad máxima de productos a retornar.
+
+        Returns:
+            List[Product]: Productos ordenados por puntaje fusionado.
+        """
+        scores: Dict[int, float] = {}
+        by_id: Dict[int, Product] = {}
+        for retriever in self._retrievers:
+            for rank, product in enumerate(retriever.retrieve(query, products, limit * self._depth)):
+                scores[product.id] = scores.get(product.id, 0.0) + 1.0 / (self.rank_constant + rank + 1)
+                by_id.setdefault(product.id, product)
+        ranked = sorted(scores, key=lambda product_id: scores[product_id], reverse=True)
+        return [by_id[product_id] for product_id in ranked[:limit]]
@@ -0,0 +1,137 @@
+"""Base común de los índices que asignan una posición fija a cada producto."""
+from __future__ import annotations
+
+import threading
+from abc import ABC, abstractmethod
+from typing import Dict, List, Optional, Sequence
+
+from src.domain.entities import Product
+
+from ..cache.catalog_cache import CatalogSnapshot
+
+_COMPACT_MIN_FREE = 64
+
+
+class SlottedProductIndex(ABC):
+    """Índice incremental en el que cada producto ocupa una posición estable.
+
+    Gestiona las posiciones, el lock y los eventos de ``CatalogListener``; las
+    subclases solo indexan y desindexan un producto en su posición. Una
+    actualización conserva la posición del producto, las altas se agregan al
+    final y las posiciones liberadas por bajas se compactan cuando superan a
+    las ocupadas, de modo que las estructuras por posición no crecen sin
+    límite.
+    """
+
+    def __init__(self) -> None:
+        """Inicializa un índice vacío."""
+        self._lock = threading.Lock()
+        self._reset()
+
+    def _reset(self) -> None:
+        """Descarta las posiciones y las estructuras propias del índice."""
+        self._slots: Dict[int, int] = {}
+        self._products: List[Optional[Product]] = []
+        self._clear()
+
+    def __len__(self) -> int:
+        return len(self._slots)
+
+    @abstractmethod
+    def _clear(self) -> None:
+        """Descarta las estructuras propias del índice."""
+
+    @abstractmethod
+    def _index(self, product: Product, slot: int) -> None:
+        """Registra el producto ubicado en ``slot``."""
+
+    @abstractmethod
+    def _unindex(self, product: Product, slot: int) -> None:
+        """Retira el producto que ocupaba ``slot``."""
+
+    def _insert(self, product: Product, slot: Optional[int] = None) -> None:
+        """Ubica el producto en ``slot`` o en una posición nueva y lo indexa."""
+        if slot is None:
+            slot = len(self._products)
+            self._products.append(product)
+        else:
+            self._products[slot] = product
+        self._slots[product.id] = slot
+        self._index(product, slot)
+
+    def _erase(self, product_id: int) -> Optional[int]:
+        """Desindexa el producto y retorna la posición que ocupaba."""
+        slot = self._slots.pop(product_id, None)
+        if slot is None:
+            return None
+        product = self._products[slot]
+        self._products[slot] = None
+        self._unindex(product, slot)
+        return slot
+
+    def _compact(self) -> None:
+        """Reasigna posiciones contiguas si las libres superan a las ocupadas."""
+        free = len(self._products) - len(self._slots)
+        if free <= max(_COMPACT_MIN_FREE, len(self._slots)):
+            return
+        products = [product for product in self._products if product is not None]
+        self._reset()
+        for product in products:
+            self._insert(product)
+
+    def rebuild(self, products: Sequence[Product]) -> None:
+        """Reconstruye el índice con posiciones contiguas.
+
+        Args:
+            products (Sequence[Product]): Catálogo completo.
+        """
+        with self._lock:
+            self._reset()
+            for product in products:
+                if product.id is not None:
+                    self._insert(product)
+
+    def upsert(self, product: Product) -> None:
+        """Indexa o reindexa un producto.
+
+        Args:
+            product (Product): Producto a indexar.
+        """
+        self.upsert_many((product,))
+
+    def upsert_many(self, products: Sequence[Product]) -> None:
+        """Indexa o reindexa un lote de productos tomando el lock una sola vez.
+
+        Args:
+            products (Sequence[Product]): Productos a indexar.
+        """
+        with self._lock:
+            for product in products:
+                if product.id is not None:
+                    self._insert(product, self._erase(product.id))
+
+    def remove(self, product_id: int) -> None:
+        """Retira un producto del índice.
+
+        Args:
+            product_id (int): Identificador del producto.
+        """
+        with self._lock:
+            self._erase(product_id)
+            self._compact()
+
+    def on_catalog_loaded(self, snapshot: CatalogSnapshot) -> None:
+        """Reconstruye el índice a partir de una instantánea completa."""
+        self.rebuild(snapshot.products)
+
+    def on_product_saved(self, product: Product, version: int) -> None:
+        """Reindexa el producto guardado."""
+        self.upsert(product)
+
+    def on_products_saved(self, products: Sequence[Product], version: int) -> None:
+        """Reindexa los productos del lote."""
+        self.upsert_many(products)
+
+    def on_product_deleted(self, product_id: int, version: int) -> None:
+        """Retira el producto eliminado."""
+        self.remove(product_id)
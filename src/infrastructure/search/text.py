@@ -0,0 +1,55 @@
+"""Normalización y tokenización de texto compartida por los índices de búsqueda."""
+from __future__ import annotations
+
+import re
+import unicodedata
+from typing import List
+
+from src.domain.entities import Product
+
+_TOKEN_PATTERN = re.compile(r"[a-z0-9]+")
+
+STOPWORDS = frozenset(
+    {
+        "a", "al", "como", "con", "de", "del", "el", "en", "es", "hay", "la", "las", "lo", "los",
+        "me", "mi", "para", "por", "que", "quiero", "se", "su", "tienen", "tiene", "un", "una",
+        "unos", "unas", "y", "o", "busco", "algo", "the", "and", "for",
+    }
+)
+
+
+def normalize(text: str) -> str:
+    """Convierte el texto a minúsculas y elimina tildes y diacríticos.
+
+    Args:
+        text (str): Texto original.
+
+    Returns:
+        str: Texto normalizado.
+    """
+    decomposed = unicodedata.normalize("NFKD", text.lower())
+    return "".join(char for char in decomposed if not unicodedata.combining(char))
+
+
+def tokenize(text: str) -> List[str]:
+    """Divide el texto en términos normalizados descartando palabras vacías.
+
+    Args:
+        text (str): Texto a tokenizar.
+
+    Returns:
+        List[str]: Términos en el orden en que aparecen.
+    """
+    return [token for token in _TOKEN_PATTERN.findall(normalize(text)) if token not in STOPWORDS]
+
+
+def product_text(product: Product) -> str:
+    """Concatena los campos descriptivos de un producto para indexarlo.
+
+    Args:
+        product (Product): Producto a describir.
+
+    Returns:
+        str: Texto con nombre, marca, categoría, color y descripción.
+    """
+    return " ".join((product.name, product.brand, product.category, product.color, product.description))
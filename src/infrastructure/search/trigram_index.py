@@ -0,0 +1,149 @@
+"""Índice de trigramas para búsquedas tolerantes a errores de tipeo."""
+from __future__ import annotations
+
+from collections import Counter
+from typing import Dict, FrozenSet, List, Set, Tuple
+
+import numpy as np
+
+from src.domain.entities import Product
+
+from .slotted_index import SlottedProductIndex
+from .text import tokenize
+
+
+def trigrams(term: str) -> FrozenSet[str]:
+    """Descompone un término en trigramas con relleno, como ``pg_trgm``.
+
+    Args:
+        term (str): Término normalizado.
+
+    Returns:
+        FrozenSet[str]: Trigramas del término rodeado de espacios.
+    """
+    padded = f"  {term} "
+    return frozenset(padded[i : i + 3] for i in range(len(padded) - 2))
+
+
+def _lookup_text(product: Product) -> str:
+    """Campos que participan de la búsqueda aproximada."""
+    return " ".join((product.name, product.brand, product.category, product.description))
+
+
+class TrigramIndex(SlottedProductIndex):
+    """Índice de trigramas sobre el vocabulario del catálogo.
+
+    Los trigramas apuntan a términos del vocabulario (nombre, marca,
+    categoría y descripción) y cada término a los productos que lo contienen.
+    Una consulta solo compara sus términos con los del vocabulario que
+    comparten algún trigrama, de modo que el costo depende del tamaño del
+    vocabulario tocado y no del catálogo. La similitud de cada término es la
+    de Jaccard entre trigramas; la de un producto es el promedio, por término
+    de la consulta, de su mejor coincidencia. El arreglo de puntajes se
+    indexa por la posición que ``SlottedProductIndex`` asigna a cada producto.
+
+    Attributes:
+        min_similarity (float): Similitud mínima entre términos para considerarlos.
+    """
+
+    def __init__(self, min_similarity: float = 0.3) -> None:
+        """Inicializa un índice vacío.
+
+        Args:
+            min_similarity (float): Similitud mínima entre términos.
+        """
+        self.min_similarity = min_similarity
+        super().__init__()
+
+    def _clear(self) -> None:
+        """Descarta el vocabulario."""
+        self._slot_terms: Dict[int, Set[str]] = {}
+        self._term_slots: Dict[str, Set[int]] = {}
+        self._term_grams: Dict[str, FrozenSet[str]] = {}
+        self._gram_terms: Dict[str, Set[str]] = {}
+        self._slot_arrays: Dict[str, np.ndarray] = {}
+
+    def _index(self, product: Product, slot: int) -> None:
+        """Registra los términos del producto ubicado en ``slot``."""
+        terms = set(tokenize(_lookup_text(product)))
+        self._slot_terms[slot] = terms
+        for term in terms:
+            slots = self._term_slots.get(term)
+            if slots is None:
+                slots = self._term_slots[term] = set()
+                grams = self._term_grams[term] = trigrams(term)
+                for gram in grams:
+                    self._gram_terms.setdefault(gram, set()).add(term)
+            slots.add(slot)
+            self._slot_arrays.pop(term, None)
+
+    def _unindex(self, product: Product, slot: int) -> None:
+        """Retira los términos del producto que ocupaba ``slot``."""
+        for term in self._slot_terms.pop(slot):
+            self._slot_arrays.pop(term, None)
+            slots = self._term_slots[term]
+            slots.discard(slot)
+            if slots:
+                continue
+            del self._term_slots[term]
+            for gram in self._term_grams.pop(term):
+                terms = self._gram_terms[gram]
+                terms.discard(term)
+                if not terms:
+                    del self._gram_terms[gram]
+
+    def similar_terms(self, term: str) -> List[Tuple[str, float]]:
+        """Busca en el vocabulario los términos parecidos a uno dado.
+
+        Args:
+            term (str): Término normalizado.
+
+        Returns:
+            List[Tuple[str, float]]: Pares ``(término, similitud)`` sobre el umbral.
+        """
+        grams = trigrams(term)
+        shared: Counter = Counter()
+        for gram in grams:
+            shared.update(self._gram_terms.get(gram, ()))
+        matches = []
+        for candidate, common in shared.items():
+            similarity = common / (len(grams) + len(self._term_grams[candidate]) - common)
+            if similarity >= self.min_similarity:
+                matches.append((candidate, similarity))
+        return matches
+
+    def _slots_of(self, term: str) -> np.ndarray:
+        """Posiciones de los productos que contienen el término, como arreglo cacheado."""
+        slots = self._slot_arrays.get(term)
+        if slots is None:
+            slots = self._slot_arrays[term] = np.fromiter(self._term_slots[term], dtype=np.int64)
+        return slots
+
+    def search(self, query: str, limit: int) -> List[Tuple[Product, float]]:
+        """Busca los productos cuyos términos se parecen a los de la consulta.
+
+        Args:
+            query (str): Consulta en texto libre, posiblemente con errores.
+            limit (int): Cantidad máxima de resultados.
+
+        Returns:
+            List[Tuple[Product, float]]: Pares ``(producto, score)`` con score en
+                ``(0, 1]``, ordenados de mayor a menor.
+        """
+        terms = list(dict.fromkeys(tokenize(query)))
+        if not terms or limit <= 0:
+            return []
+        with self._lock:
+            scores = np.zeros(len(self._products), dtype=np.float32)
+            for term in terms:
+                best = np.zeros_like(scores)
+                for candidate, similarity in self.similar_terms(term):
+                    slots = self._slots_of(candidate)
+                    best[slots] = np.maximum(best[slots], similarity)
+                scores += best
+            scores /= len(terms)
+            matched = np.flatnonzero(scores)
+            if len(matched) > limit:
+                matched = matched[np.argpartition(-scores[matched], limit - 1)[:limit]]
+            ordered = matched[np.lexsort((matched, -scores[matched]))]
+            return [(self._products[slot], float(scores[slot])) for slot in ordered.tolist()]
@@ -0,0 +1,279 @@
+"""Índice vectorial en memoria basado en n-gramas con hashing y NumPy."""
+from __future__ import annotations
+
+import threading
+import zlib
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from src.domain.entities import Product
+
+from ..cache.catalog_cache import CatalogSnapshot
+from .text import product_text, tokenize
+
+
+class HashedNgramVectorizer:
+    """Proyecta texto a vectores densos mediante el truco de hashing.
+
+    Cada término aporta su palabra completa y sus n-gramas de caracteres, lo
+    que tolera variaciones ortográficas sin depender de un vocabulario fijo.
+
+    Attributes:
+        dimensions (int): Tamaño de los vectores generados.
+        ngram_size (int): Longitud de los n-gramas de caracteres.
+    """
+
+    def __init__(self, dimensions: int = 1024, ngram_size: int = 3) -> None:
+        """Configura el vectorizador.
+
+        Args:
+            dimensions (int): Tamaño de los vectores generados.
+            ngram_size (int): Longitud de los n-gramas de caracteres.
+        """
+        self.dimensions = dimensions
+        self.ngram_size = ngram_size
+
+    def _features(self, text: str) -> List[str]:
+        """Extrae palabras y n-gramas de caracteres del texto."""
+        features: List[str] = []
+        for token in tokenize(text):
+            features.append(f"w:{token}")
+            padded = f" {token} "
+            features.extend(padded[i : i + self.ngram_size] for i in range(len(padded) - self.ngram_size + 1))
+        return features
+
+    def transform(self, texts: Sequence[str]) -> np.ndarray:
+        """Vectoriza un lote de textos con frecuencias sublineales normalizadas.
+
+        Args:
+            texts (Sequence[str]): Textos a vectorizar.
+
+        Returns:
+            np.ndarray: Matriz ``(len(texts), dimensions)`` con filas de norma 1.
+        """
+        matrix = np.zeros((len(texts), self.dimensions), dtype=np.float32)
+        for row, text in enumerate(texts):
+            for feature in self._features(text):
+                matrix[row, zlib.crc32(feature.encode("utf-8")) % self.dimensions] += 1.0
+        np.log1p(matrix, out=matrix)
+        norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+        np.divide(matrix, norms, out=matrix, where=norms > 0)
+        return matrix
+
+
+def _best(scores: np.ndarray, limit: int) -> np.ndarray:
+    """Posiciones de los ``limit`` mayores puntajes, de mayor a menor y con orden estable."""
+    top = min(limit, scores.size)
+    candidates = np.argpartition(-scores, top - 1)[:top]
+    return candidates[np.argsort(-scores[candidates], kind="stable")]
+
+
+class ProductVectorIndex:
+    """Índice vectorial del catálogo mantenido de forma incremental.
+
+    Implementa ``CatalogListener`` para reconstruirse con cada carga completa
+    del catálogo y actualizar filas individuales ante altas, cambios y bajas.
+    Las consultas se ponderan con IDF y se resuelven con un producto matricial
+    sobre todas las filas activas.
+    """
+
+    def __init__(self, vectorizer: Optional[HashedNgramVectorizer] = None, min_score: float = 0.05) -> None:
+        """Inicializa un índice vacío.
+
+        Args:
+            vectorizer (Optional[HashedNgramVectorizer]): Vectorizador a utilizar.
+            min_score (float): Similitud mínima para considerar un resultado.
+        """
+        self._vectorizer = vectorizer or HashedNgramVectorizer()
+        self._min_score = min_score
+        self._lock = threading.Lock()
+        self._matrix = np.zeros((0, self._vectorizer.dimensions), dtype=np.float32)
+        self._document_frequency = np.zeros(self._vectorizer.dimensions, dtype=np.float32)
+        self._ids: List[int] = []
+        self._rows: Dict[int, int] = {}
+        self._products: Dict[int, Product] = {}
+
+    def __len__(self) -> int:
+        return len(self._ids)
+
+    def rebuild(self, products: Sequence[Product]) -> None:
+        """Reconstruye el índice completo a partir de un conjunto de productos.
+
+        Args:
+            products (Sequence[Product]): Productos a indexar.
+        """
+        items = [product for product in products if product.id is not None]
+        matrix = self._vectorizer.transform([product_text(product) for product in items])
+        with self._lock:
+            self._matrix = matrix
+            self._document_frequency = (matrix > 0).sum(axis=0).astype(np.float32)
+            self._ids = [product.id for product in items]
+            self._rows = {product_id: row for row, product_id in enumerate(self._ids)}
+            self._products = {product.id: product for product in items}
+
+    def upsert(self, product: Product) -> None:
+        """Inserta o reemplaza el vector de un producto.
+
+        Args:
+            product (Product): Producto a indexar.
+        """
+        self.upsert_many((product,))
+
+    def upsert_many(self, products: Sequence[Product]) -> None:
+        """Inserta o reemplaza los vectores de un lote vectorizándolo de una vez.
+
+        Args:
+            products (Sequence[Product]): Productos a indexar.
+        """
+        items = [product for product in products if product.id is not None]
+        if not items:
+            return
+        vectors = self._vectorizer.transform([product_text(product) for product in items])
+        with self._lock:
+            for product, vector in zip(items, vectors):
+                row = self._rows.get(product.id)
+                if row is None:
+                    row = len(self._ids)
+                    if row == self._matrix.shape[0]:
+                        grown = np.zeros((max(8, row * 2), self._vectorizer.dimensions), dtype=np.float32)
+                        grown[:row] = self._matrix
+                        self._matrix = grown
+                    self._ids.append(product.id)
+                    self._rows[product.id] = row
+                else:
+                    self._document_frequency -= self._matrix[row] > 0
+                self._matrix[row] = vector
+                self._document_frequency += vector > 0
+                self._products[product.id] = product
+
+    def remove(self, product_id: int) -> None:
+        """Retira un producto del índice moviendo la última fila a su lugar.
+
+        Args:
+            product_id (int): Identificador del producto.
+        """
+        with self._lock:
+            row = self._rows.pop(product_id, None)
+            if row is None:
+                return
+            self._document_frequency -= self._matrix[row] > 0
+            last = len(self._ids) - 1
+            if row != last:
+                moved_id = self._ids[last]
+                self._matrix[row] = self._matrix[last]
+                self._ids[row] = moved_id
+                self._rows[moved_id] = row
+            self._matrix[last] = 0.0
+            self._ids.pop()
+            self._products.pop(product_id, None)
+
+    def search_many(self, queries: Sequence[str], limit: int) -> List[List[Tuple[Product, float]]]:
+        """Resuelve un lote de consultas con un único producto matricial.
+
+        Args:
+            queries (Sequence[str]): Consultas en texto libre.
+            limit (int): Cantidad máxima de resultados por consulta.
+
+        Returns:
+            List[List[Tuple[Product, float]]]: Resultados ``(producto, score)``
+                ordenados de mayor a menor similitud para cada consulta.
+        """
+        query_matrix = self._vectorizer.transform(queries)
+        with self._lock:
+            count = len(self._ids)
+            if count == 0 or limit <= 0:
+                return [[] for _ in queries]
+            scores = self._scores(query_matrix)
+            ids = list(self._ids)
+            products = dict(self._products)
+
+        results: List[List[Tuple[Product, float]]] = []
+        for column in range(scores.shape[1]):
+            column_scores = scores[:, column]
+            ordered = _best(column_scores, limit)
+            results.append(
+                [(products[ids[row]], float(column_scores[row])) for row in ordered if column_scores[row] >= self._min_score]
+            )
+        return results
+
+    def _scores(self, query_matrix: np.ndarray) -> np.ndarray:
+        """Similitud de cada fila activa con cada consulta; requiere tener el lock."""
+        count = len(self._ids)
+        idf = np.log((1.0 + count) / (1.0 + self._document_frequency)) + 1.0
+        weighted = query_matrix * idf
+        norms = np.linalg.norm(weighted, axis=1, keepdims=True)
+        np.divide(weighted, norms, out=weighted, where=norms > 0)
+        return self._matrix[:count] @ weighted.T
+
+    def search(self, query: str, limit: int) -> List[Tuple[Product, float]]:
+        """Busca los productos más similares a una consulta.
+
+        Args:
+            query (str): Consulta en texto libre.
+            limit (int): Cantidad máxima de resultados.
+
+        Returns:
+            List[Tuple[Product, float]]: Pares ``(producto, score)`` ordenados.
+        """
+        return self.search_many([query], limit)[0]
+
+    def retrieve(self, query: str, products: Sequence[Product], limit: int) -> List[Product]:
+        """Implementa ``ProductRetrieverProtocol`` sobre el índice vectorial.
+
+        Con una ``CatalogSnapshot`` se puntúan todas las filas en una sola
+        operación matricial y solo los ``limit`` mejores se resuelven contra la
+        instantánea. Con otra secuencia se rankean solo sus productos y se
+        retornan esas mismas entidades. El índice se mantiene al día a través
+        de la caché de catálogo; un candidato que aún no está indexado
+        simplemente no se retorna.
+
+        Args:
+            query (str): Texto de la consulta.
+            products (Sequence[Product]): Catálogo candidato.
+            limit (int): Cantidad máxima de productos a retornar.
+
+        Returns:
+            List[Product]: Candidatos ordenados por similitud.
+        """
+        if limit <= 0:
+            return []
+        if isinstance(products, CatalogSnapshot):
+            query_matrix = self._vectorizer.transform([query])
+            with self._lock:
+                if not self._ids:
+                    return []
+                scores = self._scores(query_matrix)[:, 0]
+                ranked = [(self._ids[row], scores[row]) for row in _best(scores, limit).tolist()]
+            resolved = ((products.get(product_id), score) for product_id, score in ranked if score >= self._min_score)
+            return [product for product, _ in resolved if product is not None]
+
+        candidates = {product.id: product for product in products if product.id is not None}
+        if not candidates:
+            return []
+        query_matrix = self._vectorizer.transform([query])
+        with self._lock:
+            rows = np.fromiter((self._rows[product_id] for product_id in candidates if product_id in self._rows), dtype=np.int64)
+            if rows.size == 0:
+                return []
+            scores = self._scores(query_matrix)[rows, 0]
+            ids = [self._ids[row] for row in rows.tolist()]
+
+        ordered = _best(scores, limit)
+        return [candidates[ids[position]] for position in ordered.tolist() if scores[position] >= self._min_score]
+
+    def on_catalog_loaded(self, snapshot: CatalogSnapshot) -> None:
+        """Reconstruye el índice con una instantánea completa del catálogo."""
+        self.rebuild(snapshot.products)
+
+    def on_product_saved(self, product: Product, version: int) -> None:
+        """Actualiza el vector del producto creado o modificado."""
+        self.upsert(product)
+
+    def on_products_saved(self, products: Sequence[Product], version: int) -> None:
+        """Actualiza los vectores de los productos del lote."""
+        self.upsert_many(products)
+
+    def on_product_deleted(self, product_id: int, version: int) -> None:
+        """Retira el producto eliminado del índice."""
+        self.remove(product_id)
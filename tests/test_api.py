@@ -0,0 +1,341 @@
+"""Tests for the FastAPI endpoints using an in-memory database and fake providers."""
+import asyncio
+import json
+from typing import Iterator, List
+
+import httpx
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+from sqlalchemy.orm import sessionmaker
+
+from src.application.conversation_summary import ConversationSummaryService
+from src.domain.entities import Product
+from src.domain.exceptions import ProviderOverloadedError
+from src.infrastructure.api.dependencies import (
+    get_async_chat_repository,
+    get_async_product_repository,
+    get_chat_telemetry,
+    get_conversation_summaries,
+)
+from src.infrastructure.api.main import app
+from src.infrastructure.cache.catalog_cache import catalog_cache
+from src.infrastructure.db import models  # noqa: F401 - ensure models are registered
+from src.infrastructure.db.database import Base, get_db, get_read_db
+from src.infrastructure.llm_providers.registry import AIProviderRegistry
+from src.infrastructure.observability.chat_metrics import ChatPipelineMetrics
+from src.infrastructure.observability.metrics import MetricsRegistry
+from src.infrastructure.repositories.async_chat_repository import AsyncSQLChatRepository
+from src.infrastructure.repositories.async_product_repository import AsyncCachedProductRepository, AsyncSQLProductRepository
+from src.infrastructure.repositories.cached_product_repository import CachedProductRepository
+from src.infrastructure.repositories.product_repository import SQLProductRepository
+from src.infrastructure.repositories.write_behind_chat_repository import WriteBehindChatRepository
+
+
+class EchoAIService:
+    """Fake provider that echoes the user message."""
+
+    instances = 0
+
+    def __init__(self) -> None:
+        EchoAIService.instances += 1
+
+    async def generate_response(self, user_message: str, products: List[Product], context) -> str:
+        return f"Eco: {user_message}"
+
+    async def stream_response(self, user_message: str, products: List[Product], context):
+        for token in ("Eco: ", user_message):
+            yield token
+
+
+class BrokenAIService:
+    """Fake provider whose calls always fail."""
+
+    async def generate_response(self, user_message: str, products: List[Product], context) -> str:
+        raise RuntimeError("proveedor caído")
+
+
+class OverloadedAIService:
+    """Fake provider that is always saturated."""
+
+    async def generate_response(self, user_message: str, products: List[Product], context) -> str:
+        raise ProviderOverloadedError(retry_after=2.5)
+
+    async def stream_response(self, user_message: str, products: List[Product], context):
+        raise ProviderOverloadedError(retry_after=1, queue_full=False)
+        yield ""
+
+
+def failing_factory():
+    raise ValueError("GEMINI_API_KEY no está configurada en las variables de entorno")
+
+
+@pytest.fixture()
+def client(tmp_path) -> Iterator[TestClient]:
+    database_path = tmp_path / "api.db"
+    engine = create_engine(f"sqlite:///{database_path}", connect_args={"check_same_thread": False})
+    async_engine = create_async_engine(f"sqlite+aiosqlite:///{database_path}")
+    Base.metadata.create_all(bind=engine)
+    session_factory = sessionmaker(bind=engine, autoflush=False)
+    async_session_factory = async_sessionmaker(async_engine, expire_on_commit=False)
+
+    def override_get_db():
+        session = session_factory()
+        try:
+            yield session
+        finally:
+            session.close()
+
+    registry = AIProviderRegistry(default="echo")
+    registry.register("echo", EchoAIService)
+    app.state.ai_providers = registry
+    app.dependency_overrides[get_db] = override_get_db
+    app.dependency_overrides[get_read_db] = override_get_db
+    app.dependency_overrides[get_async_product_repository] = lambda: AsyncCachedProductRepository(
+        AsyncSQLProductRepository(async_session_factory), catalog_cache
+    )
+    chat_repository = AsyncSQLChatRepository(async_session_factory)
+    app.dependency_overrides[get_async_chat_repository] = lambda: chat_repository
+    app.dependency_overrides[get_conversation_summaries] = lambda: ConversationSummaryService(chat_repository)
+    catalog_cache.invalidate()
+    EchoAIService.instances = 0
+    yield TestClient(app)
+    app.dependency_overrides.clear()
+    catalog_cache.invalidate()
+    engine.dispose()
+
+
+def test_chat_reuses_application_scoped_provider(client: TestClient) -> None:
+    for message in ("Hola", "Busco zapatillas"):
+        response = client.post("/chat", json={"session_id": "s1", "message": message})
+        assert response.status_code == 200
+        assert response.json()["assistant_message"] == f"Eco: {message}"
+
+    assert EchoAIService.instances == 1
+    history = client.get("/chat/history/s1").json()
+    assert [item["role"] for item in history] == ["user", "assistant", "user", "assistant"]
+
+
+def test_history_endpoints_do_not_need_a_provider(client: TestClient) -> None:
+    broken = AIProviderRegistry(default="gemini")
+    broken.register("gemini", failing_factory)
+    app.state.ai_providers = broken
+
+    assert client.post("/chat", json={"session_id": "s2", "message": "Hola"}).status_code == 503
+    assert client.get("/chat/history/s2").json() == []
+    assert client.delete("/chat/history/s2").json() == {"session_id": "s2", "deleted_messages": 0}
+
+
+def test_delete_history_waits_for_and_discards_write_behind_batches(client: TestClient) -> None:
+    inner = app.dependency_overrides[get_async_chat_repository]()
+    write_behind = WriteBehindChatRepository(inner)
+    app.dependency_overrides[get_async_chat_repository] = lambda: write_behind
+    save_messages = inner.save_messages
+
+    async def scenario() -> None:
+        gate = asyncio.Event()
+
+        async def gated_save(messages):  # noqa: ANN001, ANN202
+            await gate.wait()
+            return await save_messages(messages)
+
+        inner.save_messages = gated_save
+        async with httpx.AsyncClient(app=app, base_url="http://test") as http:
+            for message in ("en vuelo", "en cola"):
+                assert (await http.post("/chat", json={"session_id": "wb", "message": message})).status_code == 200
+            await asyncio.sleep(0.01)
+
+            deletion = asyncio.ensure_future(http.delete("/chat/history/wb"))
+            await asyncio.sleep(0.01)
+            assert not deletion.done()
+            gate.set()
+            assert (await deletion).json() == {"session_id": "wb", "deleted_messages": 4}
+
+            await write_behind.flush()
+            assert (await http.get("/chat/history/wb")).json() == []
+        await write_behind.aclose()
+
+    asyncio.run(scenario())
+
+
+def test_chat_stream_emits_tokens_and_done_event(client: TestClient) -> None:
+    response = client.post("/chat/stream", json={"session_id": "s3", "message": "Hola"})
+
+    assert response.headers["content-type"].startswith("text/event-stream")
+    assert 'data: {"token": "Eco: "}' in response.text
+    assert "event: done" in response.text
+    assert len(client.get("/chat/history/s3").json()) == 2
+
+
+def test_history_cursor_pagination(client: TestClient) -> None:
+    for message in ("uno", "dos", "tres"):
+        client.post("/chat", json={"session_id": "s4", "message": message})
+
+    first = client.get("/chat/history/s4", params={"limit": 4, "order": "desc"})
+    assert [item["message"] for item in first.json()] == ["Eco: tres", "tres", "Eco: dos", "dos"]
+
+    second = client.get("/chat/history/s4", params={"limit": 4, "order": "desc", "before": first.headers["X-Next-Cursor"]})
+    assert [item["message"] for item in second.json()] == ["Eco: uno", "uno"]
+    assert "X-Next-Cursor" not in second.headers
+
+    assert client.get("/chat/history/s4", params={"before": "no-es-un-cursor"}).status_code == 400
+
+
+def test_products_keyset_pagination_with_projection(client: TestClient) -> None:
+    product_repository = SQLProductRepository(next(app.dependency_overrides[get_db]()))
+    for index, price in enumerate((30.0, 10.0, 20.0), start=1):
+        product_repository.save(
+            Product(id=None, name=f"Modelo {index}", brand="Nike", category="Running", size="42", color="Negro", price=price, stock=index, description="")
+        )
+
+    first = client.get("/products", params={"limit": 2, "sort": "-price", "fields": "name,price"})
+    assert first.json() == [{"name": "Modelo 1", "price": 30.0}, {"name": "Modelo 3", "price": 20.0}]
+
+    second = client.get("/products", params={"limit": 2, "sort": "-price", "fields": "name,price", "cursor": first.headers["X-Next-Cursor"]})
+    assert second.json() == [{"name": "Modelo 2", "price": 10.0}]
+    assert "X-Next-Cursor" not in second.headers
+
+    assert client.get("/products", params={"sort": "name", "cursor": first.headers["X-Next-Cursor"]}).status_code == 400
+    assert client.get("/products", params={"fields": "name,secret"}).status_code == 400
+
+
+def test_conditional_get_answers_304_until_data_changes(client: TestClient) -> None:
+    products = CachedProductRepository(SQLProductRepository(next(app.dependency_overrides[get_db]())), catalog_cache)
+    saved = products.save(Product(id=None, name="Pegasus", brand="Nike", category="Running", size="42", color="Negro", price=120.0, stock=3, description=""))
+
+    listing = client.get("/products")
+    item = client.get(f"/products/{saved.id}")
+    assert listing.headers["ETag"] != item.headers["ETag"]
+    assert "Last-Modified" in item.headers
+    for path, etag in (("/products", listing.headers["ETag"]), (f"/products/{saved.id}", item.headers["ETag"])):
+        not_modified = client.get(path, headers={"If-None-Match": etag})
+        assert not_modified.status_code == 304
+        assert not_modified.content == b""
+        assert not_modified.headers["ETag"] == etag
+    assert client.get("/products", params={"limit": 5}, headers={"If-None-Match": listing.headers["ETag"]}).status_code == 200
+
+    saved.stock = 2
+    products.save(saved)
+    assert client.get("/products", headers={"If-None-Match": listing.headers["ETag"]}).status_code == 200
+    assert client.get(f"/products/{saved.id}", headers={"If-None-Match": item.headers["ETag"]}).status_code == 200
+
+    client.post("/chat", json={"session_id": "s5", "message": "Hola"})
+    history = client.get("/chat/history/s5")
+    assert client.get("/chat/history/s5", headers={"If-None-Match": history.headers["ETag"]}).status_code == 304
+    client.post("/chat", json={"session_id": "s5", "message": "Otra"})
+    assert client.get("/chat/history/s5", headers={"If-None-Match": history.headers["ETag"]}).status_code == 200
+
+
+def test_import_products_streams_ndjson_and_reports_row_errors(client: TestClient) -> None:
+    rows = [
+        {"name": "Pegasus", "brand": "Nike", "category": "Running", "size": "42", "color": "Negro", "price": 120, "stock": 3, "description": ""},
+        {"name": "Gratis", "brand": "Nike", "category": "Running", "size": "42", "color": "Negro", "price": 0, "stock": 3, "description": ""},
+        {"name": "Kayano", "brand": "Asics", "category": "Running", "size": "43", "color": "Azul", "price": 140, "stock": 4, "description": ""},
+    ]
+    body = "".join(json.dumps(row) + "\n" for row in rows).encode("utf-8")
+
+    response = client.post(
+        "/products/import",
+        params={"batch_size": 2},
+        content=(body[start : start + 7] for start in range(0, len(body), 7)),
+        headers={"Content-Type": "application/x-ndjson"},
+    )
+
+    assert response.status_code == 200
+    report = response.json()
+    assert (report["processed"], report["imported"], report["failed"]) == (3, 2, 1)
+    assert report["errors"][0]["row"] == 2
+    assert [item["name"] for item in client.get("/products").json()] == ["Pegasus", "Kayano"]
+    assert client.post("/products/import", content=b"x", headers={"Content-Type": "text/plain"}).status_code == 415
+
+
+def test_stock_batch_reports_each_adjustment(client: TestClient) -> None:
+    products = CachedProductRepository(SQLProductRepository(next(app.dependency_overrides[get_db]())), catalog_cache)
+    saved = products.save(Product(id=None, name="Pegasus", brand="Nike", category="Running", size="42", color="Negro", price=120.0, stock=2, description=""))
+
+    response = client.post("/products/stock:batch", json={"items": [{"product_id": saved.id, "delta": -2}, {"product_id": saved.id, "delta": -1}]})
+
+    assert response.status_code == 200
+    assert [(item["applied"], item["stock"]) for item in response.json()] == [(True, 0), (False, 0)]
+    assert client.get(f"/products/{saved.id}").json()["stock"] == 0
+    assert client.post("/products/stock:batch", json={"items": [{"product_id": saved.id, "delta": 0}]}).status_code == 422
+
+
+def test_faceted_search_filters_and_counts(client: TestClient) -> None:
+    products = CachedProductRepository(SQLProductRepository(next(app.dependency_overrides[get_db]())), catalog_cache)
+    products.upsert_many(
+        [
+            Product(id=None, name="Pegasus", brand="Nike", category="Running", size="42", color="Negro", price=120.0, stock=2, description=""),
+            Product(id=None, name="Ultraboost", brand="Adidas", category="Running", size="41", color="Blanco", price=150.0, stock=0, description=""),
+            Product(id=None, name="Samba", brand="Adidas", category="Casual", size="42", color="Blanco", price=90.0, stock=4, description=""),
+        ]
+    )
+
+    body = client.get("/products/facets", params={"brand": ["adidas"], "available": "true"}).json()
+
+    assert [item["name"] for item in body["items"]] == ["Samba"]
+    assert body["total"] == 1
+    assert body["facets"]["brand"] == {"Adidas": 1, "Nike": 1}
+    assert body["facets"]["available"] == {"true": 1, "false": 1}
+    assert client.get("/products/facets", params={"min_price": 100, "max_price": 50}).status_code == 400
+
+
+def test_lookup_tolerates_typos(client: TestClient) -> None:
+    products = CachedProductRepository(SQLProductRepository(next(app.dependency_overrides[get_db]())), catalog_cache)
+    products.save(Product(id=None, name="Ultraboost", brand="Adidas", category="Running", size="41", color="Blanco", price=150.0, stock=3, description=""))
+    products.save(Product(id=None, name="Samba", brand="Adidas", category="Casual", size="42", color="Blanco", price=90.0, stock=4, description=""))
+
+    matches = client.get("/products/lookup", params={"q": "addidas runing"}).json()
+
+    assert [match["product"]["name"] for match in matches] == ["Ultraboost", "Samba"]
+    assert matches[0]["score"] > matches[1]["score"]
+
+
+def test_metrics_endpoint_exposes_stage_latencies_and_llm_errors(client: TestClient) -> None:
+    registry = MetricsRegistry()
+    telemetry = ChatPipelineMetrics(registry)
+    app.dependency_overrides[get_chat_telemetry] = lambda: telemetry
+
+    assert client.post("/chat", json={"session_id": "m1", "message": "Hola"}).status_code == 200
+    broken = AIProviderRegistry(default="broken")
+    broken.register("broken", BrokenAIService)
+    app.state.ai_providers = broken
+    assert client.post("/chat", json={"session_id": "m1", "message": "Hola"}).status_code == 500
+
+    exposition = registry.render()
+    for stage in ("catalog_fetch", "history_fetch", "prompt_build"):
+        assert f'chat_stage_duration_seconds_count{{stage="{stage}"}} 2' in exposition
+    assert 'chat_stage_duration_seconds_count{stage="llm_call"} 2' in exposition
+    assert 'chat_stage_duration_seconds_count{stage="persist"} 1' in exposition
+    assert 'chat_llm_errors_total{error="RuntimeError"} 1' in exposition
+    assert "chat_prompt_products_count 2" in exposition
+
+    response = client.get("/metrics")
+    assert response.headers["content-type"].startswith("text/plain; version=0.0.4")
+    assert 'http_requests_total{method="POST",route="/chat",status="500"}' in response.text
+    assert 'http_requests_in_flight{route="/chat"} 0' in response.text
+
+
+def test_responses_include_server_timing_breakdown(client: TestClient) -> None:
+    response = client.get("/products")
+    stages = dict(entry.split(";dur=") for entry in response.headers["Server-Timing"].split(", "))
+    assert {"db", "serialize", "total"} <= set(stages)
+    assert float(stages["db"]) <= float(stages["total"])
+
+    assert client.get("/debug/profiles/desconocido").status_code == 404
+
+
+def test_overloaded_provider_fails_fast_with_retry_after(client: TestClient) -> None:
+    overloaded = AIProviderRegistry(default="overloaded")
+    overloaded.register("overloaded", OverloadedAIService)
+    app.state.ai_providers = overloaded
+
+    response = client.post("/chat", json={"session_id": "o1", "message": "Hola"})
+    assert response.status_code == 429
+    assert response.headers["Retry-After"] == "3"
+
+    stream = client.post("/chat/stream", json={"session_id": "o1", "message": "Hola"})
+    assert stream.status_code == 503
+    assert stream.headers["Retry-After"] == "1"
+    assert client.get("/chat/history/o1").json() == []
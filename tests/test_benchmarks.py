@@ -0,0 +1,16 @@
+"""Smoke test for the benchmark suite so it keeps running as the code evolves."""
+import asyncio
+
+from benchmarks.compare import compare
+from benchmarks.run import run_suite
+
+
+def test_benchmark_suite_reports_every_target() -> None:
+    report = asyncio.run(run_suite(sizes=[10], history_turns=5, iterations=1, max_seconds=0.0))
+
+    names = {result["name"] for result in report["results"]}
+    assert {"SQLProductRepository.get_all", "SQLChatRepository.get_recent_messages", "GET /products", "POST /chat"} <= names
+    assert all(result["size"] == 10 and result["median_ms"] >= 0 for result in report["results"])
+
+    medians = {(result["name"], result["size"]): result["median_ms"] or 1.0 for result in report["results"]}
+    assert all(ratio == 1.0 for *_, ratio in compare(medians, medians))
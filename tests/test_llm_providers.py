@@ -0,0 +1,313 @@
+"""Tests for the AI providers and their decorators (caching, coalescing and limits)."""
+import asyncio
+import random
+from typing import List
+
+import pytest
+
+from src.domain.entities import ChatContext, Product
+from src.infrastructure.cache.catalog_cache import CatalogCache
+from src.infrastructure.cache.prompt_fragments import CatalogPromptCache, format_product_line
+from src.infrastructure.cache.response_cache import CachingAIService, LLMResponseCache
+from src.domain.exceptions import ProviderOverloadedError
+from src.infrastructure.llm_providers.admission import (
+    AdaptiveConcurrencyLimiter,
+    AdmissionMetrics,
+    AdmissionSettings,
+    LimitedAIService,
+)
+from src.infrastructure.llm_providers.fake_service import FakeAIService, FakeProviderError, LatencyProfile
+from src.infrastructure.llm_providers.registry import build_provider_registry
+from src.infrastructure.llm_providers.single_flight import CoalescingAIService
+from src.infrastructure.observability.metrics import MetricsRegistry
+
+
+class CountingAIService:
+    """Fake provider that counts calls and numbers its answers."""
+
+    def __init__(self) -> None:
+        self.calls = 0
+
+    async def generate_response(self, user_message: str, products: List[Product], context: ChatContext) -> str:
+        self.calls += 1
+        return f"respuesta {self.calls}"
+
+    async def stream_response(self, user_message: str, products: List[Product], context: ChatContext):
+        self.calls += 1
+        for token in ("respuesta ", str(self.calls)):
+            yield token
+
+
+def test_response_cache_hits_on_normalized_prompt_and_invalidates_on_catalog_change() -> None:
+    provider = CountingAIService()
+    catalog = CatalogCache()
+    registry = MetricsRegistry()
+    cache = LLMResponseCache(registry=registry)
+    service = CachingAIService(provider, cache, catalog)
+
+    first = asyncio.run(service.generate_response("¿Qué zapatillas de running tienen?", [], ChatContext()))
+    second = asyncio.run(service.generate_response("que zapatillas de  RUNNING tienen", [], ChatContext()))
+    assert first == second == "respuesta 1"
+    assert (cache.stats().hits, cache.stats().misses) == (1, 1)
+
+    catalog.apply_deleted(1)
+    assert asyncio.run(service.generate_response("que zapatillas de running tienen", [], ChatContext())) == "respuesta 2"
+    exposition = registry.render()
+    assert "llm_response_cache_hits_total 1" in exposition
+    assert "llm_response_cache_misses_total 2" in exposition
+    assert "llm_response_cache_entries 2" in exposition
+
+
+def test_response_cache_serves_streams_and_evicts() -> None:
+    now = [0.0]
+    cache = LLMResponseCache(max_entries=1, ttl_seconds=10, clock=lambda: now[0])
+    provider = CountingAIService()
+    service = CachingAIService(provider, cache, CatalogCache())
+
+    async def collect(message: str) -> List[str]:
+        return [chunk async for chunk in service.stream_response(message, [], ChatContext())]
+
+    assert asyncio.run(collect("hola")) == ["respuesta ", "1"]
+    assert asyncio.run(collect("hola")) == ["respuesta 1"]
+
+    asyncio.run(collect("otra"))
+    assert cache.stats().evictions == 1
+    now[0] = 11.0
+    assert asyncio.run(collect("otra")) == ["respuesta ", "3"]
+    assert provider.calls == 3
+
+
+def test_response_cache_skips_empty_answers() -> None:
+    class SilentAIService(CountingAIService):
+        async def stream_response(self, user_message: str, products: List[Product], context: ChatContext):
+            return
+            yield ""
+
+    cache = LLMResponseCache()
+    service = CachingAIService(SilentAIService(), cache, CatalogCache())
+
+    async def collect() -> List[str]:
+        return [chunk async for chunk in service.stream_response("hola", [], ChatContext())]
+
+    assert asyncio.run(collect()) == []
+    assert cache.stats().size == 0
+
+
+class SlowAIService(CountingAIService):
+    """Fake provider that yields control while generating."""
+
+    async def generate_response(self, user_message: str, products: List[Product], context: ChatContext) -> str:
+        self.calls += 1
+        await asyncio.sleep(0.01)
+        return f"respuesta a {user_message}"
+
+    async def stream_response(self, user_message: str, products: List[Product], context: ChatContext):
+        self.calls += 1
+        for token in ("uno ", "dos ", "tres"):
+            await asyncio.sleep(0.005)
+            yield token
+
+
+def test_coalescing_shares_one_call_between_identical_requests() -> None:
+    provider = SlowAIService()
+    service = CoalescingAIService(provider, CatalogCache())
+
+    async def burst():
+        same = [service.generate_response("Hola!", [], ChatContext()) for _ in range(5)]
+        return await asyncio.gather(*same, service.generate_response("otra cosa", [], ChatContext()))
+
+    results = asyncio.run(burst())
+    assert results[:5] == ["respuesta a Hola!"] * 5
+    assert provider.calls == 2
+
+
+def test_coalescing_broadcasts_streams() -> None:
+    provider = SlowAIService()
+    service = CoalescingAIService(provider, CatalogCache())
+
+    async def consume() -> str:
+        return "".join([chunk async for chunk in service.stream_response("hola", [], ChatContext())])
+
+    async def burst():
+        return await asyncio.gather(*(consume() for _ in range(3)))
+
+    assert asyncio.run(burst()) == ["uno dos tres"] * 3
+    assert provider.calls == 1
+
+
+def test_prompt_cache_renders_each_product_once_per_version() -> None:
+    rendered: List[str] = []
+
+    def render(product: Product) -> str:
+        rendered.append(product.name)
+        return format_product_line(product)
+
+    catalog = CatalogCache()
+    prompts = CatalogPromptCache(render)
+    catalog.subscribe(prompts)
+    products = [
+        Product(id=index, name=f"Modelo {index}", brand="Nike", category="Running", size="42", color="Negro", price=100.0, stock=index, description="")
+        for index in range(1, 4)
+    ]
+    snapshot = catalog.publish(products, catalog.version)
+
+    block = prompts.render(list(snapshot.products))
+    assert block == "\n".join(format_product_line(product) for product in products)
+    assert prompts.render(list(snapshot.products)) is block
+    assert rendered == ["Modelo 1", "Modelo 2", "Modelo 3"]
+
+    updated = Product(id=2, name="Modelo 2 Pro", brand="Nike", category="Running", size="42", color="Negro", price=110.0, stock=0, description="")
+    catalog.apply_saved(updated)
+    catalog.apply_deleted(3)
+    assert prompts.render(list(catalog.current().products)).splitlines() == [format_product_line(products[0]), format_product_line(updated)]
+    assert prompts.render([updated]) == format_product_line(updated)
+    assert rendered == ["Modelo 1", "Modelo 2", "Modelo 3", "Modelo 2 Pro"]
+
+
+def test_fake_provider_is_deterministic_and_paces_tokens() -> None:
+    sleeps: List[float] = []
+
+    async def record(seconds: float) -> None:
+        sleeps.append(seconds)
+
+    product = Product(
+        id=1, name="Nike Pegasus", brand="Nike", category="Running", size="42", color="Negro", price=120.0, stock=3, description="Ligera"
+    )
+    service = FakeAIService(LatencyProfile("fixed", mean_ms=200), tokens_per_second=10, response_tokens=20, sleep=record)
+
+    async def collect() -> List[str]:
+        return [chunk async for chunk in service.stream_response("Busco zapatillas", [product], ChatContext())]
+
+    text = asyncio.run(service.generate_response("Busco zapatillas", [product], ChatContext()))
+    assert "Nike Pegasus" in text and len(text.split()) == 20
+    assert sleeps == [0.2, 2.0]
+    assert "".join(asyncio.run(collect())) == text
+    assert asyncio.run(service.generate_response("Otra consulta", [product], ChatContext())) != text
+
+
+def test_fake_provider_latency_distributions_and_failures() -> None:
+    rng = random.Random(7)
+    tail = [LatencyProfile("long_tail", mean_ms=100, tail_sigma=1.0).sample(rng) for _ in range(2000)]
+    normal = [LatencyProfile("normal", mean_ms=100, stddev_ms=10).sample(rng) for _ in range(2000)]
+    assert max(tail) > 5 * max(normal)
+    assert 0.09 < sorted(normal)[1000] < 0.11
+    with pytest.raises(ValueError):
+        LatencyProfile("uniform")
+
+    service = FakeAIService(failure_rate=0.5, seed=3)
+
+    async def outcomes() -> List[bool]:
+        results = []
+        for _ in range(200):
+            try:
+                await service.generate_response("hola", [], ChatContext())
+                results.append(True)
+            except FakeProviderError:
+                results.append(False)
+        return results
+
+    failures = asyncio.run(outcomes()).count(False)
+    assert 60 < failures < 140
+
+
+def test_registry_selects_provider_from_environment(monkeypatch) -> None:
+    monkeypatch.setenv("AI_PROVIDER", "fake")
+    monkeypatch.setenv("FAKE_LLM_RESPONSE_TOKENS", "12")
+    registry = build_provider_registry(coalesce=False)
+    text = asyncio.run(registry.get().generate_response("hola", [], ChatContext()))
+    assert text == asyncio.run(FakeAIService.from_env().generate_response("hola", [], ChatContext()))
+    assert len(text.split()) == 12
+
+    monkeypatch.setenv("AI_PROVIDER", "desconocido")
+    with pytest.raises(ValueError):
+        build_provider_registry()
+
+
+def test_limiter_caps_concurrency_queues_and_fails_fast() -> None:
+    settings = AdmissionSettings(initial_limit=2, max_limit=2, queue_size=1, queue_timeout=0.02, latency_target=1.0)
+    limiter = AdaptiveConcurrencyLimiter(settings)
+    service = LimitedAIService(FakeAIService(LatencyProfile("fixed", mean_ms=50)), limiter)
+
+    async def burst() -> List[object]:
+        calls = [service.generate_response(f"consulta {number}", [], ChatContext()) for number in range(4)]
+        return await asyncio.gather(*calls, return_exceptions=True)
+
+    results = asyncio.run(burst())
+    assert [isinstance(result, str) for result in results] == [True, True, False, False]
+    timed_out, rejected = results[2], results[3]
+    assert isinstance(rejected, ProviderOverloadedError) and rejected.queue_full
+    assert isinstance(timed_out, ProviderOverloadedError) and not timed_out.queue_full
+    assert rejected.retry_after >= 1
+    assert limiter.stats().in_flight == 0 and limiter.stats().queued == 0
+
+    patient = LimitedAIService(
+        FakeAIService(LatencyProfile("fixed", mean_ms=20)),
+        AdaptiveConcurrencyLimiter(AdmissionSettings(initial_limit=1, max_limit=1, queue_size=2, queue_timeout=1.0)),
+    )
+
+    async def queued() -> List[str]:
+        return await asyncio.gather(*(patient.generate_response(f"consulta {number}", [], ChatContext()) for number in range(3)))
+
+    assert len(asyncio.run(queued())) == 3
+
+
+def test_limiter_adapts_limit_with_aimd() -> None:
+    now = [0.0]
+    limiter = AdaptiveConcurrencyLimiter(AdmissionSettings(initial_limit=4, latency_target=1.0), clock=lambda: now[0])
+
+    async def call(duration: float, fail: bool = False) -> None:
+        async with limiter.slot():
+            now[0] += duration
+            if fail:
+                raise RuntimeError("429")
+
+    async def saturated_round(duration: float) -> None:
+        async def hold() -> None:
+            async with limiter.slot():
+                await asyncio.sleep(0)
+                now[0] += duration
+
+        await asyncio.gather(*(hold() for _ in range(int(limiter.stats().limit))))
+
+    for _ in range(8):
+        asyncio.run(saturated_round(0.1))
+    grown = limiter.stats().limit
+    assert grown > 4
+
+    asyncio.run(call(0.1))
+    assert limiter.stats().limit == grown
+
+    asyncio.run(call(2.0))
+    reduced = limiter.stats().limit
+    assert reduced == pytest.approx(grown * 0.7, abs=1e-3)
+    with pytest.raises(RuntimeError):
+        asyncio.run(call(0.1, fail=True))
+    assert limiter.stats().limit == pytest.approx(reduced * 0.7, abs=1e-3)
+
+
+def test_limiter_ignores_stream_consumption_and_publishes_metrics() -> None:
+    now = [0.0]
+    registry = MetricsRegistry()
+    limiter = AdaptiveConcurrencyLimiter(
+        AdmissionSettings(initial_limit=2, latency_target=1.0),
+        clock=lambda: now[0],
+        metrics=AdmissionMetrics(registry),
+        provider="fake",
+    )
+    service = LimitedAIService(CountingAIService(), limiter)
+
+    async def slow_reader() -> List[str]:
+        chunks = []
+        async for chunk in service.stream_response("hola", [], ChatContext()):
+            assert 'llm_admission_in_flight{provider="fake"} 1' in registry.render()
+            now[0] += 10.0
+            chunks.append(chunk)
+        return chunks
+
+    assert asyncio.run(slow_reader()) == ["respuesta ", "1"]
+    assert limiter.stats().limit == 2
+
+    exposition = registry.render()
+    assert 'llm_admission_limit{provider="fake"} 2' in exposition
+    assert 'llm_admission_in_flight{provider="fake"} 0' in exposition
+    assert 'llm_admission_queued{provider="fake"} 0' in exposition
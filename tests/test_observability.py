@@ -0,0 +1,112 @@
+"""Tests for the in-process metrics, Server-Timing and the sampling profiler."""
+import asyncio
+import time
+from typing import List
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from src.domain.entities import ChatContext, Product
+from src.infrastructure.observability.metrics import MetricsRegistry
+from src.infrastructure.observability.profiler import ProfileStore, RequestProfiler
+from src.infrastructure.observability.server_timing import (
+    RequestTimings,
+    ServerTimingAIService,
+    ServerTimingMiddleware,
+    ServerTimingRoute,
+    _current_timings,
+    timed,
+)
+
+
+def test_histogram_counter_and_gauge_render_prometheus_text() -> None:
+    registry = MetricsRegistry()
+    latency = registry.histogram("stage_seconds", "Duración.", ["stage"], buckets=(0.1, 1.0))
+    errors = registry.counter("errors_total", "Errores.", ["error"])
+    in_flight = registry.gauge("in_flight", "En curso.")
+
+    for value in (0.05, 0.1, 0.5, 3.0):
+        latency.observe(value, stage="llm")
+    errors.inc(error='Time"out')
+    with in_flight.track_inprogress():
+        assert in_flight.value() == 1
+
+    lines = registry.render().splitlines()
+    assert "# TYPE stage_seconds histogram" in lines
+    assert 'stage_seconds_bucket{stage="llm",le="0.1"} 2' in lines
+    assert 'stage_seconds_bucket{stage="llm",le="1"} 3' in lines
+    assert 'stage_seconds_bucket{stage="llm",le="+Inf"} 4' in lines
+    assert 'stage_seconds_sum{stage="llm"} 3.65' in lines
+    assert 'stage_seconds_count{stage="llm"} 4' in lines
+    assert 'errors_total{error="Time\\"out"} 1' in lines
+    assert "in_flight 0" in lines
+
+    assert registry.counter("errors_total", "Errores.", ["error"]) is errors
+    with pytest.raises(ValueError):
+        registry.gauge("errors_total", "Otro tipo.")
+    with pytest.raises(ValueError):
+        errors.inc(kind="x")
+
+
+class SlowAIService:
+    """Fake provider that spends time building the prompt and waiting for the model."""
+
+    async def generate_response(self, user_message: str, products: List[Product], context: ChatContext) -> str:
+        with timed("prompt"):
+            time.sleep(0.02)
+        await asyncio.sleep(0.03)
+        return "ok"
+
+
+def test_provider_timing_separates_prompt_from_llm() -> None:
+    timings = RequestTimings()
+
+    async def call() -> str:
+        _current_timings.set(timings)
+        return await ServerTimingAIService(SlowAIService()).generate_response("hola", [], ChatContext())
+
+    assert asyncio.run(call()) == "ok"
+    assert timings.get("prompt") >= 0.02
+    assert 0.03 <= timings.get("llm") < 0.05
+
+
+def test_middleware_adds_server_timing_and_captures_requested_profiles() -> None:
+    store = ProfileStore(max_profiles=2)
+    app = FastAPI()
+    app.router.route_class = ServerTimingRoute
+    app.add_middleware(ServerTimingMiddleware, profiler=RequestProfiler(store, header_enabled=True, interval=0.001))
+
+    def busy_endpoint() -> dict:
+        deadline = time.perf_counter() + 0.05
+        while time.perf_counter() < deadline:
+            pass
+        return {"items": list(range(1000))}
+
+    app.get("/busy")(busy_endpoint)
+    client = TestClient(app)
+
+    plain = client.get("/busy")
+    assert "X-Profile-Id" not in plain.headers
+    assert plain.headers["Server-Timing"].startswith("serialize;dur=")
+    assert "total;dur=" in plain.headers["Server-Timing"]
+
+    profiled = client.get("/busy", headers={"X-Profile": "1"})
+    profile = store.get(profiled.headers["X-Profile-Id"])
+    assert profile is not None and profile.samples > 0
+    folded = profile.folded().splitlines()
+    assert any("busy_endpoint (test_observability.py" in line for line in folded)
+    assert all(line.rsplit(" ", 1)[1].isdigit() for line in folded)
+
+
+def test_profile_downloads_require_token_or_local_client() -> None:
+    local_only = RequestProfiler(ProfileStore(), header_enabled=True)
+    assert local_only.allows_download("127.0.0.1", None)
+    assert local_only.allows_download("::1", None)
+    assert not local_only.allows_download("10.0.0.7", None)
+    assert not local_only.allows_download("testclient", None)
+
+    guarded = RequestProfiler(ProfileStore(), header_enabled=True, access_token="secreto")
+    assert guarded.allows_download("10.0.0.7", "secreto")
+    assert not guarded.allows_download("127.0.0.1", None)
+    assert not guarded.allows_download("127.0.0.1", "otro")
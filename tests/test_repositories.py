@@ -0,0 +1,340 @@
+"""Tests for infrastructure repositories backed by an in-memory SQLite database."""
+import asyncio
+from datetime import datetime, timedelta
+from typing import Iterator, List
+
+import pytest
+from sqlalchemy import create_engine, event, text
+from sqlalchemy.exc import OperationalError
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+from sqlalchemy.orm import Session, sessionmaker
+from sqlalchemy.pool import StaticPool
+
+from src.domain.entities import ChatMessage, ConversationSummary, HistoryCursor, Product, ProductCursor, StockAdjustment
+from src.infrastructure.cache.catalog_cache import CatalogCache
+from src.infrastructure.db import models  # noqa: F401 - ensure models are registered
+from src.infrastructure.db.database import Base
+from src.infrastructure.db.storage import apply_storage_profile, engine_options, get_storage_profile
+from src.infrastructure.repositories.async_chat_repository import AsyncSQLChatRepository
+from src.infrastructure.repositories.async_product_repository import AsyncCachedProductRepository, AsyncSQLProductRepository
+from src.infrastructure.repositories.cached_product_repository import CachedProductRepository
+from src.infrastructure.repositories.chat_repository import SQLChatRepository
+from src.infrastructure.repositories.product_repository import SQLProductRepository
+from src.infrastructure.repositories.write_behind_chat_repository import WriteBehindChatRepository
+
+
+@pytest.fixture()
+def engine():
+    engine = create_engine("sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool)
+    Base.metadata.create_all(bind=engine)
+    yield engine
+    engine.dispose()
+
+
+@pytest.fixture()
+def db_session(engine) -> Iterator[Session]:
+    session = sessionmaker(bind=engine, autoflush=False)()
+    yield session
+    session.close()
+
+
+@pytest.fixture()
+def select_log(engine) -> List[str]:
+    statements: List[str] = []
+
+    @event.listens_for(engine, "before_cursor_execute")
+    def _record(conn, cursor, statement, parameters, context, executemany):  # noqa: ANN001
+        if statement.lstrip().upper().startswith("SELECT"):
+            statements.append(statement)
+
+    return statements
+
+
+def make_product(name: str, brand: str = "Nike", category: str = "Running", stock: int = 5) -> Product:
+    return Product(id=None, name=name, brand=brand, category=category, size="42", color="Negro", price=100.0, stock=stock, description="")
+
+
+def test_cached_repository_serves_reads_from_snapshot(db_session: Session, select_log: List[str]) -> None:
+    sql_repo = SQLProductRepository(db_session)
+    sql_repo.save(make_product("Air Zoom"))
+    sql_repo.save(make_product("Ultraboost", brand="Adidas"))
+    cache = CatalogCache()
+    repo = CachedProductRepository(sql_repo, cache)
+
+    select_log.clear()
+    assert len(repo.get_all()) == 2
+    assert [p.name for p in repo.get_by_brand("adidas")] == ["Ultraboost"]
+    assert repo.get_by_id(1).name == "Air Zoom"
+    assert len(select_log) == 1
+    assert repo.snapshot().version == cache.version
+
+
+def test_cached_repository_invalidates_on_writes(db_session: Session) -> None:
+    cache = CatalogCache()
+    repo = CachedProductRepository(SQLProductRepository(db_session), cache)
+    created = repo.save(make_product("Air Zoom"))
+    first = repo.snapshot()
+
+    repo.save(make_product("Suede", brand="Puma", category="Casual"))
+    second = repo.snapshot()
+    assert second.version > first.version
+    assert len(second) == 2
+
+    assert repo.delete(created.id)
+    assert not repo.delete(created.id)
+    assert repo.snapshot().version > second.version
+    assert repo.get_by_id(created.id) is None
+
+
+def test_catalog_cache_notifies_listeners_in_version_order() -> None:
+    cache = CatalogCache()
+    products = [make_product(name) for name in ("Air Zoom", "Suede", "Gel")]
+    for product_id, product in enumerate(products, start=1):
+        product.id = product_id
+    loaded = cache.publish(products, cache.version)
+    events: List[tuple] = []
+
+    class Recorder:
+        def on_catalog_loaded(self, snapshot) -> None:
+            events.append(("loaded", snapshot.version))
+
+        def on_product_saved(self, product, version) -> None:
+            events.append(("saved", version))
+            # Un listener puede consultar la caché sin bloquearse.
+            assert cache.current().version == version
+
+        def on_product_deleted(self, product_id, version) -> None:
+            events.append(("deleted", version))
+
+    cache.subscribe(Recorder())
+    renamed = make_product("Suede Classic")
+    renamed.id = 2
+    saved = cache.apply_saved(renamed)
+    deleted = cache.apply_deleted(1)
+
+    assert events == [("loaded", loaded.version), ("saved", saved), ("deleted", deleted)]
+    assert [product.name for product in cache.current().products] == ["Suede Classic", "Gel"]
+    assert loaded.get(1) is products[0]
+
+
+def test_save_messages_uses_single_commit(db_session: Session, engine, select_log: List[str]) -> None:
+    commits: List[int] = []
+    event.listen(db_session, "after_commit", lambda session: commits.append(1))
+    repo = SQLChatRepository(db_session)
+    timestamp = datetime(2024, 1, 1)
+
+    saved = repo.save_messages(
+        [
+            ChatMessage(id=None, session_id="s", role="user", message="Hola", timestamp=timestamp),
+            ChatMessage(id=None, session_id="s", role="assistant", message="Hola!", timestamp=timestamp),
+        ]
+    )
+
+    assert [message.id for message in saved] == [1, 2]
+    assert len(commits) == 1
+    assert select_log == []
+
+
+def test_history_page_uses_keyset_with_id_tiebreak(db_session: Session) -> None:
+    repo = SQLChatRepository(db_session)
+    same = datetime(2024, 1, 1)
+    repo.save_messages(
+        [ChatMessage(id=None, session_id="s", role="user", message=f"m{i}", timestamp=same if i < 3 else same + timedelta(seconds=i)) for i in range(6)]
+        + [ChatMessage(id=None, session_id="other", role="user", message="x", timestamp=same)]
+    )
+
+    first = repo.get_history_page("s", 4, newest_first=True)
+    assert [m.message for m in first] == ["m5", "m4", "m3", "m2"]
+    second = repo.get_history_page("s", 4, before=HistoryCursor.from_message(first[-1]), newest_first=True)
+    assert [m.message for m in second] == ["m1", "m0"]
+
+    forward = repo.get_history_page("s", 2, after=HistoryCursor.from_message(second[0]))
+    assert [m.message for m in forward] == ["m2", "m3"]
+
+
+def test_summary_is_upserted_and_cleared_with_history(db_session: Session) -> None:
+    repo = SQLChatRepository(db_session)
+    first, second = repo.save_messages(
+        [ChatMessage(id=None, session_id="s", role=role, message=role, timestamp=datetime(2024, 1, 1)) for role in ("user", "assistant")]
+    )
+    assert repo.get_summary("s") is None
+
+    repo.save_summary(ConversationSummary("s", "borrador", HistoryCursor.from_message(first), datetime(2024, 1, 2)))
+    repo.save_summary(ConversationSummary("s", "final", HistoryCursor.from_message(second), datetime(2024, 1, 3)))
+    summary = repo.get_summary("s")
+    assert summary.summary == "final"
+    assert summary.covered_until == HistoryCursor.from_message(second)
+
+    repo.delete_session_history("s")
+    assert repo.get_summary("s") is None
+
+
+def test_async_repositories_round_trip(tmp_path) -> None:
+    async def scenario() -> None:
+        engine = create_async_engine(f"sqlite+aiosqlite:///{tmp_path / 'async.db'}")
+        async with engine.begin() as connection:
+            await connection.run_sync(Base.metadata.create_all)
+        session_factory = async_sessionmaker(engine, expire_on_commit=False)
+        chat_repo = AsyncSQLChatRepository(session_factory)
+        product_repo = AsyncCachedProductRepository(AsyncSQLProductRepository(session_factory), CatalogCache())
+
+        saved = await product_repo.save(make_product("Air Zoom"))
+        assert [p.id for p in await product_repo.get_all()] == [saved.id]
+
+        base = datetime(2024, 1, 1)
+        for offset, role in enumerate(["user", "assistant", "user"]):
+            await chat_repo.save_message(ChatMessage(id=None, session_id="s", role=role, message=f"m{offset}", timestamp=base + timedelta(seconds=offset)))
+
+        recent = await chat_repo.get_recent_messages("s", 2)
+        assert [message.message for message in recent] == ["m1", "m2"]
+        assert len(await chat_repo.get_session_history("s")) == 3
+        assert await chat_repo.delete_session_history("s") == 3
+        await engine.dispose()
+
+    asyncio.run(scenario())
+
+
+class FlakyChatRepository(AsyncSQLChatRepository):
+    """Async repository that fails the first batch write."""
+
+    def __init__(self, session_factory) -> None:  # noqa: ANN001
+        super().__init__(session_factory)
+        self.failures = 1
+
+    async def save_messages(self, messages):  # noqa: ANN001
+        if self.failures:
+            self.failures -= 1
+            raise RuntimeError("database is locked")
+        return await super().save_messages(messages)
+
+
+def test_write_behind_repository_retries_and_serves_pending_reads(tmp_path) -> None:
+    async def scenario() -> None:
+        engine = create_async_engine(f"sqlite+aiosqlite:///{tmp_path / 'wb.db'}")
+        async with engine.begin() as connection:
+            await connection.run_sync(Base.metadata.create_all)
+        inner = FlakyChatRepository(async_sessionmaker(engine, expire_on_commit=False))
+        repo = WriteBehindChatRepository(inner, retry_delay=0)
+
+        base = datetime(2024, 1, 1)
+        turn = [
+            ChatMessage(id=None, session_id="s", role="user", message="Hola", timestamp=base),
+            ChatMessage(id=None, session_id="s", role="assistant", message="Hola!", timestamp=base + timedelta(seconds=1)),
+        ]
+        await repo.save_messages(turn)
+        assert [message.message for message in await repo.get_recent_messages("s", 5)] == ["Hola", "Hola!"]
+
+        await repo.flush()
+        persisted = await inner.get_session_history("s")
+        assert [message.id is not None for message in persisted] == [True, True]
+        assert len(await repo.get_session_history("s")) == 2
+
+        await repo.save_messages([ChatMessage(id=None, session_id="s", role="user", message="Otro", timestamp=base + timedelta(seconds=2))])
+        page = await repo.get_history_page("s", 10)
+        assert [message.message for message in page] == ["Hola", "Hola!", "Otro"] and page[-1].id is not None
+        assert await repo.delete_session_history("s") == 3
+        await repo.aclose()
+        assert await inner.get_session_history("s") == []
+        await engine.dispose()
+
+    asyncio.run(scenario())
+
+
+def test_product_page_sorts_projects_and_pages_in_sql(db_session: Session, select_log: List[str]) -> None:
+    repo = SQLProductRepository(db_session)
+    for name, price in (("C", 50.0), ("A", 80.0), ("B", 50.0), ("D", 20.0)):
+        saved = repo.save(make_product(name))
+        saved.price = price
+        repo.save(saved)
+    select_log.clear()
+
+    first = repo.get_page(2, sort_by="price", fields=["name"])
+    assert first == [{"id": 4, "name": "D", "price": 20.0}, {"id": 1, "name": "C", "price": 50.0}]
+    assert "description" not in select_log[-1] and "LIMIT" in select_log[-1]
+
+    cursor = ProductCursor(sort_by="price", value=first[-1]["price"], product_id=first[-1]["id"])
+    assert [row["name"] for row in repo.get_page(2, sort_by="price", after=cursor)] == ["B", "A"]
+    assert [row["name"] for row in repo.get_page(3, sort_by="name", descending=True)] == ["D", "C", "B"]
+
+
+def test_upsert_many_inserts_and_updates_with_multi_row_statements(db_session: Session, engine) -> None:
+    statements: List[str] = []
+    event.listen(engine, "before_cursor_execute", lambda conn, cursor, statement, *args: statements.append(statement))
+    cache = CatalogCache()
+    repo = CachedProductRepository(SQLProductRepository(db_session), cache)
+    existing = repo.save(make_product("Pegasus"))
+    repo.snapshot()
+    version = cache.version
+    statements.clear()
+
+    updated = make_product("Pegasus 41", stock=1)
+    updated.id = existing.id
+    assert repo.upsert_many([updated, *(make_product(f"Modelo {index}") for index in range(3))]) == 4
+
+    writes = [statement for statement in statements if not statement.lstrip().upper().startswith("SELECT")]
+    assert len([statement for statement in writes if "ON CONFLICT" in statement]) == 1
+    assert cache.current() is None and cache.version > version
+    assert [product.name for product in repo.get_all()] == ["Pegasus 41", "Modelo 0", "Modelo 1", "Modelo 2"]
+
+
+def test_adjust_stock_many_uses_conditional_updates(db_session: Session, select_log: List[str]) -> None:
+    cache = CatalogCache()
+    repo = CachedProductRepository(SQLProductRepository(db_session), cache)
+    product = repo.save(make_product("Pegasus", stock=3))
+    other = repo.save(make_product("Vomero", stock=2))
+    repo.snapshot()
+    batches: List[tuple] = []
+
+    class Recorder:
+        def on_catalog_loaded(self, snapshot) -> None:
+            pass
+
+        def on_products_saved(self, products, version) -> None:
+            batches.append((sorted(saved.stock for saved in products), version))
+
+    cache.subscribe(Recorder())
+    version = cache.version
+    select_log.clear()
+
+    results = repo.adjust_stock_many(
+        [
+            StockAdjustment(product.id, -2),
+            StockAdjustment(product.id, -2),
+            StockAdjustment(product.id, 5),
+            StockAdjustment(999, -1),
+            StockAdjustment(other.id, 1),
+        ]
+    )
+
+    assert [(result.applied, result.stock) for result in results] == [(True, 1), (False, 1), (True, 6), (False, None), (True, 3)]
+    assert batches == [([3, 6], version + 1)] and cache.version == version + 1
+    assert results[1].error == "Stock insuficiente para completar la operación"
+    assert len(select_log) == 2
+    assert repo.get_by_id(product.id).stock == 6
+    assert SQLProductRepository(db_session).get_by_id(product.id).stock == 6
+
+
+def test_storage_profile_applies_pragmas_and_read_only_engine(tmp_path) -> None:
+    url = f"sqlite:///{tmp_path / 'profile.db'}"
+    profile = get_storage_profile("balanced")
+    writer = create_engine(url, **engine_options(url, profile))
+    reader = create_engine(url, **engine_options(url, profile, read_only=True))
+    apply_storage_profile(writer, profile)
+    apply_storage_profile(reader, profile, read_only=True)
+    try:
+        with writer.begin() as connection:
+            assert connection.execute(text("PRAGMA journal_mode")).scalar() == "wal"
+            assert connection.execute(text("PRAGMA synchronous")).scalar() == 1
+            connection.execute(text("CREATE TABLE items (id INTEGER PRIMARY KEY)"))
+            connection.execute(text("INSERT INTO items VALUES (1)"))
+        with reader.connect() as connection:
+            assert connection.execute(text("SELECT COUNT(*) FROM items")).scalar() == 1
+            with pytest.raises(OperationalError):
+                connection.execute(text("INSERT INTO items VALUES (2)"))
+        assert reader.pool.size() == profile.read_pool_size
+    finally:
+        writer.dispose()
+        reader.dispose()
+
+    with pytest.raises(ValueError):
+        get_storage_profile("turbo")
@@ -0,0 +1,179 @@
+"""Tests for the in-process catalog search indexes."""
+from typing import List
+
+import pytest
+
+from src.application.retrieval import FacetQuery
+from src.domain.entities import Product
+from src.infrastructure.cache.catalog_cache import CatalogCache, CatalogSnapshot
+from src.infrastructure.search.bm25_index import BM25ProductRetriever
+from src.infrastructure.search.columnar_catalog import ColumnarCatalog
+from src.infrastructure.search.facet_index import FacetIndex
+from src.infrastructure.search.trigram_index import TrigramIndex
+from src.infrastructure.search.vector_index import ProductVectorIndex
+
+
+@pytest.fixture()
+def catalog() -> List[Product]:
+    return [
+        Product(id=1, name="Air Zoom Pegasus", brand="Nike", category="Running", size="42", color="Negro", price=120.0, stock=5, description="Amortiguación reactiva."),
+        Product(id=2, name="Ultraboost", brand="Adidas", category="Running", size="41", color="Blanco", price=150.0, stock=3, description="Tecnología Boost."),
+        Product(id=3, name="Suede Classic", brand="Puma", category="Casual", size="40", color="Azul", price=80.0, stock=10, description="Diseño retro."),
+        Product(id=4, name="Desert Boot", brand="Clarks", category="Formal", size="42", color="Arena", price=140.0, stock=0, description="Suela de crepé."),
+    ]
+
+
+def test_bm25_retriever_ranks_by_relevance(catalog: List[Product]) -> None:
+    retriever = BM25ProductRetriever()
+    retriever.rebuild(catalog)
+
+    results = retriever.retrieve("¿Qué zapatillas de running blancas tienen?", catalog, 2)
+    assert [product.id for product in results] == [2, 1]
+
+    assert [product.id for product in retriever.retrieve("algo formal", catalog, 3)] == [4]
+    assert retriever.retrieve("sandalias", catalog, 3) == []
+
+
+def test_bm25_retriever_tracks_catalog_changes(catalog: List[Product]) -> None:
+    cache = CatalogCache()
+    retriever = BM25ProductRetriever()
+    cache.subscribe(retriever)
+    cache.publish(catalog, cache.version)
+
+    renamed = Product(id=3, name="Suede", brand="Reebok", category="Casual", size="40", color="Azul", price=80.0, stock=10, description="")
+    cache.apply_saved(renamed)
+    cache.apply_deleted(4)
+    updated = [catalog[0], catalog[1], renamed]
+
+    assert retriever.retrieve("reebok", updated, 3) == [renamed]
+    assert retriever.retrieve("puma", updated, 3) == []
+    assert retriever.retrieve("clarks", catalog, 3) == []
+    assert retriever.retrieve("running", updated[:1], 3) == [catalog[0]]
+
+
+def test_vector_index_tolerates_typos_and_batches_queries(catalog: List[Product]) -> None:
+    index = ProductVectorIndex()
+    index.rebuild(catalog)
+
+    best, score = index.search("zapatillas runing addidas", 1)[0]
+    assert best.id == 2
+    assert 0 < score <= 1.0
+
+    batch = index.search_many(["puma retro", "bota arena"], 1)
+    assert [results[0][0].id for results in batch] == [3, 4]
+
+
+def test_vector_index_follows_catalog_cache_events(catalog: List[Product]) -> None:
+    cache = CatalogCache()
+    index = ProductVectorIndex()
+    cache.subscribe(index)
+    cache.publish(catalog, cache.version)
+    assert len(index) == 4
+
+    cache.apply_deleted(1)
+    cache.apply_saved(Product(id=5, name="Gel Kayano", brand="Asics", category="Running", size="44", color="Azul", price=160.0, stock=4, description=""))
+
+    assert len(index) == 4
+    assert index.search("asics kayano", 1)[0][0].id == 5
+    assert all(product.id != 1 for product, _ in index.search("nike pegasus", 4))
+
+
+def test_vector_index_retrieve_ranks_only_the_candidates(catalog: List[Product]) -> None:
+    index = ProductVectorIndex()
+    index.rebuild(catalog)
+    available = [product for product in catalog if product.is_available()]
+
+    results = index.retrieve("bota arena clarks running", available, 3)
+    assert results and all(product in available for product in results)
+    assert index.retrieve("ultraboost", available[:1], 3) == []
+    assert len(index) == 4
+
+
+def test_retrievers_rank_a_full_snapshot_through_their_index(catalog: List[Product]) -> None:
+    snapshot = CatalogSnapshot.build(1, catalog)
+    bm25 = BM25ProductRetriever()
+    bm25.rebuild(catalog)
+    vectors = ProductVectorIndex()
+    vectors.rebuild(catalog)
+
+    query = "zapatillas de running blancas"
+    for retriever in (bm25, vectors):
+        ranked = retriever.retrieve(query, snapshot, 2)
+        assert ranked == retriever.retrieve(query, catalog, 2)
+        assert all(product is snapshot.get(product.id) for product in ranked)
+
+    older = CatalogSnapshot.build(0, catalog[2:])
+    assert bm25.retrieve("running", older, 3) == []
+    assert all(product.id in (3, 4) for product in vectors.retrieve("running", older, 4))
+
+
+def test_facet_index_counts_each_dimension_with_the_other_filters(catalog: List[Product]) -> None:
+    cache = CatalogCache()
+    index = FacetIndex(price_bucket_width=50)
+    cache.subscribe(index)
+    cache.publish(catalog, cache.version)
+
+    result = index.search(FacetQuery(category=("running",), max_price=140.0), 10)
+    assert [product.id for product in result.products] == [1]
+    assert result.total == 1
+    assert result.facets["category"] == {"Casual": 1, "Formal": 1, "Running": 1}
+    assert result.facets["brand"] == {"Nike": 1}
+    assert result.facets["price"] == {"100-150": 1, "150-200": 1}
+    assert result.facets["available"] == {"true": 1, "false": 0}
+
+    cache.apply_saved(Product(id=4, name="Desert Boot", brand="Clarks", category="Running", size="42", color="Arena", price=140.0, stock=2, description=""))
+    cache.apply_deleted(1)
+
+    result = index.search(FacetQuery(category=("Running",), available=True), 10, offset=0)
+    assert [product.id for product in result.products] == [2, 4]
+    assert result.facets["brand"] == {"Adidas": 1, "Clarks": 1}
+    assert "Formal" not in result.facets["category"]
+    assert index.search(FacetQuery(brand=("nike",)), 10).total == 0
+
+    for stock in range(100):
+        cache.apply_saved(Product(id=2, name="Ultraboost", brand="Adidas", category="Running", size="41", color="Blanco", price=150.0, stock=stock + 1, description=""))
+    assert [product.id for product in index.search(FacetQuery(), 10).products] == [2, 3, 4]
+    assert len(index._products) == 4
+
+
+def test_columnar_catalog_filters_sorts_and_follows_catalog_events(catalog: List[Product]) -> None:
+    cache = CatalogCache()
+    columnar = ColumnarCatalog()
+    cache.subscribe(columnar)
+    cache.publish(catalog, cache.version)
+
+    assert [product.id for product in columnar.select(category="running", sort_by="price", descending=True)] == [2, 1]
+    assert [product.id for product in columnar.select(available=True, sort_by="price", limit=2)] == [3, 1]
+    assert columnar.select(brand="Reebok") == []
+
+    cache.apply_saved(Product(id=3, name="Suede", brand="Puma", category="Casual", size="40", color="Azul", price=200.0, stock=1, description=""))
+    cache.apply_deleted(2)
+    cache.apply_saved(Product(id=5, name="Gel Kayano", brand="Asics", category="Running", size="44", color="Azul", price=120.0, stock=4, description=""))
+
+    assert len(columnar) == 4
+    assert [product.id for product in columnar.select(sort_by="price", descending=True, limit=3)] == [3, 4, 5]
+    assert [product.id for product in columnar.select(category="Running", sort_by="name")] == [1, 5]
+
+
+def test_trigram_index_matches_typos_and_tracks_changes(catalog: List[Product]) -> None:
+    cache = CatalogCache()
+    index = TrigramIndex()
+    cache.subscribe(index)
+    cache.publish(catalog, cache.version)
+
+    best, score = index.search("addidas runing", 2)[0]
+    assert best.id == 2
+    assert 0.5 < score < 1.0
+    assert index.search("puma", 1)[0][1] == pytest.approx(1.0)
+    assert index.search("zzzz", 3) == []
+
+    cache.apply_saved(Product(id=5, name="Gel Kayano", brand="Asics", category="Running", size="44", color="Azul", price=160.0, stock=4, description=""))
+    cache.apply_deleted(3)
+
+    assert index.search("kayamo", 1)[0][0].id == 5
+    assert index.search("puma", 3) == []
+
+    for stock in range(100):
+        cache.apply_saved(Product(id=5, name="Gel Kayano", brand="Asics", category="Running", size="44", color="Azul", price=160.0, stock=stock, description=""))
+    assert len(index._products) == 5
+    assert index.search("kayano", 1)[0][0].stock == 99
@@ -6,11 +6,20 @@ from typing import List
 import pytest
 
 from src.application.chat_service import AIServiceProtocol, ChatService
+from src.application.conversation_summary import ConversationSummaryService
 from src.application.dtos import ChatMessageRequestDTO, ProductDTO
+from src.application.product_import import ProductImportService, parse_rows
 from src.application.product_service import ProductService
-from src.domain.entities import ChatMessage, Product
+from src.domain.entities import ChatMessage, ConversationSummary, Product
 from src.domain.exceptions import ChatServiceError, ProductNotFoundError
 from src.domain.repositories import IChatRepository, IProductRepository
+from src.infrastructure.cache.catalog_cache import CatalogCache
+from src.infrastructure.cache.response_cache import CachingAIService, LLMResponseCache
+from src.infrastructure.observability.chat_metrics import ChatPipelineMetrics
+from src.infrastructure.observability.metrics import MetricsRegistry
+from src.infrastructure.repositories.async_product_repository import AsyncCachedProductRepository
+from src.infrastructure.repositories.sync_adapters import AsyncChatRepositoryAdapter, AsyncProductRepositoryAdapter
+from src.infrastructure.search.columnar_catalog import ColumnarCatalog
 
 
 class InMemoryProductRepository(IProductRepository):
@@ -50,6 +59,14 @@ class InMemoryChatRepository(IChatRepository):
 
     def __init__(self) -> None:
         self.messages: List[ChatMessage] = []
+        self.summaries: dict = {}
+
+    def get_summary(self, session_id: str) -> ConversationSummary | None:
+        return self.summaries.get(session_id)
+
+    def save_summary(self, summary: ConversationSummary) -> ConversationSummary:
+        self.summaries[summary.session_id] = summary
+        return summary
 
     def save_message(self, message: ChatMessage) -> ChatMessage:
         message.id = len(self.messages) + 1
@@ -77,11 +94,39 @@ class InMemoryChatRepository(IChatRepository):
 class FakeAIService(AIServiceProtocol):
     """Fake AI service returning deterministic responses."""
 
+    def __init__(self) -> None:
+        self.last_products: List[Product] = []
+
     async def generate_response(self, user_message: str, products: List[Product], context):
+        self.last_products = list(products)
         if "fallo" in user_message:
             raise RuntimeError("AI error")
         return "Respuesta generada"
 
+    async def stream_response(self, user_message: str, products: List[Product], context):
+        self.last_products = list(products)
+        for token in ("Respuesta ", "generada"):
+            if "fallo" in user_message:
+                raise RuntimeError("AI error")
+            yield token
+
+
+class SummarizingAIService(FakeAIService):
+    """Fake AI service that also condenses old turns into a summary."""
+
+    def __init__(self) -> None:
+        super().__init__()
+        self.folded: List[List[str]] = []
+        self.last_context = None
+
+    async def generate_response(self, user_message: str, products: List[Product], context):
+        self.last_context = context
+        return await super().generate_response(user_message, products, context)
+
+    async def summarize_conversation(self, previous_summary: str, messages: List[ChatMessage]) -> str:
+        self.folded.append([message.message for message in messages])
+        return " ".join([previous_summary, *(message.message for message in messages if message.is_from_user())]).strip()
+
 
 @pytest.fixture()
 def sample_products() -> List[Product]:
@@ -117,11 +162,24 @@ def test_product_service_crud(sample_products: List[Product]) -> None:
         service.get_product_by_id(99)
 
 
+def test_product_service_uses_columnar_catalog_for_large_catalogs(sample_products: List[Product]) -> None:
+    columnar = ColumnarCatalog()
+    columnar.rebuild(sample_products)
+    repo = InMemoryProductRepository(sample_products)
+    filters = {"category": "running", "available": True}
+
+    expected = ProductService(repo).search_products(filters, sort="-price", limit=1)
+    vectorized = ProductService(repo, columnar=columnar, columnar_min_products=1)
+
+    assert vectorized.search_products(filters, sort="-price", limit=1) == expected == [sample_products[1]]
+    assert vectorized.get_available_products() == ProductService(repo).get_available_products()
+
+
 def test_chat_service_flow(sample_products: List[Product]) -> None:
     product_repo = InMemoryProductRepository(sample_products)
     chat_repo = InMemoryChatRepository()
     ai_service = FakeAIService()
-    service = ChatService(product_repo, chat_repo, ai_service)
+    service = ChatService(AsyncProductRepositoryAdapter(product_repo), AsyncChatRepositoryAdapter(chat_repo), ai_service)
 
     request = ChatMessageRequestDTO(session_id="abc", message="Hola")
     response = asyncio.run(service.process_message(request))
@@ -131,11 +189,122 @@ def test_chat_service_flow(sample_products: List[Product]) -> None:
     assert len(history) == 2
 
 
+def test_chat_service_caches_answers_under_the_catalog_version_it_used(sample_products: List[Product]) -> None:
+    catalog = CatalogCache()
+    product_repo = AsyncCachedProductRepository(AsyncProductRepositoryAdapter(InMemoryProductRepository(sample_products)), catalog)
+
+    class CatalogChangingChatRepository(AsyncChatRepositoryAdapter):
+        """Saves a product while the first turn reads its history."""
+
+        changed = False
+
+        async def get_recent_messages(self, session_id: str, count: int) -> List[ChatMessage]:
+            if not self.changed:
+                self.changed = True
+                catalog.apply_saved(sample_products[0])
+            return await super().get_recent_messages(session_id, count)
+
+    class CountingAIService(FakeAIService):
+        calls = 0
+
+        async def generate_response(self, user_message: str, products: List[Product], context):
+            self.calls += 1
+            return await super().generate_response(user_message, products, context)
+
+    provider = CountingAIService()
+    service = ChatService(
+        product_repo,
+        CatalogChangingChatRepository(InMemoryChatRepository()),
+        CachingAIService(provider, LLMResponseCache(), catalog),
+    )
+    for session_id in ("antes", "despues"):
+        asyncio.run(service.process_message(ChatMessageRequestDTO(session_id=session_id, message="Hola")))
+
+    assert provider.calls == 2
+
+
+def test_chat_service_limits_products_with_retriever(sample_products: List[Product]) -> None:
+    class FirstMatchRetriever:
+        def retrieve(self, query: str, products, limit: int) -> List[Product]:
+            self.query = query
+            return [product for product in products if product.brand.lower() in query.lower()][:limit]
+
+    retriever = FirstMatchRetriever()
+    ai_service = FakeAIService()
+    service = ChatService(AsyncProductRepositoryAdapter(InMemoryProductRepository(sample_products)), AsyncChatRepositoryAdapter(InMemoryChatRepository()), ai_service, retriever=retriever, top_k=1)
+
+    asyncio.run(service.process_message(ChatMessageRequestDTO(session_id="abc", message="Busco Adidas")))
+
+    assert [product.name for product in ai_service.last_products] == ["Ultraboost"]
+    assert retriever.query.endswith("Busco Adidas")
+
+    asyncio.run(service.process_message(ChatMessageRequestDTO(session_id="xyz", message="Busco sandalias")))
+    assert ai_service.last_products == [next(product for product in sample_products if product.is_available())]
+
+
+def test_chat_service_streams_and_persists_after_completion(sample_products: List[Product]) -> None:
+    chat_repo = InMemoryChatRepository()
+    service = ChatService(AsyncProductRepositoryAdapter(InMemoryProductRepository(sample_products)), AsyncChatRepositoryAdapter(chat_repo), FakeAIService())
+
+    async def consume(message: str) -> List[str]:
+        tokens = []
+        async for token in service.stream_message(ChatMessageRequestDTO(session_id="abc", message=message)):
+            assert chat_repo.messages == []
+            tokens.append(token)
+        return tokens
+
+    assert asyncio.run(consume("Hola")) == ["Respuesta ", "generada"]
+    assert [message.message for message in chat_repo.get_session_history("abc")] == ["Hola", "Respuesta generada"]
+
+    with pytest.raises(ChatServiceError):
+        asyncio.run(consume("Provoca fallo"))
+    assert len(chat_repo.messages) == 2
+
+
+def test_chat_service_persists_partial_turn_when_client_disconnects(sample_products: List[Product]) -> None:
+    chat_repo = InMemoryChatRepository()
+    registry = MetricsRegistry()
+    service = ChatService(AsyncProductRepositoryAdapter(InMemoryProductRepository(sample_products)), AsyncChatRepositoryAdapter(chat_repo), FakeAIService(), telemetry=ChatPipelineMetrics(registry))
+
+    async def disconnect_after_first_token() -> None:
+        stream = service.stream_message(ChatMessageRequestDTO(session_id="abc", message="Hola"))
+        assert await stream.__anext__() == "Respuesta "
+        await asyncio.sleep(0.05)
+        await stream.aclose()
+
+    asyncio.run(disconnect_after_first_token())
+
+    assert [message.message for message in chat_repo.get_session_history("abc")] == ["Hola", "Respuesta "]
+    exposition = registry.render()
+    assert 'chat_stage_duration_seconds_bucket{stage="llm_call",le="0.025"} 1' in exposition
+    assert "chat_llm_errors_total{" not in exposition
+
+
+def test_chat_service_folds_old_turns_into_summary(sample_products: List[Product]) -> None:
+    chat_repo = InMemoryChatRepository()
+    summaries = ConversationSummaryService(AsyncChatRepositoryAdapter(chat_repo), every_turns=2, context_size=4)
+    ai_service = SummarizingAIService()
+    service = ChatService(AsyncProductRepositoryAdapter(InMemoryProductRepository(sample_products)), AsyncChatRepositoryAdapter(chat_repo), ai_service, context_size=4, summaries=summaries)
+
+    async def converse() -> None:
+        for turn in range(1, 6):
+            await service.process_message(ChatMessageRequestDTO(session_id="abc", message=f"turno {turn}"))
+            await summaries.wait_idle()
+
+    asyncio.run(converse())
+
+    assert ai_service.folded == [["turno 1", "Respuesta generada", "turno 2", "Respuesta generada"]]
+    assert chat_repo.get_summary("abc").summary == "turno 1 turno 2"
+    prompt = ai_service.last_context.format_for_prompt()
+    assert prompt.startswith("Resumen de la conversación previa: turno 1 turno 2")
+    assert "Usuario: turno 3" in prompt and "Usuario: turno 1" not in prompt
+
+
 def test_chat_service_handles_ai_errors(sample_products: List[Product]) -> None:
     product_repo = InMemoryProductRepository(sample_products)
     chat_repo = InMemoryChatRepository()
     ai_service = FakeAIService()
-    service = ChatService(product_repo, chat_repo, ai_service)
+    service = ChatService(AsyncProductRepositoryAdapter(product_repo), AsyncChatRepositoryAdapter(chat_repo), ai_service)
 
     request = ChatMessageRequestDTO(session_id="abc", message="Provoca fallo")
     with pytest.raises(ChatServiceError):
@@ -146,15 +315,43 @@ def test_chat_service_history_management(sample_products: List[Product]) -> None
     product_repo = InMemoryProductRepository(sample_products)
     chat_repo = InMemoryChatRepository()
     ai_service = FakeAIService()
-    service = ChatService(product_repo, chat_repo, ai_service)
+    service = ChatService(AsyncProductRepositoryAdapter(product_repo), AsyncChatRepositoryAdapter(chat_repo), ai_service)
 
     timestamp = datetime.utcnow()
     chat_repo.save_message(ChatMessage(id=None, session_id="abc", role="user", message="Hola", timestamp=timestamp))
     chat_repo.save_message(ChatMessage(id=None, session_id="abc", role="assistant", message="Hola", timestamp=timestamp))
 
-    history_dtos = service.get_session_history("abc")
+    history_dtos = asyncio.run(service.get_session_history("abc"))
     assert len(history_dtos) == 2
 
-    deleted = service.clear_session_history("abc")
+    page = asyncio.run(service.get_history_page("abc", 1, newest_first=True))
+    assert [item.id for item in page.items] == [2]
+    older = asyncio.run(service.get_history_page("abc", 1, before=page.next_cursor, newest_first=True))
+    assert [item.id for item in older.items] == [1]
+
+    deleted = asyncio.run(service.clear_session_history("abc"))
     assert deleted == 2
-    assert service.get_session_history("abc") == []
+    assert asyncio.run(service.get_session_history("abc")) == []
+
+
+def test_product_import_validates_in_batches_and_reports_rows(sample_products: List[Product]) -> None:
+    repo = InMemoryProductRepository(list(sample_products))
+    csv_lines = [
+        "id,name,brand,category,size,color,price,stock,description\n",
+        '1,Air Zoom,Nike,Running,42,Negro,99.5,7,"Nueva\n',
+        'temporada"\n',
+        ",Gel Kayano,Asics,Running,43,Azul,140,4,\n",
+        ",Sin precio,Asics,Running,43,Azul,-1,4,\n",
+        ",,Asics,Running,43,Azul,10,4,\n",
+        "2,Ultraboost\n",
+    ]
+    report = ProductImportService(repo, batch_size=2).import_rows(parse_rows(csv_lines, "csv"))
+
+    assert (report.processed, report.imported, report.failed) == (5, 2, 3)
+    assert [error.row for error in report.errors] == [3, 4, 5]
+    assert repo.get_by_id(1).price == 99.5 and repo.get_by_id(1).description == "Nueva\ntemporada"
+    assert [product.name for product in repo.get_all()] == ["Air Zoom", "Ultraboost", "Gel Kayano"]
+
+    ndjson = ['{"name": "Suede", "brand": "Puma", "category": "Casual", "size": "40", "color": "Rojo", "price": 80, "stock": 2, "description": ""}\n', "\n", "no es json\n"]
+    report = ProductImportService(repo).import_rows(parse_rows(ndjson, "ndjson"))
+    assert (report.imported, report.failed, report.errors[0].row) == (1, 1, 2)